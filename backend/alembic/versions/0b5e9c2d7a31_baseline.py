@@ -1,8 +1,14 @@
-"""initial schema
+"""baseline
 
-Revision ID: 82e9cddad116
+Revision ID: 0b5e9c2d7a31
 Revises: 
-Create Date: 2025-11-21 17:20:36.286199
+Create Date: 2026-10-19 20:47:52.180934
+
+Squashed baseline: the schema as of 799559651a1c (merge migration heads),
+replacing the duplicate "initial schema", "add enrollments table" and
+"add created_at" branches before it. Databases that were on 799559651a1c
+are stamped onto it (``python -m scripts.bootstrap_db --stamp-existing``)
+and then upgrade through the revisions that follow as usual.
 
 """
 from typing import Sequence, Union
@@ -12,7 +18,7 @@ import sqlalchemy as sa
 
 
 # revision identifiers, used by Alembic.
-revision: str = '82e9cddad116'
+revision: str = '0b5e9c2d7a31'
 down_revision: Union[str, Sequence[str], None] = None
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
@@ -27,7 +33,6 @@ def upgrade() -> None:
     sa.Column('code', sa.String(length=50), nullable=False),
     sa.Column('hod_user_id', sa.Integer(), nullable=True),
     sa.Column('created_at', sa.DateTime(), nullable=False),
-    sa.ForeignKeyConstraint(['hod_user_id'], ['users.id'], ),
     sa.PrimaryKeyConstraint('id'),
     sa.UniqueConstraint('code'),
     sa.UniqueConstraint('name')
@@ -49,6 +54,9 @@ def upgrade() -> None:
     op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
     op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
     op.create_index(op.f('ix_users_role'), 'users', ['role'], unique=False)
+    # departments <-> users reference each other; close the cycle once both exist
+    with op.batch_alter_table('departments') as batch_op:
+        batch_op.create_foreign_key('departments_hod_user_id_fkey', 'users', ['hod_user_id'], ['id'])
     op.create_table('courses',
     sa.Column('id', sa.Integer(), nullable=False),
     sa.Column('code', sa.String(length=50), nullable=False),
@@ -145,6 +153,8 @@ def upgrade() -> None:
 def downgrade() -> None:
     """Downgrade schema."""
     # ### commands auto generated by Alembic - please adjust! ###
+    if op.get_bind().dialect.name != 'sqlite':
+        op.drop_constraint('departments_hod_user_id_fkey', 'departments', type_='foreignkey')
     op.drop_index(op.f('ix_grades_id'), table_name='grades')
     op.drop_table('grades')
     op.drop_index(op.f('ix_enrollments_id'), table_name='enrollments')
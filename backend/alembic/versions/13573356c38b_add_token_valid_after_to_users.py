@@ -0,0 +1,28 @@
+"""add token_valid_after to users
+
+Revision ID: 13573356c38b
+Revises: 0b5e9c2d7a31
+Create Date: 2026-10-19 09:12:04.518220
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '13573356c38b'
+down_revision: Union[str, Sequence[str], None] = '0b5e9c2d7a31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('token_valid_after', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'token_valid_after')
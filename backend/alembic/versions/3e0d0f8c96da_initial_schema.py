@@ -1,168 +0,0 @@
-"""initial schema
-
-Revision ID: 3e0d0f8c96da
-Revises: 
-Create Date: 2025-11-21 17:47:19.177415
-
-"""
-from typing import Sequence, Union
-
-from alembic import op
-import sqlalchemy as sa
-
-
-# revision identifiers, used by Alembic.
-revision: str = '3e0d0f8c96da'
-down_revision: Union[str, Sequence[str], None] = None
-branch_labels: Union[str, Sequence[str], None] = None
-depends_on: Union[str, Sequence[str], None] = None
-
-
-def upgrade() -> None:
-    """Upgrade schema."""
-    # ### commands auto generated by Alembic - please adjust! ###
-    op.create_table('departments',
-    sa.Column('id', sa.Integer(), nullable=False),
-    sa.Column('name', sa.String(length=255), nullable=False),
-    sa.Column('code', sa.String(length=50), nullable=False),
-    sa.Column('hod_user_id', sa.Integer(), nullable=True),
-    sa.Column('created_at', sa.DateTime(), nullable=False),
-    sa.ForeignKeyConstraint(['hod_user_id'], ['users.id'], ),
-    sa.PrimaryKeyConstraint('id'),
-    sa.UniqueConstraint('code'),
-    sa.UniqueConstraint('name')
-    )
-    op.create_index(op.f('ix_departments_id'), 'departments', ['id'], unique=False)
-    op.create_table('users',
-    sa.Column('id', sa.Integer(), nullable=False),
-    sa.Column('full_name', sa.String(length=255), nullable=False),
-    sa.Column('email', sa.String(length=255), nullable=False),
-    sa.Column('password_hash', sa.String(length=255), nullable=False),
-    sa.Column('role', sa.Enum('STUDENT', 'TA', 'TEACHER', 'HOD', 'ADMIN', name='userrole'), nullable=False),
-    sa.Column('is_active', sa.Boolean(), nullable=False),
-    sa.Column('department_id', sa.Integer(), nullable=True),
-    sa.Column('created_at', sa.DateTime(), nullable=False),
-    sa.Column('updated_at', sa.DateTime(), nullable=True),
-    sa.ForeignKeyConstraint(['department_id'], ['departments.id'], ),
-    sa.PrimaryKeyConstraint('id')
-    )
-    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
-    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
-    op.create_index(op.f('ix_users_role'), 'users', ['role'], unique=False)
-    op.create_table('courses',
-    sa.Column('id', sa.Integer(), nullable=False),
-    sa.Column('code', sa.String(length=50), nullable=False),
-    sa.Column('name', sa.String(length=255), nullable=False),
-    sa.Column('description', sa.Text(), nullable=True),
-    sa.Column('department_id', sa.Integer(), nullable=False),
-    sa.Column('teacher_id', sa.Integer(), nullable=False),
-    sa.Column('semester', sa.String(length=50), nullable=True),
-    sa.Column('credits', sa.Integer(), nullable=True),
-    sa.ForeignKeyConstraint(['department_id'], ['departments.id'], ),
-    sa.ForeignKeyConstraint(['teacher_id'], ['users.id'], ),
-    sa.PrimaryKeyConstraint('id'),
-    sa.UniqueConstraint('code')
-    )
-    op.create_index(op.f('ix_courses_id'), 'courses', ['id'], unique=False)
-    op.create_table('resources',
-    sa.Column('id', sa.Integer(), nullable=False),
-    sa.Column('name', sa.String(length=255), nullable=False),
-    sa.Column('type', sa.String(length=50), nullable=False),
-    sa.Column('location', sa.String(length=255), nullable=True),
-    sa.Column('capacity', sa.Integer(), nullable=True),
-    sa.Column('department_id', sa.Integer(), nullable=True),
-    sa.Column('is_active', sa.Boolean(), nullable=False),
-    sa.ForeignKeyConstraint(['department_id'], ['departments.id'], ),
-    sa.PrimaryKeyConstraint('id')
-    )
-    op.create_index(op.f('ix_resources_id'), 'resources', ['id'], unique=False)
-    op.create_table('assignments',
-    sa.Column('id', sa.Integer(), nullable=False),
-    sa.Column('course_id', sa.Integer(), nullable=False),
-    sa.Column('title', sa.String(length=255), nullable=False),
-    sa.Column('description', sa.Text(), nullable=True),
-    sa.Column('due_date', sa.DateTime(), nullable=True),
-    sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ),
-    sa.PrimaryKeyConstraint('id')
-    )
-    op.create_index(op.f('ix_assignments_id'), 'assignments', ['id'], unique=False)
-    op.create_table('attendance',
-    sa.Column('id', sa.Integer(), nullable=False),
-    sa.Column('course_id', sa.Integer(), nullable=False),
-    sa.Column('student_id', sa.Integer(), nullable=False),
-    sa.Column('date', sa.Date(), nullable=False),
-    sa.Column('status', sa.String(length=20), nullable=False),
-    sa.Column('marked_by_id', sa.Integer(), nullable=False),
-    sa.Column('period', sa.String(length=50), nullable=True),
-    sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ),
-    sa.ForeignKeyConstraint(['marked_by_id'], ['users.id'], ),
-    sa.ForeignKeyConstraint(['student_id'], ['users.id'], ),
-    sa.PrimaryKeyConstraint('id')
-    )
-    op.create_index(op.f('ix_attendance_id'), 'attendance', ['id'], unique=False)
-    op.create_table('bookings',
-    sa.Column('id', sa.Integer(), nullable=False),
-    sa.Column('resource_id', sa.Integer(), nullable=False),
-    sa.Column('booked_by_id', sa.Integer(), nullable=False),
-    sa.Column('start_time', sa.DateTime(), nullable=False),
-    sa.Column('end_time', sa.DateTime(), nullable=False),
-    sa.Column('purpose', sa.Text(), nullable=True),
-    sa.Column('status', sa.String(length=50), nullable=False),
-    sa.ForeignKeyConstraint(['booked_by_id'], ['users.id'], ),
-    sa.ForeignKeyConstraint(['resource_id'], ['resources.id'], ),
-    sa.PrimaryKeyConstraint('id')
-    )
-    op.create_index(op.f('ix_bookings_id'), 'bookings', ['id'], unique=False)
-    op.create_table('enrollments',
-    sa.Column('id', sa.Integer(), nullable=False),
-    sa.Column('student_id', sa.Integer(), nullable=False),
-    sa.Column('course_id', sa.Integer(), nullable=False),
-    sa.Column('created_at', sa.DateTime(), nullable=True),
-    sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
-    sa.ForeignKeyConstraint(['student_id'], ['users.id'], ondelete='CASCADE'),
-    sa.PrimaryKeyConstraint('id'),
-    sa.UniqueConstraint('student_id', 'course_id', name='uq_student_course')
-    )
-    op.create_index(op.f('ix_enrollments_id'), 'enrollments', ['id'], unique=False)
-    op.create_table('grades',
-    sa.Column('id', sa.Integer(), nullable=False),
-    sa.Column('assignment_id', sa.Integer(), nullable=False),
-    sa.Column('student_id', sa.Integer(), nullable=False),
-    sa.Column('graded_by_id', sa.Integer(), nullable=False),
-    sa.Column('grade_value', sa.String(length=10), nullable=False),
-    sa.Column('feedback', sa.Text(), nullable=True),
-    sa.Column('is_finalized', sa.Boolean(), nullable=False),
-    sa.Column('graded_at', sa.DateTime(), nullable=False),
-    sa.ForeignKeyConstraint(['assignment_id'], ['assignments.id'], ),
-    sa.ForeignKeyConstraint(['graded_by_id'], ['users.id'], ),
-    sa.ForeignKeyConstraint(['student_id'], ['users.id'], ),
-    sa.PrimaryKeyConstraint('id')
-    )
-    op.create_index(op.f('ix_grades_id'), 'grades', ['id'], unique=False)
-    # ### end Alembic commands ###
-
-
-def downgrade() -> None:
-    """Downgrade schema."""
-    # ### commands auto generated by Alembic - please adjust! ###
-    op.drop_index(op.f('ix_grades_id'), table_name='grades')
-    op.drop_table('grades')
-    op.drop_index(op.f('ix_enrollments_id'), table_name='enrollments')
-    op.drop_table('enrollments')
-    op.drop_index(op.f('ix_bookings_id'), table_name='bookings')
-    op.drop_table('bookings')
-    op.drop_index(op.f('ix_attendance_id'), table_name='attendance')
-    op.drop_table('attendance')
-    op.drop_index(op.f('ix_assignments_id'), table_name='assignments')
-    op.drop_table('assignments')
-    op.drop_index(op.f('ix_resources_id'), table_name='resources')
-    op.drop_table('resources')
-    op.drop_index(op.f('ix_courses_id'), table_name='courses')
-    op.drop_table('courses')
-    op.drop_index(op.f('ix_users_role'), table_name='users')
-    op.drop_index(op.f('ix_users_id'), table_name='users')
-    op.drop_index(op.f('ix_users_email'), table_name='users')
-    op.drop_table('users')
-    op.drop_index(op.f('ix_departments_id'), table_name='departments')
-    op.drop_table('departments')
-    # ### end Alembic commands ###
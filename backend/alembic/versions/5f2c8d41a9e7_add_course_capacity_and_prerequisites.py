@@ -0,0 +1,53 @@
+"""add course capacity and prerequisites
+
+Revision ID: 5f2c8d41a9e7
+Revises: 13573356c38b
+Create Date: 2026-10-19 10:03:41.220816
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f2c8d41a9e7'
+down_revision: Union[str, Sequence[str], None] = '13573356c38b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('courses', sa.Column('capacity', sa.Integer(), nullable=True))
+    op.add_column(
+        'enrollments',
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='enrolled'),
+    )
+    op.create_table('course_prerequisites',
+    sa.Column('course_id', sa.Integer(), nullable=False),
+    sa.Column('prerequisite_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['prerequisite_id'], ['courses.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('course_id', 'prerequisite_id')
+    )
+    op.create_index(op.f('ix_course_prerequisites_prerequisite_id'), 'course_prerequisites', ['prerequisite_id'], unique=False)
+    op.create_table('course_prerequisite_closure',
+    sa.Column('course_id', sa.Integer(), nullable=False),
+    sa.Column('ancestor_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['ancestor_id'], ['courses.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('course_id', 'ancestor_id')
+    )
+    op.create_index(op.f('ix_course_prerequisite_closure_ancestor_id'), 'course_prerequisite_closure', ['ancestor_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_course_prerequisite_closure_ancestor_id'), table_name='course_prerequisite_closure')
+    op.drop_table('course_prerequisite_closure')
+    op.drop_index(op.f('ix_course_prerequisites_prerequisite_id'), table_name='course_prerequisites')
+    op.drop_table('course_prerequisites')
+    op.drop_column('enrollments', 'status')
+    op.drop_column('courses', 'capacity')
@@ -0,0 +1,61 @@
+"""add course seats and waitlist
+
+Revision ID: 9b71e4c0d2a6
+Revises: 5f2c8d41a9e7
+Create Date: 2026-10-19 11:26:08.514327
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b71e4c0d2a6'
+down_revision: Union[str, Sequence[str], None] = '5f2c8d41a9e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('course_seats',
+    sa.Column('course_id', sa.Integer(), nullable=False),
+    sa.Column('seats_available', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('course_id')
+    )
+    op.create_table('waitlist_entries',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('course_id', sa.Integer(), nullable=False),
+    sa.Column('student_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['student_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('course_id', 'student_id', name='uq_waitlist_course_student')
+    )
+    op.create_index(op.f('ix_waitlist_entries_id'), 'waitlist_entries', ['id'], unique=False)
+    op.create_index('ix_waitlist_entries_course_id_id', 'waitlist_entries', ['course_id', 'id'], unique=False)
+
+    # Seed counters for courses that already have a capacity
+    op.execute(
+        """
+        INSERT INTO course_seats (course_id, seats_available)
+        SELECT c.id,
+               CASE WHEN c.capacity > COALESCE(e.taken, 0) THEN c.capacity - COALESCE(e.taken, 0) ELSE 0 END
+        FROM courses c
+        LEFT JOIN (SELECT course_id, COUNT(*) AS taken FROM enrollments GROUP BY course_id) e
+               ON e.course_id = c.id
+        WHERE c.capacity IS NOT NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_waitlist_entries_course_id_id', table_name='waitlist_entries')
+    op.drop_index(op.f('ix_waitlist_entries_id'), table_name='waitlist_entries')
+    op.drop_table('waitlist_entries')
+    op.drop_table('course_seats')
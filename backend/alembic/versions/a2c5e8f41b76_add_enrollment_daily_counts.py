@@ -0,0 +1,49 @@
+"""add enrollment daily counts
+
+Revision ID: a2c5e8f41b76
+Revises: f1d7b3c85a92
+Create Date: 2026-10-19 19:04:13.580271
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a2c5e8f41b76'
+down_revision: Union[str, Sequence[str], None] = 'f1d7b3c85a92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('enrollment_daily_counts',
+    sa.Column('course_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('department_id', sa.Integer(), nullable=False),
+    sa.Column('enrollments', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['department_id'], ['departments.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('course_id', 'day')
+    )
+    op.create_index('ix_enrollment_daily_counts_day', 'enrollment_daily_counts', ['day'], unique=False)
+    op.create_index('ix_enrollment_daily_counts_department_day', 'enrollment_daily_counts', ['department_id', 'day'], unique=False)
+
+    # Backfill from existing enrollments
+    op.execute(
+        "INSERT INTO enrollment_daily_counts (course_id, day, department_id, enrollments) "
+        "SELECT e.course_id, date(e.created_at), c.department_id, count(*) "
+        "FROM enrollments e JOIN courses c ON c.id = e.course_id "
+        "WHERE e.created_at IS NOT NULL "
+        "GROUP BY e.course_id, date(e.created_at), c.department_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_enrollment_daily_counts_department_day', table_name='enrollment_daily_counts')
+    op.drop_index('ix_enrollment_daily_counts_day', table_name='enrollment_daily_counts')
+    op.drop_table('enrollment_daily_counts')
@@ -0,0 +1,55 @@
+"""add outbox and audit log
+
+Revision ID: a84d0c6e2f51
+Revises: f7c3b2a95d18
+Create Date: 2026-10-19 15:04:52.180337
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a84d0c6e2f51'
+down_revision: Union[str, Sequence[str], None] = 'f7c3b2a95d18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('outbox_events',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('entity', sa.String(length=50), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('action', sa.String(length=20), nullable=False),
+    sa.Column('actor_id', sa.Integer(), nullable=True),
+    sa.Column('changes', sa.JSON(), nullable=True),
+    sa.Column('occurred_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('audit_log',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('entity', sa.String(length=50), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('action', sa.String(length=20), nullable=False),
+    sa.Column('actor_id', sa.Integer(), nullable=True),
+    sa.Column('changes', sa.JSON(), nullable=True),
+    sa.Column('occurred_at', sa.DateTime(), nullable=False),
+    sa.Column('recorded_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_audit_log_actor_id'), 'audit_log', ['actor_id'], unique=False)
+    op.create_index('ix_audit_log_entity_time', 'audit_log', ['entity', 'entity_id', 'occurred_at'], unique=False)
+    op.create_index('ix_audit_log_occurred_at', 'audit_log', ['occurred_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_audit_log_occurred_at', table_name='audit_log')
+    op.drop_index('ix_audit_log_entity_time', table_name='audit_log')
+    op.drop_index(op.f('ix_audit_log_actor_id'), table_name='audit_log')
+    op.drop_table('audit_log')
+    op.drop_table('outbox_events')
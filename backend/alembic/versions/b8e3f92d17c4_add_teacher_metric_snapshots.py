@@ -0,0 +1,46 @@
+"""add teacher metric snapshots
+
+Revision ID: b8e3f92d17c4
+Revises: a2c5e8f41b76
+Create Date: 2026-10-19 19:41:36.227418
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e3f92d17c4'
+down_revision: Union[str, Sequence[str], None] = 'a2c5e8f41b76'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('teacher_metric_snapshots',
+    sa.Column('teacher_id', sa.Integer(), nullable=False),
+    sa.Column('term', sa.String(length=50), nullable=False),
+    sa.Column('department_id', sa.Integer(), nullable=False),
+    sa.Column('courses', sa.Integer(), nullable=False),
+    sa.Column('grades', sa.Integer(), nullable=False),
+    sa.Column('pass_rate', sa.Float(), nullable=True),
+    sa.Column('average_percent', sa.Float(), nullable=True),
+    sa.Column('turnaround_hours', sa.Float(), nullable=True),
+    sa.Column('late_grading_rate', sa.Float(), nullable=True),
+    sa.Column('attendance_sessions', sa.Integer(), nullable=False),
+    sa.Column('attendance_regularity', sa.Float(), nullable=True),
+    sa.Column('computed_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['department_id'], ['departments.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['teacher_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('teacher_id', 'term', 'department_id')
+    )
+    op.create_index('ix_teacher_metric_snapshots_department_term', 'teacher_metric_snapshots', ['department_id', 'term'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_teacher_metric_snapshots_department_term', table_name='teacher_metric_snapshots')
+    op.drop_table('teacher_metric_snapshots')
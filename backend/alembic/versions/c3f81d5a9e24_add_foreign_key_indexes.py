@@ -0,0 +1,50 @@
+"""add foreign key indexes
+
+Revision ID: c3f81d5a9e24
+Revises: b8e3f92d17c4
+Create Date: 2026-10-19 20:12:07.514630
+
+Indexes the foreign keys used in hot filters. On PostgreSQL they are built
+with CREATE INDEX CONCURRENTLY (outside the migration transaction), so
+writes to large tables are not blocked while they build. A concurrent build
+that fails leaves an INVALID index behind; drop it and rerun the upgrade.
+
+grades.student_id is already the leading column of
+ix_grades_student_assignment, so it gets no index of its own.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f81d5a9e24'
+down_revision: Union[str, Sequence[str], None] = 'b8e3f92d17c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_courses_teacher_id', 'courses', ['teacher_id']),
+    ('ix_courses_department_id', 'courses', ['department_id']),
+    ('ix_users_department_id', 'users', ['department_id']),
+    ('ix_grades_assignment_id', 'grades', ['assignment_id']),
+    ('ix_enrollments_course_id', 'enrollments', ['course_id']),
+    ('ix_attendance_course_date', 'attendance', ['course_id', 'date']),
+    ('ix_bookings_resource_start', 'bookings', ['resource_id', 'start_time']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,44 @@
+"""add course meetings
+
+Revision ID: c4e8a1f7b305
+Revises: 9b71e4c0d2a6
+Create Date: 2026-10-19 12:14:52.903118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8a1f7b305'
+down_revision: Union[str, Sequence[str], None] = '9b71e4c0d2a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('course_meetings',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('course_id', sa.Integer(), nullable=False),
+    sa.Column('resource_id', sa.Integer(), nullable=True),
+    sa.Column('day_of_week', sa.Integer(), nullable=False),
+    sa.Column('start_time', sa.Time(), nullable=False),
+    sa.Column('end_time', sa.Time(), nullable=False),
+    sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['resource_id'], ['resources.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_course_meetings_course_id'), 'course_meetings', ['course_id'], unique=False)
+    op.create_index(op.f('ix_course_meetings_id'), 'course_meetings', ['id'], unique=False)
+    op.create_index(op.f('ix_course_meetings_resource_id'), 'course_meetings', ['resource_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_course_meetings_resource_id'), table_name='course_meetings')
+    op.drop_index(op.f('ix_course_meetings_id'), table_name='course_meetings')
+    op.drop_index(op.f('ix_course_meetings_course_id'), table_name='course_meetings')
+    op.drop_table('course_meetings')
@@ -0,0 +1,47 @@
+"""add submissions
+
+Revision ID: c9f4a2d70b16
+Revises: b5e17f39c062
+Create Date: 2026-10-19 16:31:44.260815
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9f4a2d70b16'
+down_revision: Union[str, Sequence[str], None] = 'b5e17f39c062'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('submissions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('assignment_id', sa.Integer(), nullable=False),
+    sa.Column('student_id', sa.Integer(), nullable=False),
+    sa.Column('filename', sa.String(length=255), nullable=False),
+    sa.Column('content_type', sa.String(length=100), nullable=False),
+    sa.Column('size', sa.BigInteger(), nullable=False),
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('submitted_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['assignment_id'], ['assignments.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['student_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('assignment_id', 'student_id', name='uq_submissions_assignment_student')
+    )
+    op.create_index(op.f('ix_submissions_id'), 'submissions', ['id'], unique=False)
+    op.create_index(op.f('ix_submissions_sha256'), 'submissions', ['sha256'], unique=False)
+    op.create_index(op.f('ix_submissions_student_id'), 'submissions', ['student_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_submissions_student_id'), table_name='submissions')
+    op.drop_index(op.f('ix_submissions_sha256'), table_name='submissions')
+    op.drop_index(op.f('ix_submissions_id'), table_name='submissions')
+    op.drop_table('submissions')
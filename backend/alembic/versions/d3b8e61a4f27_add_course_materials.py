@@ -0,0 +1,48 @@
+"""add course materials
+
+Revision ID: d3b8e61a4f27
+Revises: c9f4a2d70b16
+Create Date: 2026-10-19 17:12:05.418392
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3b8e61a4f27'
+down_revision: Union[str, Sequence[str], None] = 'c9f4a2d70b16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('course_materials',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('course_id', sa.Integer(), nullable=False),
+    sa.Column('uploaded_by_id', sa.Integer(), nullable=True),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('filename', sa.String(length=255), nullable=False),
+    sa.Column('content_type', sa.String(length=100), nullable=False),
+    sa.Column('size', sa.BigInteger(), nullable=False),
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['uploaded_by_id'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_course_materials_course_id'), 'course_materials', ['course_id'], unique=False)
+    op.create_index(op.f('ix_course_materials_id'), 'course_materials', ['id'], unique=False)
+    op.create_index(op.f('ix_course_materials_sha256'), 'course_materials', ['sha256'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_course_materials_sha256'), table_name='course_materials')
+    op.drop_index(op.f('ix_course_materials_id'), table_name='course_materials')
+    op.drop_index(op.f('ix_course_materials_course_id'), table_name='course_materials')
+    op.drop_table('course_materials')
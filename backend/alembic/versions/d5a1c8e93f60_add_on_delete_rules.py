@@ -0,0 +1,85 @@
+"""add on delete rules
+
+Revision ID: d5a1c8e93f60
+Revises: c3f81d5a9e24
+Create Date: 2026-10-19 21:26:14.683207
+
+Children of courses, assignments and users are removed by the database
+(ON DELETE CASCADE) and references to departments and HODs are cleared
+(ON DELETE SET NULL), so the ORM no longer loads them to delete a parent.
+
+attendance.student_id gets an index, since deleting a user now cascades
+through it (built CONCURRENTLY on PostgreSQL).
+
+On PostgreSQL each constraint is recreated NOT VALID, which is quick but
+holds an ACCESS EXCLUSIVE lock until the migration's transaction commits.
+Existing rows are checked afterwards by VALIDATE CONSTRAINT, each in its
+own transaction (autocommit block), which only takes a SHARE UPDATE
+EXCLUSIVE lock and so does not block writes to the table. SQLite rebuilds
+the affected tables (batch mode); its unnamed constraints are addressed
+through PostgreSQL's default names.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a1c8e93f60'
+down_revision: Union[str, Sequence[str], None] = 'c3f81d5a9e24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NAMING_CONVENTION = {'fk': '%(table_name)s_%(column_0_name)s_fkey'}
+
+# table -> [(column, referred table, ON DELETE)]
+FOREIGN_KEYS = {
+    'departments': [('hod_user_id', 'users', 'SET NULL')],
+    'users': [('department_id', 'departments', 'SET NULL')],
+    'resources': [('department_id', 'departments', 'SET NULL')],
+    'assignments': [('course_id', 'courses', 'CASCADE')],
+    'grades': [('assignment_id', 'assignments', 'CASCADE'), ('student_id', 'users', 'CASCADE')],
+    'attendance': [('course_id', 'courses', 'CASCADE'), ('student_id', 'users', 'CASCADE')],
+}
+
+
+def _replace_foreign_keys(with_rules: bool) -> None:
+    for table, keys in FOREIGN_KEYS.items():
+        with op.batch_alter_table(table, naming_convention=NAMING_CONVENTION) as batch_op:
+            for column, referred, ondelete in keys:
+                name = f'{table}_{column}_fkey'
+                batch_op.drop_constraint(name, type_='foreignkey')
+                batch_op.create_foreign_key(
+                    name, referred, [column], ['id'],
+                    ondelete=ondelete if with_rules else None,
+                    postgresql_not_valid=True,
+                )
+
+
+def _validate_foreign_keys() -> None:
+    """Check existing rows; call inside an autocommit block."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table, keys in FOREIGN_KEYS.items():
+        for column, _, _ in keys:
+            op.execute(f'ALTER TABLE {table} VALIDATE CONSTRAINT {table}_{column}_fkey')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _replace_foreign_keys(with_rules=True)
+    # Commits the constraint swap (releasing its locks) before validating
+    with op.get_context().autocommit_block():
+        _validate_foreign_keys()
+        op.create_index('ix_attendance_student_id', 'attendance', ['student_id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_attendance_student_id', table_name='attendance', postgresql_concurrently=True)
+    _replace_foreign_keys(with_rules=False)
+    with op.get_context().autocommit_block():
+        _validate_foreign_keys()
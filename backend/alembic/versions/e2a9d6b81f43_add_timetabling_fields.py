@@ -0,0 +1,41 @@
+"""add timetabling fields
+
+Revision ID: e2a9d6b81f43
+Revises: c4e8a1f7b305
+Create Date: 2026-10-19 13:02:37.448190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a9d6b81f43'
+down_revision: Union[str, Sequence[str], None] = 'c4e8a1f7b305'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('courses', sa.Column('room_type', sa.String(length=50), nullable=True))
+    op.add_column('courses', sa.Column('sessions_per_week', sa.Integer(), nullable=True))
+    op.add_column('bookings', sa.Column('course_id', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_bookings_course_id'), 'bookings', ['course_id'], unique=False)
+    # batch mode: SQLite cannot add a constraint to an existing table
+    with op.batch_alter_table('bookings') as batch_op:
+        batch_op.create_foreign_key(
+            'fk_bookings_course_id_courses', 'courses', ['course_id'], ['id'], ondelete='CASCADE'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('bookings') as batch_op:
+        batch_op.drop_constraint('fk_bookings_course_id_courses', type_='foreignkey')
+    op.drop_index(op.f('ix_bookings_course_id'), table_name='bookings')
+    op.drop_column('bookings', 'course_id')
+    op.drop_column('courses', 'sessions_per_week')
+    op.drop_column('courses', 'room_type')
@@ -0,0 +1,30 @@
+"""add deadline indexes
+
+Revision ID: e6a29c4d8b13
+Revises: d3b8e61a4f27
+Create Date: 2026-10-19 17:48:21.903145
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6a29c4d8b13'
+down_revision: Union[str, Sequence[str], None] = 'd3b8e61a4f27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_assignments_course_due', 'assignments', ['course_id', 'due_date'], unique=False)
+    op.create_index('ix_grades_student_assignment', 'grades', ['student_id', 'assignment_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_grades_student_assignment', table_name='grades')
+    op.drop_index('ix_assignments_course_due', table_name='assignments')
@@ -0,0 +1,37 @@
+"""add row versions
+
+Revision ID: e7c4a1f5b208
+Revises: d5a1c8e93f60
+Create Date: 2026-10-19 22:41:07.315482
+
+users, courses and departments get a ``version`` counter for optimistic
+concurrency (ETag / If-Match). Existing rows start at 1; with a constant
+default PostgreSQL adds the column without rewriting the table.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7c4a1f5b208'
+down_revision: Union[str, Sequence[str], None] = 'd5a1c8e93f60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('users', 'courses', 'departments')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.add_column(table, sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('version')
@@ -0,0 +1,45 @@
+"""add risk scores
+
+Revision ID: f1d7b3c85a92
+Revises: e6a29c4d8b13
+Create Date: 2026-10-19 18:26:57.137604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1d7b3c85a92'
+down_revision: Union[str, Sequence[str], None] = 'e6a29c4d8b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('risk_scores',
+    sa.Column('course_id', sa.Integer(), nullable=False),
+    sa.Column('student_id', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('attendance_rate', sa.Float(), nullable=True),
+    sa.Column('grade_average', sa.Float(), nullable=True),
+    sa.Column('grade_trend', sa.Float(), nullable=True),
+    sa.Column('missing_count', sa.Integer(), nullable=False),
+    sa.Column('past_due_count', sa.Integer(), nullable=False),
+    sa.Column('computed_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['student_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('course_id', 'student_id')
+    )
+    op.create_index('ix_risk_scores_course_score', 'risk_scores', ['course_id', 'score'], unique=False)
+    op.create_index('ix_risk_scores_student_id', 'risk_scores', ['student_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_risk_scores_student_id', table_name='risk_scores')
+    op.drop_index('ix_risk_scores_course_score', table_name='risk_scores')
+    op.drop_table('risk_scores')
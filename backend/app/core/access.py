@@ -0,0 +1,58 @@
+# app/core/access.py
+
+from typing import Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from app import models
+from app.models import UserRole
+
+
+def can_manage_course(course: models.Course, user: models.User) -> bool:
+    """
+    Admins and the course's teacher.
+    """
+    return user.role == UserRole.ADMIN or course.teacher_id == user.id
+
+
+def can_read_course(db: Session, course: models.Course, user: models.User) -> bool:
+    """
+    Those who can manage the course, the HOD of its department and students
+    enrolled in it.
+    """
+    if can_manage_course(course, user):
+        return True
+    if user.role == UserRole.HOD and user.department_id == course.department_id:
+        return True
+    enrolled = (
+        db.query(models.Enrollment.id)
+        .filter(models.Enrollment.course_id == course.id, models.Enrollment.student_id == user.id)
+        .first()
+    )
+    return enrolled is not None
+
+
+def scope_department(
+    user: models.User,
+    department_id: Optional[int],
+    what: str,
+    verb: str = "view",
+) -> Optional[int]:
+    """
+    The department an admin/HOD may ``verb`` ``what`` for: admins any (or
+    all, None), HODs are pinned to their own. Raises 403 for everyone else.
+    """
+    if user.role == UserRole.HOD and user.department_id is not None:
+        if department_id not in (None, user.department_id):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"HODs can only {verb} their own department.",
+            )
+        return user.department_id
+    if user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Only admins and HODs can {verb} {what}.",
+        )
+    return department_id
@@ -1,5 +1,6 @@
 # app/core/auth.py
 
+import calendar
 from typing import Optional
 
 from fastapi import Depends, HTTPException, status
@@ -7,15 +8,60 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 
-from app.deps import get_db
+from app.deps import batch_context, get_db
 from app import models
 from app.models import UserRole
 from app.schemas import TokenData
-from app.core.security import JWT_SECRET_KEY, JWT_ALGORITHM
+from app.core.security import JWT_SECRET_KEY, JWT_ALGORITHM, TOKEN_CACHE_SIZE
+from app.core.token_cache import VerifiedTokenCache
 
 # Use simple Bearer auth instead of OAuth2 password flow
 bearer_scheme = HTTPBearer()
 
+token_cache = VerifiedTokenCache(max_size=TOKEN_CACHE_SIZE)
+
+
+def decode_access_token(token_str: str) -> TokenData:
+    """
+    Verify a JWT and return its validated claims.
+
+    Repeat requests with the same token are answered from ``token_cache``
+    (until the token's own ``exp``) without re-checking the signature or
+    rebuilding ``TokenData``. Raises ``JWTError`` for invalid tokens.
+    """
+    cached = token_cache.get(token_str)
+    if cached is not None:
+        return cached
+
+    payload = jwt.decode(token_str, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+    subject: Optional[str] = payload.get("sub")
+    role: Optional[str] = payload.get("role")
+    if subject is None:
+        raise JWTError("Token has no subject.")
+
+    token_data = TokenData(
+        sub=subject,
+        role=UserRole(role) if role else None,
+        iat=payload.get("iat"),
+        exp=payload.get("exp"),
+    )
+    if token_data.exp is not None:
+        token_cache.put(token_str, token_data, token_data.exp)
+    return token_data
+
+
+def is_token_revoked(token_data: TokenData, user: models.User) -> bool:
+    """
+    A token is revoked if it was issued before the user's ``token_valid_after``
+    (set on logout). Checked against the freshly loaded user on every request,
+    so revocation applies to cached tokens and across worker processes.
+    """
+    if user.token_valid_after is None:
+        return False
+    if token_data.iat is None:
+        return True
+    return token_data.iat < calendar.timegm(user.token_valid_after.utctimetuple())
+
 
 def get_current_user(
     token: HTTPAuthorizationCredentials = Depends(bearer_scheme),
@@ -25,6 +71,11 @@ def get_current_user(
     Extract user from JWT access token sent as:
     Authorization: Bearer <token>
     """
+    context = batch_context.get()
+    if context is not None:
+        # A POST /batch sub-request: the batch already resolved this token
+        return context[1]
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials.",
@@ -32,20 +83,16 @@ def get_current_user(
     )
 
     try:
-        token_str = token.credentials
-        payload = jwt.decode(token_str, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
-        subject: Optional[str] = payload.get("sub")
-        role: Optional[str] = payload.get("role")
-        if subject is None:
-            raise credentials_exception
-        token_data = TokenData(sub=subject, role=UserRole(role) if role else None)
-    except JWTError:
+        token_data = decode_access_token(token.credentials)
+    except (JWTError, ValueError):
         raise credentials_exception
 
     user = db.query(models.User).filter(models.User.id == int(token_data.sub)).first()
-    if user is None:
+    if user is None or is_token_revoked(token_data, user):
         raise credentials_exception
 
+    # Attributes changes made in this request's session (see app.services.audit)
+    db.info["actor_id"] = user.id
     return user
 
 
@@ -0,0 +1,48 @@
+# app/core/etags.py
+"""
+Optimistic concurrency over HTTP.
+
+Users, courses and departments carry a ``version`` (the mapper's
+``version_id_col``) that every write increments. GET and PUT responses
+send it as a strong ``ETag``; a PUT with ``If-Match`` is applied only if
+the row still has one of the listed versions. The check is part of the
+UPDATE's own WHERE clause (``app.services.writes.update``), so detecting
+a lost update takes no lock and no extra query; only a failed update
+looks the row up again to tell 404 from 412. Without ``If-Match`` (or
+with ``*``) the last write wins, as before.
+"""
+
+from typing import Optional
+
+from fastapi import HTTPException, Response, status
+
+
+def etag(obj) -> str:
+    return f'"{obj.version}"'
+
+
+def set_etag(response: Response, obj) -> None:
+    response.headers["ETag"] = etag(obj)
+
+
+def if_match(model, header: Optional[str]) -> tuple:
+    """
+    WHERE conditions for an ``If-Match`` header: none without one (or for
+    ``*``), otherwise the row's version must be among the listed tags.
+    Weak tags never match (If-Match uses strong comparison).
+    """
+    if header is None or header.strip() == "*":
+        return ()
+    versions = []
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag.startswith('"') and tag.endswith('"') and tag[1:-1].isdigit():
+            versions.append(int(tag[1:-1]))
+    return (model.version.in_(versions),)
+
+
+def precondition_failed(what: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail=f"{what} was changed by someone else; reload it and try again.",
+    )
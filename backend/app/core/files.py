@@ -0,0 +1,71 @@
+# app/core/files.py
+
+from typing import Optional
+
+from fastapi import HTTPException, Request, Response, status
+from fastapi.responses import FileResponse, RedirectResponse
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    True if the request's ``If-None-Match`` lists ``etag`` (quoted, as sent
+    in the ``ETag`` header) or is ``*``.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def file_response(
+    request: Request,
+    path: str,
+    media_type: str,
+    filename: Optional[str] = None,
+    etag: Optional[str] = None,
+    cache_control: str = "private, no-cache",
+) -> Response:
+    """
+    Serve a file from disk with a strong ``ETag`` (if given).
+
+    ``If-None-Match`` revalidation is answered with 304. ``FileResponse``
+    handles ``Range``/``If-Range`` (206/416) and uses the server's zero-copy
+    ``pathsend`` extension when available.
+    """
+    headers = {"cache-control": cache_control}
+    if etag is not None:
+        headers["etag"] = f'"{etag}"'
+        if etag_matches(request, headers["etag"]):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return FileResponse(path, media_type=media_type, filename=filename, headers=headers)
+
+
+def blob_response(
+    request: Request,
+    store,
+    digest: str,
+    media_type: str,
+    filename: str,
+    cache_control: str = "private, no-cache",
+) -> Response:
+    """
+    Serve a content-addressed blob (see ``app.services.storage``); its
+    digest is the ETag. Local blobs go through ``file_response``; backends
+    that hand out download URLs get a 307 redirect to one.
+    """
+    path = store.local_path(digest)
+    if path is not None:
+        return file_response(request, path, media_type, filename, etag=digest, cache_control=cache_control)
+
+    headers = {"cache-control": cache_control, "etag": f'"{digest}"'}
+    if etag_matches(request, headers["etag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    url = store.url(digest, filename, media_type)
+    if url is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="File is missing.",
+        )
+    return RedirectResponse(url, status_code=status.HTTP_307_TEMPORARY_REDIRECT, headers={"cache-control": "no-store"})
@@ -0,0 +1,45 @@
+# app/core/grading.py
+"""
+Interpretation of ``Grade.grade_value``, which holds either a letter grade
+("A", "B+") or a numeric mark ("85", "72.5").
+"""
+
+import os
+from typing import Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Minimum percentage that counts as a pass in reports and analytics
+PASS_PERCENT = float(os.getenv("PASS_PERCENT", "40"))
+
+# Letter grades map to the midpoint of their usual percentage band
+LETTER_PERCENT = {
+    "A+": 97.0, "A": 93.0, "A-": 90.0,
+    "B+": 87.0, "B": 83.0, "B-": 80.0,
+    "C+": 77.0, "C": 73.0, "C-": 70.0,
+    "D+": 67.0, "D": 63.0, "D-": 60.0,
+    "F": 0.0,
+}
+
+
+def grade_to_percent(value: Optional[str]) -> Optional[float]:
+    """
+    Percentage for a stored grade, or None if it cannot be interpreted.
+    """
+    if value is None:
+        return None
+    value = value.strip().upper()
+    if value in LETTER_PERCENT:
+        return LETTER_PERCENT[value]
+    try:
+        percent = float(value.rstrip("%"))
+    except ValueError:
+        return None
+    return percent if 0.0 <= percent <= 100.0 else None
+
+
+def is_pass(value: Optional[str]) -> Optional[bool]:
+    percent = grade_to_percent(value)
+    return None if percent is None else percent >= PASS_PERCENT
@@ -0,0 +1,123 @@
+# app/core/multipart.py
+"""
+Incremental ``multipart/form-data`` parser.
+
+Feed it the request body chunk by chunk; it yields part boundaries, headers
+and body data as they become available, holding back at most one boundary
+length of data. Used for uploads that must go straight to disk instead of
+being spooled by the framework first.
+"""
+
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+MAX_HEADER_BYTES = 16 * 1024
+
+
+class MultipartError(ValueError):
+    pass
+
+
+class PartHeaders:
+    def __init__(self, headers: Dict[str, str]):
+        self.headers = headers
+        self.name, self.filename = None, None
+        disposition = headers.get("content-disposition", "")
+        for item in disposition.split(";")[1:]:
+            key, _, value = item.strip().partition("=")
+            value = value.strip()
+            if len(value) >= 2 and value[0] == value[-1] == '"':
+                value = value[1:-1].replace('\\"', '"')
+            if key.lower() == "name":
+                self.name = value
+            elif key.lower() == "filename":
+                self.filename = value
+        self.content_type = headers.get("content-type", "application/octet-stream")
+
+
+# Events: ("part", PartHeaders), ("data", bytes), ("end", None)
+Event = Tuple[str, Union[PartHeaders, bytes, None]]
+
+
+def boundary_from_content_type(content_type: Optional[str]) -> bytes:
+    if not content_type or not content_type.lower().startswith("multipart/form-data"):
+        raise MultipartError("Expected multipart/form-data.")
+    for item in content_type.split(";")[1:]:
+        key, _, value = item.strip().partition("=")
+        if key.lower() == "boundary" and value:
+            return value.strip('"').encode("latin-1")
+    raise MultipartError("Missing multipart boundary.")
+
+
+class MultipartParser:
+    _PREAMBLE, _HEADERS, _BODY, _AFTER_BOUNDARY, _DONE = range(5)
+
+    def __init__(self, boundary: bytes):
+        self._first = b"--" + boundary
+        self._delimiter = b"\r\n--" + boundary
+        self._buffer = bytearray()
+        self._state = self._PREAMBLE
+
+    @property
+    def done(self) -> bool:
+        return self._state == self._DONE
+
+    def feed(self, chunk: bytes) -> Iterator[Event]:
+        self._buffer += chunk
+        buf = self._buffer
+
+        while True:
+            if self._state == self._PREAMBLE:
+                index = buf.find(self._first)
+                if index < 0:
+                    # Keep only what could still be the start of the boundary
+                    del buf[: max(0, len(buf) - len(self._first) + 1)]
+                    return
+                del buf[: index + len(self._first)]
+                self._state = self._AFTER_BOUNDARY
+
+            elif self._state == self._AFTER_BOUNDARY:
+                if len(buf) < 2:
+                    return
+                marker = bytes(buf[:2])
+                del buf[:2]
+                if marker == b"--":
+                    self._state = self._DONE
+                    buf.clear()
+                    return
+                if marker != b"\r\n":
+                    raise MultipartError("Malformed multipart boundary.")
+                self._state = self._HEADERS
+
+            elif self._state == self._HEADERS:
+                index = buf.find(b"\r\n\r\n")
+                if index < 0:
+                    if len(buf) > MAX_HEADER_BYTES:
+                        raise MultipartError("Multipart headers too large.")
+                    return
+                headers = {}
+                for line in bytes(buf[:index]).decode("utf-8", "replace").split("\r\n"):
+                    key, sep, value = line.partition(":")
+                    if sep:
+                        headers[key.strip().lower()] = value.strip()
+                del buf[: index + 4]
+                self._state = self._BODY
+                yield "part", PartHeaders(headers)
+
+            elif self._state == self._BODY:
+                index = buf.find(self._delimiter)
+                if index < 0:
+                    keep = len(self._delimiter) - 1
+                    if len(buf) > keep:
+                        data = bytes(buf[: len(buf) - keep])
+                        del buf[: len(buf) - keep]
+                        yield "data", data
+                    return
+                if index:
+                    yield "data", bytes(buf[:index])
+                del buf[: index + len(self._delimiter)]
+                self._state = self._AFTER_BOUNDARY
+                yield "end", None
+
+            else:
+                buf.clear()
+                return
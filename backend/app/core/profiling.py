@@ -0,0 +1,59 @@
+# app/core/profiling.py
+
+from contextvars import ContextVar
+from typing import List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+QUERY_COUNT_HEADER = "x-query-count"
+
+# Holds a one-element list rather than an int so that increments made in the
+# threadpool (sync endpoints and dependencies run there with a *copy* of the
+# request context) are visible to the middleware that created it.
+_query_counter: ContextVar[Optional[List[int]]] = ContextVar("query_counter", default=None)
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    counter = _query_counter.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+class QueryCountMiddleware:
+    """
+    ASGI middleware that reports the number of SQL statements executed while
+    handling a request in an ``X-Query-Count`` response header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        counter = [0]
+        token = _query_counter.set(counter)
+
+        async def send_with_count(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((QUERY_COUNT_HEADER.encode(), str(counter[0]).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_count)
+        finally:
+            _query_counter.reset(token)
+
+
+def install_query_counter(app, engine: Engine) -> None:
+    """
+    Count SQL statements per request. Meant for benchmarks, not production.
+    """
+    if not event.contains(engine, "before_cursor_execute", _count_query):
+        event.listen(engine, "before_cursor_execute", _count_query)
+    app.add_middleware(QueryCountMiddleware)
@@ -0,0 +1,214 @@
+# app/core/ratelimit.py
+
+import os
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Optional, Protocol
+
+from dotenv import load_dotenv
+from fastapi import Request
+
+load_dotenv()
+
+LOGIN_THROTTLE_ENABLED = os.getenv("LOGIN_THROTTLE_ENABLED", "1") == "1"
+# Per client IP. Successful logins give their token back, so these bound
+# failed attempts; many users can share one address (NAT, campus proxy).
+LOGIN_IP_BURST = float(os.getenv("LOGIN_IP_BURST", "50"))
+LOGIN_IP_PER_MINUTE = float(os.getenv("LOGIN_IP_PER_MINUTE", "30"))
+LOGIN_ACCOUNT_BURST = float(os.getenv("LOGIN_ACCOUNT_BURST", "5"))
+LOGIN_ACCOUNT_PER_MINUTE = float(os.getenv("LOGIN_ACCOUNT_PER_MINUTE", "2"))
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL")
+# Only honour X-Forwarded-For when running behind a trusted reverse proxy,
+# and then it is required: without it every client has the proxy's address
+# and shares one IP bucket.
+TRUST_PROXY_HEADERS = os.getenv("TRUST_PROXY_HEADERS", "0") == "1"
+
+
+class RateLimitBackend(Protocol):
+    """
+    Storage for token buckets. ``take`` returns 0.0 when the request is
+    allowed, otherwise the number of seconds until a token is available.
+    """
+
+    def take(self, key: str, rate: float, burst: float, cost: float = 1.0) -> float:
+        ...
+
+    def reset(self, key: str) -> None:
+        ...
+
+
+class InMemoryTokenBuckets:
+    """
+    Process-local token buckets.
+
+    Bucket state lives in two preallocated ``array('d')`` columns (tokens,
+    last refill time) indexed by slot, with an ``OrderedDict`` mapping keys
+    to slots in least-recently-used order. When every slot is taken, the
+    least recently used bucket is recycled - a bucket that has not been
+    touched for a while has refilled anyway, so forgetting it is harmless.
+    """
+
+    def __init__(self, max_keys: int = 100_000, clock=time.monotonic):
+        self._clock = clock
+        self._tokens = array("d", bytes(8 * max_keys))
+        self._stamps = array("d", bytes(8 * max_keys))
+        self._slots: "OrderedDict[str, int]" = OrderedDict()
+        self._free = list(range(max_keys - 1, -1, -1))
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def _slot_for(self, key: str, burst: float, now: float) -> int:
+        slot = self._slots.get(key)
+        if slot is not None:
+            self._slots.move_to_end(key)
+            return slot
+
+        if self._free:
+            slot = self._free.pop()
+        else:
+            _, slot = self._slots.popitem(last=False)
+        self._slots[key] = slot
+        self._tokens[slot] = burst
+        self._stamps[slot] = now
+        return slot
+
+    def take(self, key: str, rate: float, burst: float, cost: float = 1.0) -> float:
+        with self._lock:
+            now = self._clock()
+            slot = self._slot_for(key, burst, now)
+            tokens = min(burst, self._tokens[slot] + (now - self._stamps[slot]) * rate)
+            self._stamps[slot] = now
+
+            if tokens >= cost:
+                self._tokens[slot] = min(burst, tokens - cost)
+                return 0.0
+
+            self._tokens[slot] = tokens
+            return (cost - tokens) / rate if rate > 0 else float("inf")
+
+    def reset(self, key: str) -> None:
+        with self._lock:
+            slot = self._slots.pop(key, None)
+            if slot is not None:
+                self._free.append(slot)
+
+
+# KEYS[1] = bucket key; ARGV = rate (tokens/s), burst, cost, ttl (s)
+_REDIS_TAKE_SCRIPT = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'stamp')
+local tokens = tonumber(state[1]) or burst
+local stamp = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + (now - stamp) * rate)
+local wait = 0
+if tokens >= cost then
+  tokens = math.min(burst, tokens - cost)
+else
+  wait = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'stamp', now)
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return tostring(wait)
+"""
+
+
+class RedisTokenBuckets:
+    """
+    Token buckets shared by every worker and host, kept in Redis and updated
+    atomically by a Lua script. Requires the optional ``redis`` package.
+    """
+
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        import redis  # optional dependency
+
+        self._redis = redis.Redis.from_url(url)
+        self._take = self._redis.register_script(_REDIS_TAKE_SCRIPT)
+        self._prefix = prefix
+
+    def take(self, key: str, rate: float, burst: float, cost: float = 1.0) -> float:
+        ttl = max(1, int(burst / rate) + 1) if rate > 0 else 86400
+        return float(self._take(keys=[self._prefix + key], args=[rate, burst, cost, ttl]))
+
+    def reset(self, key: str) -> None:
+        self._redis.delete(self._prefix + key)
+
+
+class TokenBucketLimit:
+    """
+    A named limit: ``burst`` requests at once, refilled at ``per_minute``.
+    """
+
+    def __init__(self, name: str, burst: float, per_minute: float, backend: RateLimitBackend):
+        self.name = name
+        self.burst = burst
+        self.rate = per_minute / 60.0
+        self.backend = backend
+
+    def take(self, key: str, cost: float = 1.0) -> float:
+        return self.backend.take(f"{self.name}:{key}", self.rate, self.burst, cost)
+
+    def refund(self, key: str, amount: float = 1.0) -> None:
+        """
+        Give back tokens spent on a request that turned out to be fine (the
+        bucket never holds more than ``burst``).
+        """
+        self.backend.take(f"{self.name}:{key}", self.rate, self.burst, -amount)
+
+    def reset(self, key: str) -> None:
+        self.backend.reset(f"{self.name}:{key}")
+
+
+def create_backend(redis_url: Optional[str] = None, max_keys: int = 100_000) -> RateLimitBackend:
+    if redis_url:
+        return RedisTokenBuckets(redis_url)
+    return InMemoryTokenBuckets(max_keys=max_keys)
+
+
+rate_limit_backend = create_backend(RATE_LIMIT_REDIS_URL, RATE_LIMIT_MAX_KEYS)
+
+login_ip_limit = TokenBucketLimit("login-ip", LOGIN_IP_BURST, LOGIN_IP_PER_MINUTE, rate_limit_backend)
+login_account_limit = TokenBucketLimit(
+    "login-account", LOGIN_ACCOUNT_BURST, LOGIN_ACCOUNT_PER_MINUTE, rate_limit_backend
+)
+
+
+def client_ip(request: Request) -> str:
+    if TRUST_PROXY_HEADERS:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def check_login_throttle(ip: str, email: str) -> float:
+    """
+    Spend one token from the client's IP bucket and one from the account's
+    bucket. Returns 0.0 if the attempt may proceed, else seconds to wait.
+    """
+    if not LOGIN_THROTTLE_ENABLED:
+        return 0.0
+
+    retry_after = login_ip_limit.take(ip)
+    if retry_after:
+        return retry_after
+    return login_account_limit.take(email.lower())
+
+
+def clear_login_throttle(ip: str, email: str) -> None:
+    """
+    After a successful login: forget failed attempts against the account
+    and refund the IP's token, so only failures count against an address
+    that many users may share.
+    """
+    if LOGIN_THROTTLE_ENABLED:
+        login_ip_limit.refund(ip)
+        login_account_limit.reset(email.lower())
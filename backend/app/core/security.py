@@ -2,6 +2,7 @@
 
 import os
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
 
 from dotenv import load_dotenv
@@ -13,6 +14,8 @@ load_dotenv()
 JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "dev-secret-key")
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))
+# Verified-token cache size (0 disables it)
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -25,12 +28,27 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+@lru_cache(maxsize=1)
+def _dummy_password_hash() -> str:
+    return pwd_context.hash("dummy-password-for-timing-equalisation")
+
+
+def verify_password_dummy(plain_password: str) -> bool:
+    """
+    Spend the same bcrypt work as a real check, so a login for an unknown
+    email takes as long as one with a wrong password. Always returns False.
+    """
+    pwd_context.verify(plain_password, _dummy_password_hash())
+    return False
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
+    now = datetime.utcnow()
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = now + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+        expire = now + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    to_encode.update({"exp": expire, "iat": now})
     encoded_jwt = jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
     return encoded_jwt
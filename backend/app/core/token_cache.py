@@ -0,0 +1,64 @@
+# app/core/token_cache.py
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from app.schemas import TokenData
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of access tokens whose signature has already been verified.
+
+    Entries are keyed by the SHA-256 digest of the raw token (the token
+    itself is never kept) and hold the validated ``TokenData`` until the
+    token's ``exp``. An expired entry is dropped on lookup, so a cache hit
+    is never more permissive than a fresh ``jwt.decode``.
+    """
+
+    def __init__(self, max_size: int = 10_000, clock=time.time):
+        self._max_size = max_size
+        self._clock = clock
+        self._entries: "OrderedDict[bytes, Tuple[TokenData, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, token: str) -> Optional[TokenData]:
+        key = self._digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            token_data, expires_at = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return token_data
+
+    def put(self, token: str, token_data: TokenData, expires_at: float) -> None:
+        if self._max_size <= 0 or expires_at <= self._clock():
+            return
+        key = self._digest(token)
+        with self._lock:
+            self._entries[key] = (token_data, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def discard(self, token: str) -> None:
+        with self._lock:
+            self._entries.pop(self._digest(token), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
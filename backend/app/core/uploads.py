@@ -0,0 +1,107 @@
+# app/core/uploads.py
+
+import os
+from typing import Dict, NamedTuple, Optional
+
+from fastapi import HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.multipart import boundary_from_content_type, MultipartError, MultipartParser
+from app.services.storage import blob_store, BlobStore, BlobTooLarge
+
+# Allowance for the multipart envelope when checking Content-Length up front
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+# Limit for the plain (non-file) form fields sent alongside the file
+MAX_FIELD_BYTES = 4096
+
+
+class ReceivedFile(NamedTuple):
+    filename: str
+    content_type: str
+    sha256: str
+    size: int
+    fields: Dict[str, str]
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Uploads are limited to {max_bytes // (1024 * 1024)} MB.",
+    )
+
+
+async def receive_file(
+    request: Request,
+    max_bytes: int,
+    field: str = "file",
+    store: Optional[BlobStore] = None,
+) -> ReceivedFile:
+    """
+    Read a ``multipart/form-data`` request with one file field straight
+    into the blob store.
+
+    The body is parsed as it arrives and written to disk while being
+    hashed, so memory use does not depend on the file size. All blob I/O
+    (temp file, hashing, the final put, which for S3 uploads the whole
+    file) runs in the threadpool, never on the event loop. Oversized
+    uploads are refused from ``Content-Length`` before any of the body is
+    read, or as soon as the limit is crossed. Other (small) form fields are
+    returned in ``fields``.
+    """
+    store = store or blob_store
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > max_bytes + MULTIPART_OVERHEAD_BYTES:
+        raise _too_large(max_bytes)
+
+    try:
+        parser = MultipartParser(boundary_from_content_type(request.headers.get("content-type")))
+    except MultipartError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    writer, filename, content_type = None, None, None
+    fields: Dict[str, str] = {}
+    # Where data events go: ``field`` (the upload), another field name, or None
+    receiving, text = None, bytearray()
+    try:
+        async for chunk in request.stream():
+            for event, value in parser.feed(chunk):
+                if event == "part":
+                    if writer is None and value.name == field and value.filename is not None:
+                        writer = await run_in_threadpool(store.writer, max_bytes)
+                        filename = os.path.basename(value.filename.replace("\\", "/"))[:255] or "upload"
+                        content_type = value.content_type[:100]
+                        receiving = field
+                    elif value.filename is None and value.name and value.name != field:
+                        receiving, text = value.name, bytearray()
+                    else:
+                        receiving = None
+                elif event == "data":
+                    if receiving == field:
+                        await run_in_threadpool(writer.write, value)
+                    elif receiving is not None:
+                        text += value
+                        if len(text) > MAX_FIELD_BYTES:
+                            raise MultipartError(f"Form field '{receiving}' is too long.")
+                elif event == "end":
+                    if receiving is not None and receiving != field:
+                        fields[receiving] = text.decode("utf-8", "replace")
+                    receiving = None
+        if not parser.done:
+            raise MultipartError("Incomplete multipart body.")
+        if writer is None:
+            raise MultipartError(f"Missing file field '{field}'.")
+        digest, size = await run_in_threadpool(writer.commit)
+    except BlobTooLarge:
+        await run_in_threadpool(writer.abort)
+        raise _too_large(max_bytes)
+    except MultipartError as exc:
+        if writer is not None:
+            await run_in_threadpool(writer.abort)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    except BaseException:
+        if writer is not None:
+            # Not awaited: this also runs on cancellation, which must not be delayed
+            writer.abort()
+        raise
+
+    return ReceivedFile(filename, content_type, digest, size, fields)
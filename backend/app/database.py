@@ -1,6 +1,6 @@
 import os
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 # Load environment variables from .env
@@ -13,6 +13,14 @@ if not DATABASE_URL:
 
 engine = create_engine(DATABASE_URL, echo=False, future=True)
 
+if engine.dialect.name == "sqlite":
+    # SQLite ignores foreign keys (and so ON DELETE rules) unless asked, per connection
+    @event.listens_for(engine, "connect")
+    def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
@@ -20,3 +28,17 @@ SessionLocal = sessionmaker(
 )
 
 Base = declarative_base()
+
+
+def dispose_engine_after_fork() -> None:
+    """
+    Drop pooled connections inherited from the parent process.
+
+    A forked worker must never reuse its parent's sockets; ``close=False``
+    forgets them without sending a terminate message on the parent's behalf.
+    """
+    engine.dispose(close=False)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=dispose_engine_after_fork)
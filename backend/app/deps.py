@@ -1,7 +1,19 @@
-from typing import Generator
+from contextvars import ContextVar
+from typing import Generator, Optional
+
 from .database import SessionLocal
 
+# (session, user) while POST /batch runs its sub-requests in-process: they
+# share the batch's session and its already authenticated user
+batch_context: ContextVar[Optional[tuple]] = ContextVar("batch_context", default=None)
+
+
 def get_db() -> Generator:
+    context = batch_context.get()
+    if context is not None:
+        yield context[0]
+        return
+
     db = SessionLocal()
     try:
         yield db
@@ -1,11 +1,18 @@
-from fastapi import FastAPI, Depends
+import os
+
+from fastapi import FastAPI, Depends, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
 
 from .deps import get_db
 from . import models
-from .routers import auth,departments,users,courses,teacher,enrollments
+from .routers import auth,departments,users,courses,teacher,enrollments,jobs,timetable,reports,audit as audit_router,notifications,submissions,materials,assignments,students,risk as risk_router,trends as trends_router,metrics,batch
 from app.core.auth import get_current_active_user
+from app.core.profiling import install_query_counter
+from .database import engine, SessionLocal
+from .services import audit, risk, trends
 
 from .deps import get_db
 from . import models
@@ -28,6 +35,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outbox-based audit trail of changes to users, courses, enrollments, grades...
+audit.install(SessionLocal)
+risk.install(SessionLocal)
+trends.install(SessionLocal)
+
+# A versioned row (users, courses, departments) changed under an ORM flush;
+# PUTs with If-Match answer 412 before getting here (see app.core.etags)
+@app.exception_handler(StaleDataError)
+async def stale_data_handler(request: Request, exc: StaleDataError):
+    return JSONResponse(
+        status_code=status.HTTP_409_CONFLICT,
+        content={"detail": "The record was changed concurrently; reload it and try again."},
+    )
+
+
+# Opt-in per-request SQL statement counting (used by bench/loadtest.py)
+if os.getenv("QUERY_STATS") == "1":
+    install_query_counter(app, engine)
+
 
 app.include_router(auth.router)
 app.include_router(departments.router)
@@ -35,6 +61,19 @@ app.include_router(users.router)
 app.include_router(courses.router)
 app.include_router(teacher.router)
 app.include_router(enrollments.router)
+app.include_router(jobs.router)
+app.include_router(timetable.router)
+app.include_router(reports.router)
+app.include_router(audit_router.router)
+app.include_router(notifications.router)
+app.include_router(submissions.router)
+app.include_router(materials.router)
+app.include_router(assignments.router)
+app.include_router(students.router)
+app.include_router(risk_router.router)
+app.include_router(trends_router.router)
+app.include_router(metrics.router)
+app.include_router(batch.router)
 
 
 @app.get("/health")
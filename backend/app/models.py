@@ -2,8 +2,8 @@ from datetime import datetime, date, time
 from enum import Enum as PyEnum
 
 from sqlalchemy import (
-    Column, Integer, String, DateTime, Date, Time,
-    Boolean, ForeignKey, Enum, Text, UniqueConstraint
+    BigInteger, Column, Integer, String, DateTime, Date, Time,
+    Boolean, Float, ForeignKey, Enum, Index, JSON, Text, UniqueConstraint
 )
 from sqlalchemy.orm import relationship
 
@@ -28,13 +28,21 @@ class User(Base):
     role = Column(Enum(UserRole), nullable=False, index=True)
     is_active = Column(Boolean, default=True, nullable=False)
 
-    department_id = Column(Integer, ForeignKey("departments.id"), nullable=True)
+    department_id = Column(Integer, ForeignKey("departments.id", ondelete="SET NULL"), nullable=True, index=True)
+
+    # Access tokens issued before this instant are rejected (logout / revocation)
+    token_valid_after = Column(DateTime, nullable=True)
 
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Optimistic concurrency: bumped by every write, sent as the ETag
+    version = Column(Integer, nullable=False, server_default="1")
+
     department = relationship("Department", back_populates="users",foreign_keys=[department_id],)
 
+    __mapper_args__ = {"version_id_col": version}
+
 
 class Department(Base):
     __tablename__ = "departments"
@@ -43,14 +51,18 @@ class Department(Base):
     name = Column(String(255), unique=True, nullable=False)
     code = Column(String(50), unique=True, nullable=False)
 
-    hod_user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    hod_user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
 
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
-    users = relationship("User", back_populates="department", foreign_keys=[User.department_id])
+    version = Column(Integer, nullable=False, server_default="1")
+
+    users = relationship("User", back_populates="department", foreign_keys=[User.department_id], passive_deletes=True)
 
     hod = relationship("User", foreign_keys=[hod_user_id], post_update=True)
 
+    __mapper_args__ = {"version_id_col": version}
+
 
 class Course(Base):
     __tablename__ = "courses"
@@ -60,18 +72,34 @@ class Course(Base):
     name = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
 
-    department_id = Column(Integer, ForeignKey("departments.id"), nullable=False)
-    teacher_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    department_id = Column(Integer, ForeignKey("departments.id"), nullable=False, index=True)
+    teacher_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
 
     semester = Column(String(50), nullable=True)
     credits = Column(Integer, nullable=True)
+    capacity = Column(Integer, nullable=True)  # None = unlimited
+
+    # Timetabling: resource type the course needs (e.g. "lab"; None = any room)
+    # and weekly sessions (None = one per credit)
+    room_type = Column(String(50), nullable=True)
+    sessions_per_week = Column(Integer, nullable=True)
+
+    version = Column(Integer, nullable=False, server_default="1")
 
     department = relationship("Department")
     teacher = relationship("User")
 
-    enrollments = relationship("Enrollment", back_populates="course")
-    assignments = relationship("Assignment", back_populates="course")
-    attendance_records = relationship("Attendance", back_populates="course")
+    # Children are removed by ON DELETE CASCADE rather than loaded and
+    # deleted one by one; see app.services.purge for very large courses
+    enrollments = relationship("Enrollment", back_populates="course", cascade="all, delete", passive_deletes=True)
+    assignments = relationship("Assignment", back_populates="course", cascade="all, delete", passive_deletes=True)
+    attendance_records = relationship("Attendance", back_populates="course", cascade="all, delete", passive_deletes=True)
+    meetings = relationship(
+        "CourseMeeting", back_populates="course", order_by="CourseMeeting.day_of_week",
+        cascade="all, delete", passive_deletes=True,
+    )
+
+    __mapper_args__ = {"version_id_col": version}
 
 
 class Enrollment(Base):
@@ -81,36 +109,114 @@ class Enrollment(Base):
     student_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
 
+    status = Column(String(20), default="enrolled", nullable=False)  # "enrolled", "completed"
+
     created_at = Column(DateTime, default=datetime.utcnow)
 
     __table_args__ = (
         UniqueConstraint("student_id", "course_id", name="uq_student_course"),
+        # uq_student_course serves lookups by student; rosters filter by course
+        Index("ix_enrollments_course_id", "course_id"),
     )
     student = relationship("User", foreign_keys=[student_id])
     course = relationship("Course", foreign_keys=[course_id])
 
 
+class CoursePrerequisite(Base):
+    """
+    Adjacency table: ``prerequisite_id`` must be completed before ``course_id``.
+    """
+    __tablename__ = "course_prerequisites"
+
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True)
+    prerequisite_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True, index=True)
+
+
+class CoursePrerequisiteClosure(Base):
+    """
+    Transitive closure of ``course_prerequisites``: one row for every course
+    that is a direct or indirect prerequisite (``ancestor_id``) of ``course_id``.
+    Maintained by ``app.services.prerequisites``.
+    """
+    __tablename__ = "course_prerequisite_closure"
+
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True)
+    ancestor_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True, index=True)
+
+
+class CourseMeeting(Base):
+    """
+    A weekly meeting slot of a course: ``day_of_week`` (0 = Monday) and a
+    start/end time on that day, optionally in a resource (room/lab).
+    """
+    __tablename__ = "course_meetings"
+
+    id = Column(Integer, primary_key=True, index=True)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False, index=True)
+    resource_id = Column(Integer, ForeignKey("resources.id", ondelete="SET NULL"), nullable=True, index=True)
+
+    day_of_week = Column(Integer, nullable=False)
+    start_time = Column(Time, nullable=False)
+    end_time = Column(Time, nullable=False)
+
+    course = relationship("Course", back_populates="meetings")
+    resource = relationship("Resource")
+
+
+class CourseSeats(Base):
+    """
+    Remaining-seat counter for a course with a capacity. Seats are claimed
+    with a conditional decrement of ``seats_available`` so concurrent
+    registrations never overbook. Maintained by ``app.services.registration``.
+    """
+    __tablename__ = "course_seats"
+
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True)
+    seats_available = Column(Integer, nullable=False)
+
+
+class WaitlistEntry(Base):
+    """
+    A student waiting for a seat in a full course; served in ``id`` order.
+    """
+    __tablename__ = "waitlist_entries"
+
+    id = Column(Integer, primary_key=True, index=True)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
+    student_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("course_id", "student_id", name="uq_waitlist_course_student"),
+        Index("ix_waitlist_entries_course_id_id", "course_id", "id"),
+    )
+
 
 class Assignment(Base):
     __tablename__ = "assignments"
 
     id = Column(Integer, primary_key=True, index=True)
-    course_id = Column(Integer, ForeignKey("courses.id"), nullable=False)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
 
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     due_date = Column(DateTime, nullable=True)
 
+    __table_args__ = (
+        Index("ix_assignments_course_due", "course_id", "due_date"),
+    )
+
     course = relationship("Course", back_populates="assignments")
-    grades = relationship("Grade", back_populates="assignment")
+    grades = relationship("Grade", back_populates="assignment", cascade="all, delete", passive_deletes=True)
 
 
 class Grade(Base):
     __tablename__ = "grades"
 
     id = Column(Integer, primary_key=True, index=True)
-    assignment_id = Column(Integer, ForeignKey("assignments.id"), nullable=False)
-    student_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    assignment_id = Column(Integer, ForeignKey("assignments.id", ondelete="CASCADE"), nullable=False, index=True)
+    student_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     graded_by_id = Column(Integer, ForeignKey("users.id"), nullable=False)
 
     grade_value = Column(String(10), nullable=False)  # e.g., "A", "B+", "85"
@@ -118,6 +224,10 @@ class Grade(Base):
     is_finalized = Column(Boolean, default=False, nullable=False)
     graded_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
+    __table_args__ = (
+        Index("ix_grades_student_assignment", "student_id", "assignment_id"),
+    )
+
     assignment = relationship("Assignment", back_populates="grades")
     student = relationship("User", foreign_keys=[student_id])
     graded_by = relationship("User", foreign_keys=[graded_by_id])
@@ -127,8 +237,8 @@ class Attendance(Base):
     __tablename__ = "attendance"
 
     id = Column(Integer, primary_key=True, index=True)
-    course_id = Column(Integer, ForeignKey("courses.id"), nullable=False)
-    student_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
+    student_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
 
     date = Column(Date, nullable=False)
     status = Column(String(20), nullable=False)  # "present", "absent", etc.
@@ -137,6 +247,11 @@ class Attendance(Base):
     # Optional: period or slot within the day
     period = Column(String(50), nullable=True)
 
+    __table_args__ = (
+        Index("ix_attendance_course_date", "course_id", "date"),
+        Index("ix_attendance_student_id", "student_id"),
+    )
+
     course = relationship("Course", back_populates="attendance_records")
     student = relationship("User", foreign_keys=[student_id])
     marked_by = relationship("User", foreign_keys=[marked_by_id])
@@ -151,7 +266,7 @@ class Resource(Base):
     location = Column(String(255), nullable=True)
     capacity = Column(Integer, nullable=True)
 
-    department_id = Column(Integer, ForeignKey("departments.id"), nullable=True)
+    department_id = Column(Integer, ForeignKey("departments.id", ondelete="SET NULL"), nullable=True)
     is_active = Column(Boolean, default=True, nullable=False)
 
     department = relationship("Department")
@@ -164,11 +279,261 @@ class Booking(Base):
     id = Column(Integer, primary_key=True, index=True)
     resource_id = Column(Integer, ForeignKey("resources.id"), nullable=False)
     booked_by_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # Set for bookings generated from a course timetable
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=True, index=True)
 
     start_time = Column(DateTime, nullable=False)
     end_time = Column(DateTime, nullable=False)
     purpose = Column(Text, nullable=True)
     status = Column(String(50), default="pending", nullable=False)  # "pending", "approved", "rejected"
 
+    __table_args__ = (
+        Index("ix_bookings_resource_start", "resource_id", "start_time"),
+    )
+
     resource = relationship("Resource", back_populates="bookings")
     booked_by = relationship("User")
+
+
+class Job(Base):
+    """
+    A unit of background work, claimed by ``app.worker`` processes with
+    ``SELECT ... FOR UPDATE SKIP LOCKED``. See ``app.services.jobs``.
+    """
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(100), nullable=False, index=True)
+    payload = Column(JSON, nullable=False, default=dict)
+
+    status = Column(String(20), nullable=False, default="queued")  # "queued", "running", "succeeded", "failed"
+    priority = Column(Integer, nullable=False, default=0)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    run_after = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    locked_by = Column(String(100), nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+
+    progress = Column(Float, nullable=False, default=0.0)
+    progress_message = Column(String(255), nullable=True)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+
+    created_by_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_jobs_claim", "status", "run_after", "priority"),
+    )
+
+    created_by = relationship("User")
+
+
+class OutboxEvent(Base):
+    """
+    Audit event written in the same transaction as the change it describes;
+    moved to ``audit_log`` by ``app.services.audit.drain``.
+    """
+    __tablename__ = "outbox_events"
+
+    id = Column(Integer, primary_key=True)
+    entity = Column(String(50), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    action = Column(String(20), nullable=False)  # "create", "update", "delete"
+    actor_id = Column(Integer, nullable=True)
+    changes = Column(JSON, nullable=True)
+    occurred_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class AuditLog(Base):
+    """
+    Append-only audit trail. ``id`` is the originating outbox id, so rows
+    are ordered as they were committed. ``actor_id`` has no foreign key:
+    entries must outlive the users they mention.
+    """
+    __tablename__ = "audit_log"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    entity = Column(String(50), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    action = Column(String(20), nullable=False)
+    actor_id = Column(Integer, nullable=True, index=True)
+    changes = Column(JSON, nullable=True)
+    occurred_at = Column(DateTime, nullable=False)
+    recorded_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("ix_audit_log_entity_time", "entity", "entity_id", "occurred_at"),
+        Index("ix_audit_log_occurred_at", "occurred_at"),
+    )
+
+
+class NotificationEvent(Base):
+    """
+    Something students of a course are told about (an assignment was
+    published, grades were finalised). ``context`` holds the template values.
+    """
+    __tablename__ = "notification_events"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(50), nullable=False)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False, index=True)
+    assignment_id = Column(Integer, ForeignKey("assignments.id", ondelete="CASCADE"), nullable=True)
+    actor_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    context = Column(JSON, nullable=False, default=dict)
+
+    recipients = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    delivered_at = Column(DateTime, nullable=True)
+
+
+class Notification(Base):
+    """
+    In-app inbox entry; ``emailed_at`` records e-mail delivery.
+    """
+    __tablename__ = "notifications"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    event_id = Column(Integer, ForeignKey("notification_events.id", ondelete="CASCADE"), nullable=True)
+    kind = Column(String(50), nullable=False)
+
+    subject = Column(String(255), nullable=False)
+    body = Column(Text, nullable=False)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    read_at = Column(DateTime, nullable=True)
+    emailed_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint("event_id", "user_id", name="uq_notifications_event_user"),
+        Index("ix_notifications_user_read", "user_id", "read_at"),
+    )
+
+
+class Submission(Base):
+    """
+    A student's upload for an assignment (one per student; resubmitting
+    replaces it). The file lives in the content-addressed blob store under
+    ``sha256``, so identical files are stored once.
+    """
+    __tablename__ = "submissions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    assignment_id = Column(Integer, ForeignKey("assignments.id", ondelete="CASCADE"), nullable=False)
+    student_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+
+    filename = Column(String(255), nullable=False)
+    content_type = Column(String(100), nullable=False)
+    size = Column(BigInteger, nullable=False)
+    sha256 = Column(String(64), nullable=False, index=True)
+
+    submitted_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("assignment_id", "student_id", name="uq_submissions_assignment_student"),
+    )
+
+    assignment = relationship("Assignment")
+    student = relationship("User")
+
+
+class CourseMaterial(Base):
+    """
+    A file a teacher shares with a course. Like submissions, the body lives
+    in the blob store under ``sha256``.
+    """
+    __tablename__ = "course_materials"
+
+    id = Column(Integer, primary_key=True, index=True)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False, index=True)
+    uploaded_by_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+
+    title = Column(String(255), nullable=False)
+    filename = Column(String(255), nullable=False)
+    content_type = Column(String(100), nullable=False)
+    size = Column(BigInteger, nullable=False)
+    sha256 = Column(String(64), nullable=False, index=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    course = relationship("Course")
+    uploaded_by = relationship("User")
+
+
+class RiskScore(Base):
+    """
+    Latest at-risk score of an enrolled student in a course, written by
+    ``app.services.risk``. Rows of a course are replaced wholesale on each
+    recompute.
+    """
+    __tablename__ = "risk_scores"
+
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True)
+    student_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+
+    score = Column(Float, nullable=False)
+    attendance_rate = Column(Float, nullable=True)
+    grade_average = Column(Float, nullable=True)
+    grade_trend = Column(Float, nullable=True)  # percentage points per week
+    missing_count = Column(Integer, nullable=False, default=0)
+    past_due_count = Column(Integer, nullable=False, default=0)
+    computed_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_risk_scores_course_score", "course_id", "score"),
+        Index("ix_risk_scores_student_id", "student_id"),
+    )
+
+    student = relationship("User")
+
+
+class EnrollmentDailyCount(Base):
+    """
+    Rollup of enrollments by course and creation day, maintained by
+    ``app.services.trends``; trend queries read this instead of
+    ``enrollments``.
+    """
+    __tablename__ = "enrollment_daily_counts"
+
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    department_id = Column(Integer, ForeignKey("departments.id", ondelete="CASCADE"), nullable=False)
+    enrollments = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_enrollment_daily_counts_department_day", "department_id", "day"),
+        Index("ix_enrollment_daily_counts_day", "day"),
+    )
+
+
+class TeacherMetricSnapshot(Base):
+    """
+    Performance metrics of a teacher's courses in one department and term,
+    written by ``app.services.teacher_metrics``.
+    """
+    __tablename__ = "teacher_metric_snapshots"
+
+    teacher_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    term = Column(String(50), primary_key=True)  # e.g. "2025 Fall"
+    department_id = Column(Integer, ForeignKey("departments.id", ondelete="CASCADE"), primary_key=True)
+
+    courses = Column(Integer, nullable=False, default=0)
+    grades = Column(Integer, nullable=False, default=0)
+    pass_rate = Column(Float, nullable=True)
+    average_percent = Column(Float, nullable=True)
+    turnaround_hours = Column(Float, nullable=True)
+    late_grading_rate = Column(Float, nullable=True)
+    attendance_sessions = Column(Integer, nullable=False, default=0)
+    attendance_regularity = Column(Float, nullable=True)
+    computed_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_teacher_metric_snapshots_department_term", "department_id", "term"),
+    )
+
+    teacher = relationship("User")
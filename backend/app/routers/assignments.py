@@ -0,0 +1,139 @@
+# app/routers/assignments.py
+
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.deps import get_db
+from app.core.access import can_manage_course, can_read_course
+from app.core.auth import get_current_active_user
+
+router = APIRouter(
+    prefix="/assignments",
+    tags=["assignments"],
+)
+
+
+def _get_assignment(db: Session, assignment_id: int) -> models.Assignment:
+    assignment = db.query(models.Assignment).filter(models.Assignment.id == assignment_id).first()
+    if not assignment:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Assignment not found.",
+        )
+    return assignment
+
+
+def _ensure_can_manage(assignment: models.Assignment, current_user: models.User) -> None:
+    if not can_manage_course(assignment.course, current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are not assigned to this course.",
+        )
+
+
+@router.get("/", response_model=List[schemas.AssignmentRead])
+def list_assignments(
+    course_id: int = Query(...),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    """
+    Assignments of a course, by due date (undated last). Assignments are
+    created with ``POST /teacher/courses/{course_id}/assignments``, which
+    also notifies the students.
+    """
+    course = db.query(models.Course).filter(models.Course.id == course_id).first()
+    if not course:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Course not found.",
+        )
+    if not can_read_course(db, course, current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have access to this course.",
+        )
+
+    return (
+        db.query(models.Assignment)
+        .filter(models.Assignment.course_id == course_id)
+        .order_by(models.Assignment.due_date.is_(None), models.Assignment.due_date, models.Assignment.id)
+        .all()
+    )
+
+
+@router.get("/{assignment_id}", response_model=schemas.AssignmentRead)
+def get_assignment(
+    assignment_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    assignment = _get_assignment(db, assignment_id)
+    if not can_read_course(db, assignment.course, current_user):
+        # Same answer as a missing assignment, so ids of other courses don't leak
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Assignment not found.",
+        )
+    return assignment
+
+
+@router.put("/{assignment_id}", response_model=schemas.AssignmentRead)
+def update_assignment(
+    assignment_id: int,
+    assignment_in: schemas.AssignmentUpdate,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    """
+    Course teacher / admin: change an assignment's title, description or
+    due date.
+    """
+    assignment = _get_assignment(db, assignment_id)
+    _ensure_can_manage(assignment, current_user)
+
+    if assignment_in.title is not None:
+        assignment.title = assignment_in.title
+
+    if assignment_in.description is not None:
+        assignment.description = assignment_in.description
+
+    if assignment_in.due_date is not None:
+        assignment.due_date = assignment_in.due_date
+
+    db.commit()
+    db.refresh(assignment)
+
+    return assignment
+
+
+@router.delete("/{assignment_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_assignment(
+    assignment_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    """
+    Course teacher / admin: delete an assignment that has not been graded.
+    Its submissions are removed with it.
+    """
+    assignment = _get_assignment(db, assignment_id)
+    _ensure_can_manage(assignment, current_user)
+
+    graded = db.query(models.Grade.id).filter(models.Grade.assignment_id == assignment.id).first()
+    if graded:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Assignment has grades and cannot be deleted.",
+        )
+
+    db.query(models.Submission).filter(models.Submission.assignment_id == assignment.id).delete(
+        synchronize_session=False
+    )
+    db.delete(assignment)
+    db.commit()
+
+    return
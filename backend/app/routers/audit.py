@@ -0,0 +1,52 @@
+# app/routers/audit.py
+
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.deps import get_db
+from app.core.auth import get_current_admin
+
+router = APIRouter(
+    prefix="/audit",
+    tags=["audit"],
+)
+
+
+@router.get("/", response_model=List[schemas.AuditLogRead])
+def list_audit_log(
+    db: Session = Depends(get_db),
+    admin_user: models.User = Depends(get_current_admin),
+    entity: Optional[str] = Query(default=None),
+    entity_id: Optional[int] = Query(default=None),
+    actor_id: Optional[int] = Query(default=None),
+    since: Optional[datetime] = Query(default=None),
+    until: Optional[datetime] = Query(default=None),
+    before_id: Optional[int] = Query(default=None, description="Return entries older than this id (paging)."),
+    limit: int = Query(default=100, ge=1, le=1000),
+):
+    """
+    Admin-only: audit entries, newest first. Filtering by ``entity`` and
+    ``entity_id`` (optionally with a time range) uses the
+    (entity, entity_id, occurred_at) index. Changes reach the log a few
+    seconds after they commit, once the outbox is drained.
+    """
+    query = db.query(models.AuditLog)
+
+    if entity is not None:
+        query = query.filter(models.AuditLog.entity == entity)
+    if entity_id is not None:
+        query = query.filter(models.AuditLog.entity_id == entity_id)
+    if actor_id is not None:
+        query = query.filter(models.AuditLog.actor_id == actor_id)
+    if since is not None:
+        query = query.filter(models.AuditLog.occurred_at >= since)
+    if until is not None:
+        query = query.filter(models.AuditLog.occurred_at < until)
+    if before_id is not None:
+        query = query.filter(models.AuditLog.id < before_id)
+
+    return query.order_by(models.AuditLog.occurred_at.desc(), models.AuditLog.id.desc()).limit(limit).all()
@@ -1,18 +1,23 @@
 # app/routers/auth.py
 
-from datetime import timedelta
+import math
+from datetime import datetime, timedelta
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 
 from app import models, schemas
 from app.deps import get_db
+from app.core.auth import bearer_scheme, get_current_active_user, token_cache
 from app.core.security import (
     ACCESS_TOKEN_EXPIRE_MINUTES,
     create_access_token,
     get_password_hash,
     verify_password,
+    verify_password_dummy,
 )
+from app.core.ratelimit import check_login_throttle, clear_login_throttle, client_ip
 from app.models import UserRole
 
 router = APIRouter(
@@ -66,14 +71,27 @@ def register_admin(user_in: schemas.UserCreate, db: Session = Depends(get_db)):
 
 
 @router.post("/login")
-def login(user_in: schemas.UserLogin, db: Session = Depends(get_db)):
+def login(user_in: schemas.UserLogin, request: Request, db: Session = Depends(get_db)):
     """
     Authenticate user and return JWT token + basic user info.
+
+    Attempts are throttled per client IP and per account before any DB
+    lookup or password hashing happens.
     """
 
+    ip = client_ip(request)
+    retry_after = check_login_throttle(ip, user_in.email)
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts. Please try again later.",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
     user = db.query(models.User).filter(models.User.email == user_in.email).first()
 
     if not user:
+        verify_password_dummy(user_in.password)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
@@ -85,6 +103,8 @@ def login(user_in: schemas.UserLogin, db: Session = Depends(get_db)):
             detail="Invalid email or password",
         )
 
+    clear_login_throttle(ip, user_in.email)
+
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": str(user.id), "role": user.role.value},
@@ -101,3 +121,23 @@ def login(user_in: schemas.UserLogin, db: Session = Depends(get_db)):
             "role": user.role.value,
         },
     }
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(
+    token: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    """
+    Revoke every access token issued to the current user so far.
+    """
+    # JWT iat has one-second resolution; tokens issued within the same second
+    # as the logout stay valid.
+    current_user.token_valid_after = datetime.utcnow().replace(microsecond=0)
+    db.add(current_user)
+    db.commit()
+
+    token_cache.discard(token.credentials)
+
+    return
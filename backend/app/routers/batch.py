@@ -0,0 +1,132 @@
+# app/routers/batch.py
+
+import json
+import os
+from contextlib import AsyncExitStack
+from typing import List
+from urllib.parse import unquote
+
+from dotenv import load_dotenv
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.orm import Session
+from starlette.exceptions import HTTPException as StarletteHTTPException
+
+from app import models, schemas
+from app.deps import batch_context, get_db
+from app.core.auth import get_current_active_user
+
+load_dotenv()
+
+# Most sub-requests one POST /batch may carry
+BATCH_MAX_REQUESTS = int(os.getenv("BATCH_MAX_REQUESTS", "20"))
+
+router = APIRouter(
+    prefix="/batch",
+    tags=["batch"],
+)
+
+
+async def _dispatch(request: Request, path: str) -> schemas.BatchSubResponse:
+    """
+    Run one GET through the app's router (not its middleware), in this
+    task, and collect the response.
+    """
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": request.scope.get("asgi", {"version": "3.0"}),
+        "http_version": request.scope.get("http_version", "1.1"),
+        "method": "GET",
+        "scheme": request.scope["scheme"],
+        "server": request.scope.get("server"),
+        "client": request.scope.get("client"),
+        "root_path": request.scope.get("root_path", ""),
+        "path": unquote(path),
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        # The bearer scheme still wants the header; the token is not decoded again
+        "headers": [
+            (name, value) for name, value in request.scope["headers"]
+            if name in (b"authorization", b"accept", b"accept-language")
+        ],
+        "app": request.scope["app"],
+        "starlette.exception_handlers": request.scope["starlette.exception_handlers"],
+    }
+    started = {}
+    chunks: List[bytes] = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            started.update(message)
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    try:
+        # Normally set up by FastAPI's own middleware, which is bypassed here
+        async with AsyncExitStack() as stack:
+            scope["fastapi_middleware_astack"] = stack
+            await request.app.router(scope, receive, send)
+    except StarletteHTTPException as exc:
+        # Raised by the router itself (no such route), outside any endpoint
+        return schemas.BatchSubResponse(status=exc.status_code, body={"detail": exc.detail})
+
+    headers = {
+        name.decode("latin-1"): value.decode("latin-1")
+        for name, value in started.get("headers", [])
+        if name != b"content-length"
+    }
+    raw = b"".join(chunks)
+    body = None
+    if raw:
+        body = json.loads(raw) if headers.get("content-type", "").startswith("application/json") else raw.decode()
+    return schemas.BatchSubResponse(status=started["status"], headers=headers, body=body)
+
+
+@router.post("", response_model=List[schemas.BatchSubResponse])
+async def run_batch(
+    batch_in: schemas.BatchRequest,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    """
+    Run up to ``BATCH_MAX_REQUESTS`` GET sub-requests, one after another,
+    and return their responses (status, headers, JSON body) in order.
+
+    A page that needs several resources pays for one HTTP round trip, one
+    token check and one user lookup: sub-requests run in-process on this
+    request's session and principal, with the same permission checks as
+    standalone requests. One failing sub-request does not fail the others.
+    Bodies are buffered whole, so file downloads do not belong in a batch.
+    """
+    if len(batch_in.requests) > BATCH_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {BATCH_MAX_REQUESTS} sub-requests per batch.",
+        )
+    for sub in batch_in.requests:
+        if not sub.path.startswith("/") or sub.path.split("?")[0].rstrip("/") == router.prefix:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid sub-request path: {sub.path!r}.",
+            )
+
+    results = []
+    token = batch_context.set((db, current_user))
+    try:
+        for sub in batch_in.requests:
+            try:
+                results.append(await _dispatch(request, sub.path))
+            except Exception:
+                # Unhandled in the endpoint: a 500 for this one, a clean session for the rest
+                db.rollback()
+                results.append(schemas.BatchSubResponse(
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    body={"detail": "Internal Server Error"},
+                ))
+    finally:
+        batch_context.reset(token)
+    return results
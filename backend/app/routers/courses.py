@@ -2,13 +2,17 @@
 
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 
 from app import models, schemas
 from app.deps import get_db
+from app.core import etags
 from app.core.auth import get_current_admin, get_current_active_user
 from app.models import UserRole
+from app.services import prerequisites, purge, registration, trends, writes
 
 router = APIRouter(
     prefix="/courses",
@@ -26,16 +30,6 @@ def ensure_teacher_exists(db: Session, teacher_id: int):
     return teacher
 
 
-def ensure_department_exists(db: Session, department_id: int):
-    dept = db.query(models.Department).filter(models.Department.id == department_id).first()
-    if not dept:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="department_id must refer to an existing department.",
-        )
-    return dept
-
-
 @router.post("/", response_model=schemas.CourseRead, status_code=status.HTTP_201_CREATED)
 def create_course(
     course_in: schemas.CourseCreate,
@@ -46,19 +40,7 @@ def create_course(
     Admin-only: create a course and assign a teacher.
     """
 
-    # Ensure unique course code
-    existing = (
-        db.query(models.Course)
-        .filter(models.Course.code == course_in.code)
-        .first()
-    )
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="A course with this code already exists.",
-        )
-
-    ensure_department_exists(db, course_in.department_id)
+    # The code's uniqueness and the department are checked by the database
     ensure_teacher_exists(db, course_in.teacher_id)
 
     course = models.Course(
@@ -67,13 +49,22 @@ def create_course(
         description=course_in.description,
         semester=course_in.semester,
         credits=course_in.credits,
+        capacity=course_in.capacity,
+        room_type=course_in.room_type,
+        sessions_per_week=course_in.sessions_per_week,
         department_id=course_in.department_id,
         teacher_id=course_in.teacher_id,
     )
 
-    db.add(course)
-    db.commit()
-    db.refresh(course)
+    writes.insert(
+        db,
+        course,
+        unique={"code": "A course with this code already exists."},
+        foreign_keys={"department_id": "department_id must refer to an existing department."},
+    )
+    if course.capacity is not None:
+        registration.sync_seats(db, course)
+    writes.commit(db)
 
     return course
 
@@ -110,9 +101,23 @@ def list_courses(
     return courses
 
 
+@router.post("/eligibility", response_model=List[schemas.EligibilityResult])
+def check_eligibility(
+    request_in: schemas.EligibilityRequest,
+    db: Session = Depends(get_db),
+    admin_user: models.User = Depends(get_current_admin),
+):
+    """
+    Admin-only: check prerequisites, capacity and existing enrollment for
+    every student x course pair in one pass.
+    """
+    return prerequisites.check_eligibility(db, request_in.student_ids, request_in.course_ids)
+
+
 @router.get("/{course_id}", response_model=schemas.CourseRead)
 def get_course(
     course_id: int,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_active_user),
 ):
@@ -122,6 +127,7 @@ def get_course(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Course not found.",
         )
+    etags.set_etag(response, course)
     return course
 
 
@@ -129,85 +135,209 @@ def get_course(
 def update_course(
     course_id: int,
     course_in: schemas.CourseUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(default=None),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_active_user),
 ):
     """
     Admin: can update any course.
     Teacher/HOD: can update only their own courses (basic fields).
-    """
 
-    course = db.query(models.Course).filter(models.Course.id == course_id).first()
-    if not course:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Course not found.",
-        )
+    Send the course's ETag in ``If-Match`` to get 412 instead of
+    overwriting someone else's change.
+    """
 
-    # Authorization: admin can update any; teacher/hod can only update their own course
     if current_user.role not in (UserRole.ADMIN, UserRole.HOD, UserRole.TEACHER):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough privileges to update courses.",
         )
 
-    if current_user.role in (UserRole.HOD, UserRole.TEACHER) and course.teacher_id != current_user.id:
+    values = course_in.dict(exclude_none=True)
+    if "teacher_id" in values:
+        ensure_teacher_exists(db, values["teacher_id"])
+
+    # Authorization: admin can update any; teacher/hod only a course they teach
+    own = () if current_user.role == UserRole.ADMIN else (models.Course.teacher_id == current_user.id,)
+    updated = writes.update(
+        db,
+        models.Course,
+        course_id,
+        values,
+        *own,
+        *etags.if_match(models.Course, if_match),
+        unique={"code": "Another course with this code already exists."},
+        foreign_keys={"department_id": "department_id must refer to an existing department."},
+    )
+    if updated is None:
+        course = db.query(models.Course).filter(models.Course.id == course_id).first()
+        if not course:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Course not found.",
+            )
+        if own and course.teacher_id != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You can only update courses you teach.",
+            )
+        raise etags.precondition_failed("Course")
+
+    course, previous = updated
+    if "capacity" in previous:
+        # Re-seat the counter row; a larger capacity promotes waitlisted students
+        registration.sync_seats(db, course)
+    if previous.get("department_id", course.department_id) != course.department_id:
+        trends.move_course(db.connection(), course.id, course.department_id)
+
+    writes.commit(db)
+
+    etags.set_etag(response, course)
+    return course
+
+
+@router.delete(
+    "/{course_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={status.HTTP_202_ACCEPTED: {"model": schemas.JobRead, "description": "Queued as a purge job."}},
+)
+def delete_course(
+    course_id: int,
+    db: Session = Depends(get_db),
+    admin_user: models.User = Depends(get_current_admin),
+):
+    """
+    Admin-only: delete a course with its enrollments, assignments, grades,
+    attendance and everything else under it (removed by the database's
+    ON DELETE rules). Courses with a large history are deleted in the
+    background instead: 202 with the purge job (see ``Location``).
+    """
+
+    course = db.query(models.Course).filter(models.Course.id == course_id).first()
+    if not course:
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You can only update courses you teach.",
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Course not found.",
         )
 
-    # If code changed, check uniqueness
-    if course_in.code and course_in.code != course.code:
-        existing_code = (
-            db.query(models.Course)
-            .filter(models.Course.code == course_in.code)
-            .first()
+    if purge.is_large(db, "course", course.id):
+        job = purge.enqueue(db, "course", course.id, created_by_id=admin_user.id)
+        db.commit()
+        db.refresh(job)
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=jsonable_encoder(schemas.JobRead.model_validate(job, from_attributes=True)),
+            headers={"Location": f"/jobs/{job.id}"},
         )
-        if existing_code:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Another course with this code already exists.",
-            )
 
-    # Validate department/teacher if changed
-    if course_in.department_id is not None:
-        ensure_department_exists(db, course_in.department_id)
-        course.department_id = course_in.department_id
+    db.delete(course)
+    db.commit()
 
-    if course_in.teacher_id is not None:
-        ensure_teacher_exists(db, course_in.teacher_id)
-        course.teacher_id = course_in.teacher_id
+    return
 
-    if course_in.name is not None:
-        course.name = course_in.name
 
-    if course_in.description is not None:
-        course.description = course_in.description
+@router.get("/{course_id}/prerequisites", response_model=List[schemas.CourseRead])
+def list_prerequisites(
+    course_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    """
+    Direct prerequisites of a course.
+    """
+    courses = (
+        db.query(models.Course)
+        .join(
+            models.CoursePrerequisite,
+            models.CoursePrerequisite.prerequisite_id == models.Course.id,
+        )
+        .filter(models.CoursePrerequisite.course_id == course_id)
+        .order_by(models.Course.id)
+        .all()
+    )
+    return courses
 
-    if course_in.semester is not None:
-        course.semester = course_in.semester
 
-    if course_in.credits is not None:
-        course.credits = course_in.credits
+@router.post(
+    "/{course_id}/prerequisites",
+    response_model=List[schemas.CourseRead],
+    status_code=status.HTTP_201_CREATED,
+)
+def add_prerequisite(
+    course_id: int,
+    prerequisite_in: schemas.PrerequisiteCreate,
+    db: Session = Depends(get_db),
+    admin_user: models.User = Depends(get_current_admin),
+):
+    """
+    Admin-only: require another course to be completed before this one.
+    """
+    found = (
+        db.query(models.Course.id)
+        .filter(models.Course.id.in_([course_id, prerequisite_in.prerequisite_id]))
+        .count()
+    )
+    if found != len({course_id, prerequisite_in.prerequisite_id}):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Course not found.",
+        )
 
-    db.add(course)
+    prerequisites.add_prerequisite(db, course_id, prerequisite_in.prerequisite_id)
     db.commit()
-    db.refresh(course)
 
-    return course
+    return list_prerequisites(course_id, db, admin_user)
 
 
-@router.delete("/{course_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_course(
+@router.delete("/{course_id}/prerequisites/{prerequisite_id}", status_code=status.HTTP_204_NO_CONTENT)
+def remove_prerequisite(
     course_id: int,
+    prerequisite_id: int,
     db: Session = Depends(get_db),
     admin_user: models.User = Depends(get_current_admin),
 ):
     """
-    Admin-only: delete a course.
+    Admin-only: drop a prerequisite.
+    """
+    prerequisites.remove_prerequisite(db, course_id, prerequisite_id)
+    db.commit()
+
+    return
+
+
+@router.get("/{course_id}/meetings", response_model=List[schemas.CourseMeetingRead])
+def list_meetings(
+    course_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    """
+    Weekly meeting slots of a course.
     """
+    meetings = (
+        db.query(models.CourseMeeting)
+        .filter(models.CourseMeeting.course_id == course_id)
+        .order_by(models.CourseMeeting.day_of_week, models.CourseMeeting.start_time)
+        .all()
+    )
+    return meetings
+
 
+@router.post(
+    "/{course_id}/meetings",
+    response_model=schemas.CourseMeetingRead,
+    status_code=status.HTTP_201_CREATED,
+)
+def add_meeting(
+    course_id: int,
+    meeting_in: schemas.CourseMeetingCreate,
+    db: Session = Depends(get_db),
+    admin_user: models.User = Depends(get_current_admin),
+):
+    """
+    Admin-only: add a weekly meeting slot to a course.
+    """
     course = db.query(models.Course).filter(models.Course.id == course_id).first()
     if not course:
         raise HTTPException(
@@ -215,7 +345,57 @@ def delete_course(
             detail="Course not found.",
         )
 
-    db.delete(course)
+    if meeting_in.end_time <= meeting_in.start_time:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end_time must be after start_time.",
+        )
+
+    if meeting_in.resource_id is not None:
+        resource = db.query(models.Resource).filter(models.Resource.id == meeting_in.resource_id).first()
+        if not resource:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="resource_id must refer to an existing resource.",
+            )
+
+    meeting = models.CourseMeeting(
+        course_id=course_id,
+        day_of_week=meeting_in.day_of_week,
+        start_time=meeting_in.start_time,
+        end_time=meeting_in.end_time,
+        resource_id=meeting_in.resource_id,
+    )
+
+    db.add(meeting)
+    db.commit()
+    db.refresh(meeting)
+
+    return meeting
+
+
+@router.delete("/{course_id}/meetings/{meeting_id}", status_code=status.HTTP_204_NO_CONTENT)
+def remove_meeting(
+    course_id: int,
+    meeting_id: int,
+    db: Session = Depends(get_db),
+    admin_user: models.User = Depends(get_current_admin),
+):
+    """
+    Admin-only: remove a meeting slot.
+    """
+    meeting = (
+        db.query(models.CourseMeeting)
+        .filter(models.CourseMeeting.id == meeting_id, models.CourseMeeting.course_id == course_id)
+        .first()
+    )
+    if not meeting:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Meeting not found.",
+        )
+
+    db.delete(meeting)
     db.commit()
 
     return
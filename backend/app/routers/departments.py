@@ -1,13 +1,15 @@
 # app/routers/departments.py
 
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
 from sqlalchemy.orm import Session
 
 from app import models, schemas
 from app.deps import get_db
+from app.core import etags
 from app.core.auth import get_current_admin
+from app.services import writes
 
 router = APIRouter(
     prefix="/departments",
@@ -21,30 +23,21 @@ def create_department(
     db: Session = Depends(get_db),
     admin_user: models.User = Depends(get_current_admin),
 ):
-    # Ensure unique code and name
-    existing = (
-        db.query(models.Department)
-        .filter(
-            (models.Department.code == department_in.code)
-            | (models.Department.name == department_in.name)
-        )
-        .first()
-    )
-
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Department with this name or code already exists.",
-        )
-
     department = models.Department(
         name=department_in.name,
         code=department_in.code,
     )
 
-    db.add(department)
-    db.commit()
-    db.refresh(department)
+    # Unique code and name are enforced by the database
+    writes.insert(
+        db,
+        department,
+        unique={
+            "code": "Department with this name or code already exists.",
+            "name": "Department with this name or code already exists.",
+        },
+    )
+    writes.commit(db)
 
     return department
 
@@ -61,6 +54,7 @@ def list_departments(
 @router.get("/{department_id}", response_model=schemas.DepartmentRead)
 def get_department(
     department_id: int,
+    response: Response,
     db: Session = Depends(get_db),
     admin_user: models.User = Depends(get_current_admin),
 ):
@@ -70,6 +64,7 @@ def get_department(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Department not found.",
         )
+    etags.set_etag(response, department)
     return department
 
 
@@ -77,57 +72,40 @@ def get_department(
 def update_department(
     department_id: int,
     department_in: schemas.DepartmentUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(default=None),
     db: Session = Depends(get_db),
     admin_user: models.User = Depends(get_current_admin),
 ):
-    department = db.query(models.Department).filter(models.Department.id == department_id).first()
-    if not department:
+    """
+    Admin-only. Send the department's ETag in ``If-Match`` to get 412
+    instead of overwriting someone else's change.
+    """
+    # Optional: we are not yet validating that the HOD is from the same department.
+    updated = writes.update(
+        db,
+        models.Department,
+        department_id,
+        department_in.dict(exclude_none=True),
+        *etags.if_match(models.Department, if_match),
+        unique={
+            "code": "Another department with this code already exists.",
+            "name": "Another department with this name already exists.",
+        },
+        foreign_keys={"hod_user_id": "hod_user_id must refer to an existing user."},
+    )
+    if updated is None:
+        if db.query(models.Department.id).filter(models.Department.id == department_id).first():
+            raise etags.precondition_failed("Department")
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Department not found.",
         )
 
-    # If code or name being changed, ensure uniqueness
-    if department_in.code and department_in.code != department.code:
-        existing_code = (
-            db.query(models.Department)
-            .filter(models.Department.code == department_in.code)
-            .first()
-        )
-        if existing_code:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Another department with this code already exists.",
-            )
-
-    if department_in.name and department_in.name != department.name:
-        existing_name = (
-            db.query(models.Department)
-            .filter(models.Department.name == department_in.name)
-            .first()
-        )
-        if existing_name:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Another department with this name already exists.",
-            )
-
-    # Apply changes
-    if department_in.name is not None:
-        department.name = department_in.name
+    writes.commit(db)
 
-    if department_in.code is not None:
-        department.code = department_in.code
-
-    if department_in.hod_user_id is not None:
-        # Optional: we are not yet validating that HOD exists or is from same department.
-        department.hod_user_id = department_in.hod_user_id
-
-    db.add(department)
-    db.commit()
-    db.refresh(department)
-
-    return department
+    etags.set_etag(response, updated.obj)
+    return updated.obj
 
 
 @router.delete("/{department_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -143,6 +121,13 @@ def delete_department(
             detail="Department not found.",
         )
 
+    # Members and resources are detached by ON DELETE SET NULL; courses are not
+    if db.query(models.Course.id).filter(models.Course.department_id == department_id).first():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Department still has courses; move or delete them first.",
+        )
+
     db.delete(department)
     db.commit()
 
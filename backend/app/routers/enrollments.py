@@ -2,13 +2,14 @@
 
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
 from app import models, schemas
 from app.deps import get_db
-from app.core.auth import get_current_admin
+from app.core.auth import get_current_admin, get_current_active_user
 from app.models import UserRole
+from app.services import jobs, registration as registration_service, writes
 
 router = APIRouter(
     prefix="/enrollments",
@@ -16,6 +17,16 @@ router = APIRouter(
 )
 
 
+def _waitlist_read(entry: models.WaitlistEntry, position: int) -> schemas.WaitlistEntryRead:
+    return schemas.WaitlistEntryRead(
+        id=entry.id,
+        course_id=entry.course_id,
+        student_id=entry.student_id,
+        position=position,
+        created_at=entry.created_at,
+    )
+
+
 @router.post("/", response_model=schemas.EnrollmentRead, status_code=status.HTTP_201_CREATED)
 def create_enrollment(
     enrollment_in: schemas.EnrollmentCreate,
@@ -30,39 +41,46 @@ def create_enrollment(
             detail="student_id must refer to a user with role 'student'.",
         )
 
-    # Validate course
-    course = db.query(models.Course).filter(models.Course.id == enrollment_in.course_id).first()
-    if not course:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="course_id must refer to an existing course.",
-        )
-
-    # Check duplicate
-    existing = (
-        db.query(models.Enrollment)
-        .filter(
-            models.Enrollment.student_id == enrollment_in.student_id,
-            models.Enrollment.course_id == enrollment_in.course_id,
-        )
-        .first()
+    # Duplicates, prerequisites and the seat claim are handled atomically;
+    # an unknown course_id fails the enrollment's foreign key
+    registration = registration_service.register(
+        db, enrollment_in.student_id, enrollment_in.course_id, waitlist=False
     )
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Student is already enrolled in this course.",
-        )
 
-    enrollment = models.Enrollment(
-        student_id=enrollment_in.student_id,
-        course_id=enrollment_in.course_id,
-    )
+    writes.commit(db)
+
+    return registration.enrollment
+
 
-    db.add(enrollment)
+@router.post("/bulk", response_model=schemas.JobRead, status_code=status.HTTP_202_ACCEPTED)
+def bulk_enroll(
+    bulk_in: schemas.BulkEnrollmentRequest,
+    response: Response,
+    db: Session = Depends(get_db),
+    admin_user: models.User = Depends(get_current_admin),
+):
+    """
+    Admin-only: enroll a cohort of students in a set of courses.
+
+    The ids are checked immediately; the cohort itself is validated and
+    enrolled by a background job (see ``registration.bulk_enroll``) whose
+    result is the per-pair outcome list. Poll ``GET /jobs/{id}``.
+    """
+    student_ids = list(dict.fromkeys(bulk_in.student_ids))
+    course_ids = list(dict.fromkeys(bulk_in.course_ids))
+    registration_service.validate_cohort_ids(db, student_ids, course_ids)
+
+    job = jobs.enqueue(
+        db,
+        "enrollments.bulk",
+        {"student_ids": student_ids, "course_ids": course_ids, "dry_run": bulk_in.dry_run},
+        created_by_id=admin_user.id,
+    )
     db.commit()
-    db.refresh(enrollment)
+    db.refresh(job)
 
-    return enrollment
+    response.headers["Location"] = f"/jobs/{job.id}"
+    return job
 
 
 @router.get("/", response_model=List[schemas.EnrollmentRead])
@@ -81,86 +99,128 @@ def list_enrollments(
 
     enrollments = query.order_by(models.Enrollment.id).all()
     return enrollments
-# app/routers/enrollments.py
 
-from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+@router.put("/{enrollment_id}", response_model=schemas.EnrollmentRead)
+def update_enrollment(
+    enrollment_id: int,
+    enrollment_in: schemas.EnrollmentUpdate,
+    db: Session = Depends(get_db),
+    admin_user: models.User = Depends(get_current_admin),
+):
+    """
+    Admin-only: mark an enrollment as completed (or back to enrolled).
+    Completed enrollments satisfy prerequisites of later courses.
+    """
+    updated = writes.update(db, models.Enrollment, enrollment_id, {"status": enrollment_in.status})
+    if updated is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Enrollment not found.",
+        )
 
-from app import models, schemas
-from app.deps import get_db
-from app.core.auth import get_current_admin
-from app.models import UserRole
+    writes.commit(db)
 
-router = APIRouter(
-    prefix="/enrollments",
-    tags=["enrollments"],
-)
+    return updated.obj
 
 
-@router.post("/", response_model=schemas.EnrollmentRead, status_code=status.HTTP_201_CREATED)
-def create_enrollment(
-    enrollment_in: schemas.EnrollmentCreate,
+@router.delete("/{enrollment_id}", status_code=status.HTTP_204_NO_CONTENT)
+def drop_enrollment(
+    enrollment_id: int,
     db: Session = Depends(get_db),
-    admin_user: models.User = Depends(get_current_admin),
+    current_user: models.User = Depends(get_current_active_user),
 ):
-    # Validate student
-    student = db.query(models.User).filter(models.User.id == enrollment_in.student_id).first()
-    if not student or student.role != UserRole.STUDENT:
+    """
+    Admin: drop any enrollment. Student: drop their own.
+    The freed seat goes to the next waitlisted student in the same transaction.
+    """
+    enrollment = db.query(models.Enrollment).filter(models.Enrollment.id == enrollment_id).first()
+    if not enrollment or (
+        current_user.role != UserRole.ADMIN and enrollment.student_id != current_user.id
+    ):
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="student_id must refer to a user with role 'student'.",
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Enrollment not found.",
         )
 
-    # Validate course
-    course = db.query(models.Course).filter(models.Course.id == enrollment_in.course_id).first()
-    if not course:
+    registration_service.drop(db, enrollment)
+    db.commit()
+
+    return
+
+
+@router.post("/register", response_model=schemas.RegistrationRead, status_code=status.HTTP_201_CREATED)
+def register_for_course(
+    registration_in: schemas.RegistrationCreate,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    """
+    Student self-registration: takes a seat if one is left, otherwise joins
+    the course waitlist.
+    """
+    if current_user.role != UserRole.STUDENT:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="course_id must refer to an existing course.",
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only students can register for courses.",
         )
 
-    # Check duplicate
-    existing = (
-        db.query(models.Enrollment)
-        .filter(
-            models.Enrollment.student_id == enrollment_in.student_id,
-            models.Enrollment.course_id == enrollment_in.course_id,
-        )
-        .first()
-    )
-    if existing:
+    course = db.query(models.Course).filter(models.Course.id == registration_in.course_id).first()
+    if not course:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Student is already enrolled in this course.",
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Course not found.",
         )
 
-    enrollment = models.Enrollment(
-        student_id=enrollment_in.student_id,
-        course_id=enrollment_in.course_id,
-    )
+    registration = registration_service.register(db, current_user.id, course.id)
+    writes.commit(db)
 
-    db.add(enrollment)
-    db.commit()
-    db.refresh(enrollment)
+    if registration.enrollment is not None:
+        return {"status": registration.status, "enrollment": registration.enrollment}
 
-    return enrollment
+    entry = registration.waitlist_entry
+    return {
+        "status": registration.status,
+        "waitlist_entry": _waitlist_read(entry, registration_service.waitlist_position(db, entry)),
+    }
 
 
-@router.get("/", response_model=List[schemas.EnrollmentRead])
-def list_enrollments(
+@router.get("/waitlist", response_model=List[schemas.WaitlistEntryRead])
+def list_waitlist(
+    course_id: int = Query(...),
     db: Session = Depends(get_db),
     admin_user: models.User = Depends(get_current_admin),
-    student_id: Optional[int] = Query(default=None),
-    course_id: Optional[int] = Query(default=None),
 ):
-    query = db.query(models.Enrollment)
+    """
+    Admin-only: a course's waitlist in promotion order.
+    """
+    entries = (
+        db.query(models.WaitlistEntry)
+        .filter(models.WaitlistEntry.course_id == course_id)
+        .order_by(models.WaitlistEntry.id)
+        .all()
+    )
+    return [_waitlist_read(entry, position) for position, entry in enumerate(entries, start=1)]
 
-    if student_id is not None:
-        query = query.filter(models.Enrollment.student_id == student_id)
-    if course_id is not None:
-        query = query.filter(models.Enrollment.course_id == course_id)
 
-    enrollments = query.order_by(models.Enrollment.id).all()
-    return enrollments
+@router.delete("/waitlist/{entry_id}", status_code=status.HTTP_204_NO_CONTENT)
+def leave_waitlist(
+    entry_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    """
+    Admin: remove any waitlist entry. Student: leave a waitlist they are on.
+    """
+    entry = db.query(models.WaitlistEntry).filter(models.WaitlistEntry.id == entry_id).first()
+    if not entry or (current_user.role != UserRole.ADMIN and entry.student_id != current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Waitlist entry not found.",
+        )
+
+    db.delete(entry)
+    db.commit()
+
+    return
+
@@ -0,0 +1,56 @@
+# app/routers/jobs.py
+
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.deps import get_db
+from app.core.auth import get_current_admin, get_current_active_user
+from app.models import UserRole
+
+router = APIRouter(
+    prefix="/jobs",
+    tags=["jobs"],
+)
+
+
+@router.get("/", response_model=List[schemas.JobRead])
+def list_jobs(
+    db: Session = Depends(get_db),
+    admin_user: models.User = Depends(get_current_admin),
+    status_filter: Optional[str] = Query(default=None, alias="status"),
+    kind: Optional[str] = Query(default=None),
+    limit: int = Query(default=50, ge=1, le=500),
+):
+    """
+    Admin-only: most recent jobs first.
+    """
+    query = db.query(models.Job)
+
+    if status_filter is not None:
+        query = query.filter(models.Job.status == status_filter)
+    if kind is not None:
+        query = query.filter(models.Job.kind == kind)
+
+    return query.order_by(models.Job.id.desc()).limit(limit).all()
+
+
+@router.get("/{job_id}", response_model=schemas.JobRead)
+def get_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    """
+    Status, progress and (once finished) result of a job. Visible to the
+    user who started it and to admins.
+    """
+    job = db.query(models.Job).filter(models.Job.id == job_id).first()
+    if not job or (current_user.role != UserRole.ADMIN and job.created_by_id != current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found.",
+        )
+    return job
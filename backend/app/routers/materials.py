@@ -0,0 +1,280 @@
+# app/routers/materials.py
+
+import hashlib
+import os
+import zipfile
+from typing import Iterator, List
+
+from dotenv import load_dotenv
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.deps import get_db
+from app.core.access import can_manage_course, can_read_course
+from app.core.auth import get_current_active_user
+from app.core.files import blob_response, etag_matches
+from app.core.uploads import receive_file
+from app.services.storage import blob_store
+
+load_dotenv()
+
+MATERIAL_MAX_BYTES = int(os.getenv("MATERIAL_MAX_BYTES", str(512 * 1024 * 1024)))
+# Browsers may reuse a download this long without asking; after that it is
+# revalidated against the ETag (a 304 costs no body)
+MATERIAL_CACHE_MAX_AGE = int(os.getenv("MATERIAL_CACHE_MAX_AGE", "300"))
+ZIP_READ_BYTES = 256 * 1024
+
+router = APIRouter(
+    tags=["materials"],
+)
+
+
+def _cache_control() -> str:
+    return f"private, max-age={MATERIAL_CACHE_MAX_AGE}, must-revalidate"
+
+
+def _get_course(db: Session, course_id: int) -> models.Course:
+    course = db.query(models.Course).filter(models.Course.id == course_id).first()
+    if not course:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Course not found",
+        )
+    return course
+
+
+def _managed_course(db: Session, course_id: int, current_user: models.User) -> models.Course:
+    course = _get_course(db, course_id)
+    if not can_manage_course(course, current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are not assigned to this course.",
+        )
+    return course
+
+
+def _readable_course(db: Session, course_id: int, current_user: models.User) -> models.Course:
+    course = _get_course(db, course_id)
+    if not can_read_course(db, course, current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have access to this course.",
+        )
+    return course
+
+
+def _get_material(db: Session, material_id: int) -> models.CourseMaterial:
+    material = db.query(models.CourseMaterial).filter(models.CourseMaterial.id == material_id).first()
+    if not material:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Material not found.",
+        )
+    return material
+
+
+def _save_material(db: Session, course_id: int, uploaded_by_id: int, upload) -> models.CourseMaterial:
+    material = models.CourseMaterial(
+        course_id=course_id,
+        uploaded_by_id=uploaded_by_id,
+        title=(upload.fields.get("title") or upload.filename).strip()[:255] or upload.filename,
+        filename=upload.filename,
+        content_type=upload.content_type,
+        size=upload.size,
+        sha256=upload.sha256,
+    )
+    db.add(material)
+    db.commit()
+    db.refresh(material)
+    return material
+
+
+@router.post(
+    "/courses/{course_id}/materials",
+    response_model=schemas.CourseMaterialRead,
+    status_code=status.HTTP_201_CREATED,
+)
+async def upload_material(
+    course_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    """
+    Course teacher / admin: upload a material as ``multipart/form-data``
+    field ``file`` (optional text field ``title``, default the filename).
+    Streamed to the blob store like submissions; identical files are
+    stored once.
+    """
+    await run_in_threadpool(_managed_course, db, course_id, current_user)
+    # Release the connection while the file streams in (see upload_submission)
+    await run_in_threadpool(db.close)
+    upload = await receive_file(request, MATERIAL_MAX_BYTES)
+    return await run_in_threadpool(_save_material, db, course_id, current_user.id, upload)
+
+
+@router.get("/courses/{course_id}/materials", response_model=List[schemas.CourseMaterialRead])
+def list_materials(
+    course_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    """
+    Materials of a course, for its teacher, its department's HOD, admins
+    and enrolled students.
+    """
+    _readable_course(db, course_id, current_user)
+    return (
+        db.query(models.CourseMaterial)
+        .filter(models.CourseMaterial.course_id == course_id)
+        .order_by(models.CourseMaterial.id)
+        .all()
+    )
+
+
+@router.get("/materials/{material_id}/file")
+def download_material(
+    material_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    """
+    Download a material. The ETag is the file's SHA-256, so clients
+    revalidate with ``If-None-Match`` and get 304; Range requests are
+    supported for resuming and seeking.
+    """
+    material = _get_material(db, material_id)
+    _readable_course(db, material.course_id, current_user)
+    return blob_response(
+        request, blob_store, material.sha256, material.content_type, material.filename,
+        cache_control=_cache_control(),
+    )
+
+
+@router.patch("/materials/{material_id}", response_model=schemas.CourseMaterialRead)
+def update_material(
+    material_id: int,
+    payload: schemas.CourseMaterialUpdate,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    material = _get_material(db, material_id)
+    _managed_course(db, material.course_id, current_user)
+    title = payload.title.strip()
+    if not title:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Title must not be empty.",
+        )
+    material.title = title[:255]
+    db.commit()
+    db.refresh(material)
+    return material
+
+
+@router.delete("/materials/{material_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_material(
+    material_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    """
+    Remove a material. The blob stays in the store, since other materials
+    or submissions may share it.
+    """
+    material = _get_material(db, material_id)
+    _managed_course(db, material.course_id, current_user)
+    db.delete(material)
+    db.commit()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+class _ZipSink:
+    """
+    Write-only file object that collects what ``zipfile`` writes so it can
+    be yielded. Having no ``seek``/``tell`` makes ``zipfile`` stream: sizes
+    and CRCs go into data descriptors after each entry.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _zip_names(materials: List[models.CourseMaterial]) -> List[str]:
+    names, seen = [], set()
+    for material in materials:
+        name = material.filename
+        if name in seen:
+            stem, ext = os.path.splitext(name)
+            name = f"{stem} ({material.id}){ext}"
+        seen.add(name)
+        names.append(name)
+    return names
+
+
+def _zip_stream(entries: List[tuple]) -> Iterator[bytes]:
+    """
+    Yield a zip archive of ``(name, sha256, created_at)`` blobs as it is
+    built. Entries are stored, not compressed: course materials are mostly
+    PDFs, slides and media that do not shrink, and this keeps the cost of a
+    download at copying bytes.
+    """
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+        for name, digest, created_at in entries:
+            info = zipfile.ZipInfo(name, date_time=created_at.timetuple()[:6])
+            with blob_store.open(digest) as source, archive.open(info, "w", force_zip64=True) as target:
+                while data := source.read(ZIP_READ_BYTES):
+                    target.write(data)
+                    yield sink.take()
+            yield sink.take()
+    yield sink.take()
+
+
+@router.get("/courses/{course_id}/materials.zip")
+def download_materials_zip(
+    course_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    """
+    All materials of a course as one zip, built while it is sent (nothing
+    is written to disk or held in memory). The ETag covers the set of
+    files, so an unchanged course revalidates with 304.
+    """
+    course = _readable_course(db, course_id, current_user)
+    materials = (
+        db.query(models.CourseMaterial)
+        .filter(models.CourseMaterial.course_id == course_id)
+        .order_by(models.CourseMaterial.id)
+        .all()
+    )
+    entries = [
+        (name, material.sha256, material.created_at)
+        for name, material in zip(_zip_names(materials), materials)
+    ]
+
+    etag = '"' + hashlib.sha256(repr([(n, d) for n, d, _ in entries]).encode()).hexdigest() + '"'
+    headers = {"cache-control": _cache_control(), "etag": etag}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    headers["content-disposition"] = f'attachment; filename="{course.code}-materials.zip"'
+    return StreamingResponse((chunk for chunk in _zip_stream(entries) if chunk), media_type="application/zip", headers=headers)
@@ -0,0 +1,79 @@
+# app/routers/metrics.py
+
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query, Response, status
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.deps import get_db
+from app.core.access import scope_department
+from app.core.auth import get_current_active_user
+from app.services import jobs, teacher_metrics
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["metrics"],
+)
+
+
+@router.get("/teachers", response_model=List[schemas.TeacherMetricsRead])
+def list_teacher_metrics(
+    term: Optional[str] = Query(None, description='e.g. "2025 Fall"; default the latest term'),
+    department_id: Optional[int] = Query(None),
+    teacher_id: Optional[int] = Query(None),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    """
+    Admin/HOD: teacher performance metrics for a term, from the latest
+    snapshot (see ``computed_at``; refreshed nightly or with
+    ``POST /metrics/teachers/recompute``).
+    """
+    department_id = scope_department(current_user, department_id, "teacher metrics")
+    term = term or teacher_metrics.latest_term(db, department_id)
+    if term is None:
+        return []
+
+    Snapshot = models.TeacherMetricSnapshot
+    query = (
+        db.query(Snapshot, models.User.full_name)
+        .join(models.User, models.User.id == Snapshot.teacher_id)
+        .filter(Snapshot.term == term)
+    )
+    if department_id is not None:
+        query = query.filter(Snapshot.department_id == department_id)
+    if teacher_id is not None:
+        query = query.filter(Snapshot.teacher_id == teacher_id)
+
+    rows = query.order_by(Snapshot.department_id, models.User.full_name).all()
+    return [
+        {
+            **{column.key: getattr(snapshot, column.key) for column in Snapshot.__table__.columns},
+            "teacher_name": name,
+        }
+        for snapshot, name in rows
+    ]
+
+
+@router.post("/teachers/recompute", response_model=schemas.JobRead, status_code=status.HTTP_202_ACCEPTED)
+def recompute_teacher_metrics(
+    recompute_in: schemas.TeacherMetricsRecomputeRequest,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    """
+    Admin/HOD: refresh the snapshots now, in a background job (HODs: their
+    own department).
+    """
+    department_id = scope_department(current_user, recompute_in.department_id, "teacher metrics", verb="recompute")
+
+    job = jobs.enqueue(
+        db, "metrics.teachers", {"department_id": department_id}, created_by_id=current_user.id, max_attempts=3
+    )
+    db.commit()
+    db.refresh(job)
+
+    response.headers["Location"] = f"/jobs/{job.id}"
+    return job
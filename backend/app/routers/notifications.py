@@ -0,0 +1,65 @@
+# app/routers/notifications.py
+
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.deps import get_db
+from app.core.auth import get_current_active_user
+from app.services import notifications as notification_service
+
+router = APIRouter(
+    prefix="/notifications",
+    tags=["notifications"],
+)
+
+
+@router.get("/", response_model=List[schemas.NotificationRead])
+def list_notifications(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+    unread_only: bool = Query(default=False),
+    before_id: Optional[int] = Query(default=None, description="Return notifications older than this id (paging)."),
+    limit: int = Query(default=50, ge=1, le=200),
+):
+    """
+    The current user's inbox, newest first.
+    """
+    query = db.query(models.Notification).filter(models.Notification.user_id == current_user.id)
+
+    if unread_only:
+        query = query.filter(models.Notification.read_at.is_(None))
+    if before_id is not None:
+        query = query.filter(models.Notification.id < before_id)
+
+    return query.order_by(models.Notification.id.desc()).limit(limit).all()
+
+
+@router.get("/unread-count", response_model=schemas.UnreadCount)
+def get_unread_count(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    """
+    Number of unread notifications (cached for a few seconds per process).
+    """
+    return {"unread": notification_service.unread_count(db, current_user.id)}
+
+
+@router.post("/read", response_model=schemas.UnreadCount)
+def mark_notifications_read(
+    read_in: schemas.NotificationMarkRead,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    """
+    Mark the given notifications (or all of them) read; returns the new
+    unread count.
+    """
+    notification_service.mark_read(db, current_user.id, read_in.ids)
+    db.commit()
+    notification_service.unread_cache.discard(current_user.id)
+
+    return {"unread": notification_service.unread_count(db, current_user.id)}
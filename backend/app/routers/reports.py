@@ -0,0 +1,111 @@
+# app/routers/reports.py
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.deps import get_db
+from app.core.auth import get_current_active_user
+from app.models import UserRole
+from app.services import jobs, reports as report_service
+
+router = APIRouter(
+    prefix="/reports",
+    tags=["reports"],
+)
+
+
+@router.post("/", response_model=schemas.JobRead, status_code=status.HTTP_202_ACCEPTED)
+def create_report(
+    report_in: schemas.ReportRequest,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    """
+    Admin/HOD: export department datasets (CSV, and Parquet when pyarrow is
+    installed) in a background job. HODs can only export their own
+    department. The job's result lists the files; download them from
+    ``GET /reports/{job_id}/files/{name}``.
+    """
+    if current_user.role == UserRole.ADMIN:
+        query = db.query(models.Department.id)
+        if report_in.department_ids is not None:
+            query = query.filter(models.Department.id.in_(report_in.department_ids))
+        department_ids = [row.id for row in query.order_by(models.Department.id)]
+        if report_in.department_ids is not None and len(department_ids) != len(set(report_in.department_ids)):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="One or more departments do not exist.",
+            )
+    elif current_user.role == UserRole.HOD and current_user.department_id is not None:
+        if report_in.department_ids not in (None, [current_user.department_id]):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="HODs can only export their own department.",
+            )
+        department_ids = [current_user.department_id]
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins and HODs can export reports.",
+        )
+
+    missing = set(report_in.formats) - set(report_service.available_formats())
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported report format: {', '.join(sorted(missing))} (install pyarrow for Parquet).",
+        )
+    if not department_ids or not report_in.datasets or not report_in.formats:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Nothing to export.",
+        )
+
+    payload = {
+        "department_ids": department_ids,
+        "datasets": list(dict.fromkeys(report_in.datasets)),
+        "formats": list(dict.fromkeys(report_in.formats)),
+    }
+    job = jobs.enqueue(db, "reports.generate", payload, created_by_id=current_user.id, max_attempts=3)
+    db.commit()
+    db.refresh(job)
+
+    response.headers["Location"] = f"/jobs/{job.id}"
+    return job
+
+
+@router.get("/{job_id}/files/{name}")
+def download_report_file(
+    job_id: int,
+    name: str,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    """
+    Download one file of a finished report. Supports ``Range`` requests and
+    conditional requests (``ETag`` / ``Last-Modified``); the file is sent
+    with zero-copy ``pathsend`` on servers that offer it.
+    """
+    job = db.query(models.Job).filter(models.Job.id == job_id).first()
+    if not job or (current_user.role != UserRole.ADMIN and job.created_by_id != current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report not found.",
+        )
+
+    path = report_service.find_file(job, name)
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report file not found.",
+        )
+
+    fmt = name.rsplit(".", 1)[-1]
+    return FileResponse(
+        path,
+        media_type=report_service.MEDIA_TYPES.get(fmt, "application/octet-stream"),
+        filename=name,
+    )
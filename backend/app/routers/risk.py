@@ -0,0 +1,111 @@
+# app/routers/risk.py
+
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.deps import get_db
+from app.core.access import can_manage_course, scope_department
+from app.core.auth import get_current_active_user
+from app.models import UserRole
+from app.services import jobs, risk as risk_service
+
+router = APIRouter(
+    prefix="/risk",
+    tags=["risk"],
+)
+
+
+@router.get("/courses/{course_id}", response_model=List[schemas.RiskScoreRead])
+def at_risk_students(
+    course_id: int,
+    min_score: Optional[float] = Query(None, ge=0.0, le=1.0),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    """
+    Course teacher / department HOD / admin: enrolled students of a course
+    by at-risk score, highest first, down to ``min_score`` (default
+    ``RISK_THRESHOLD``; pass 0 for everyone). Scores are precomputed, see
+    ``POST /risk/recompute``.
+    """
+    course = db.query(models.Course).filter(models.Course.id == course_id).first()
+    if not course:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Course not found.",
+        )
+    hod = current_user.role == UserRole.HOD and current_user.department_id == course.department_id
+    if not (can_manage_course(course, current_user) or hod):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are not assigned to this course.",
+        )
+
+    threshold = risk_service.RISK_THRESHOLD if min_score is None else min_score
+    rows = (
+        db.query(models.RiskScore, models.User.full_name, models.User.email)
+        .join(models.User, models.User.id == models.RiskScore.student_id)
+        .filter(models.RiskScore.course_id == course_id, models.RiskScore.score >= threshold)
+        .order_by(models.RiskScore.score.desc(), models.RiskScore.student_id)
+        .limit(limit)
+        .all()
+    )
+    return [
+        {
+            "student_id": score.student_id,
+            "student_name": name,
+            "student_email": email,
+            "score": score.score,
+            "attendance_rate": score.attendance_rate,
+            "grade_average": score.grade_average,
+            "grade_trend": score.grade_trend,
+            "missing_count": score.missing_count,
+            "past_due_count": score.past_due_count,
+            "computed_at": score.computed_at,
+        }
+        for score, name, email in rows
+    ]
+
+
+@router.post("/recompute", response_model=schemas.JobRead, status_code=status.HTTP_202_ACCEPTED)
+def recompute_scores(
+    recompute_in: schemas.RiskRecomputeRequest,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    """
+    Admin/HOD: recompute at-risk scores now, in a background job, for the
+    given courses or department (HODs: their own department only).
+    Optional ``weights`` override the configured component weights.
+    """
+    department_id = scope_department(current_user, recompute_in.department_id, "risk scores", verb="recompute")
+
+    try:
+        risk_service.validate_weights(recompute_in.weights)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    payload = {"department_id": department_id, "weights": recompute_in.weights}
+    if recompute_in.course_ids is not None:
+        query = db.query(models.Course.id).filter(models.Course.id.in_(recompute_in.course_ids))
+        if department_id is not None:
+            query = query.filter(models.Course.department_id == department_id)
+        course_ids = sorted(row.id for row in query)
+        if len(course_ids) != len(set(recompute_in.course_ids)):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="One or more courses do not exist or are outside the department.",
+            )
+        payload["course_ids"] = course_ids
+
+    job = jobs.enqueue(db, "risk.score", payload, created_by_id=current_user.id, max_attempts=3)
+    db.commit()
+    db.refresh(job)
+
+    response.headers["Location"] = f"/jobs/{job.id}"
+    return job
@@ -0,0 +1,123 @@
+# app/routers/students.py
+
+import re
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import and_
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.deps import get_db
+from app.core.auth import get_current_active_user
+from app.models import UserRole
+
+router = APIRouter(
+    prefix="/students",
+    tags=["students"],
+)
+
+_WITHIN_UNITS = {"h": "hours", "d": "days", "w": "weeks"}
+MAX_WITHIN = timedelta(days=366)
+
+
+def _parse_within(value: str) -> timedelta:
+    match = re.fullmatch(r"(\d{1,4})([hdw])", value.strip())
+    if not match:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="within must look like 12h, 7d or 2w.",
+        )
+    within = timedelta(**{_WITHIN_UNITS[match.group(2)]: int(match.group(1))})
+    return min(within, MAX_WITHIN)
+
+
+@router.get("/me/deadlines", response_model=List[schemas.DeadlineRead])
+def my_deadlines(
+    within: str = Query("7d"),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    """
+    Student: assignments due from now until ``within`` (e.g. ``7d``) across
+    all courses they are enrolled in, soonest first, with whether each has
+    been submitted and graded.
+
+    One query: enrollments -> assignments (range scan on
+    ``ix_assignments_course_due`` per course) with the student's submission
+    and grade left-joined on their (assignment, student) indexes.
+    """
+    if current_user.role != UserRole.STUDENT:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only students have deadlines.",
+        )
+
+    now = datetime.utcnow()
+    until = now + _parse_within(within)
+
+    rows = (
+        db.query(
+            models.Assignment.id,
+            models.Assignment.title,
+            models.Assignment.due_date,
+            models.Course.id,
+            models.Course.code,
+            models.Course.name,
+            models.Submission.submitted_at,
+            models.Grade.grade_value,
+            models.Grade.is_finalized,
+        )
+        .select_from(models.Enrollment)
+        .join(
+            models.Assignment,
+            and_(
+                models.Assignment.course_id == models.Enrollment.course_id,
+                models.Assignment.due_date >= now,
+                models.Assignment.due_date < until,
+            ),
+        )
+        .join(models.Course, models.Course.id == models.Assignment.course_id)
+        .outerjoin(
+            models.Submission,
+            and_(
+                models.Submission.assignment_id == models.Assignment.id,
+                models.Submission.student_id == current_user.id,
+            ),
+        )
+        .outerjoin(
+            models.Grade,
+            and_(
+                models.Grade.student_id == current_user.id,
+                models.Grade.assignment_id == models.Assignment.id,
+            ),
+        )
+        .filter(models.Enrollment.student_id == current_user.id, models.Enrollment.status == "enrolled")
+        .order_by(models.Assignment.due_date, models.Assignment.id)
+        .limit(limit)
+        .all()
+    )
+
+    deadlines = []
+    for assignment_id, title, due_date, course_id, code, name, submitted_at, grade_value, finalized in rows:
+        if grade_value is not None:
+            state = "graded"
+        elif submitted_at is not None:
+            state = "submitted"
+        else:
+            state = "pending"
+        deadlines.append({
+            "assignment_id": assignment_id,
+            "title": title,
+            "due_date": due_date,
+            "course_id": course_id,
+            "course_code": code,
+            "course_name": name,
+            "status": state,
+            "submitted_at": submitted_at,
+            "grade_value": grade_value,
+            "grade_finalized": bool(finalized),
+        })
+    return deadlines
@@ -0,0 +1,202 @@
+# app/routers/submissions.py
+
+import os
+from datetime import datetime
+from typing import List
+
+from dotenv import load_dotenv
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.deps import get_db
+from app.core.auth import get_current_active_user
+from app.core.files import blob_response
+from app.core.uploads import receive_file
+from app.models import UserRole
+from app.services.storage import blob_store
+
+load_dotenv()
+
+SUBMISSION_MAX_BYTES = int(os.getenv("SUBMISSION_MAX_BYTES", str(256 * 1024 * 1024)))
+
+router = APIRouter(
+    tags=["submissions"],
+)
+
+
+def _submittable_assignment(db: Session, assignment_id: int, current_user: models.User) -> models.Assignment:
+    if current_user.role != UserRole.STUDENT:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only students can submit assignments.",
+        )
+    assignment = db.query(models.Assignment).filter(models.Assignment.id == assignment_id).first()
+    if not assignment:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Assignment not found.",
+        )
+    enrolled = (
+        db.query(models.Enrollment.id)
+        .filter(
+            models.Enrollment.course_id == assignment.course_id,
+            models.Enrollment.student_id == current_user.id,
+            models.Enrollment.status == "enrolled",
+        )
+        .first()
+    )
+    if not enrolled:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are not enrolled in this course.",
+        )
+    return assignment
+
+
+def _save_submission(
+    db: Session,
+    assignment_id: int,
+    student_id: int,
+    filename: str,
+    content_type: str,
+    digest: str,
+    size: int,
+) -> models.Submission:
+    for attempt in range(2):
+        submission = (
+            db.query(models.Submission)
+            .filter(models.Submission.assignment_id == assignment_id, models.Submission.student_id == student_id)
+            .first()
+        )
+        if submission is None:
+            submission = models.Submission(assignment_id=assignment_id, student_id=student_id)
+            db.add(submission)
+        submission.filename = filename
+        submission.content_type = content_type
+        submission.size = size
+        submission.sha256 = digest
+        submission.submitted_at = datetime.utcnow()
+        try:
+            db.commit()
+        except IntegrityError:
+            # A concurrent first upload won; update that row instead
+            db.rollback()
+            if attempt:
+                raise
+            continue
+        db.refresh(submission)
+        return submission
+
+
+def _can_view(db: Session, submission: models.Submission, current_user: models.User) -> bool:
+    if current_user.role == UserRole.ADMIN or submission.student_id == current_user.id:
+        return True
+    teacher_id = (
+        db.query(models.Course.teacher_id)
+        .join(models.Assignment, models.Assignment.course_id == models.Course.id)
+        .filter(models.Assignment.id == submission.assignment_id)
+        .scalar()
+    )
+    return teacher_id == current_user.id
+
+
+@router.post(
+    "/assignments/{assignment_id}/submission",
+    response_model=schemas.SubmissionRead,
+    status_code=status.HTTP_201_CREATED,
+)
+async def upload_submission(
+    assignment_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    """
+    Student: submit (or resubmit) a file as ``multipart/form-data`` field
+    ``file``.
+
+    The body is parsed as it arrives and written straight to the blob store
+    while being hashed, so memory use does not depend on the file size.
+    Oversized uploads are refused with 413 before the limit is exceeded.
+    """
+    await run_in_threadpool(_submittable_assignment, db, assignment_id, current_user)
+    # Don't hold a pooled connection (idle in transaction) for the whole
+    # upload; saving starts a new transaction
+    await run_in_threadpool(db.close)
+    upload = await receive_file(request, SUBMISSION_MAX_BYTES)
+
+    return await run_in_threadpool(
+        _save_submission, db, assignment_id, current_user.id, upload.filename, upload.content_type, upload.sha256, upload.size
+    )
+
+
+@router.get("/assignments/{assignment_id}/submission", response_model=schemas.SubmissionRead)
+def get_my_submission(
+    assignment_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    submission = (
+        db.query(models.Submission)
+        .filter(models.Submission.assignment_id == assignment_id, models.Submission.student_id == current_user.id)
+        .first()
+    )
+    if not submission:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No submission for this assignment.",
+        )
+    return submission
+
+
+@router.get("/assignments/{assignment_id}/submissions", response_model=List[schemas.SubmissionRead])
+def list_submissions(
+    assignment_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    """
+    Teacher of the course / admin: all submissions for an assignment.
+    """
+    assignment = db.query(models.Assignment).filter(models.Assignment.id == assignment_id).first()
+    if not assignment:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Assignment not found.",
+        )
+    if current_user.role != UserRole.ADMIN and assignment.course.teacher_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are not assigned to this course.",
+        )
+
+    return (
+        db.query(models.Submission)
+        .filter(models.Submission.assignment_id == assignment_id)
+        .order_by(models.Submission.submitted_at)
+        .all()
+    )
+
+
+@router.get("/submissions/{submission_id}/file")
+def download_submission(
+    submission_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    """
+    Download a submitted file (its author, the course teacher or an admin).
+    The ETag is the file's SHA-256; Range requests are supported.
+    """
+    submission = db.query(models.Submission).filter(models.Submission.id == submission_id).first()
+    if not submission or not _can_view(db, submission, current_user):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Submission not found.",
+        )
+
+    return blob_response(request, blob_store, submission.sha256, submission.content_type, submission.filename)
@@ -9,6 +9,7 @@ from app import models, schemas
 from app.deps import get_db
 from app.core.auth import get_current_active_user
 from app.models import UserRole
+from app.services import notifications
 
 router = APIRouter(
     prefix="/teacher",
@@ -93,4 +94,110 @@ def get_enrolled_students(
         .all()
     )
 
-    return students
\ No newline at end of file
+    return students
+
+def _own_course(db: Session, course_id: int, current_user: models.User) -> models.Course:
+    if current_user.role not in (UserRole.TEACHER, UserRole.HOD):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only teachers/HOD can manage course work.",
+        )
+    course = db.query(models.Course).filter(models.Course.id == course_id).first()
+    if not course:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Course not found",
+        )
+    if course.teacher_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are not assigned to this course.",
+        )
+    return course
+
+
+@router.post(
+    "/courses/{course_id}/assignments",
+    response_model=schemas.AssignmentRead,
+    status_code=status.HTTP_201_CREATED,
+)
+def publish_assignment(
+    course_id: int,
+    assignment_in: schemas.AssignmentCreate,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    """
+    Teacher/HOD: publish an assignment in one of their courses. Enrolled
+    students are notified in the background.
+    """
+    course = _own_course(db, course_id, current_user)
+
+    assignment = models.Assignment(
+        course_id=course.id,
+        title=assignment_in.title,
+        description=assignment_in.description,
+        due_date=assignment_in.due_date,
+    )
+    db.add(assignment)
+    db.flush()
+    notifications.publish(db, "assignment.published", course, actor_id=current_user.id, assignment=assignment)
+    db.commit()
+    db.refresh(assignment)
+
+    return assignment
+
+
+@router.post("/courses/{course_id}/grades/finalize", response_model=schemas.GradeFinalizeResult)
+def finalize_grades(
+    course_id: int,
+    finalize_in: schemas.GradeFinalizeRequest,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    """
+    Teacher/HOD: finalise the grades of one assignment (or the whole
+    course) and notify enrolled students in the background.
+    """
+    course = _own_course(db, course_id, current_user)
+
+    assignment = None
+    if finalize_in.assignment_id is not None:
+        assignment = (
+            db.query(models.Assignment)
+            .filter(models.Assignment.id == finalize_in.assignment_id, models.Assignment.course_id == course.id)
+            .first()
+        )
+        if not assignment:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Assignment not found in this course.",
+            )
+
+    query = (
+        db.query(models.Grade)
+        .join(models.Assignment, models.Assignment.id == models.Grade.assignment_id)
+        .filter(models.Assignment.course_id == course.id, models.Grade.is_finalized.is_(False))
+    )
+    if assignment is not None:
+        query = query.filter(models.Grade.assignment_id == assignment.id)
+
+    # Row by row through the ORM so that every grade change is audited
+    grades = query.all()
+    for grade in grades:
+        grade.is_finalized = True
+
+    event = None
+    if grades:
+        scope = f'"{assignment.title}"' if assignment is not None else "all assignments"
+        event = notifications.publish(
+            db,
+            "grades.finalized",
+            course,
+            actor_id=current_user.id,
+            assignment=assignment,
+            context={"scope": scope},
+        )
+    db.commit()
+
+    return {"finalized": len(grades), "notification_event_id": event.id if event else None}
@@ -0,0 +1,46 @@
+# app/routers/timetable.py
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.deps import get_db
+from app.core.auth import get_current_admin
+from app.services import jobs
+
+router = APIRouter(
+    prefix="/timetable",
+    tags=["timetable"],
+)
+
+
+@router.post("/generate", response_model=schemas.JobRead, status_code=status.HTTP_202_ACCEPTED)
+def generate_timetable(
+    request_in: schemas.TimetableGenerateRequest,
+    response: Response,
+    db: Session = Depends(get_db),
+    admin_user: models.User = Depends(get_current_admin),
+):
+    """
+    Admin-only: solve and write the weekly timetable of a department (all
+    courses if ``department_id`` is omitted) in a background job. The job's
+    result is the solver summary; poll ``GET /jobs/{id}``.
+    """
+    if request_in.department_id is not None:
+        department = db.query(models.Department).filter(models.Department.id == request_in.department_id).first()
+        if not department:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Department does not exist.",
+            )
+
+    payload = request_in.dict()
+    payload["term_start"] = request_in.term_start.isoformat()
+    payload["day_start"] = request_in.day_start.strftime("%H:%M")
+
+    job = jobs.enqueue(db, "timetable.generate", payload, created_by_id=admin_user.id, max_attempts=2)
+    db.commit()
+    db.refresh(job)
+
+    response.headers["Location"] = f"/jobs/{job.id}"
+    return job
@@ -0,0 +1,53 @@
+# app/routers/trends.py
+
+from datetime import date
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.deps import get_db
+from app.core.access import scope_department
+from app.core.auth import get_current_active_user
+from app.services import trends as trend_service
+
+router = APIRouter(
+    prefix="/trends",
+    tags=["trends"],
+)
+
+
+@router.get("/enrollments", response_model=List[schemas.TrendSeries])
+def enrollment_trends(
+    granularity: Literal["day", "week", "term"] = Query("week"),
+    group_by: Literal["department", "course", "none"] = Query("department"),
+    start: Optional[date] = Query(None),
+    end: Optional[date] = Query(None),
+    department_id: Optional[int] = Query(None),
+    course_id: Optional[int] = Query(None),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    """
+    Admin/HOD: new enrollments per day, week or term (``TERM_STARTS``), one
+    series per department, per course or overall. HODs see their own
+    department only. Served from the daily rollup, never ``enrollments``.
+    """
+    department_id = scope_department(current_user, department_id, "enrollment trends")
+
+    if start is not None and end is not None and start > end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must not be after end.",
+        )
+
+    return trend_service.enrollment_trends(
+        db,
+        granularity=granularity,
+        group_by=group_by,
+        start=start,
+        end=end,
+        department_id=department_id,
+        course_id=course_id,
+    )
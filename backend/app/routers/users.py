@@ -2,14 +2,18 @@
 
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 
 from app import models, schemas
 from app.deps import get_db
+from app.core import etags
 from app.core.auth import get_current_admin, get_current_active_user
 from app.core.security import get_password_hash
 from app.models import UserRole
+from app.services import purge, writes
 
 router = APIRouter(
     prefix="/users",
@@ -31,14 +35,6 @@ def create_user(
     db: Session = Depends(get_db),
     admin_user: models.User = Depends(get_current_admin),
 ):
-    # Prevent duplicate emails
-    existing = db.query(models.User).filter(models.User.email == user_in.email).first()
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="A user with this email already exists.",
-        )
-
     # Optionally, you can prevent creating another admin via this endpoint
     # For now, allow admin creation as well:
     hashed_password = get_password_hash(user_in.password)
@@ -52,9 +48,14 @@ def create_user(
         is_active=True,
     )
 
-    db.add(user)
-    db.commit()
-    db.refresh(user)
+    # Duplicate emails are rejected by the unique index
+    writes.insert(
+        db,
+        user,
+        unique={"email": "A user with this email already exists."},
+        foreign_keys={"department_id": "department_id must refer to an existing department."},
+    )
+    writes.commit(db)
 
     return user
 
@@ -91,6 +92,7 @@ def list_users(
 @router.get("/{user_id}", response_model=schemas.UserRead)
 def get_user(
     user_id: int,
+    response: Response,
     db: Session = Depends(get_db),
     admin_user: models.User = Depends(get_current_admin),
 ):
@@ -100,6 +102,7 @@ def get_user(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found.",
         )
+    etags.set_etag(response, user)
     return user
 
 
@@ -107,52 +110,43 @@ def get_user(
 def update_user(
     user_id: int,
     user_in: schemas.UserAdminUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(default=None),
     db: Session = Depends(get_db),
     admin_user: models.User = Depends(get_current_admin),
 ):
-    user = db.query(models.User).filter(models.User.id == user_id).first()
-    if not user:
+    """
+    Admin-only. Send the user's ETag in ``If-Match`` to get 412 instead of
+    overwriting someone else's change.
+    """
+    updated = writes.update(
+        db,
+        models.User,
+        user_id,
+        user_in.dict(exclude_none=True),
+        *etags.if_match(models.User, if_match),
+        unique={"email": "Another user with this email already exists."},
+        foreign_keys={"department_id": "department_id must refer to an existing department."},
+    )
+    if updated is None:
+        if db.query(models.User.id).filter(models.User.id == user_id).first():
+            raise etags.precondition_failed("User")
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found.",
         )
 
-    # Email uniqueness check if changed
-    if user_in.email and user_in.email != user.email:
-        existing = (
-            db.query(models.User)
-            .filter(models.User.email == user_in.email)
-            .first()
-        )
-        if existing:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Another user with this email already exists.",
-            )
-
-    if user_in.full_name is not None:
-        user.full_name = user_in.full_name
-
-    if user_in.email is not None:
-        user.email = user_in.email
+    writes.commit(db)
 
-    if user_in.role is not None:
-        user.role = user_in.role
+    etags.set_etag(response, updated.obj)
+    return updated.obj
 
-    if user_in.department_id is not None:
-        user.department_id = user_in.department_id
 
-    if user_in.is_active is not None:
-        user.is_active = user_in.is_active
-
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-
-    return user
-
-
-@router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete(
+    "/{user_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={status.HTTP_202_ACCEPTED: {"model": schemas.JobRead, "description": "Queued as a purge job."}},
+)
 def delete_user(
     user_id: int,
     db: Session = Depends(get_db),
@@ -161,6 +155,12 @@ def delete_user(
     """
     Hard delete user.
     In many real systems you'd prefer to set is_active=False instead.
+
+    Their enrollments are dropped (seats go to the waitlist) and their
+    grades, attendance, submissions and notifications are removed by the
+    database; users with a large history are deleted in the background
+    (202 with the purge job). Staff who still teach courses or have
+    graded, marked attendance or booked rooms cannot be deleted (409).
     """
     user = db.query(models.User).filter(models.User.id == user_id).first()
     if not user:
@@ -169,6 +169,24 @@ def delete_user(
             detail="User not found.",
         )
 
+    blockers = purge.blocking_references(db, user.id)
+    if blockers:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"User is still referenced ({', '.join(blockers)}); deactivate the account instead.",
+        )
+
+    if purge.is_large(db, "user", user.id):
+        job = purge.enqueue(db, "user", user.id, created_by_id=admin_user.id)
+        db.commit()
+        db.refresh(job)
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=jsonable_encoder(schemas.JobRead.model_validate(job, from_attributes=True)),
+            headers={"Location": f"/jobs/{job.id}"},
+        )
+
+    purge.release_enrollments(db, user.id)
     db.delete(user)
     db.commit()
     return
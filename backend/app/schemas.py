@@ -1,9 +1,9 @@
 # app/schemas.py
 
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime, time
+from typing import Any, List, Literal, Optional
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 
 from .models import UserRole
 
@@ -23,6 +23,7 @@ class UserRead(UserBase):
     role: UserRole
     is_active: bool
     created_at: datetime
+    version: int
 
     class Config:
         orm_mode = True
@@ -53,6 +54,8 @@ class Token(BaseModel):
 class TokenData(BaseModel):
     sub: Optional[str] = None  # subject (e.g. email or user id)
     role: Optional[UserRole] = None
+    iat: Optional[int] = None  # issued-at, seconds since epoch
+    exp: Optional[int] = None  # expiry, seconds since epoch
 
 class LoginRequest(BaseModel):
     email: EmailStr
@@ -76,6 +79,7 @@ class DepartmentUpdate(BaseModel):
 class DepartmentRead(DepartmentBase):
     id: int
     hod_user_id: int | None = None
+    version: int
 
     class Config:
         orm_mode = True
@@ -86,6 +90,9 @@ class CourseBase(BaseModel):
     description: str | None = None
     semester: str | None = None
     credits: int | None = None
+    capacity: int | None = None
+    room_type: str | None = None
+    sessions_per_week: int | None = None
     department_id: int
     teacher_id: int
 
@@ -100,6 +107,9 @@ class CourseUpdate(BaseModel):
     description: str | None = None
     semester: str | None = None
     credits: int | None = None
+    capacity: int | None = None
+    room_type: str | None = None
+    sessions_per_week: int | None = None
     department_id: int | None = None
     teacher_id: int | None = None
 
@@ -111,8 +121,12 @@ class CourseRead(BaseModel):
     description: str | None = None
     semester: str | None = None
     credits: int | None = None
+    capacity: int | None = None
+    room_type: str | None = None
+    sessions_per_week: int | None = None
     department_id: int
     teacher_id: int
+    version: int
 
     class Config:
         orm_mode = True
@@ -125,9 +139,311 @@ class EnrollmentCreate(EnrollmentBase):
     pass
 
 
+class EnrollmentUpdate(BaseModel):
+    status: Literal["enrolled", "completed"]
+
+
 class EnrollmentRead(EnrollmentBase):
     id: int
+    status: str
+    created_at: datetime
+
+    class Config:
+        orm_mode = True
+
+
+class JobRead(BaseModel):
+    id: int
+    kind: str
+    status: Literal["queued", "running", "succeeded", "failed"]
+    progress: float
+    progress_message: Optional[str] = None
+    attempts: int
+    max_attempts: int
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_by_id: Optional[int] = None
+    run_after: datetime
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
+
+
+class BulkEnrollmentRequest(BaseModel):
+    student_ids: List[int]
+    course_ids: List[int]
+    dry_run: bool = False
+
+
+class TimetableClash(BaseModel):
+    course_id: int
+    conflicts_with: int
+    slot: str
+
+
+class BulkEnrollmentResult(BaseModel):
+    student_id: int
+    course_id: int
+    status: Literal["enrolled", "waitlisted", "valid", "rejected"]
+    detail: Optional[str] = None
+    missing_prerequisites: List[int] = []
+    clashes: List[TimetableClash] = []
+
+
+class RegistrationCreate(BaseModel):
+    course_id: int
+
+
+class WaitlistEntryRead(BaseModel):
+    id: int
+    course_id: int
+    student_id: int
+    position: int
     created_at: datetime
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        orm_mode = True
+
+
+class RegistrationRead(BaseModel):
+    status: Literal["enrolled", "waitlisted"]
+    enrollment: Optional[EnrollmentRead] = None
+    waitlist_entry: Optional[WaitlistEntryRead] = None
+
+
+class CourseMeetingBase(BaseModel):
+    day_of_week: int = Field(..., ge=0, le=6)  # 0 = Monday
+    start_time: time
+    end_time: time
+    resource_id: Optional[int] = None
+
+
+class CourseMeetingCreate(CourseMeetingBase):
+    pass
+
+
+class CourseMeetingRead(CourseMeetingBase):
+    id: int
+    course_id: int
+
+    class Config:
+        orm_mode = True
+
+
+class PrerequisiteCreate(BaseModel):
+    prerequisite_id: int
+
+
+class EligibilityRequest(BaseModel):
+    student_ids: List[int]
+    course_ids: List[int]
+
+
+class EligibilityResult(BaseModel):
+    student_id: int
+    course_id: int
+    eligible: bool
+    missing_prerequisites: List[int] = []
+    course_full: bool = False
+    already_enrolled: bool = False
+
+
+class TimetableGenerateRequest(BaseModel):
+    term_start: date
+    weeks: int = Field(16, ge=1, le=52)
+    department_id: Optional[int] = None
+    days: int = Field(5, ge=1, le=7)
+    periods: int = Field(8, ge=1, le=24)
+    day_start: time = time(9, 0)
+    period_minutes: int = Field(60, ge=15, le=240)
+    time_limit: float = Field(50.0, gt=0, le=600)
+    seed: int = 0
+    dry_run: bool = False
+
+
+class ReportRequest(BaseModel):
+    datasets: List[Literal["enrollments", "grades", "attendance", "course_summary"]] = [
+        "enrollments", "grades", "attendance", "course_summary",
+    ]
+    formats: List[Literal["csv", "parquet"]] = ["csv"]
+    department_ids: Optional[List[int]] = None  # None = all (admin) / own department (HOD)
+
+
+class AuditLogRead(BaseModel):
+    id: int
+    entity: str
+    entity_id: int
+    action: Literal["create", "update", "delete"]
+    actor_id: Optional[int] = None
+    changes: Optional[dict] = None
+    occurred_at: datetime
+    recorded_at: datetime
+
+    class Config:
+        orm_mode = True
+
+
+class AssignmentCreate(BaseModel):
+    title: str
+    description: Optional[str] = None
+    due_date: Optional[datetime] = None
+
+
+class AssignmentRead(AssignmentCreate):
+    id: int
+    course_id: int
+
+    class Config:
+        orm_mode = True
+
+
+class AssignmentUpdate(BaseModel):
+    title: str | None = None
+    description: str | None = None
+    due_date: datetime | None = None
+
+
+class DeadlineRead(BaseModel):
+    assignment_id: int
+    title: str
+    due_date: datetime
+    course_id: int
+    course_code: str
+    course_name: str
+    status: Literal["pending", "submitted", "graded"]
+    submitted_at: Optional[datetime] = None
+    grade_value: Optional[str] = None
+    grade_finalized: bool = False
+
+
+class GradeFinalizeRequest(BaseModel):
+    assignment_id: Optional[int] = None  # None = every assignment of the course
+
+
+class GradeFinalizeResult(BaseModel):
+    finalized: int
+    notification_event_id: Optional[int] = None
+
+
+class NotificationRead(BaseModel):
+    id: int
+    kind: str
+    subject: str
+    body: str
+    created_at: datetime
+    read_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
+
+
+class UnreadCount(BaseModel):
+    unread: int
+
+
+class NotificationMarkRead(BaseModel):
+    ids: Optional[List[int]] = None  # None = all
+
+
+class SubmissionRead(BaseModel):
+    id: int
+    assignment_id: int
+    student_id: int
+    filename: str
+    content_type: str
+    size: int
+    sha256: str
+    submitted_at: datetime
+
+    class Config:
+        orm_mode = True
+
+
+class CourseMaterialRead(BaseModel):
+    id: int
+    course_id: int
+    uploaded_by_id: Optional[int] = None
+    title: str
+    filename: str
+    content_type: str
+    size: int
+    sha256: str
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        orm_mode = True
+
+
+class CourseMaterialUpdate(BaseModel):
+    title: str
+
+
+class RiskScoreRead(BaseModel):
+    student_id: int
+    student_name: str
+    student_email: str
+    score: float
+    attendance_rate: Optional[float] = None
+    grade_average: Optional[float] = None
+    grade_trend: Optional[float] = None
+    missing_count: int
+    past_due_count: int
+    computed_at: datetime
+
+
+class RiskRecomputeRequest(BaseModel):
+    department_id: Optional[int] = None
+    course_ids: Optional[List[int]] = None  # None = every course (of the department)
+    weights: Optional[dict] = None  # overrides per component: attendance, grades, trend, missing
+
+
+class TrendPoint(BaseModel):
+    period: str
+    start: date
+    count: int
+
+
+class TrendSeries(BaseModel):
+    group_id: Optional[int] = None
+    group_name: Optional[str] = None
+    total: int
+    points: List[TrendPoint]
+
+
+class TeacherMetricsRead(BaseModel):
+    teacher_id: int
+    teacher_name: str
+    term: str
+    department_id: int
+    courses: int
+    grades: int
+    pass_rate: Optional[float] = None
+    average_percent: Optional[float] = None
+    turnaround_hours: Optional[float] = None
+    late_grading_rate: Optional[float] = None
+    attendance_sessions: int
+    attendance_regularity: Optional[float] = None
+    computed_at: datetime
+
+
+class TeacherMetricsRecomputeRequest(BaseModel):
+    department_id: Optional[int] = None  # None = all departments (admins only)
+
+
+class BatchSubRequest(BaseModel):
+    method: Literal["GET"] = "GET"
+    path: str  # e.g. "/courses/?teacher_id=3"
+
+
+class BatchRequest(BaseModel):
+    requests: List[BatchSubRequest]
+
+
+class BatchSubResponse(BaseModel):
+    status: int
+    headers: dict = {}
+    body: Any = None
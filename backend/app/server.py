@@ -0,0 +1,198 @@
+# app/server.py
+"""
+Production launcher: a pre-forking master with N uvicorn workers.
+
+    python -m app.server --host 0.0.0.0 --port 8000 --workers 4
+
+The master imports ``app.main`` once, binds the listening socket and then
+forks the workers, so imported modules are shared copy-on-write. Each
+worker disposes the inherited DB engine (``app.database`` does this from
+an at-fork hook), runs the warmup steps in ``app.warmup`` and only then
+reports ready and starts accepting connections. Dead workers are replaced.
+"""
+
+import argparse
+import gc
+import json
+import logging
+import os
+import select
+import signal
+import socket
+import sys
+import time
+
+import uvicorn
+
+logger = logging.getLogger("app.server")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=os.getenv("HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 1))))
+    parser.add_argument("--backlog", type=int, default=2048)
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument("--no-warmup", action="store_true")
+    return parser.parse_args(argv)
+
+
+def process_memory(pid: int) -> dict:
+    """
+    RSS/PSS in KiB from /proc (Linux). PSS splits shared pages between the
+    processes mapping them, so it is the fair per-worker figure.
+    """
+    memory = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as fh:
+            for line in fh:
+                key, _, value = line.partition(":")
+                if key in ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty"):
+                    memory[key.lower()] = int(value.split()[0])
+    except OSError:
+        pass
+    return memory
+
+
+def bind_socket(host: str, port: int, backlog: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(app, sock: socket.socket, ready_fd: int, args, forked_at: float) -> None:
+    from app.warmup import run_warmup
+
+    timings = {} if args.no_warmup else run_warmup()
+
+    config = uvicorn.Config(app, log_level=args.log_level, lifespan="on", access_log=False)
+    server = uvicorn.Server(config)
+
+    report = {
+        "pid": os.getpid(),
+        "warmup_ms": timings,
+        "ready_ms": round((time.monotonic() - forked_at) * 1000, 1),
+    }
+    os.write(ready_fd, (json.dumps(report) + "\n").encode())
+    os.close(ready_fd)
+
+    server.run(sockets=[sock])
+
+
+class Master:
+    def __init__(self, app, sock: socket.socket, args):
+        self.app = app
+        self.sock = sock
+        self.args = args
+        self.workers = {}  # pid -> ready pipe read end (or None once ready)
+        self.started = time.monotonic()
+        self.all_ready_logged = False
+        self.stopping = False
+
+    def spawn(self) -> None:
+        read_fd, write_fd = os.pipe()
+        forked_at = time.monotonic()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            code = 0
+            try:
+                run_worker(self.app, self.sock, write_fd, self.args, forked_at)
+            except Exception:
+                logger.exception("worker crashed")
+                code = 1
+            finally:
+                os._exit(code)
+        os.close(write_fd)
+        self.workers[pid] = read_fd
+
+    def handle_ready(self, pid: int, fd: int) -> None:
+        data = os.read(fd, 65536)
+        os.close(fd)
+        self.workers[pid] = None
+        if not data:
+            return
+        report = json.loads(data.decode())
+        memory = process_memory(pid)
+        logger.info(
+            "worker %s ready in %.0f ms (warmup %s) rss=%s KiB pss=%s KiB",
+            pid, report["ready_ms"], report["warmup_ms"], memory.get("rss"), memory.get("pss"),
+        )
+        if not self.all_ready_logged and all(fd is None for fd in self.workers.values()):
+            self.all_ready_logged = True
+            logger.info(
+                "%d workers ready %.0f ms after launch; listening on %s:%s",
+                len(self.workers), (time.monotonic() - self.started) * 1000, self.args.host, self.args.port,
+            )
+
+    def stop(self, signum, frame) -> None:
+        self.stopping = True
+        for pid in list(self.workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def reap(self) -> None:
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            fd = self.workers.pop(pid, None)
+            if fd is not None:
+                os.close(fd)
+            if not self.stopping:
+                logger.warning("worker %s exited with status %s; restarting", pid, status)
+                self.spawn()
+
+    def run(self) -> int:
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+
+        # Move everything allocated so far out of the GC's reach, so the
+        # collector in the workers does not touch (and un-share) those pages.
+        gc.collect()
+        gc.freeze()
+
+        for _ in range(self.args.workers):
+            self.spawn()
+
+        while self.workers:
+            pending = {fd: pid for pid, fd in self.workers.items() if fd is not None}
+            try:
+                readable, _, _ = select.select(list(pending), [], [], 1.0)
+            except InterruptedError:
+                readable = []
+            for fd in readable:
+                self.handle_ready(pending[fd], fd)
+            self.reap()
+
+        logger.info("all workers stopped")
+        return 0
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s %(levelname)s [%(name)s] %(message)s")
+
+    started = time.monotonic()
+    from app.main import app  # preload once in the master
+
+    logger.info("application imported in %.0f ms", (time.monotonic() - started) * 1000)
+
+    sock = bind_socket(args.host, args.port, args.backlog)
+    return Master(app, sock, args).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
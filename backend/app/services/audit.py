@@ -0,0 +1,203 @@
+# app/services/audit.py
+"""
+Audit trail via a transactional outbox.
+
+``install`` hooks the session's ``after_flush`` event: every insert, update
+and delete of an audited model adds an ``OutboxEvent`` row in the same
+transaction as the change itself, so the audit trail commits (or rolls
+back) with it and a request pays for one extra multi-row INSERT, not a
+synchronous log write. ``drain`` later moves outbox rows in batches into
+the append-only ``audit_log`` table (and optionally a JSON-lines file);
+job workers call it every ``AUDIT_DRAIN_INTERVAL`` seconds.
+
+The acting user is read from ``session.info["actor_id"]``, which
+``get_current_user`` and job contexts set.
+"""
+
+import json
+import os
+from datetime import date, datetime, time
+from enum import Enum as PyEnum
+
+from dotenv import load_dotenv
+from sqlalchemy import delete, event, insert, inspect, select
+from sqlalchemy.orm import Session
+
+from app import models
+
+load_dotenv()
+
+AUDIT_ENABLED = os.getenv("AUDIT_ENABLED", "1") == "1"
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+AUDIT_DRAIN_INTERVAL = float(os.getenv("AUDIT_DRAIN_INTERVAL", "5"))
+# Optional JSON-lines copy of the audit log (in addition to the table)
+AUDIT_LOG_FILE = os.getenv("AUDIT_LOG_FILE")
+
+AUDITED = {
+    models.User: "user",
+    models.Department: "department",
+    models.Course: "course",
+    models.Enrollment: "enrollment",
+    models.Grade: "grade",
+}
+
+# Never copied into the log; a change is recorded as "<redacted>"
+REDACTED = {"password_hash"}
+# Bookkeeping columns that are not worth an audit entry on their own
+IGNORED = {"updated_at", "version"}
+
+
+def _json_value(value):
+    if isinstance(value, PyEnum):
+        return value.value
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return value
+
+
+def _snapshot(state) -> dict:
+    return {
+        attr.key: "<redacted>" if attr.key in REDACTED else _json_value(state.dict.get(attr.key))
+        for attr in state.mapper.column_attrs
+        if attr.key not in IGNORED and attr.key in state.dict
+    }
+
+
+def _changes(state) -> dict:
+    changes = {}
+    for attr in state.mapper.column_attrs:
+        if attr.key in IGNORED:
+            continue
+        history = state.attrs[attr.key].history
+        if not history.has_changes():
+            continue
+        if attr.key in REDACTED:
+            changes[attr.key] = "<redacted>"
+            continue
+        old = history.deleted[0] if history.deleted else None
+        new = history.added[0] if history.added else None
+        if old != new:
+            changes[attr.key] = [_json_value(old), _json_value(new)]
+    return changes
+
+
+def _record_changes(session: Session, flush_context) -> None:
+    now = datetime.utcnow()
+    actor_id = session.info.get("actor_id")
+    rows = []
+
+    def add(obj, action, changes):
+        rows.append({
+            "entity": AUDITED[type(obj)],
+            "entity_id": inspect(obj).mapper.primary_key_from_instance(obj)[0],
+            "action": action,
+            "actor_id": actor_id,
+            "changes": changes,
+            "occurred_at": now,
+        })
+
+    for obj in session.new:
+        if type(obj) in AUDITED:
+            add(obj, "create", _snapshot(inspect(obj)))
+    for obj in session.dirty:
+        if type(obj) in AUDITED and session.is_modified(obj, include_collections=False):
+            changes = _changes(inspect(obj))
+            if changes:
+                add(obj, "update", changes)
+    for obj in session.deleted:
+        if type(obj) in AUDITED:
+            add(obj, "delete", _snapshot(inspect(obj)))
+
+    if rows:
+        session.connection().execute(insert(models.OutboxEvent), rows)
+
+
+def record_update(session: Session, obj, previous: dict) -> None:
+    """
+    Record an update made outside the unit of work (see
+    ``app.services.writes``), given the previous values of the columns it
+    wrote; ``obj`` holds the new ones.
+    """
+    if not AUDIT_ENABLED or type(obj) not in AUDITED:
+        return
+    changes = {}
+    for key, old in previous.items():
+        new = getattr(obj, key)
+        if key in IGNORED or old == new:
+            continue
+        changes[key] = "<redacted>" if key in REDACTED else [_json_value(old), _json_value(new)]
+    if not changes:
+        return
+    session.connection().execute(insert(models.OutboxEvent), [{
+        "entity": AUDITED[type(obj)],
+        "entity_id": inspect(obj).mapper.primary_key_from_instance(obj)[0],
+        "action": "update",
+        "actor_id": session.info.get("actor_id"),
+        "changes": changes,
+        "occurred_at": datetime.utcnow(),
+    }])
+
+
+def install(session_factory) -> None:
+    """
+    Record audited changes made through sessions of ``session_factory``.
+    """
+    if AUDIT_ENABLED and not event.contains(session_factory, "after_flush", _record_changes):
+        event.listen(session_factory, "after_flush", _record_changes)
+
+
+def drain(db: Session, batch_size: int = AUDIT_BATCH_SIZE) -> int:
+    """
+    Move outbox rows into ``audit_log``, ``batch_size`` per transaction,
+    until the outbox is empty. Safe to run from several processes at once
+    (rows are claimed with SKIP LOCKED). Audit rows keep the outbox id, so
+    the log preserves commit order. Returns the number of rows moved.
+    """
+    moved = 0
+    while True:
+        batch = db.execute(
+            select(models.OutboxEvent)
+            .order_by(models.OutboxEvent.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        ).scalars().all()
+        if not batch:
+            db.rollback()
+            return moved
+
+        now = datetime.utcnow()
+        entries = [
+            {
+                "id": e.id,
+                "entity": e.entity,
+                "entity_id": e.entity_id,
+                "action": e.action,
+                "actor_id": e.actor_id,
+                "changes": e.changes,
+                "occurred_at": e.occurred_at,
+                "recorded_at": now,
+            }
+            for e in batch
+        ]
+        db.execute(insert(models.AuditLog), entries)
+        db.execute(
+            delete(models.OutboxEvent)
+            .where(models.OutboxEvent.id.in_([e["id"] for e in entries]))
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        db.expunge_all()
+
+        if AUDIT_LOG_FILE:
+            _append_to_file(entries)
+
+        moved += len(entries)
+        if len(batch) < batch_size:
+            return moved
+
+
+def _append_to_file(entries) -> None:
+    with open(AUDIT_LOG_FILE, "a", encoding="utf-8") as f:
+        for entry in entries:
+            f.write(json.dumps(entry, default=_json_value) + "\n")
+
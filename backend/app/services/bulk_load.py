@@ -0,0 +1,166 @@
+# app/services/bulk_load.py
+
+from datetime import date, datetime, time
+from enum import Enum as PyEnum
+from typing import Iterable, Iterator, List, Sequence
+
+from sqlalchemy import Table, text
+from sqlalchemy.engine import Connection
+
+DEFAULT_BATCH_SIZE = 10_000
+
+
+def _copy_value(value) -> str:
+    """
+    Render a single value in PostgreSQL COPY text format.
+    """
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, PyEnum):
+        # SQLAlchemy's Enum type persists the member *name*, not its value.
+        return value.name
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    value = str(value)
+    if any(ch in value for ch in "\\\t\n\r"):
+        value = (
+            value.replace("\\", "\\\\")
+            .replace("\t", "\\t")
+            .replace("\n", "\\n")
+            .replace("\r", "\\r")
+        )
+    return value
+
+
+class _CopyStream:
+    """
+    File-like object that renders rows lazily, so COPY never needs the whole
+    data set in memory.
+    """
+
+    def __init__(self, rows: Iterable[Sequence], lines_per_chunk: int = 2_000):
+        self._rows = iter(rows)
+        self._buffer = ""
+        self._lines_per_chunk = lines_per_chunk
+        self.rowcount = 0
+
+    def _fill(self) -> bool:
+        lines = []
+        for row in self._rows:
+            lines.append("\t".join(_copy_value(v) for v in row))
+            if len(lines) >= self._lines_per_chunk:
+                break
+        if not lines:
+            return False
+        self.rowcount += len(lines)
+        self._buffer += "\n".join(lines) + "\n"
+        return True
+
+    def read(self, size: int = -1) -> str:
+        if size is None or size < 0:
+            while self._fill():
+                pass
+            data, self._buffer = self._buffer, ""
+            return data
+
+        while len(self._buffer) < size and self._fill():
+            pass
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+def _batched(rows: Iterable[Sequence], size: int) -> Iterator[List[Sequence]]:
+    batch: List[Sequence] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _copy_rows(conn: Connection, table: Table, columns: Sequence[str], rows: Iterable[Sequence]) -> int:
+    dbapi_conn = conn.connection.dbapi_connection
+    column_list = ", ".join(f'"{c}"' for c in columns)
+    sql = f'COPY "{table.name}" ({column_list}) FROM STDIN'
+    stream = _CopyStream(rows)
+
+    cursor = dbapi_conn.cursor()
+    try:
+        if hasattr(cursor, "copy_expert"):
+            # psycopg2
+            cursor.copy_expert(sql, stream)
+        else:
+            # psycopg 3
+            with cursor.copy(sql) as copy:
+                while True:
+                    data = stream.read(1 << 16)
+                    if not data:
+                        break
+                    copy.write(data)
+    finally:
+        cursor.close()
+
+    return stream.rowcount
+
+
+def bulk_insert(
+    conn: Connection,
+    table: Table,
+    columns: Sequence[str],
+    rows: Iterable[Sequence],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> int:
+    """
+    Load an iterable of row tuples into ``table``.
+
+    On PostgreSQL the rows are streamed through ``COPY ... FROM STDIN``;
+    on every other backend they are sent as ``executemany`` batches of
+    ``batch_size`` rows. Returns the number of rows written.
+    """
+    if conn.dialect.name == "postgresql":
+        return _copy_rows(conn, table, columns, rows)
+
+    stmt = table.insert()
+    written = 0
+    for batch in _batched(rows, batch_size):
+        conn.execute(stmt, [dict(zip(columns, row)) for row in batch])
+        written += len(batch)
+    return written
+
+
+def reset_sequences(conn: Connection, tables: Iterable[Table], pk: str = "id") -> None:
+    """
+    Move serial sequences past explicitly inserted ids (PostgreSQL only).
+    """
+    if conn.dialect.name != "postgresql":
+        return
+
+    for table in tables:
+        conn.execute(
+            text(
+                f"SELECT setval(pg_get_serial_sequence('{table.name}', '{pk}'), "
+                f"COALESCE((SELECT MAX({pk}) FROM \"{table.name}\"), 0) + 1, false)"
+            )
+        )
+
+
+def truncate_tables(conn: Connection, tables: Sequence[Table], restart_identity: bool = True) -> None:
+    """
+    Empty the given tables, children first.
+    """
+    if conn.dialect.name == "postgresql":
+        names = ", ".join(f'"{t.name}"' for t in tables)
+        restart = " RESTART IDENTITY" if restart_identity else ""
+        conn.execute(text(f"TRUNCATE {names}{restart} CASCADE"))
+        return
+
+    for table in tables:
+        conn.execute(table.delete())
+
+
+def table_is_empty(conn: Connection, table: Table) -> bool:
+    return conn.execute(table.select().limit(1)).first() is None
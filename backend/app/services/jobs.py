@@ -0,0 +1,328 @@
+# app/services/jobs.py
+"""
+Database-backed job queue.
+
+Work is described by a ``Job`` row (``kind`` + JSON ``payload``) and run by
+the handler registered for its kind with ``@job_handler``. Worker processes
+(``python -m app.worker``) claim due jobs with ``FOR UPDATE SKIP LOCKED``, so
+any number of them can poll the same table without handing a job out twice.
+Failed jobs are retried with exponential backoff up to ``max_attempts``;
+jobs whose worker died are re-queued once their heartbeat goes stale, or
+failed if that was their last attempt.
+"""
+
+import logging
+import os
+import random
+import socket
+import threading
+import traceback
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from dotenv import load_dotenv
+from fastapi import HTTPException
+from sqlalchemy import case, or_, select, update
+from sqlalchemy.orm import Session
+
+from app import models
+from app.database import SessionLocal
+
+load_dotenv()
+
+JOB_RETRY_BASE_SECONDS = float(os.getenv("JOB_RETRY_BASE_SECONDS", "10"))
+JOB_RETRY_MAX_SECONDS = float(os.getenv("JOB_RETRY_MAX_SECONDS", "3600"))
+JOB_STALE_SECONDS = float(os.getenv("JOB_STALE_SECONDS", "300"))
+JOB_HEARTBEAT_SECONDS = float(os.getenv("JOB_HEARTBEAT_SECONDS", "30"))
+
+logger = logging.getLogger(__name__)
+
+Job = models.Job
+JobHandler = Callable[["JobContext", Dict[str, Any]], Any]
+
+_handlers: Dict[str, JobHandler] = {}
+
+
+class PermanentJobError(Exception):
+    """
+    Raised by a handler for failures a retry cannot fix (bad payload, missing
+    rows); the job fails immediately.
+    """
+
+
+def job_handler(kind: str):
+    """
+    Decorator registering the function that runs jobs of ``kind``. It is
+    called as ``fn(ctx, payload)`` and its return value (JSON-serialisable)
+    becomes the job's ``result``.
+    """
+
+    def decorator(fn: JobHandler) -> JobHandler:
+        _handlers[kind] = fn
+        return fn
+
+    return decorator
+
+
+def registered_kinds() -> Sequence[str]:
+    return sorted(_handlers)
+
+
+def worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def enqueue(
+    db: Session,
+    kind: str,
+    payload: Optional[dict] = None,
+    created_by_id: Optional[int] = None,
+    priority: int = 0,
+    max_attempts: int = 5,
+    run_after: Optional[datetime] = None,
+) -> models.Job:
+    """
+    Add a job. Does not commit: the job becomes visible to workers together
+    with the caller's other changes.
+    """
+    job = Job(
+        kind=kind,
+        payload=payload or {},
+        created_by_id=created_by_id,
+        priority=priority,
+        max_attempts=max_attempts,
+        run_after=run_after or datetime.utcnow(),
+        status="queued",
+    )
+    db.add(job)
+    db.flush()
+    return job
+
+
+def next_daily_run(hour: int, now: Optional[datetime] = None) -> datetime:
+    """
+    The next ``hour``:00 UTC after ``now``.
+    """
+    now = now or datetime.utcnow()
+    run = now.replace(hour=hour, minute=0, second=0, microsecond=0)
+    return run if run > now else run + timedelta(days=1)
+
+
+def schedule_daily(
+    db: Session,
+    kind: str,
+    hour: int,
+    current_job_id: Optional[int] = None,
+    payload: Optional[dict] = None,
+) -> Optional[models.Job]:
+    """
+    Queue the next daily run of ``kind`` at ``hour`` UTC unless one (other
+    than ``current_job_id``, the run calling this) is already pending.
+    Daily jobs call this when they finish, and the worker at startup, so
+    the queue doubles as the scheduler. Does not commit.
+    """
+    query = select(Job.id).where(Job.kind == kind, Job.status.in_(("queued", "running")))
+    if current_job_id is not None:
+        query = query.where(Job.id != current_job_id)
+    if db.execute(query.limit(1)).first():
+        return None
+    return enqueue(db, kind, payload, priority=-1, max_attempts=3, run_after=next_daily_run(hour))
+
+
+def retry_delay(attempts: int) -> float:
+    """
+    Exponential backoff with jitter: between half and all of
+    base * 2^(attempts-1) seconds, capped at JOB_RETRY_MAX_SECONDS.
+    """
+    ceiling = min(JOB_RETRY_MAX_SECONDS, JOB_RETRY_BASE_SECONDS * 2 ** max(0, attempts - 1))
+    return random.uniform(ceiling / 2, ceiling)
+
+
+def claim(db: Session, worker: str, kinds: Optional[Sequence[str]] = None) -> Optional[int]:
+    """
+    Take the next due job and mark it running; returns its id. Commits.
+    """
+    now = datetime.utcnow()
+    query = (
+        select(Job.id)
+        .where(Job.status == "queued", Job.run_after <= now)
+        .order_by(Job.priority.desc(), Job.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    if kinds:
+        query = query.where(Job.kind.in_(kinds))
+
+    job_id = db.execute(query).scalar_one_or_none()
+    if job_id is None:
+        db.rollback()
+        return None
+
+    # The status guard keeps this safe on backends without SKIP LOCKED.
+    claimed = db.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.status == "queued")
+        .values(
+            status="running",
+            locked_by=worker,
+            attempts=Job.attempts + 1,
+            started_at=now,
+            heartbeat_at=now,
+            error=None,
+        )
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+    return job_id if claimed else None
+
+
+def requeue_stale(db: Session, stale_after: float = JOB_STALE_SECONDS) -> int:
+    """
+    Put running jobs whose worker stopped heartbeating back in the queue,
+    or mark them failed if they have used up their attempts (a job that
+    keeps crashing its worker must not be retried forever). Commits;
+    returns the number of jobs re-queued or failed.
+    """
+    now = datetime.utcnow()
+    cutoff = now - timedelta(seconds=stale_after)
+    exhausted = Job.attempts >= Job.max_attempts
+    count = db.execute(
+        update(Job)
+        .where(
+            Job.status == "running",
+            or_(Job.heartbeat_at.is_(None), Job.heartbeat_at < cutoff),
+        )
+        .values(
+            status=case((exhausted, "failed"), else_="queued"),
+            finished_at=case((exhausted, now), else_=None),
+            locked_by=None,
+            error="Worker stopped responding.",
+        )
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+    return count
+
+
+class JobContext:
+    """
+    Passed to handlers. ``db`` is committed when the handler returns and
+    rolled back if it raises; ``progress`` writes through its own session so
+    that pollers see it while the job is still running.
+    """
+
+    def __init__(self, job: models.Job, db: Session, worker: str):
+        self.job_id = job.id
+        self.kind = job.kind
+        self.attempt = job.attempts
+        self.created_by_id = job.created_by_id
+        self.db = db
+        self.worker = worker
+        db.info["actor_id"] = job.created_by_id
+
+    def progress(self, done: float, total: float = 1.0, message: Optional[str] = None) -> None:
+        fraction = 0.0 if not total else max(0.0, min(1.0, done / total))
+        with SessionLocal() as db:
+            db.execute(
+                update(Job)
+                .where(Job.id == self.job_id, Job.locked_by == self.worker)
+                .values(progress=fraction, progress_message=message, heartbeat_at=datetime.utcnow())
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+
+
+class _Heartbeat(threading.Thread):
+    """
+    Refreshes ``heartbeat_at`` while a handler runs, so long jobs that do
+    not report progress are not mistaken for abandoned ones.
+    """
+
+    def __init__(self, job_id: int, worker: str):
+        super().__init__(name=f"job-{job_id}-heartbeat", daemon=True)
+        self.job_id = job_id
+        self.worker = worker
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self.stopped.wait(JOB_HEARTBEAT_SECONDS):
+            try:
+                _update_claimed(self.job_id, self.worker, heartbeat_at=datetime.utcnow())
+            except Exception:
+                logger.exception("heartbeat for job %s failed", self.job_id)
+
+    def stop(self) -> None:
+        self.stopped.set()
+
+
+def _update_claimed(job_id: int, worker: str, **values) -> None:
+    with SessionLocal() as db:
+        db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.locked_by == worker)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+
+def run(job_id: int, worker: str) -> str:
+    """
+    Execute a claimed job and record the outcome. Returns the final status.
+    """
+    with SessionLocal() as db:
+        job = db.get(Job, job_id)
+        handler = _handlers.get(job.kind)
+        ctx = JobContext(job, db, worker)
+        payload = dict(job.payload or {})
+        attempts, max_attempts = job.attempts, job.max_attempts
+
+        heartbeat = _Heartbeat(job_id, worker)
+        heartbeat.start()
+        try:
+            if handler is None:
+                raise PermanentJobError(f"No handler registered for job kind {job.kind!r}.")
+            result = handler(ctx, payload)
+            db.commit()
+        except Exception as exc:
+            db.rollback()
+            permanent = isinstance(exc, (PermanentJobError, HTTPException))
+            error = exc.detail if isinstance(exc, HTTPException) else traceback.format_exc(limit=20)
+            if permanent or attempts >= max_attempts:
+                logger.warning("job %s (%s) failed: %s", job_id, ctx.kind, exc)
+                _update_claimed(job_id, worker, status="failed", error=str(error), finished_at=datetime.utcnow())
+                return "failed"
+            delay = retry_delay(attempts)
+            logger.info("job %s (%s) attempt %s failed; retrying in %.0fs", job_id, ctx.kind, attempts, delay)
+            _update_claimed(
+                job_id,
+                worker,
+                status="queued",
+                locked_by=None,
+                error=str(error),
+                run_after=datetime.utcnow() + timedelta(seconds=delay),
+            )
+            return "queued"
+        finally:
+            heartbeat.stop()
+
+    _update_claimed(
+        job_id,
+        worker,
+        status="succeeded",
+        result=result,
+        progress=1.0,
+        finished_at=datetime.utcnow(),
+    )
+    return "succeeded"
+
+
+def run_next(worker: str, kinds: Optional[Sequence[str]] = None) -> Optional[str]:
+    """
+    Claim and run one job; returns its final status, or None if none was due.
+    """
+    with SessionLocal() as db:
+        job_id = claim(db, worker, kinds)
+    if job_id is None:
+        return None
+    return run(job_id, worker)
@@ -0,0 +1,317 @@
+# app/services/notifications.py
+"""
+Notification pipeline.
+
+``publish`` records a ``NotificationEvent`` and queues a
+"notifications.deliver" job in the caller's transaction. The job
+(``deliver``) resolves the recipients - the course's active students - with
+one JOIN over ``enrollments``, renders each message from the event's
+template, bulk-inserts the in-app inbox rows and then emails them in
+batches through the configured transport, rate limited by a token bucket.
+Progress is committed per batch (``Notification.emailed_at``), so a retried
+job resumes where the failed attempt stopped instead of re-sending.
+"""
+
+import logging
+import os
+import smtplib
+import threading
+import time
+from datetime import datetime
+from email.message import EmailMessage
+from string import Template
+from typing import Dict, List, Optional, Protocol, Sequence
+
+from dotenv import load_dotenv
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.ratelimit import rate_limit_backend, TokenBucketLimit
+from app.models import UserRole
+from app.services import jobs
+
+load_dotenv()
+
+NOTIFY_TRANSPORT = os.getenv("NOTIFY_TRANSPORT", "log")  # "smtp", "log" or "none"
+NOTIFY_SMTP_HOST = os.getenv("NOTIFY_SMTP_HOST", "localhost")
+NOTIFY_SMTP_PORT = int(os.getenv("NOTIFY_SMTP_PORT", "1025"))
+NOTIFY_SMTP_TIMEOUT = float(os.getenv("NOTIFY_SMTP_TIMEOUT", "10"))
+NOTIFY_FROM = os.getenv("NOTIFY_FROM", "College Management System <noreply@localhost>")
+NOTIFY_BATCH_SIZE = int(os.getenv("NOTIFY_BATCH_SIZE", "50"))
+NOTIFY_EMAIL_BURST = float(os.getenv("NOTIFY_EMAIL_BURST", "100"))
+NOTIFY_EMAIL_PER_MINUTE = float(os.getenv("NOTIFY_EMAIL_PER_MINUTE", "600"))
+NOTIFY_UNREAD_CACHE_SECONDS = float(os.getenv("NOTIFY_UNREAD_CACHE_SECONDS", "30"))
+
+logger = logging.getLogger(__name__)
+
+email_limit = TokenBucketLimit("notify-email", NOTIFY_EMAIL_BURST, NOTIFY_EMAIL_PER_MINUTE, rate_limit_backend)
+
+# kind -> (subject, body); placeholders are filled from the event context
+# plus $student_name
+TEMPLATES: Dict[str, tuple] = {
+    "assignment.published": (
+        Template("New assignment in $course_code: $assignment_title"),
+        Template(
+            "Hello $student_name,\n\n"
+            "A new assignment \"$assignment_title\" has been published in $course_code ($course_name).\n"
+            "Due: $due_date\n"
+        ),
+    ),
+    "grades.finalized": (
+        Template("Grades finalised in $course_code"),
+        Template(
+            "Hello $student_name,\n\n"
+            "Grades for $scope in $course_code ($course_name) have been finalised "
+            "and are now available.\n"
+        ),
+    ),
+}
+
+
+class Transport(Protocol):
+    def send(self, messages: Sequence[EmailMessage]) -> None:
+        ...
+
+
+class SmtpTransport:
+    """
+    Sends a batch over a single SMTP connection. Point it at
+    ``python -m scripts.smtp_stub`` for local development.
+    """
+
+    def __init__(self, host: str, port: int, timeout: float):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+
+    def send(self, messages: Sequence[EmailMessage]) -> None:
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            for message in messages:
+                smtp.send_message(message)
+
+
+class LogTransport:
+    def send(self, messages: Sequence[EmailMessage]) -> None:
+        for message in messages:
+            logger.info("email to %s: %s", message["To"], message["Subject"])
+
+
+class NullTransport:
+    def send(self, messages: Sequence[EmailMessage]) -> None:
+        pass
+
+
+def create_transport(name: str = NOTIFY_TRANSPORT) -> Transport:
+    if name == "smtp":
+        return SmtpTransport(NOTIFY_SMTP_HOST, NOTIFY_SMTP_PORT, NOTIFY_SMTP_TIMEOUT)
+    if name == "none":
+        return NullTransport()
+    return LogTransport()
+
+
+class UnreadCountCache:
+    """
+    Per-process cache of unread counts. Entries expire after ``ttl``
+    seconds, so notifications delivered by a worker show up within that
+    time; this process drops an entry as soon as it changes the count.
+    """
+
+    def __init__(self, ttl: float, max_size: int = 100_000, clock=time.monotonic):
+        self._ttl = ttl
+        self._max_size = max_size
+        self._clock = clock
+        self._entries: Dict[int, tuple] = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[1] <= self._clock():
+                return None
+            return entry[0]
+
+    def put(self, user_id: int, count: int) -> None:
+        with self._lock:
+            if len(self._entries) >= self._max_size:
+                self._entries.clear()
+            self._entries[user_id] = (count, self._clock() + self._ttl)
+
+    def discard(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+
+unread_cache = UnreadCountCache(NOTIFY_UNREAD_CACHE_SECONDS)
+
+
+def publish(
+    db: Session,
+    kind: str,
+    course: models.Course,
+    actor_id: Optional[int] = None,
+    assignment: Optional[models.Assignment] = None,
+    context: Optional[dict] = None,
+) -> models.NotificationEvent:
+    """
+    Record an event and queue its delivery. Does not commit.
+    """
+    if kind not in TEMPLATES:
+        raise ValueError(f"Unknown notification kind {kind!r}")
+
+    values = {"course_code": course.code, "course_name": course.name}
+    if assignment is not None:
+        values["assignment_title"] = assignment.title
+        values["due_date"] = assignment.due_date.strftime("%Y-%m-%d %H:%M") if assignment.due_date else "no deadline"
+    values.update(context or {})
+
+    event = models.NotificationEvent(
+        kind=kind,
+        course_id=course.id,
+        assignment_id=assignment.id if assignment is not None else None,
+        actor_id=actor_id,
+        context=values,
+    )
+    db.add(event)
+    db.flush()
+    jobs.enqueue(db, "notifications.deliver", {"event_id": event.id}, created_by_id=actor_id)
+    return event
+
+
+def _fan_out(db: Session, event: models.NotificationEvent) -> int:
+    """
+    Create the inbox rows of an event (once). Returns the recipient count.
+    """
+    already = db.execute(
+        select(func.count()).select_from(models.Notification).where(models.Notification.event_id == event.id)
+    ).scalar_one()
+    if already:
+        return already
+
+    recipients = db.execute(
+        select(models.User.id, models.User.full_name)
+        .join(models.Enrollment, models.Enrollment.student_id == models.User.id)
+        .where(
+            models.Enrollment.course_id == event.course_id,
+            models.Enrollment.status == "enrolled",
+            models.User.role == UserRole.STUDENT,
+            models.User.is_active.is_(True),
+        )
+    ).all()
+    if not recipients:
+        return 0
+
+    subject_template, body_template = TEMPLATES[event.kind]
+    now = datetime.utcnow()
+    rows = []
+    for user_id, name in recipients:
+        values = {**event.context, "student_name": name}
+        rows.append({
+            "user_id": user_id,
+            "event_id": event.id,
+            "kind": event.kind,
+            "subject": subject_template.safe_substitute(values)[:255],
+            "body": body_template.safe_substitute(values),
+            "created_at": now,
+        })
+    db.execute(insert(models.Notification), rows)
+    return len(rows)
+
+
+def _take_email_tokens(count: int) -> None:
+    while True:
+        wait = email_limit.take("global", cost=count)
+        if not wait:
+            return
+        time.sleep(min(wait, 5.0))
+
+
+def deliver(
+    db: Session,
+    event_id: int,
+    transport: Optional[Transport] = None,
+    batch_size: int = NOTIFY_BATCH_SIZE,
+    progress=None,
+) -> dict:
+    """
+    Fan out an event to the inbox and email it. Commits after the fan-out
+    and after every batch. Transport errors propagate so the job is retried.
+    """
+    transport = transport or create_transport()
+    batch_size = max(1, min(batch_size, int(NOTIFY_EMAIL_BURST)))
+
+    event = db.get(models.NotificationEvent, event_id)
+    if event is None:
+        return {"recipients": 0, "emailed": 0}
+
+    recipients = _fan_out(db, event)
+    event.recipients = recipients
+    db.commit()
+
+    emailed = 0
+    while True:
+        batch = db.execute(
+            select(models.Notification.id, models.Notification.subject, models.Notification.body, models.User.email)
+            .join(models.User, models.User.id == models.Notification.user_id)
+            .where(models.Notification.event_id == event_id, models.Notification.emailed_at.is_(None))
+            .order_by(models.Notification.id)
+            .limit(batch_size)
+        ).all()
+        if not batch:
+            break
+
+        messages = []
+        for _, subject, body, email in batch:
+            message = EmailMessage()
+            message["From"] = NOTIFY_FROM
+            message["To"] = email
+            message["Subject"] = subject
+            message.set_content(body)
+            messages.append(message)
+
+        _take_email_tokens(len(messages))
+        transport.send(messages)
+
+        db.execute(
+            update(models.Notification)
+            .where(models.Notification.id.in_([row.id for row in batch]))
+            .values(emailed_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        emailed += len(batch)
+        if progress:
+            progress(emailed, recipients)
+
+    event.delivered_at = datetime.utcnow()
+    db.commit()
+    return {"recipients": recipients, "emailed": emailed, "emailed_earlier": recipients - emailed}
+
+
+def unread_count(db: Session, user_id: int) -> int:
+    count = unread_cache.get(user_id)
+    if count is None:
+        count = db.execute(
+            select(func.count())
+            .select_from(models.Notification)
+            .where(models.Notification.user_id == user_id, models.Notification.read_at.is_(None))
+        ).scalar_one()
+        unread_cache.put(user_id, count)
+    return count
+
+
+def mark_read(db: Session, user_id: int, notification_ids: Optional[List[int]] = None) -> int:
+    """
+    Mark some (or all) of a user's unread notifications read. Does not
+    commit; drop the user's ``unread_cache`` entry after committing.
+    Returns the number changed.
+    """
+    query = (
+        update(models.Notification)
+        .where(models.Notification.user_id == user_id, models.Notification.read_at.is_(None))
+        .values(read_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    if notification_ids is not None:
+        query = query.where(models.Notification.id.in_(notification_ids))
+    return db.execute(query).rowcount
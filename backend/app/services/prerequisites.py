@@ -0,0 +1,216 @@
+# app/services/prerequisites.py
+
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set
+
+from fastapi import HTTPException, status
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app import models
+
+Closure = models.CoursePrerequisiteClosure
+Edge = models.CoursePrerequisite
+
+# Upper bound on students x courses for a single eligibility call
+MAX_ELIGIBILITY_PAIRS = 100_000
+
+
+def ancestors_of(db: Session, course_ids: Iterable[int]) -> Dict[int, Set[int]]:
+    """
+    All direct and indirect prerequisites of each course, from the closure table.
+    """
+    course_ids = list(set(course_ids))
+    result: Dict[int, Set[int]] = {cid: set() for cid in course_ids}
+    if not course_ids:
+        return result
+    rows = db.execute(
+        select(Closure.course_id, Closure.ancestor_id).where(Closure.course_id.in_(course_ids))
+    )
+    for course_id, ancestor_id in rows:
+        result[course_id].add(ancestor_id)
+    return result
+
+
+def _descendants_of(db: Session, course_id: int) -> Set[int]:
+    return set(
+        db.execute(select(Closure.course_id).where(Closure.ancestor_id == course_id)).scalars()
+    )
+
+
+def add_prerequisite(db: Session, course_id: int, prerequisite_id: int) -> None:
+    """
+    Add an edge and extend the closure: every course that (transitively)
+    requires ``course_id`` now also requires ``prerequisite_id`` and all of
+    its ancestors. Rejects self-references and cycles. Does not commit.
+    """
+    if course_id == prerequisite_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A course cannot be its own prerequisite.",
+        )
+
+    prereq_ancestors = ancestors_of(db, [prerequisite_id])[prerequisite_id]
+    if course_id in prereq_ancestors:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="This prerequisite would create a cycle.",
+        )
+
+    existing = db.get(Edge, (course_id, prerequisite_id))
+    if existing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="This prerequisite is already set.",
+        )
+
+    db.add(Edge(course_id=course_id, prerequisite_id=prerequisite_id))
+
+    new_ancestors = prereq_ancestors | {prerequisite_id}
+    affected = _descendants_of(db, course_id) | {course_id}
+    current = ancestors_of(db, affected)
+
+    rows = [
+        {"course_id": d, "ancestor_id": a}
+        for d in affected
+        for a in new_ancestors - current[d]
+    ]
+    if rows:
+        db.execute(Closure.__table__.insert(), rows)
+
+
+def remove_prerequisite(db: Session, course_id: int, prerequisite_id: int) -> None:
+    """
+    Remove an edge and rebuild the closure rows of ``course_id`` and the
+    courses that depend on it; the rest of the closure is untouched.
+    Does not commit.
+    """
+    edge = db.get(Edge, (course_id, prerequisite_id))
+    if not edge:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Prerequisite not found.",
+        )
+
+    affected = _descendants_of(db, course_id) | {course_id}
+    db.delete(edge)
+    db.flush()
+
+    parents: Dict[int, List[int]] = defaultdict(list)
+    for child, parent in db.execute(select(Edge.course_id, Edge.prerequisite_id)):
+        parents[child].append(parent)
+
+    memo: Dict[int, Set[int]] = {}
+
+    def walk(cid: int) -> Set[int]:
+        if cid in memo:
+            return memo[cid]
+        found: Set[int] = set()
+        stack = list(parents.get(cid, ()))
+        while stack:
+            node = stack.pop()
+            if node in found:
+                continue
+            found.add(node)
+            if node in memo:
+                found |= memo[node]
+            else:
+                stack.extend(parents.get(node, ()))
+        memo[cid] = found
+        return found
+
+    db.execute(Closure.__table__.delete().where(Closure.course_id.in_(affected)))
+    rows = [{"course_id": d, "ancestor_id": a} for d in affected for a in walk(d)]
+    if rows:
+        db.execute(Closure.__table__.insert(), rows)
+
+
+def completed_courses(db: Session, student_ids: Iterable[int]) -> Dict[int, Set[int]]:
+    student_ids = list(set(student_ids))
+    result: Dict[int, Set[int]] = {sid: set() for sid in student_ids}
+    if not student_ids:
+        return result
+    rows = db.execute(
+        select(models.Enrollment.student_id, models.Enrollment.course_id).where(
+            models.Enrollment.student_id.in_(student_ids),
+            models.Enrollment.status == "completed",
+        )
+    )
+    for student_id, course_id in rows:
+        result[student_id].add(course_id)
+    return result
+
+
+def missing_prerequisites(db: Session, student_id: int, course_id: int) -> List[int]:
+    required = ancestors_of(db, [course_id])[course_id]
+    if not required:
+        return []
+    done = completed_courses(db, [student_id])[student_id]
+    return sorted(required - done)
+
+
+def check_eligibility(db: Session, student_ids: List[int], course_ids: List[int]) -> List[dict]:
+    """
+    Evaluate every (student, course) pair in one pass: a fixed number of
+    set-based queries, then pure set lookups per pair.
+    """
+    student_ids = list(dict.fromkeys(student_ids))
+    course_ids = list(dict.fromkeys(course_ids))
+    if len(student_ids) * len(course_ids) > MAX_ELIGIBILITY_PAIRS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_ELIGIBILITY_PAIRS} student/course pairs per request.",
+        )
+    if not student_ids or not course_ids:
+        return []
+
+    required = ancestors_of(db, course_ids)
+    completed = completed_courses(db, student_ids)
+
+    enrolled = {
+        (sid, cid)
+        for sid, cid in db.execute(
+            select(models.Enrollment.student_id, models.Enrollment.course_id).where(
+                models.Enrollment.student_id.in_(student_ids),
+                models.Enrollment.course_id.in_(course_ids),
+            )
+        )
+    }
+
+    capacity = {
+        cid: cap
+        for cid, cap in db.execute(
+            select(models.Course.id, models.Course.capacity).where(models.Course.id.in_(course_ids))
+        )
+    }
+    taken = {
+        cid: count
+        for cid, count in db.execute(
+            select(models.Enrollment.course_id, func.count())
+            .where(models.Enrollment.course_id.in_(course_ids))
+            .group_by(models.Enrollment.course_id)
+        )
+    }
+    full = {
+        cid for cid, cap in capacity.items()
+        if cap is not None and taken.get(cid, 0) >= cap
+    }
+
+    results = []
+    for sid in student_ids:
+        done = completed[sid]
+        for cid in course_ids:
+            missing = required[cid] - done
+            already = (sid, cid) in enrolled
+            is_full = cid in full
+            results.append(
+                {
+                    "student_id": sid,
+                    "course_id": cid,
+                    "eligible": not missing and not already and not is_full and cid in capacity,
+                    "missing_prerequisites": sorted(missing),
+                    "course_full": is_full,
+                    "already_enrolled": already,
+                }
+            )
+    return results
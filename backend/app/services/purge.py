@@ -0,0 +1,157 @@
+# app/services/purge.py
+"""
+Deleting courses and users with many dependent rows.
+
+Their children go away through ON DELETE rules, so a plain
+``db.delete(parent)`` never loads them. But the database still removes them
+all in one statement and one transaction, which holds locks and grows the
+WAL in proportion to the course's history. Above ``PURGE_SYNC_MAX_ROWS``
+dependent rows, the routers therefore queue a ``purge`` job instead: it
+deletes the big child tables ``PURGE_CHUNK_ROWS`` rows per transaction and
+finally the parent, whose remaining (small) children cascade.
+"""
+
+import os
+from typing import Callable, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.services import jobs, registration
+
+load_dotenv()
+
+PURGE_CHUNK_ROWS = int(os.getenv("PURGE_CHUNK_ROWS", "5000"))
+PURGE_SYNC_MAX_ROWS = int(os.getenv("PURGE_SYNC_MAX_ROWS", "20000"))
+
+ENTITIES = {"course": models.Course, "user": models.User}
+
+
+def _children(entity: str, entity_id: int) -> List[Tuple[type, object]]:
+    """
+    (model, condition) of the child tables that can be large, in the order
+    they are purged (rows that reference others first).
+    """
+    if entity == "course":
+        assignments = select(models.Assignment.id).where(models.Assignment.course_id == entity_id)
+        events = select(models.NotificationEvent.id).where(models.NotificationEvent.course_id == entity_id)
+        return [
+            (models.Grade, models.Grade.assignment_id.in_(assignments)),
+            (models.Submission, models.Submission.assignment_id.in_(assignments)),
+            (models.Notification, models.Notification.event_id.in_(events)),
+            (models.Attendance, models.Attendance.course_id == entity_id),
+            (models.Enrollment, models.Enrollment.course_id == entity_id),
+            (models.Booking, models.Booking.course_id == entity_id),
+        ]
+    return [
+        (models.Grade, models.Grade.student_id == entity_id),
+        (models.Attendance, models.Attendance.student_id == entity_id),
+        (models.Submission, models.Submission.student_id == entity_id),
+        (models.Notification, models.Notification.user_id == entity_id),
+    ]
+
+
+def dependent_rows(db: Session, entity: str, entity_id: int) -> int:
+    """
+    How many rows deleting the entity would cascade to, counting the large
+    child tables only.
+    """
+    return sum(
+        db.execute(select(func.count()).select_from(model).where(condition)).scalar_one()
+        for model, condition in _children(entity, entity_id)
+    )
+
+
+def is_large(db: Session, entity: str, entity_id: int) -> bool:
+    return dependent_rows(db, entity, entity_id) > PURGE_SYNC_MAX_ROWS
+
+
+def blocking_references(db: Session, user_id: int) -> List[str]:
+    """
+    What keeps a user from being deleted: records they authored, whose
+    foreign keys deliberately have no ON DELETE rule.
+    """
+    checks = [
+        ("courses taught", models.Course.teacher_id),
+        ("grades given", models.Grade.graded_by_id),
+        ("attendance marked", models.Attendance.marked_by_id),
+        ("bookings made", models.Booking.booked_by_id),
+    ]
+    return [
+        label
+        for label, column in checks
+        if db.execute(select(column).where(column == user_id).limit(1)).first() is not None
+    ]
+
+
+def release_enrollments(db: Session, student_id: int) -> None:
+    """
+    Drop a student's enrollments through registration, so their seats go to
+    waitlisted students and the trend rollup sees the change, instead of
+    letting the cascade remove them silently. Does not commit.
+    """
+    enrollments = db.execute(
+        select(models.Enrollment).where(models.Enrollment.student_id == student_id)
+    ).scalars().all()
+    for enrollment in enrollments:
+        registration.drop(db, enrollment)
+
+
+def enqueue(db: Session, entity: str, entity_id: int, created_by_id: Optional[int] = None) -> models.Job:
+    """
+    Queue a purge, or return the one already pending for the same entity.
+    Does not commit.
+    """
+    payload = {"entity": entity, "id": entity_id}
+    pending = db.execute(
+        select(models.Job).where(models.Job.kind == "purge", models.Job.status.in_(("queued", "running")))
+    ).scalars()
+    for job in pending:
+        if job.payload == payload:
+            return job
+    return jobs.enqueue(db, "purge", payload, created_by_id=created_by_id, max_attempts=3)
+
+
+def purge(
+    db: Session,
+    entity: str,
+    entity_id: int,
+    progress: Optional[Callable[[int, int, str], None]] = None,
+) -> Dict[str, int]:
+    """
+    Delete the entity and everything under it in chunks, committing after
+    each one (an interrupted purge resumes where it stopped). Returns the
+    number of rows deleted per table.
+    """
+    model = ENTITIES[entity]
+    if db.get(model, entity_id) is None:
+        return {}
+
+    if entity == "user":
+        release_enrollments(db, entity_id)
+        db.commit()
+
+    total = dependent_rows(db, entity, entity_id)
+    deleted: Dict[str, int] = {}
+    done = 0
+    for child, condition in _children(entity, entity_id):
+        table = child.__table__.name
+        while True:
+            ids = select(child.id).where(condition).limit(PURGE_CHUNK_ROWS)
+            count = db.execute(
+                delete(child).where(child.id.in_(ids)).execution_options(synchronize_session=False)
+            ).rowcount
+            db.commit()
+            if not count:
+                break
+            deleted[table] = deleted.get(table, 0) + count
+            done += count
+            if progress:
+                progress(done, total, f"{done}/{total} rows")
+
+    db.delete(db.get(model, entity_id))
+    db.commit()
+    deleted[model.__table__.name] = 1
+    return deleted
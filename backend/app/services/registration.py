@@ -0,0 +1,340 @@
+# app/services/registration.py
+
+from typing import Callable, List, NamedTuple, Optional, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app import models
+from app.models import UserRole
+from app.services import prerequisites, timetable, writes
+
+Seats = models.CourseSeats
+Waitlist = models.WaitlistEntry
+
+
+class Registration(NamedTuple):
+    status: str  # "enrolled" or "waitlisted"
+    enrollment: Optional[models.Enrollment] = None
+    waitlist_entry: Optional[models.WaitlistEntry] = None
+
+
+def _claim_seat(db: Session, course_id: int) -> bool:
+    """
+    Take one seat with a single conditional decrement. On PostgreSQL a
+    concurrent claimer blocks on the row lock and re-evaluates
+    ``seats_available > 0`` after the first one commits, so the counter can
+    never go below zero.
+    """
+    result = db.execute(
+        update(Seats)
+        .where(Seats.course_id == course_id, Seats.seats_available > 0)
+        .values(seats_available=Seats.seats_available - 1)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+def _lock_seats(db: Session, course_id: int) -> Optional[int]:
+    """
+    Lock the course's counter row and return the seats left, or None for a
+    course without a capacity. Joining the waitlist and releasing a seat
+    both take this lock, so a seat is never freed while someone is queued.
+    """
+    return db.execute(
+        select(Seats.seats_available).where(Seats.course_id == course_id).with_for_update()
+    ).scalar_one_or_none()
+
+
+def _already_registered(db: Session, student_id: int, course_id: int) -> None:
+    enrolled = db.execute(
+        select(models.Enrollment.id).where(
+            models.Enrollment.student_id == student_id,
+            models.Enrollment.course_id == course_id,
+        )
+    ).first()
+    if enrolled:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Student is already enrolled in this course.",
+        )
+    waiting = db.execute(
+        select(Waitlist.id).where(Waitlist.student_id == student_id, Waitlist.course_id == course_id)
+    ).first()
+    if waiting:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Student is already on the waitlist for this course.",
+        )
+
+
+def _insert(db: Session, obj, detail: str):
+    # A duplicate means a concurrent request for the same student/course
+    # won the race; an unknown course is caught the same way.
+    return writes.insert(
+        db,
+        obj,
+        unique={("student_id", "course_id"): detail},
+        foreign_keys={"course_id": "course_id must refer to an existing course."},
+    )
+
+
+def _enroll(db: Session, student_id: int, course_id: int) -> models.Enrollment:
+    return _insert(
+        db,
+        models.Enrollment(student_id=student_id, course_id=course_id),
+        "Student is already enrolled in this course.",
+    )
+
+
+def register(
+    db: Session,
+    student_id: int,
+    course_id: int,
+    waitlist: bool = True,
+    precheck: bool = True,
+) -> Registration:
+    """
+    Enroll a student, or queue them if the course is full (``waitlist``) and
+    otherwise reject with 400. Unless the caller has already validated the
+    pair in bulk (``precheck=False``), checks duplicates, prerequisites and
+    timetable clashes first. Does not commit; the seat claim is held until
+    the caller commits.
+    """
+    if precheck:
+        _already_registered(db, student_id, course_id)
+
+        missing = prerequisites.missing_prerequisites(db, student_id, course_id)
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Missing prerequisites: {', '.join(str(cid) for cid in missing)}.",
+            )
+
+        clashes = timetable.enrollment_clashes(db, student_id, course_id)
+        if clashes:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Timetable clash: "
+                + "; ".join(f"course {c['conflicts_with']} ({c['slot']})" for c in clashes)
+                + ".",
+            )
+
+    if _claim_seat(db, course_id):
+        return Registration("enrolled", enrollment=_enroll(db, student_id, course_id))
+
+    seats = _lock_seats(db, course_id)
+    if seats is None:
+        # No counter row: the course has no capacity limit.
+        return Registration("enrolled", enrollment=_enroll(db, student_id, course_id))
+    if seats > 0 and _claim_seat(db, course_id):
+        return Registration("enrolled", enrollment=_enroll(db, student_id, course_id))
+
+    if not waitlist:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Course is full.",
+        )
+
+    entry = _insert(
+        db,
+        Waitlist(student_id=student_id, course_id=course_id),
+        "Student is already on the waitlist for this course.",
+    )
+    return Registration("waitlisted", waitlist_entry=entry)
+
+
+def promote_next(db: Session, course_id: int) -> Optional[models.Enrollment]:
+    """
+    Hand one free seat to the head of the waitlist, or return it to the
+    counter if nobody is waiting. Does not commit.
+    """
+    seats = _lock_seats(db, course_id)
+    entry = db.execute(
+        select(Waitlist)
+        .where(Waitlist.course_id == course_id)
+        .order_by(Waitlist.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    ).scalar_one_or_none()
+
+    if entry is None:
+        if seats is not None:
+            db.execute(
+                update(Seats)
+                .where(Seats.course_id == course_id)
+                .values(seats_available=Seats.seats_available + 1)
+                .execution_options(synchronize_session=False)
+            )
+        return None
+
+    student_id = entry.student_id
+    db.delete(entry)
+    db.flush()
+    return _enroll(db, student_id, course_id)
+
+
+def drop(db: Session, enrollment: models.Enrollment) -> Optional[models.Enrollment]:
+    """
+    Remove an enrollment and promote the next waitlisted student into the
+    freed seat, in the caller's transaction. Returns the promoted enrollment.
+    """
+    course_id = enrollment.course_id
+    db.delete(enrollment)
+    db.flush()
+    return promote_next(db, course_id)
+
+
+def sync_seats(db: Session, course: models.Course) -> List[models.Enrollment]:
+    """
+    Bring the counter row in line with ``course.capacity`` (creating or
+    removing it as needed) and promote waitlisted students into any seats
+    this frees. Returns the promoted enrollments. Does not commit.
+    """
+    if course.capacity is None:
+        db.execute(Seats.__table__.delete().where(Seats.course_id == course.id))
+        waiting = [entry.student_id for entry in _waitlist(db, course.id)]
+        db.execute(Waitlist.__table__.delete().where(Waitlist.course_id == course.id))
+        return [_enroll(db, sid, course.id) for sid in waiting]
+
+    _lock_seats(db, course.id)
+    taken = db.execute(
+        select(func.count()).select_from(models.Enrollment).where(models.Enrollment.course_id == course.id)
+    ).scalar_one()
+    available = max(course.capacity - taken, 0)
+
+    counter = db.get(Seats, course.id)
+    if counter is None:
+        db.add(Seats(course_id=course.id, seats_available=0))
+        db.flush()
+
+    promoted = []
+    for entry in _waitlist(db, course.id, limit=available):
+        student_id = entry.student_id
+        db.delete(entry)
+        db.flush()
+        promoted.append(_enroll(db, student_id, course.id))
+        available -= 1
+
+    db.execute(
+        update(Seats)
+        .where(Seats.course_id == course.id)
+        .values(seats_available=available)
+        .execution_options(synchronize_session=False)
+    )
+    return promoted
+
+
+def _waitlist(db: Session, course_id: int, limit: Optional[int] = None) -> List[models.WaitlistEntry]:
+    query = select(Waitlist).where(Waitlist.course_id == course_id).order_by(Waitlist.id)
+    if limit is not None:
+        query = query.limit(limit)
+    return list(db.execute(query).scalars())
+
+
+def waitlist_position(db: Session, entry: models.WaitlistEntry) -> int:
+    """
+    1-based position of an entry in its course's waitlist.
+    """
+    return db.execute(
+        select(func.count())
+        .select_from(Waitlist)
+        .where(Waitlist.course_id == entry.course_id, Waitlist.id <= entry.id)
+    ).scalar_one()
+
+
+def validate_cohort_ids(db: Session, student_ids: Sequence[int], course_ids: Sequence[int]) -> None:
+    """
+    Reject a bulk request that names non-students, unknown courses or too
+    many pairs, before any work is queued.
+    """
+    if len(student_ids) * len(course_ids) > prerequisites.MAX_ELIGIBILITY_PAIRS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {prerequisites.MAX_ELIGIBILITY_PAIRS} student/course pairs per request.",
+        )
+
+    students = set(
+        db.execute(
+            select(models.User.id).where(models.User.id.in_(student_ids), models.User.role == UserRole.STUDENT)
+        ).scalars()
+    )
+    not_students = [sid for sid in student_ids if sid not in students]
+    if not_students:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Not students: {', '.join(str(sid) for sid in not_students)}.",
+        )
+
+    courses = set(db.execute(select(models.Course.id).where(models.Course.id.in_(course_ids))).scalars())
+    unknown = [cid for cid in course_ids if cid not in courses]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown courses: {', '.join(str(cid) for cid in unknown)}.",
+        )
+
+
+def bulk_enroll(
+    db: Session,
+    student_ids: Sequence[int],
+    course_ids: Sequence[int],
+    dry_run: bool = False,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> List[dict]:
+    """
+    Enroll a cohort of students in a set of courses.
+
+    Prerequisites, existing enrollments and the timetable of every student
+    are validated in one pass (courses are added in the order given, so
+    clashes between the requested courses are caught too). Valid pairs are
+    enrolled, or waitlisted when a course is full; invalid ones are reported
+    and skipped. With ``dry_run`` nothing is written. Does not commit.
+    """
+    eligibility = prerequisites.check_eligibility(db, student_ids, course_ids)
+
+    waitlisted = set(
+        db.execute(
+            select(Waitlist.student_id, Waitlist.course_id).where(
+                Waitlist.student_id.in_(student_ids),
+                Waitlist.course_id.in_(course_ids),
+            )
+        ).tuples()
+    )
+
+    results = {}
+    for r in eligibility:
+        pair = (r["student_id"], r["course_id"])
+        detail = None
+        if r["already_enrolled"]:
+            detail = "Already enrolled."
+        elif pair in waitlisted:
+            detail = "Already on the waitlist."
+        elif r["missing_prerequisites"]:
+            detail = "Missing prerequisites."
+        results[pair] = {
+            "student_id": pair[0],
+            "course_id": pair[1],
+            "status": "rejected" if detail else "valid",
+            "detail": detail,
+            "missing_prerequisites": r["missing_prerequisites"],
+            "clashes": [],
+        }
+
+    rejected = [pair for pair, r in results.items() if r["status"] == "rejected"]
+    clashes = timetable.validate_cohort(db, student_ids, course_ids, skip=rejected)
+    for pair, found in clashes.items():
+        if found:
+            results[pair].update(status="rejected", detail="Timetable clash.", clashes=found)
+
+    ordered = [results[(sid, cid)] for sid in student_ids for cid in course_ids]
+    if dry_run:
+        return ordered
+
+    for n, r in enumerate(ordered, start=1):
+        if r["status"] == "valid":
+            r["status"] = register(db, r["student_id"], r["course_id"], precheck=False).status
+        if progress is not None and n % 500 == 0:
+            progress(n, len(ordered))
+    return ordered
@@ -0,0 +1,364 @@
+# app/services/reports.py
+"""
+Department report exports.
+
+Each dataset is read with a server-side cursor in chunks of
+``REPORT_CHUNK_ROWS`` and appended chunk by chunk to CSV and (if pyarrow is
+installed) Parquet files, so memory use does not grow with the table.
+Departments are exported in parallel in a process pool; the files land in
+``REPORTS_DIR/<job id>/`` and are served by ``GET /reports/{job_id}/files/...``.
+"""
+
+import csv
+import multiprocessing
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from dotenv import load_dotenv
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.grading import grade_to_percent, PASS_PERCENT
+from app.database import SessionLocal
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet output is optional
+    pa = pq = None
+
+load_dotenv()
+
+REPORTS_DIR = os.getenv("REPORTS_DIR", "artifacts/reports")
+REPORT_CHUNK_ROWS = int(os.getenv("REPORT_CHUNK_ROWS", "10000"))
+REPORT_PROCESSES = int(os.getenv("REPORT_PROCESSES", "4"))
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+class Dataset(NamedTuple):
+    # (name, type) pairs; type is one of "int", "float", "bool", "str", "date", "datetime"
+    columns: Sequence[tuple]
+    # department_id -> iterable of row chunks
+    chunks: Callable[[Session, int], Iterable[List[tuple]]]
+
+
+def available_formats() -> List[str]:
+    return ["csv", "parquet"] if pq is not None else ["csv"]
+
+
+def _stream(db: Session, query) -> Iterable[List[tuple]]:
+    """
+    Run ``query`` with a server-side cursor, yielding lists of row tuples.
+    """
+    result = db.execute(query, execution_options={"yield_per": REPORT_CHUNK_ROWS})
+    for partition in result.partitions():
+        yield [tuple(row) for row in partition]
+
+
+def _enrollment_chunks(db: Session, department_id: int):
+    query = (
+        select(
+            models.Course.id,
+            models.Course.code,
+            models.Enrollment.student_id,
+            models.User.full_name,
+            models.Enrollment.status,
+            models.Enrollment.created_at,
+        )
+        .join(models.Course, models.Course.id == models.Enrollment.course_id)
+        .join(models.User, models.User.id == models.Enrollment.student_id)
+        .where(models.Course.department_id == department_id)
+        .order_by(models.Enrollment.id)
+    )
+    return _stream(db, query)
+
+
+def _grade_chunks(db: Session, department_id: int):
+    query = (
+        select(
+            models.Course.id,
+            models.Course.code,
+            models.Assignment.id,
+            models.Assignment.title,
+            models.Grade.student_id,
+            models.Grade.grade_value,
+            models.Grade.is_finalized,
+            models.Grade.graded_at,
+        )
+        .join(models.Assignment, models.Assignment.id == models.Grade.assignment_id)
+        .join(models.Course, models.Course.id == models.Assignment.course_id)
+        .where(models.Course.department_id == department_id)
+        .order_by(models.Grade.id)
+    )
+    for chunk in _stream(db, query):
+        rows = []
+        for course_id, code, assignment_id, title, student_id, value, finalized, graded_at in chunk:
+            percent = grade_to_percent(value)
+            passed = None if percent is None else percent >= PASS_PERCENT
+            rows.append((course_id, code, assignment_id, title, student_id, value, percent, passed, finalized, graded_at))
+        yield rows
+
+
+def _attendance_chunks(db: Session, department_id: int):
+    query = (
+        select(
+            models.Course.id,
+            models.Course.code,
+            models.Attendance.student_id,
+            models.Attendance.date,
+            models.Attendance.period,
+            models.Attendance.status,
+        )
+        .join(models.Course, models.Course.id == models.Attendance.course_id)
+        .where(models.Course.department_id == department_id)
+        .order_by(models.Attendance.id)
+    )
+    return _stream(db, query)
+
+
+def _course_summary_chunks(db: Session, department_id: int):
+    """
+    One row per course: enrollment counts, pass rate over interpretable
+    grades and the share of attendance records marked present.
+    """
+    courses = db.execute(
+        select(models.Course.id, models.Course.code, models.Course.name)
+        .where(models.Course.department_id == department_id)
+        .order_by(models.Course.code)
+    ).all()
+    course_ids = [c.id for c in courses]
+    if not course_ids:
+        return
+
+    enrolled = {
+        course_id: (total, completed)
+        for course_id, total, completed in db.execute(
+            select(
+                models.Enrollment.course_id,
+                func.count(),
+                func.sum(case((models.Enrollment.status == "completed", 1), else_=0)),
+            )
+            .where(models.Enrollment.course_id.in_(course_ids))
+            .group_by(models.Enrollment.course_id)
+        )
+    }
+    attendance = {
+        course_id: (total, present)
+        for course_id, total, present in db.execute(
+            select(
+                models.Attendance.course_id,
+                func.count(),
+                func.sum(case((models.Attendance.status == "present", 1), else_=0)),
+            )
+            .where(models.Attendance.course_id.in_(course_ids))
+            .group_by(models.Attendance.course_id)
+        )
+    }
+
+    # Grades are free-form strings, so pass/fail is decided in Python
+    graded: Dict[int, int] = {}
+    passed: Dict[int, int] = {}
+    for chunk in _stream(
+        db,
+        select(models.Assignment.course_id, models.Grade.grade_value)
+        .join(models.Assignment, models.Assignment.id == models.Grade.assignment_id)
+        .where(models.Assignment.course_id.in_(course_ids)),
+    ):
+        for course_id, value in chunk:
+            percent = grade_to_percent(value)
+            if percent is None:
+                continue
+            graded[course_id] = graded.get(course_id, 0) + 1
+            if percent >= PASS_PERCENT:
+                passed[course_id] = passed.get(course_id, 0) + 1
+
+    rows = []
+    for course in courses:
+        total, completed = enrolled.get(course.id, (0, 0))
+        records, present = attendance.get(course.id, (0, 0))
+        n_graded, n_passed = graded.get(course.id, 0), passed.get(course.id, 0)
+        rows.append((
+            course.id,
+            course.code,
+            course.name,
+            total,
+            completed or 0,
+            n_graded,
+            n_passed,
+            n_passed / n_graded if n_graded else None,
+            records,
+            present / records if records else None,
+        ))
+    yield rows
+
+
+DATASETS: Dict[str, Dataset] = {
+    "enrollments": Dataset(
+        (
+            ("course_id", "int"), ("course_code", "str"), ("student_id", "int"),
+            ("student_name", "str"), ("status", "str"), ("enrolled_at", "datetime"),
+        ),
+        _enrollment_chunks,
+    ),
+    "grades": Dataset(
+        (
+            ("course_id", "int"), ("course_code", "str"), ("assignment_id", "int"),
+            ("assignment_title", "str"), ("student_id", "int"), ("grade_value", "str"),
+            ("percent", "float"), ("passed", "bool"), ("is_finalized", "bool"), ("graded_at", "datetime"),
+        ),
+        _grade_chunks,
+    ),
+    "attendance": Dataset(
+        (
+            ("course_id", "int"), ("course_code", "str"), ("student_id", "int"),
+            ("date", "date"), ("period", "str"), ("status", "str"),
+        ),
+        _attendance_chunks,
+    ),
+    "course_summary": Dataset(
+        (
+            ("course_id", "int"), ("course_code", "str"), ("course_name", "str"),
+            ("enrolled", "int"), ("completed", "int"), ("graded", "int"), ("passed", "int"),
+            ("pass_rate", "float"), ("attendance_records", "int"), ("attendance_rate", "float"),
+        ),
+        _course_summary_chunks,
+    ),
+}
+
+
+def _arrow_schema(columns):
+    types = {
+        "int": pa.int64(),
+        "float": pa.float64(),
+        "bool": pa.bool_(),
+        "str": pa.string(),
+        "date": pa.date32(),
+        "datetime": pa.timestamp("us"),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in columns])
+
+
+def _csv_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def report_dir(job_id: int) -> str:
+    return os.path.join(REPORTS_DIR, str(job_id))
+
+
+def file_name(department_id: int, dataset: str, fmt: str) -> str:
+    return f"department-{department_id}-{dataset}.{fmt}"
+
+
+def export_department(job_id: int, department_id: int, datasets: Sequence[str], formats: Sequence[str]) -> List[dict]:
+    """
+    Write the requested datasets of one department. Runs in a pool process,
+    with its own session. Files are written under a temporary name and
+    renamed once complete, so a half-written file is never served.
+    """
+    directory = report_dir(job_id)
+    os.makedirs(directory, exist_ok=True)
+    files = []
+
+    with SessionLocal() as db:
+        for name in datasets:
+            dataset = DATASETS[name]
+            header = [column for column, _ in dataset.columns]
+            paths = {fmt: os.path.join(directory, file_name(department_id, name, fmt)) for fmt in formats}
+
+            csv_file = csv_writer = parquet_writer = None
+            if "csv" in paths:
+                csv_file = open(paths["csv"] + ".part", "w", newline="", encoding="utf-8")
+                csv_writer = csv.writer(csv_file)
+                csv_writer.writerow(header)
+            if "parquet" in paths:
+                schema = _arrow_schema(dataset.columns)
+                parquet_writer = pq.ParquetWriter(paths["parquet"] + ".part", schema)
+
+            rows = 0
+            try:
+                for chunk in dataset.chunks(db, department_id):
+                    rows += len(chunk)
+                    if csv_writer is not None:
+                        csv_writer.writerows([_csv_value(v) for v in row] for row in chunk)
+                    if parquet_writer is not None and chunk:
+                        arrays = [pa.array(column, type=field.type) for column, field in zip(zip(*chunk), schema)]
+                        parquet_writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+            finally:
+                if csv_file is not None:
+                    csv_file.close()
+                if parquet_writer is not None:
+                    parquet_writer.close()
+
+            for fmt, path in paths.items():
+                os.replace(path + ".part", path)
+                files.append({
+                    "name": os.path.basename(path),
+                    "department_id": department_id,
+                    "dataset": name,
+                    "format": fmt,
+                    "rows": rows,
+                    "bytes": os.path.getsize(path),
+                })
+    return files
+
+
+def generate(
+    job_id: int,
+    department_ids: Sequence[int],
+    datasets: Sequence[str],
+    formats: Sequence[str],
+    processes: int = REPORT_PROCESSES,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> List[dict]:
+    """
+    Export every department, ``processes`` at a time. Returns the file list
+    (see ``export_department``), ordered by department.
+    """
+    shutil.rmtree(report_dir(job_id), ignore_errors=True)
+    files: List[dict] = []
+    total = len(department_ids)
+
+    if processes <= 1 or total <= 1:
+        for done, department_id in enumerate(department_ids, start=1):
+            files.extend(export_department(job_id, department_id, datasets, formats))
+            if progress:
+                progress(done, total)
+    else:
+        # Job workers run a heartbeat thread, which makes forking unsafe.
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=min(processes, total), mp_context=context) as pool:
+            futures = [
+                pool.submit(export_department, job_id, department_id, datasets, formats)
+                for department_id in department_ids
+            ]
+            for done, future in enumerate(as_completed(futures), start=1):
+                files.extend(future.result())
+                if progress:
+                    progress(done, total)
+
+    files.sort(key=lambda f: (f["department_id"], f["dataset"], f["format"]))
+    return files
+
+
+def find_file(job: models.Job, name: str) -> Optional[str]:
+    """
+    Path of a finished report file, or None if ``name`` is not one of the
+    job's files (or it has since been removed).
+    """
+    if job.kind != "reports.generate" or job.status != "succeeded":
+        return None
+    if not any(f["name"] == name for f in (job.result or {}).get("files", [])):
+        return None
+    path = os.path.join(report_dir(job.id), name)
+    return path if os.path.isfile(path) else None
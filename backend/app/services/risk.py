@@ -0,0 +1,355 @@
+# app/services/risk.py
+"""
+At-risk student scoring.
+
+Every enrolled (course, student) pair gets a score in [0, 1] combining four
+components, each also in [0, 1] (higher = more at risk):
+
+* ``attendance``: share of attendance records not marked present/late;
+* ``grades``: how far the average grade is below ``RISK_GOOD_PERCENT``
+  (1 at or below ``PASS_PERCENT``);
+* ``trend``: how fast grades are falling, from a least-squares slope of
+  percent over time (1 at ``RISK_TREND_SCALE`` points/week down or worse);
+* ``missing``: share of past-due assignments neither submitted nor graded.
+
+The score is the weighted mean of the components that have data for the
+pair. Aggregates are loaded per chunk of courses with a few grouped queries
+into NumPy arrays and scored in one vectorised pass; results replace the
+chunk's rows in ``risk_scores``, so reading a course's at-risk list is one
+range scan of ``ix_risk_scores_course_score``.
+
+Scores are recomputed for all courses by the self-rescheduling
+``risk.nightly`` job, and for single courses by ``risk.score`` jobs that
+``install``'s flush listener queues (debounced) when grades, attendance or
+submissions change.
+"""
+
+import os
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from dotenv import load_dotenv
+from sqlalchemy import case, delete, event, func, insert, select, union, update
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.grading import PASS_PERCENT, grade_to_percent
+from app.services import jobs
+
+load_dotenv()
+
+RISK_ENABLED = os.getenv("RISK_ENABLED", "1") == "1"
+RISK_WEIGHTS = {
+    "attendance": float(os.getenv("RISK_WEIGHT_ATTENDANCE", "0.35")),
+    "grades": float(os.getenv("RISK_WEIGHT_GRADES", "0.30")),
+    "trend": float(os.getenv("RISK_WEIGHT_TREND", "0.15")),
+    "missing": float(os.getenv("RISK_WEIGHT_MISSING", "0.20")),
+}
+RISK_GOOD_PERCENT = float(os.getenv("RISK_GOOD_PERCENT", "70"))
+RISK_TREND_SCALE = float(os.getenv("RISK_TREND_SCALE", "10"))  # percentage points per week
+# Default cut-off for the at-risk list
+RISK_THRESHOLD = float(os.getenv("RISK_THRESHOLD", "0.5"))
+RISK_CHUNK_COURSES = int(os.getenv("RISK_CHUNK_COURSES", "200"))
+RISK_NIGHTLY_HOUR = int(os.getenv("RISK_NIGHTLY_HOUR", "2"))  # UTC
+# Changes within this many seconds are scored together by one job
+RISK_RESCORE_DELAY = float(os.getenv("RISK_RESCORE_DELAY", "60"))
+
+ATTENDED_STATUSES = ("present", "late")
+
+
+def validate_weights(weights: Optional[Dict[str, float]]) -> Dict[str, float]:
+    """
+    ``RISK_WEIGHTS`` overridden by ``weights``; raises ValueError for unknown
+    components or negative weights.
+    """
+    merged = dict(RISK_WEIGHTS)
+    for key, value in (weights or {}).items():
+        if key not in merged:
+            raise ValueError(f"Unknown risk component {key!r}.")
+        if value < 0:
+            raise ValueError("Risk weights must not be negative.")
+        merged[key] = float(value)
+    if not any(merged.values()):
+        raise ValueError("At least one risk weight must be positive.")
+    return merged
+
+
+# ---------------------------------------------------------------------------
+# Scoring
+# ---------------------------------------------------------------------------
+
+def _pair_keys(course_ids: np.ndarray, student_ids: np.ndarray) -> np.ndarray:
+    return (course_ids.astype(np.int64) << 32) | student_ids.astype(np.int64)
+
+
+def _lookup(keys: np.ndarray, course_ids: Sequence[int], student_ids: Sequence[int]):
+    """
+    Positions in the sorted ``keys`` of the given pairs, and a mask of the
+    pairs that are present.
+    """
+    wanted = _pair_keys(np.asarray(course_ids, dtype=np.int64), np.asarray(student_ids, dtype=np.int64))
+    pos = np.minimum(np.searchsorted(keys, wanted), len(keys) - 1)
+    found = keys[pos] == wanted
+    return pos[found], found
+
+
+def _columns(rows: List[tuple], count: int) -> List[list]:
+    return [list(col) for col in zip(*rows)] if rows else [[] for _ in range(count)]
+
+
+def compute_scores(db: Session, course_ids: Sequence[int], weights: Dict[str, float], now: datetime) -> dict:
+    """
+    Score every enrolled pair of ``course_ids``. Returns the pair ids and
+    the per-pair arrays that ``score_courses`` stores.
+    """
+    enrolled = db.execute(
+        select(models.Enrollment.course_id, models.Enrollment.student_id)
+        .where(models.Enrollment.course_id.in_(course_ids), models.Enrollment.status == "enrolled")
+    ).all()
+    pair_course, pair_student = (np.asarray(col, dtype=np.int64) for col in _columns(enrolled, 2))
+    order = np.argsort(_pair_keys(pair_course, pair_student), kind="stable")
+    pair_course, pair_student = pair_course[order], pair_student[order]
+    keys = _pair_keys(pair_course, pair_student)
+    n = len(keys)
+    if n == 0:
+        empty = np.zeros(0)
+        return {
+            "course_id": pair_course, "student_id": pair_student, "score": empty, "attendance_rate": empty,
+            "grade_average": empty, "grade_trend": empty, "missing_count": empty, "past_due_count": empty,
+        }
+
+    # Attendance: records and attended records per pair
+    attendance = db.execute(
+        select(
+            models.Attendance.course_id,
+            models.Attendance.student_id,
+            func.count(),
+            func.sum(case((models.Attendance.status.in_(ATTENDED_STATUSES), 1), else_=0)),
+        )
+        .where(models.Attendance.course_id.in_(course_ids))
+        .group_by(models.Attendance.course_id, models.Attendance.student_id)
+    ).all()
+    a_course, a_student, a_total, a_present = _columns(attendance, 4)
+    att_total, att_present = np.zeros(n), np.zeros(n)
+    pos, found = _lookup(keys, a_course, a_student)
+    att_total[pos] = np.asarray(a_total, dtype=float)[found]
+    att_present[pos] = np.asarray(a_present, dtype=float)[found]
+
+    # Grades: one row per grade, reduced to per-pair regression sums
+    grades = db.execute(
+        select(models.Assignment.course_id, models.Grade.student_id, models.Grade.grade_value, models.Grade.graded_at)
+        .join(models.Assignment, models.Assignment.id == models.Grade.assignment_id)
+        .where(models.Assignment.course_id.in_(course_ids))
+    ).all()
+    g_course, g_student, g_value, g_time = _columns(grades, 4)
+    values, inverse = np.unique(np.asarray(g_value, dtype=object).astype(str), return_inverse=True)
+    percent_of = np.array([np.nan if (p := grade_to_percent(v)) is None else p for v in values], dtype=float)
+    percent = percent_of[inverse].reshape(-1) if len(values) else np.zeros(0)
+    days = np.array([t.timestamp() / 86400.0 for t in g_time], dtype=float)
+    pos, found = _lookup(keys, g_course, g_student)
+    percent, days = percent[found], days[found]
+    usable = ~np.isnan(percent)
+    pos, percent, days = pos[usable], percent[usable], days[usable]
+    if len(days):
+        days -= days.min()
+    g_n = np.bincount(pos, minlength=n).astype(float)
+    g_sy = np.bincount(pos, weights=percent, minlength=n)
+    g_sx = np.bincount(pos, weights=days, minlength=n)
+    g_sxx = np.bincount(pos, weights=days * days, minlength=n)
+    g_sxy = np.bincount(pos, weights=days * percent, minlength=n)
+
+    # Past-due assignments per course, and those each student has handed in or been graded on
+    past_due = db.execute(
+        select(models.Assignment.course_id, func.count())
+        .where(models.Assignment.course_id.in_(course_ids), models.Assignment.due_date < now)
+        .group_by(models.Assignment.course_id)
+    ).all()
+    due = np.zeros(n)
+    if past_due:
+        due_courses, due_counts = (np.asarray(col, dtype=np.int64) for col in zip(*past_due))
+        order = np.argsort(due_courses)
+        due_courses, due_counts = due_courses[order], due_counts[order]
+        pos = np.minimum(np.searchsorted(due_courses, pair_course), len(due_courses) - 1)
+        hit = due_courses[pos] == pair_course
+        due[hit] = due_counts[pos[hit]]
+
+    handed_in = union(
+        select(models.Submission.assignment_id, models.Submission.student_id),
+        select(models.Grade.assignment_id, models.Grade.student_id),
+    ).subquery()
+    done_rows = db.execute(
+        select(models.Assignment.course_id, handed_in.c.student_id, func.count())
+        .join(handed_in, handed_in.c.assignment_id == models.Assignment.id)
+        .where(models.Assignment.course_id.in_(course_ids), models.Assignment.due_date < now)
+        .group_by(models.Assignment.course_id, handed_in.c.student_id)
+    ).all()
+    d_course, d_student, d_count = _columns(done_rows, 3)
+    done = np.zeros(n)
+    pos, found = _lookup(keys, d_course, d_student)
+    done[pos] = np.asarray(d_count, dtype=float)[found]
+    missing = np.clip(due - done, 0, None)
+
+    # Components and masks of the pairs that have data for them
+    with np.errstate(divide="ignore", invalid="ignore"):
+        has_att = att_total > 0
+        attendance_rate = np.where(has_att, att_present / att_total, np.nan)
+
+        has_grades = g_n > 0
+        grade_average = np.where(has_grades, g_sy / g_n, np.nan)
+        denominator = g_n * g_sxx - g_sx * g_sx
+        has_trend = (g_n >= 2) & (denominator > 1e-9)
+        grade_trend = np.where(has_trend, (g_n * g_sxy - g_sx * g_sy) / denominator * 7.0, np.nan)
+
+        has_due = due > 0
+        missing_rate = np.where(has_due, missing / due, np.nan)
+
+    span = max(RISK_GOOD_PERCENT - PASS_PERCENT, 1e-9)
+    components = {
+        "attendance": (np.nan_to_num(1.0 - attendance_rate), has_att),
+        "grades": (np.clip((RISK_GOOD_PERCENT - np.nan_to_num(grade_average)) / span, 0.0, 1.0), has_grades),
+        "trend": (np.clip(-np.nan_to_num(grade_trend) / RISK_TREND_SCALE, 0.0, 1.0), has_trend),
+        "missing": (np.nan_to_num(missing_rate), has_due),
+    }
+    weighted, weight_sum = np.zeros(n), np.zeros(n)
+    for name, (risk, mask) in components.items():
+        w = weights.get(name, 0.0) * mask
+        weighted += w * risk
+        weight_sum += w
+    score = np.divide(weighted, weight_sum, out=np.zeros(n), where=weight_sum > 0)
+
+    return {
+        "course_id": pair_course,
+        "student_id": pair_student,
+        "score": score,
+        "attendance_rate": attendance_rate,
+        "grade_average": grade_average,
+        "grade_trend": grade_trend,
+        "missing_count": missing,
+        "past_due_count": due,
+    }
+
+
+def _rows(scores: dict, now: datetime) -> List[dict]:
+    def nullable(values: np.ndarray) -> list:
+        return [None if np.isnan(v) else round(float(v), 4) for v in values]
+
+    columns = {
+        "course_id": scores["course_id"].tolist(),
+        "student_id": scores["student_id"].tolist(),
+        "score": np.round(scores["score"], 4).tolist(),
+        "attendance_rate": nullable(scores["attendance_rate"]),
+        "grade_average": nullable(scores["grade_average"]),
+        "grade_trend": nullable(scores["grade_trend"]),
+        "missing_count": scores["missing_count"].astype(int).tolist(),
+        "past_due_count": scores["past_due_count"].astype(int).tolist(),
+    }
+    return [
+        {**{key: values[i] for key, values in columns.items()}, "computed_at": now}
+        for i in range(len(columns["course_id"]))
+    ]
+
+
+def score_courses(
+    db: Session,
+    course_ids: Iterable[int],
+    weights: Optional[Dict[str, float]] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> dict:
+    """
+    Recompute and store the scores of ``course_ids``, ``RISK_CHUNK_COURSES``
+    courses per transaction (commits each chunk). Returns counts.
+    """
+    weights = validate_weights(weights)
+    course_ids = sorted(set(course_ids))
+    scored = 0
+    for start in range(0, len(course_ids), RISK_CHUNK_COURSES):
+        chunk = course_ids[start:start + RISK_CHUNK_COURSES]
+        now = datetime.utcnow()
+        rows = _rows(compute_scores(db, chunk, weights, now), now)
+        db.execute(delete(models.RiskScore).where(models.RiskScore.course_id.in_(chunk)))
+        if rows:
+            db.execute(insert(models.RiskScore), rows)
+        db.commit()
+        scored += len(rows)
+        if progress:
+            progress(min(start + len(chunk), len(course_ids)), len(course_ids))
+    return {"courses": len(course_ids), "scored": scored}
+
+
+def course_ids_for(db: Session, department_id: Optional[int] = None) -> List[int]:
+    query = select(models.Course.id)
+    if department_id is not None:
+        query = query.where(models.Course.department_id == department_id)
+    return list(db.execute(query).scalars())
+
+
+# ---------------------------------------------------------------------------
+# Scheduling
+# ---------------------------------------------------------------------------
+
+def schedule_nightly(db: Session, current_job_id: Optional[int] = None) -> Optional[models.Job]:
+    return jobs.schedule_daily(db, "risk.nightly", RISK_NIGHTLY_HOUR, current_job_id)
+
+
+def _affected_courses(session: Session) -> set:
+    course_ids, assignment_ids = set(), set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, models.Attendance):
+            course_ids.add(obj.course_id)
+        elif isinstance(obj, (models.Grade, models.Submission)):
+            assignment_ids.add(obj.assignment_id)
+    assignment_ids.discard(None)
+    if assignment_ids:
+        course_ids.update(session.connection().execute(
+            select(models.Assignment.course_id).where(models.Assignment.id.in_(assignment_ids))
+        ).scalars())
+    course_ids.discard(None)
+    return course_ids
+
+
+def _request_rescore(session: Session, flush_context) -> None:
+    course_ids = _affected_courses(session)
+    if not course_ids:
+        return
+
+    connection = session.connection()
+    now = datetime.utcnow()
+    # Fold into a rescore job this hook queued that has not started yet, if
+    # there is one. Jobs from POST /risk/recompute (created_by_id set; may
+    # carry department_id or weights) are never rewritten.
+    pending = connection.execute(
+        select(models.Job.id, models.Job.payload)
+        .where(
+            models.Job.kind == "risk.score",
+            models.Job.status == "queued",
+            models.Job.run_after > now,
+            models.Job.created_by_id.is_(None),
+        )
+        .order_by(models.Job.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    ).first()
+    if pending and set(pending.payload or {}) == {"course_ids"}:
+        merged = sorted(course_ids | set(pending.payload.get("course_ids", [])))
+        connection.execute(
+            update(models.Job).where(models.Job.id == pending.id).values(payload={"course_ids": merged})
+        )
+        return
+    connection.execute(insert(models.Job).values(
+        kind="risk.score",
+        payload={"course_ids": sorted(course_ids)},
+        status="queued",
+        priority=-1,
+        max_attempts=3,
+        run_after=now + timedelta(seconds=RISK_RESCORE_DELAY),
+    ))
+
+
+def install(session_factory) -> None:
+    """
+    Queue rescoring of courses whose grades, attendance or submissions are
+    changed through sessions of ``session_factory``.
+    """
+    if RISK_ENABLED and not event.contains(session_factory, "after_flush", _request_rescore):
+        event.listen(session_factory, "after_flush", _request_rescore)
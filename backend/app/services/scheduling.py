@@ -0,0 +1,585 @@
+# app/services/scheduling.py
+"""
+Timetable generation: assign every weekly session of a set of courses to a
+time slot and a room.
+
+Hard constraints (each violation costs ``HARD``):
+    * a room hosts at most one session per slot
+    * a teacher teaches at most one session per slot
+    * the room holds the course (capacity >= expected size)
+    * courses with a ``room_type`` (e.g. "lab") get a room of that type
+
+Soft preferences: a course's sessions fall on different days, sessions use
+the smallest room that fits, and ordinary courses stay out of labs.
+
+``TimetableSolver`` builds a greedy solution (hardest sessions first, best
+fitting free room) and improves it with simulated annealing over move and
+swap neighbourhoods. Occupancy counters make each move's cost change O(1),
+so hundreds of thousands of moves fit in the time budget.
+"""
+
+import math
+import random
+import time as _time
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.services.bulk_load import bulk_insert
+
+HARD = 1000.0
+SAME_DAY = 10.0
+LAB_MISUSE = 2.0
+WASTE = 1.0  # scaled by the unused share of the room
+
+UNASSIGNED = -1
+
+
+class TimeGrid(NamedTuple):
+    """
+    Weekly grid of ``days`` x ``periods``; slot ``t`` is day ``t // periods``.
+    """
+    days: int = 5
+    periods: int = 8
+    day_start: time = time(9, 0)
+    period_minutes: int = 60
+
+    @property
+    def slots(self) -> int:
+        return self.days * self.periods
+
+    def day_of(self, t: int) -> int:
+        return t // self.periods
+
+    def bounds(self, t: int) -> Tuple[time, time]:
+        start = datetime.combine(date.min, self.day_start) + timedelta(
+            minutes=(t % self.periods) * self.period_minutes
+        )
+        return start.time(), (start + timedelta(minutes=self.period_minutes)).time()
+
+    def slots_overlapping(self, day_of_week: int, start: time, end: time) -> List[int]:
+        if day_of_week >= self.days:
+            return []
+        base = datetime.combine(date.min, self.day_start)
+        result = []
+        for p in range(self.periods):
+            p_start = (base + timedelta(minutes=p * self.period_minutes)).time()
+            p_end = (base + timedelta(minutes=(p + 1) * self.period_minutes)).time()
+            if p_start < end and start < p_end:
+                result.append(day_of_week * self.periods + p)
+        return result
+
+
+class SessionSpec(NamedTuple):
+    course_id: int
+    teacher_id: int
+    size: int
+    room_type: Optional[str] = None
+
+
+class RoomSpec(NamedTuple):
+    id: int
+    capacity: Optional[int]
+    type: str
+
+
+class SolveResult(NamedTuple):
+    assignments: List[Tuple[int, int]]  # per session: (slot, room id) or (-1, -1)
+    hard_violations: int
+    soft_cost: float
+    unplaceable: List[int]  # sessions with no suitable room at all
+    iterations: int
+    elapsed: float
+
+
+class TimetableSolver:
+    def __init__(
+        self,
+        sessions: Sequence[SessionSpec],
+        rooms: Sequence[RoomSpec],
+        grid: TimeGrid = TimeGrid(),
+        blocked_rooms: Iterable[Tuple[int, int]] = (),
+        blocked_teachers: Iterable[Tuple[int, int]] = (),
+        seed: int = 0,
+    ):
+        """
+        ``blocked_rooms`` / ``blocked_teachers`` are (room id | teacher id, slot)
+        pairs already taken by courses outside this run.
+        """
+        self.sessions = list(sessions)
+        self.rooms = list(rooms)
+        self.grid = grid
+        self.n_slots = grid.slots
+        self.rng = random.Random(seed)
+
+        room_index = {room.id: r for r, room in enumerate(self.rooms)}
+
+        # Feasible rooms per session, best fit (smallest adequate) first
+        self.feasible: List[List[int]] = []
+        self.feasible_sets: List[Set[int]] = []
+        self.penalty: List[Dict[int, float]] = []
+        for s in self.sessions:
+            rooms_ok = []
+            for r, room in enumerate(self.rooms):
+                if room.capacity is not None and room.capacity < s.size:
+                    continue
+                if s.room_type is not None and room.type != s.room_type:
+                    continue
+                rooms_ok.append(r)
+            rooms_ok.sort(key=lambda r: (self.rooms[r].capacity is None, self.rooms[r].capacity or 0))
+            self.feasible.append(rooms_ok)
+            self.feasible_sets.append(set(rooms_ok))
+            self.penalty.append({r: self._room_penalty(s, self.rooms[r]) for r in rooms_ok})
+
+        self.slot = [UNASSIGNED] * len(self.sessions)
+        self.room = [UNASSIGNED] * len(self.sessions)
+
+        # Occupancy counters; cost is derived from them incrementally
+        self.room_occ = [0] * (len(self.rooms) * self.n_slots)
+        self.room_cells: Dict[int, List[int]] = defaultdict(list)
+        self.teacher_occ: Dict[Tuple[int, int], int] = defaultdict(int)
+        self.course_day: Dict[Tuple[int, int], int] = defaultdict(int)
+        for room_id, t in blocked_rooms:
+            if room_id in room_index and 0 <= t < self.n_slots:
+                self.room_occ[room_index[room_id] * self.n_slots + t] += 1
+        for teacher_id, t in blocked_teachers:
+            self.teacher_occ[(teacher_id, t)] += 1
+
+        self.hard = 0
+        self.soft = 0.0
+
+    @staticmethod
+    def _room_penalty(s: SessionSpec, room: RoomSpec) -> float:
+        penalty = 0.0
+        if room.capacity:
+            penalty += WASTE * (room.capacity - s.size) / room.capacity
+        if s.room_type is None and room.type == "lab":
+            penalty += LAB_MISUSE
+        return penalty
+
+    # -- incremental bookkeeping ------------------------------------------
+
+    def _place(self, i: int, t: int, r: int) -> float:
+        s = self.sessions[i]
+        cell = r * self.n_slots + t
+        tkey = (s.teacher_id, t)
+        dkey = (s.course_id, self.grid.day_of(t))
+
+        hard = (self.room_occ[cell] >= 1) + (self.teacher_occ[tkey] >= 1)
+        soft = SAME_DAY * (self.course_day[dkey] >= 1) + self.penalty[i][r]
+
+        self.room_occ[cell] += 1
+        self.room_cells[cell].append(i)
+        self.teacher_occ[tkey] += 1
+        self.course_day[dkey] += 1
+        self.slot[i], self.room[i] = t, r
+        self.hard += hard
+        self.soft += soft
+        return HARD * hard + soft
+
+    def _unplace(self, i: int) -> float:
+        t, r = self.slot[i], self.room[i]
+        s = self.sessions[i]
+        cell = r * self.n_slots + t
+        tkey = (s.teacher_id, t)
+        dkey = (s.course_id, self.grid.day_of(t))
+
+        self.room_occ[cell] -= 1
+        self.room_cells[cell].remove(i)
+        self.teacher_occ[tkey] -= 1
+        self.course_day[dkey] -= 1
+
+        hard = (self.room_occ[cell] >= 1) + (self.teacher_occ[tkey] >= 1)
+        soft = SAME_DAY * (self.course_day[dkey] >= 1) + self.penalty[i][r]
+        self.slot[i] = self.room[i] = UNASSIGNED
+        self.hard -= hard
+        self.soft -= soft
+        return -(HARD * hard + soft)
+
+    def _place_cost(self, i: int, t: int, r: int) -> float:
+        s = self.sessions[i]
+        hard = (self.room_occ[r * self.n_slots + t] >= 1) + (self.teacher_occ[(s.teacher_id, t)] >= 1)
+        return HARD * hard + SAME_DAY * (self.course_day[(s.course_id, self.grid.day_of(t))] >= 1) + self.penalty[i][r]
+
+    def _conflicted(self, i: int) -> bool:
+        t = self.slot[i]
+        s = self.sessions[i]
+        return (
+            self.room_occ[self.room[i] * self.n_slots + t] > 1
+            or self.teacher_occ[(s.teacher_id, t)] > 1
+            or self.course_day[(s.course_id, self.grid.day_of(t))] > 1
+        )
+
+    @property
+    def cost(self) -> float:
+        return HARD * self.hard + self.soft
+
+    # -- construction -------------------------------------------------------
+
+    def _first_free_room(self, i: int, t: int) -> int:
+        for r in self.feasible[i]:
+            if self.room_occ[r * self.n_slots + t] == 0:
+                return r
+        return self.feasible[i][0]
+
+    def construct(self) -> None:
+        """
+        Greedy: most constrained sessions first (fewest rooms, largest
+        size), each into the cheapest slot with its best fitting free room.
+        """
+        order = sorted(
+            (i for i in range(len(self.sessions)) if self.feasible[i]),
+            key=lambda i: (len(self.feasible[i]), -self.sessions[i].size),
+        )
+        offset = 0
+        for i in order:
+            best = None
+            for k in range(self.n_slots):
+                t = (offset + k) % self.n_slots
+                r = self._first_free_room(i, t)
+                c = self._place_cost(i, t, r)
+                if best is None or c < best[0]:
+                    best = (c, t, r)
+                    if c < SAME_DAY:
+                        break
+            offset += 1
+            self._place(i, best[1], best[2])
+
+    # -- improvement ------------------------------------------------------
+
+    def _pick(self, placed: List[int]) -> int:
+        for _ in range(8):
+            i = placed[self.rng.randrange(len(placed))]
+            if self._conflicted(i):
+                return i
+        return placed[self.rng.randrange(len(placed))]
+
+    def improve(self, time_limit: float, start_temp: float = 50.0) -> int:
+        """
+        Simulated annealing until the time limit or a solution with no hard
+        violations that has stopped improving. Returns the iteration count.
+        """
+        placed = [i for i in range(len(self.sessions)) if self.feasible[i]]
+        if not placed:
+            return 0
+
+        best_cost = self.cost
+        best = (self.slot[:], self.room[:])
+        started = _time.monotonic()
+        deadline = started + time_limit
+        iterations = 0
+        since_best = 0
+        temp = start_temp
+        patience = max(20_000, 20 * len(placed))
+
+        while True:
+            iterations += 1
+            if iterations & 255 == 0:
+                now = _time.monotonic()
+                if now >= deadline or (self.hard == 0 and since_best > patience):
+                    break
+                temp = start_temp * max(1e-3, 1 - (now - started) / time_limit)
+
+            i = self._pick(placed)
+            old_t, old_r = self.slot[i], self.room[i]
+            t = self.rng.randrange(self.n_slots)
+            r = self._first_free_room(i, t) if self.rng.random() < 0.8 else self.rng.choice(self.feasible[i])
+
+            occupants = [j for j in self.room_cells[r * self.n_slots + t] if j != i]
+            j = occupants[0] if occupants and old_r in self.feasible_sets[occupants[0]] else None
+
+            delta = self._unplace(i)
+            if j is not None:
+                # Swap: the occupant moves into i's old slot and room
+                delta += self._unplace(j)
+                delta += self._place(j, old_t, old_r)
+            delta += self._place(i, t, r)
+
+            if delta <= 0 or self.rng.random() < math.exp(-delta / temp):
+                if self.cost < best_cost - 1e-9:
+                    best_cost = self.cost
+                    best = (self.slot[:], self.room[:])
+                    since_best = 0
+                else:
+                    since_best += 1
+                continue
+
+            # Reject: restore
+            since_best += 1
+            self._unplace(i)
+            if j is not None:
+                self._unplace(j)
+                self._place(j, t, r)
+            self._place(i, old_t, old_r)
+
+        self._restore(*best)
+        return iterations
+
+    def _restore(self, slots: List[int], rooms: List[int]) -> None:
+        for i in range(len(self.sessions)):
+            if self.slot[i] != UNASSIGNED:
+                self._unplace(i)
+        for i, (t, r) in enumerate(zip(slots, rooms)):
+            if t != UNASSIGNED:
+                self._place(i, t, r)
+
+    def solve(self, time_limit: float = 50.0) -> SolveResult:
+        started = _time.monotonic()
+        self.construct()
+        iterations = self.improve(max(0.0, time_limit - (_time.monotonic() - started)))
+        return SolveResult(
+            assignments=[
+                (t, self.rooms[r].id) if t != UNASSIGNED else (UNASSIGNED, UNASSIGNED)
+                for t, r in zip(self.slot, self.room)
+            ],
+            hard_violations=self.hard,
+            soft_cost=round(self.soft, 2),
+            unplaceable=[i for i in range(len(self.sessions)) if not self.feasible[i]],
+            iterations=iterations,
+            elapsed=_time.monotonic() - started,
+        )
+
+
+# ---------------------------------------------------------------------------
+# Database integration
+# ---------------------------------------------------------------------------
+
+
+def sessions_per_week(course: models.Course) -> int:
+    return course.sessions_per_week or course.credits or 1
+
+
+def term_bounds(term_start: date, weeks: int) -> Tuple[datetime, datetime]:
+    """[start, end) of a term of ``weeks`` weeks, starting on the Monday of ``term_start``'s week."""
+    monday = term_start - timedelta(days=term_start.weekday())
+    return datetime.combine(monday, time.min), datetime.combine(monday + timedelta(weeks=weeks), time.min)
+
+
+def load_problem(
+    db: Session,
+    grid: TimeGrid,
+    department_id: Optional[int] = None,
+    term_start: Optional[date] = None,
+    weeks: Optional[int] = None,
+) -> dict:
+    """
+    Courses to schedule (one ``SessionSpec`` per weekly session), candidate
+    rooms (active resources of the department or shared ones) and the room
+    and teacher slots already taken by meetings of other courses. Given a
+    term, approved ad-hoc bookings (not tied to a course) during it also
+    block their room's slot, in every week, since sessions repeat weekly.
+
+    A course's expected size is its enrollment count, or its capacity when
+    that is larger, so the room still fits once registration fills up.
+    """
+    courses_q = select(models.Course)
+    rooms_q = select(models.Resource).where(models.Resource.is_active.is_(True))
+    if department_id is not None:
+        courses_q = courses_q.where(models.Course.department_id == department_id)
+        rooms_q = rooms_q.where(
+            (models.Resource.department_id == department_id) | models.Resource.department_id.is_(None)
+        )
+    courses = db.execute(courses_q.order_by(models.Course.id)).scalars().all()
+    course_ids = [c.id for c in courses]
+
+    enrolled = {
+        cid: n
+        for cid, n in db.execute(
+            select(models.Enrollment.course_id, func.count())
+            .where(models.Enrollment.status == "enrolled")
+            .group_by(models.Enrollment.course_id)
+        )
+    }
+
+    sessions = []
+    for course in courses:
+        size = max(enrolled.get(course.id, 0), course.capacity or 0)
+        for _ in range(sessions_per_week(course)):
+            sessions.append(SessionSpec(course.id, course.teacher_id, size, course.room_type))
+
+    rooms = [
+        RoomSpec(res.id, res.capacity, res.type)
+        for res in db.execute(rooms_q.order_by(models.Resource.id)).scalars()
+    ]
+
+    blocked_rooms, blocked_teachers = [], []
+    other = select(
+        models.CourseMeeting.resource_id,
+        models.Course.teacher_id,
+        models.CourseMeeting.day_of_week,
+        models.CourseMeeting.start_time,
+        models.CourseMeeting.end_time,
+    ).join(models.Course, models.Course.id == models.CourseMeeting.course_id)
+    if course_ids:
+        other = other.where(models.CourseMeeting.course_id.not_in(course_ids))
+    for resource_id, teacher_id, day, start, end in db.execute(other):
+        for t in grid.slots_overlapping(day, start, end):
+            if resource_id is not None:
+                blocked_rooms.append((resource_id, t))
+            blocked_teachers.append((teacher_id, t))
+
+    if term_start is not None and weeks:
+        start_at, end_at = term_bounds(term_start, weeks)
+        booked = select(models.Booking.resource_id, models.Booking.start_time, models.Booking.end_time).where(
+            models.Booking.course_id.is_(None),
+            models.Booking.status == "approved",
+            models.Booking.start_time < end_at,
+            models.Booking.end_time > start_at,
+        )
+        taken = set()
+        for resource_id, start, end in db.execute(booked):
+            on = start.date()
+            while on <= end.date():
+                day_start = start.time() if on == start.date() else time.min
+                day_end = end.time() if on == end.date() else time.max
+                taken.update((resource_id, t) for t in grid.slots_overlapping(on.weekday(), day_start, day_end))
+                on += timedelta(days=1)
+        blocked_rooms.extend(sorted(taken))
+
+    return {
+        "course_ids": course_ids,
+        "sessions": sessions,
+        "rooms": rooms,
+        "blocked_rooms": blocked_rooms,
+        "blocked_teachers": blocked_teachers,
+    }
+
+
+def write_timetable(
+    db: Session,
+    problem: dict,
+    result: SolveResult,
+    grid: TimeGrid,
+    term_start: date,
+    weeks: int,
+    booked_by_id: int,
+) -> Dict[str, int]:
+    """
+    Replace the meetings of the scheduled courses and their room bookings
+    for the term with the solution, using bulk inserts: one meeting row per
+    session and one approved ``Booking`` per session per week. Does not commit.
+    """
+    course_ids = problem["course_ids"]
+    start_at, term_end = term_bounds(term_start, weeks)
+    term_start = start_at.date()  # Monday
+    codes = {}
+
+    if course_ids:
+        codes = {
+            cid: code
+            for cid, code in db.execute(
+                select(models.Course.id, models.Course.code).where(models.Course.id.in_(course_ids))
+            )
+        }
+        db.execute(models.CourseMeeting.__table__.delete().where(models.CourseMeeting.course_id.in_(course_ids)))
+        db.execute(
+            models.Booking.__table__.delete().where(
+                models.Booking.course_id.in_(course_ids),
+                models.Booking.start_time >= start_at,
+                models.Booking.start_time < term_end,
+            )
+        )
+
+    meetings, bookings = [], []
+    for session, (t, room_id) in zip(problem["sessions"], result.assignments):
+        if t == UNASSIGNED:
+            continue
+        day = grid.day_of(t)
+        start, end = grid.bounds(t)
+        meetings.append((session.course_id, room_id, day, start, end))
+        for week in range(weeks):
+            on = term_start + timedelta(weeks=week, days=day)
+            bookings.append(
+                (
+                    room_id,
+                    booked_by_id,
+                    session.course_id,
+                    datetime.combine(on, start),
+                    datetime.combine(on, end),
+                    f"{codes.get(session.course_id, session.course_id)} class",
+                    "approved",
+                )
+            )
+
+    conn = db.connection()
+    written_meetings = bulk_insert(
+        conn,
+        models.CourseMeeting.__table__,
+        ("course_id", "resource_id", "day_of_week", "start_time", "end_time"),
+        meetings,
+    )
+    written_bookings = bulk_insert(
+        conn,
+        models.Booking.__table__,
+        ("resource_id", "booked_by_id", "course_id", "start_time", "end_time", "purpose", "status"),
+        bookings,
+    )
+    return {"meetings": written_meetings, "bookings": written_bookings}
+
+
+def generate_timetable(
+    db: Session,
+    grid: TimeGrid,
+    term_start: date,
+    weeks: int,
+    booked_by_id: int,
+    department_id: Optional[int] = None,
+    time_limit: float = 50.0,
+    seed: int = 0,
+    dry_run: bool = False,
+    progress: Optional[Callable[[float, str], None]] = None,
+) -> dict:
+    """
+    Load, solve and (unless ``dry_run``) write a timetable; returns a
+    summary. An incomplete solution is never written: with hard violations
+    (double-booked rooms or teachers, rooms that don't fit) or sessions
+    left unassigned (``unplaceable``: no suitable room at all), the summary
+    has ``written`` False and the existing timetable stays as it was, since
+    writing replaces every scheduled course's meetings.
+    ``progress(fraction, message)`` is called between phases. Does not
+    commit.
+    """
+    report = progress or (lambda fraction, message: None)
+
+    problem = load_problem(db, grid, department_id, term_start, weeks)
+    report(0.05, f"Loaded {len(problem['sessions'])} sessions and {len(problem['rooms'])} rooms.")
+    summary = {
+        "courses": len(problem["course_ids"]),
+        "sessions": len(problem["sessions"]),
+        "rooms": len(problem["rooms"]),
+    }
+    if not problem["sessions"]:
+        return summary
+
+    solver = TimetableSolver(
+        problem["sessions"],
+        problem["rooms"],
+        grid,
+        blocked_rooms=problem["blocked_rooms"],
+        blocked_teachers=problem["blocked_teachers"],
+        seed=seed,
+    )
+    result = solver.solve(time_limit)
+    report(0.9, f"Solved with {result.hard_violations} hard violations.")
+    summary.update(
+        hard_violations=result.hard_violations,
+        soft_cost=result.soft_cost,
+        unplaceable=[
+            {"course_id": problem["sessions"][i].course_id, "size": problem["sessions"][i].size}
+            for i in result.unplaceable
+        ],
+        iterations=result.iterations,
+        solve_seconds=round(result.elapsed, 2),
+    )
+
+    unassigned = sum(1 for t, _ in result.assignments if t == UNASSIGNED)
+    summary["written"] = not dry_run and not result.hard_violations and not unassigned
+    if summary["written"]:
+        summary.update(write_timetable(db, problem, result, grid, term_start, weeks, booked_by_id))
+    elif not dry_run:
+        report(1.0, f"Not written: {result.hard_violations} hard violations, {unassigned} sessions without a room.")
+    return summary
@@ -0,0 +1,211 @@
+# app/services/storage.py
+"""
+Content-addressed file storage.
+
+Blobs are written to a temporary file while their SHA-256 is computed,
+then stored under their digest (``<aa>/<bb>/<sha256>``). Identical uploads
+therefore share one stored object; the database rows referencing a blob
+hold its digest.
+
+``STORAGE_BACKEND`` picks where blobs live:
+
+* ``local`` (default): files under ``STORAGE_DIR``. The final rename is
+  atomic, so readers never see partial blobs, and downloads are served
+  straight from disk.
+* ``s3``: an S3-compatible bucket (requires boto3). Uploads are spooled to
+  ``STORAGE_DIR/tmp`` and put once the digest is known; downloads are
+  redirected to short-lived presigned URLs, so the bucket serves the bytes
+  (and Range requests) instead of the app.
+"""
+
+import hashlib
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from typing import BinaryIO, Optional, Tuple
+
+from dotenv import load_dotenv
+
+try:
+    import boto3
+except ImportError:  # only needed for STORAGE_BACKEND=s3
+    boto3 = None
+
+load_dotenv()
+
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "local")
+STORAGE_DIR = os.getenv("STORAGE_DIR", "artifacts/blobs")
+STORAGE_S3_BUCKET = os.getenv("STORAGE_S3_BUCKET", "")
+STORAGE_S3_PREFIX = os.getenv("STORAGE_S3_PREFIX", "blobs/")
+STORAGE_S3_ENDPOINT_URL = os.getenv("STORAGE_S3_ENDPOINT_URL") or None
+STORAGE_S3_URL_TTL = int(os.getenv("STORAGE_S3_URL_TTL", "300"))
+
+
+class BlobTooLarge(Exception):
+    pass
+
+
+class BlobWriter:
+    """
+    Streams one blob to a temporary file. Call ``write`` per chunk, then
+    ``commit`` (or ``abort`` on error). Exceeding ``max_bytes`` raises
+    ``BlobTooLarge`` before the offending chunk is written.
+    """
+
+    def __init__(self, store: "BlobStore", max_bytes: Optional[int] = None):
+        self.store = store
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._hash = hashlib.sha256()
+        os.makedirs(store.tmp_dir, exist_ok=True)
+        fd, self._tmp_path = tempfile.mkstemp(dir=store.tmp_dir)
+        self._file = os.fdopen(fd, "wb")
+
+    def write(self, data: bytes) -> None:
+        if self.max_bytes is not None and self.size + len(data) > self.max_bytes:
+            raise BlobTooLarge()
+        self.size += len(data)
+        self._hash.update(data)
+        self._file.write(data)
+
+    def commit(self) -> Tuple[str, int]:
+        """
+        Finish the blob; returns (sha256 hex digest, size).
+        """
+        self._file.close()
+        digest = self._hash.hexdigest()
+        try:
+            self.store.put(self._tmp_path, digest)
+        finally:
+            if os.path.exists(self._tmp_path):
+                os.unlink(self._tmp_path)
+        return digest, self.size
+
+    def abort(self) -> None:
+        self._file.close()
+        try:
+            os.unlink(self._tmp_path)
+        except FileNotFoundError:
+            pass
+
+
+class BlobStore(ABC):
+    """
+    Interface shared by the storage backends. ``put``, ``exists`` and
+    ``open`` are abstract, so a backend missing one fails when it is
+    constructed rather than on the first upload.
+    """
+
+    tmp_dir: str
+
+    def key(self, digest: str) -> str:
+        return f"{digest[:2]}/{digest[2:4]}/{digest}"
+
+    def writer(self, max_bytes: Optional[int] = None) -> BlobWriter:
+        return BlobWriter(self, max_bytes)
+
+    @abstractmethod
+    def put(self, tmp_path: str, digest: str) -> None:
+        """
+        Store the finished temporary file under ``digest``. The caller
+        removes ``tmp_path`` afterwards if it is still there.
+        """
+
+    @abstractmethod
+    def exists(self, digest: str) -> bool:
+        ...
+
+    @abstractmethod
+    def open(self, digest: str) -> BinaryIO:
+        """
+        Readable binary stream of the blob's contents.
+        """
+
+    def local_path(self, digest: str) -> Optional[str]:
+        """
+        Path of the blob on this machine's disk, if the backend has one.
+        """
+        return None
+
+    def url(self, digest: str, filename: str, content_type: str) -> Optional[str]:
+        """
+        URL clients can download the blob from directly, if the backend
+        offers one.
+        """
+        return None
+
+
+class LocalBlobStore(BlobStore):
+    def __init__(self, root: str):
+        self.root = root
+        self.tmp_dir = os.path.join(root, "tmp")
+
+    def path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    def put(self, tmp_path: str, digest: str) -> None:
+        path = self.path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp_path, path)
+
+    def exists(self, digest: str) -> bool:
+        return os.path.isfile(self.path(digest))
+
+    def open(self, digest: str) -> BinaryIO:
+        return open(self.path(digest), "rb")
+
+    def local_path(self, digest: str) -> Optional[str]:
+        path = self.path(digest)
+        return path if os.path.isfile(path) else None
+
+
+class S3BlobStore(BlobStore):
+    def __init__(self, bucket: str, prefix: str = "", endpoint_url: Optional[str] = None, tmp_dir: str = STORAGE_DIR):
+        if boto3 is None:
+            raise RuntimeError("STORAGE_BACKEND=s3 requires boto3.")
+        self.bucket = bucket
+        self.prefix = prefix
+        self.tmp_dir = os.path.join(tmp_dir, "tmp")
+        self._client = boto3.client("s3", endpoint_url=endpoint_url)
+
+    def key(self, digest: str) -> str:
+        return self.prefix + super().key(digest)
+
+    def put(self, tmp_path: str, digest: str) -> None:
+        if not self.exists(digest):
+            self._client.upload_file(tmp_path, self.bucket, self.key(digest))
+
+    def exists(self, digest: str) -> bool:
+        try:
+            self._client.head_object(Bucket=self.bucket, Key=self.key(digest))
+        except self._client.exceptions.ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+        return True
+
+    def open(self, digest: str) -> BinaryIO:
+        return self._client.get_object(Bucket=self.bucket, Key=self.key(digest))["Body"]
+
+    def url(self, digest: str, filename: str, content_type: str) -> Optional[str]:
+        safe_name = filename.replace('"', "")
+        return self._client.generate_presigned_url(
+            "get_object",
+            Params={
+                "Bucket": self.bucket,
+                "Key": self.key(digest),
+                "ResponseContentType": content_type,
+                "ResponseContentDisposition": f'attachment; filename="{safe_name}"',
+            },
+            ExpiresIn=STORAGE_S3_URL_TTL,
+        )
+
+
+def create_blob_store(backend: str = STORAGE_BACKEND) -> BlobStore:
+    if backend == "s3":
+        return S3BlobStore(STORAGE_S3_BUCKET, STORAGE_S3_PREFIX, STORAGE_S3_ENDPOINT_URL)
+    return LocalBlobStore(STORAGE_DIR)
+
+
+blob_store = create_blob_store()
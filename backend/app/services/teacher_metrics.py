@@ -0,0 +1,228 @@
+# app/services/teacher_metrics.py
+"""
+Teacher performance metrics per term, for HOD dashboards.
+
+For every (teacher, term, department) — the teacher of a course, terms as
+in ``app.services.trends.TERM_STARTS`` — ``compute`` derives:
+
+* ``pass_rate`` and ``average_percent`` of the grades given in the
+  teacher's courses (see ``app.core.grading``);
+* grading turnaround: mean hours from the assignment's due date to
+  ``graded_at`` (early grading counts as 0) and the share graded later than
+  ``GRADING_TARGET_DAYS``;
+* attendance-marking regularity: per course, the share of weeks between
+  the first and last marked session of the term with at least one marked
+  session, averaged over the teacher's courses.
+
+Grades and (per course and day) attendance sessions are each read once
+with a server-side cursor and folded into fixed-size per-key accumulators,
+so a pass is linear in the data and its memory is bounded by the number of
+(teacher, term) keys and sessions. ``snapshot`` replaces the stored rows in
+``teacher_metric_snapshots``, which dashboards read directly.
+"""
+
+import os
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.grading import PASS_PERCENT, grade_to_percent
+from app.services import jobs
+from app.services.trends import TERMS, period_of
+
+load_dotenv()
+
+GRADING_TARGET_DAYS = float(os.getenv("GRADING_TARGET_DAYS", "7"))
+METRICS_CHUNK_ROWS = int(os.getenv("METRICS_CHUNK_ROWS", "20000"))
+METRICS_NIGHTLY_HOUR = int(os.getenv("METRICS_NIGHTLY_HOUR", "3"))  # UTC
+
+Key = Tuple[int, str, int]  # (teacher_id, term, department_id)
+
+
+class _Accumulator:
+    __slots__ = (
+        "courses", "grades", "scored", "percent_sum", "passes",
+        "timed", "turnaround_hours", "late", "sessions", "course_weeks",
+    )
+
+    def __init__(self):
+        self.courses = set()
+        self.grades = 0
+        self.scored = 0
+        self.percent_sum = 0.0
+        self.passes = 0
+        self.timed = 0
+        self.turnaround_hours = 0.0
+        self.late = 0
+        self.sessions = 0
+        # course_id -> [first week start, last week start, weeks with a session]
+        self.course_weeks: Dict[int, list] = {}
+
+    def row(self, key: Key, now: datetime) -> dict:
+        teacher_id, term, department_id = key
+        regularity = [
+            weeks / ((last - first).days // 7 + 1)
+            for first, last, weeks in self.course_weeks.values()
+        ]
+        return {
+            "teacher_id": teacher_id,
+            "term": term,
+            "department_id": department_id,
+            "courses": len(self.courses),
+            "grades": self.grades,
+            "pass_rate": round(self.passes / self.scored, 4) if self.scored else None,
+            "average_percent": round(self.percent_sum / self.scored, 2) if self.scored else None,
+            "turnaround_hours": round(self.turnaround_hours / self.timed, 1) if self.timed else None,
+            "late_grading_rate": round(self.late / self.timed, 4) if self.timed else None,
+            "attendance_sessions": self.sessions,
+            "attendance_regularity": round(sum(regularity) / len(regularity), 4) if regularity else None,
+            "computed_at": now,
+        }
+
+
+def _count(db: Session, query) -> int:
+    return db.execute(select(func.count()).select_from(query.subquery())).scalar_one()
+
+
+def _stream(db: Session, query) -> Iterable[List[tuple]]:
+    result = db.execute(query, execution_options={"yield_per": METRICS_CHUNK_ROWS})
+    for partition in result.partitions():
+        yield partition
+
+
+def compute(
+    db: Session,
+    department_id: Optional[int] = None,
+    progress: Optional[Callable[[float, str], None]] = None,
+) -> Dict[Key, _Accumulator]:
+    """
+    ``progress(fraction, message)``, if given, is called after each chunk:
+    the grades pass covers 0-0.5 and the attendance pass 0.5-1.0, each
+    against a row count taken just before it.
+    """
+    stats: Dict[Key, _Accumulator] = defaultdict(_Accumulator)
+    terms: Dict[date, str] = {}
+    percents: Dict[str, Optional[float]] = {}
+    target_hours = GRADING_TARGET_DAYS * 24.0
+
+    def term_of(day: date) -> str:
+        term = terms.get(day)
+        if term is None:
+            term = terms[day] = period_of(day, "term")[1]
+        return term
+
+    grades = (
+        select(
+            models.Course.id,
+            models.Course.teacher_id,
+            models.Course.department_id,
+            models.Assignment.due_date,
+            models.Grade.graded_at,
+            models.Grade.grade_value,
+        )
+        .join(models.Assignment, models.Assignment.id == models.Grade.assignment_id)
+        .join(models.Course, models.Course.id == models.Assignment.course_id)
+    )
+    if department_id is not None:
+        grades = grades.where(models.Course.department_id == department_id)
+
+    seen, total = 0, _count(db, grades) if progress else 0
+    for partition in _stream(db, grades):
+        for course_id, teacher_id, dept_id, due_date, graded_at, value in partition:
+            acc = stats[(teacher_id, term_of((due_date or graded_at).date()), dept_id)]
+            acc.courses.add(course_id)
+            acc.grades += 1
+            if value not in percents:
+                percents[value] = grade_to_percent(value)
+            percent = percents[value]
+            if percent is not None:
+                acc.scored += 1
+                acc.percent_sum += percent
+                acc.passes += percent >= PASS_PERCENT
+            if due_date is not None:
+                hours = max(0.0, (graded_at - due_date).total_seconds() / 3600.0)
+                acc.timed += 1
+                acc.turnaround_hours += hours
+                acc.late += hours > target_hours
+        seen += len(partition)
+        if progress:
+            progress(0.5 * seen / max(total, seen, 1), f"{seen}/{total} grades")
+
+    # One row per marked session (course, day), in date order per course
+    day = models.Attendance.date
+    sessions = (
+        select(models.Course.id, models.Course.teacher_id, models.Course.department_id, day)
+        .join(models.Course, models.Course.id == models.Attendance.course_id)
+        .group_by(models.Course.id, models.Course.teacher_id, models.Course.department_id, day)
+        .order_by(models.Course.id, day)
+    )
+    if department_id is not None:
+        sessions = sessions.where(models.Course.department_id == department_id)
+
+    seen, total = 0, _count(db, sessions) if progress else 0
+    for partition in _stream(db, sessions):
+        for course_id, teacher_id, dept_id, session_day in partition:
+            acc = stats[(teacher_id, term_of(session_day), dept_id)]
+            acc.courses.add(course_id)
+            acc.sessions += 1
+            week = date.fromordinal(session_day.toordinal() - session_day.weekday())
+            weeks = acc.course_weeks.get(course_id)
+            if weeks is None:
+                acc.course_weeks[course_id] = [week, week, 1]
+            elif week != weeks[1]:
+                weeks[1], weeks[2] = week, weeks[2] + 1
+        seen += len(partition)
+        if progress:
+            progress(0.5 + 0.5 * seen / max(total, seen, 1), f"{seen}/{total} attendance sessions")
+
+    return stats
+
+
+def snapshot(
+    db: Session,
+    department_id: Optional[int] = None,
+    progress: Optional[Callable[[float, str], None]] = None,
+) -> dict:
+    """
+    Recompute all metrics (or one department's) and replace the stored
+    snapshot rows. Does not commit.
+    """
+    stats = compute(db, department_id, progress)
+    now = datetime.utcnow()
+    rows = [acc.row(key, now) for key, acc in stats.items()]
+
+    clear = delete(models.TeacherMetricSnapshot)
+    if department_id is not None:
+        clear = clear.where(models.TeacherMetricSnapshot.department_id == department_id)
+    db.execute(clear)
+    if rows:
+        db.execute(insert(models.TeacherMetricSnapshot), rows)
+    return {"rows": len(rows), "teachers": len({row["teacher_id"] for row in rows})}
+
+
+def schedule_nightly(db: Session, current_job_id: Optional[int] = None) -> Optional[models.Job]:
+    return jobs.schedule_daily(
+        db, "metrics.teachers", METRICS_NIGHTLY_HOUR, current_job_id, payload={"nightly": True}
+    )
+
+
+def latest_term(db: Session, department_id: Optional[int] = None) -> Optional[str]:
+    """
+    The most recent term with a snapshot (terms sort by their start date).
+    """
+    query = select(models.TeacherMetricSnapshot.term).distinct()
+    if department_id is not None:
+        query = query.where(models.TeacherMetricSnapshot.department_id == department_id)
+    labels = list(db.execute(query).scalars())
+    return max(labels, key=_term_sort_key, default=None)
+
+
+def _term_sort_key(label: str) -> Tuple[int, int]:
+    year, _, name = label.partition(" ")
+    order = {term_name: i for i, (_, _, term_name) in enumerate(TERMS)}
+    return int(year), order.get(name, -1)
@@ -0,0 +1,192 @@
+# app/services/timetable.py
+
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import time
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app import models
+
+Meeting = models.CourseMeeting
+
+MINUTES_PER_DAY = 24 * 60
+DAY_NAMES = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+# (start, end, course_id) in minutes since Monday 00:00; end is exclusive
+Slot = Tuple[int, int, int]
+
+
+def week_minutes(day_of_week: int, at: time) -> int:
+    return day_of_week * MINUTES_PER_DAY + at.hour * 60 + at.minute
+
+
+def format_slot(start: int, end: int) -> str:
+    day, start_min = divmod(start, MINUTES_PER_DAY)
+    end_min = end - day * MINUTES_PER_DAY
+    return f"{DAY_NAMES[day]} {start_min // 60:02d}:{start_min % 60:02d}-{end_min // 60:02d}:{end_min % 60:02d}"
+
+
+class StudentTimetable:
+    """
+    A student's weekly slots as disjoint blocks sorted by start time, kept in
+    parallel lists so both ends can be binary searched.
+
+    Blocks never overlap: slots that do (legacy data, or a course's own
+    meetings) are merged into one block that keeps its member slots.
+    Finding the slots a new interval clashes with is two bisections, i.e.
+    O(log n) plus the size of the blocks hit.
+    """
+
+    __slots__ = ("starts", "ends", "members")
+
+    def __init__(self):
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        self.members: List[List[Slot]] = []
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def _overlapping(self, start: int, end: int) -> range:
+        # First block ending after ``start`` .. last block starting before ``end``
+        return range(bisect_right(self.ends, start), bisect_left(self.starts, end))
+
+    def clashes(self, start: int, end: int) -> Set[int]:
+        """
+        Course ids whose slots overlap ``[start, end)``.
+        """
+        found: Set[int] = set()
+        for i in self._overlapping(start, end):
+            for slot_start, slot_end, course_id in self.members[i]:
+                if slot_start < end and start < slot_end:
+                    found.add(course_id)
+        return found
+
+    def add(self, start: int, end: int, course_id: int) -> None:
+        hit = self._overlapping(start, end)
+        slot = (start, end, course_id)
+        if not hit:
+            i = hit.start
+            self.starts.insert(i, start)
+            self.ends.insert(i, end)
+            self.members.insert(i, [slot])
+            return
+
+        lo, hi = hit.start, hit.stop
+        merged = [slot]
+        for i in hit:
+            merged.extend(self.members[i])
+        self.starts[lo:hi] = [min(start, self.starts[lo])]
+        self.ends[lo:hi] = [max(end, self.ends[hi - 1])]
+        self.members[lo:hi] = [merged]
+
+    def clashes_for_course(self, slots: Sequence[Slot]) -> List[dict]:
+        """
+        Clashes between a course's slots and this timetable (not including
+        the course itself), one entry per conflicting course and slot.
+        """
+        result = []
+        for start, end, course_id in slots:
+            for other in sorted(self.clashes(start, end) - {course_id}):
+                result.append({"course_id": course_id, "conflicts_with": other, "slot": format_slot(start, end)})
+        return result
+
+
+def course_slots(db: Session, course_ids: Iterable[int]) -> Dict[int, List[Slot]]:
+    course_ids = list(set(course_ids))
+    slots: Dict[int, List[Slot]] = {cid: [] for cid in course_ids}
+    if not course_ids:
+        return slots
+    rows = db.execute(
+        select(Meeting.course_id, Meeting.day_of_week, Meeting.start_time, Meeting.end_time)
+        .where(Meeting.course_id.in_(course_ids))
+    )
+    for course_id, day, start, end in rows:
+        slots[course_id].append((week_minutes(day, start), week_minutes(day, end), course_id))
+    for course in slots.values():
+        course.sort()
+    return slots
+
+
+def load_timetables(
+    db: Session,
+    student_ids: Iterable[int],
+    exclude_course_ids: Iterable[int] = (),
+) -> Dict[int, StudentTimetable]:
+    """
+    Build the timetables of many students with one query over their current
+    ("enrolled") enrollments joined to the meeting slots.
+    """
+    student_ids = list(set(student_ids))
+    timetables: Dict[int, StudentTimetable] = {sid: StudentTimetable() for sid in student_ids}
+    if not student_ids:
+        return timetables
+
+    query = (
+        select(
+            models.Enrollment.student_id,
+            Meeting.course_id,
+            Meeting.day_of_week,
+            Meeting.start_time,
+            Meeting.end_time,
+        )
+        .join(Meeting, Meeting.course_id == models.Enrollment.course_id)
+        .where(
+            models.Enrollment.student_id.in_(student_ids),
+            models.Enrollment.status == "enrolled",
+        )
+    )
+    exclude = list(exclude_course_ids)
+    if exclude:
+        query = query.where(models.Enrollment.course_id.not_in(exclude))
+
+    for student_id, course_id, day, start, end in db.execute(query):
+        timetables[student_id].add(week_minutes(day, start), week_minutes(day, end), course_id)
+    return timetables
+
+
+def enrollment_clashes(db: Session, student_id: int, course_id: int) -> List[dict]:
+    """
+    Clashes a single new enrollment would introduce into the student's week.
+    """
+    slots = course_slots(db, [course_id])[course_id]
+    if not slots:
+        return []
+    timetable = load_timetables(db, [student_id], exclude_course_ids=[course_id])[student_id]
+    return timetable.clashes_for_course(slots)
+
+
+def validate_cohort(
+    db: Session,
+    student_ids: Sequence[int],
+    course_ids: Sequence[int],
+    skip: Iterable[Tuple[int, int]] = (),
+) -> Dict[Tuple[int, int], List[dict]]:
+    """
+    Check a whole cohort in one pass: two queries, then for each student the
+    new courses are added in order, so clashes among the new courses are
+    found as well as clashes with existing enrollments. Returns the clashes
+    of every (student, course) pair; a clashing course is not added to the
+    student's timetable, so it does not block the courses after it.
+    Pairs in ``skip`` (rejected for other reasons) are neither checked nor
+    added.
+    """
+    slots = course_slots(db, course_ids)
+    timetables = load_timetables(db, student_ids)
+    skip = set(skip)
+
+    result: Dict[Tuple[int, int], List[dict]] = defaultdict(list)
+    for sid in student_ids:
+        timetable = timetables[sid]
+        for cid in course_ids:
+            if (sid, cid) in skip:
+                continue
+            clashes = timetable.clashes_for_course(slots[cid])
+            result[(sid, cid)] = clashes
+            if not clashes:
+                for start, end, course_id in slots[cid]:
+                    timetable.add(start, end, course_id)
+    return result
@@ -0,0 +1,279 @@
+# app/services/trends.py
+"""
+Enrollment trends from a daily rollup.
+
+``enrollment_daily_counts`` holds, per course and day, how many current
+enrollments were created that day (i.e. ``GROUP BY course_id,
+date(created_at)`` over ``enrollments``), with the course's department
+copied in. A flush listener (``install``) keeps it in step with
+enrollments added, deleted or moved through the ORM, and with courses
+changing department; ``rebuild`` recomputes it from scratch (after bulk
+loads, or to repair drift from rows removed by database-level cascades,
+e.g. when a user is deleted).
+
+Trend queries read only the rollup: rows are summed per day and group in
+SQL and folded into weeks or terms here.
+"""
+
+import os
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import delete, event, func, insert, inspect, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app import models
+
+load_dotenv()
+
+ROLLUPS_ENABLED = os.getenv("ENROLLMENT_ROLLUPS_ENABLED", "1") == "1"
+# Academic terms as "MM-DD:Name" start dates, in calendar order
+TERM_STARTS = os.getenv("TERM_STARTS", "01-01:Spring,06-01:Summer,08-15:Fall")
+
+Rollup = models.EnrollmentDailyCount
+
+
+def _parse_terms(spec: str) -> List[Tuple[int, int, str]]:
+    terms = []
+    for item in spec.split(","):
+        start, _, name = item.strip().partition(":")
+        month, day = (int(part) for part in start.split("-"))
+        terms.append((month, day, name.strip() or start))
+    return sorted(terms)
+
+
+TERMS = _parse_terms(TERM_STARTS)
+
+
+def period_of(day: date, granularity: str) -> Tuple[date, str]:
+    """
+    (start date, label) of the day/week/term containing ``day``.
+    """
+    if granularity == "day":
+        return day, day.isoformat()
+    if granularity == "week":
+        start = day - timedelta(days=day.weekday())
+        year, week, _ = start.isocalendar()
+        return start, f"{year}-W{week:02d}"
+    # Last term start on or before the day; before the first one, the previous year's last term
+    year, current = day.year, None
+    for month, start_day, name in TERMS:
+        if (month, start_day) <= (day.month, day.day):
+            current = (month, start_day, name)
+    if current is None:
+        year -= 1
+        current = TERMS[-1]
+    month, start_day, name = current
+    return date(year, month, start_day), f"{year} {name}"
+
+
+# ---------------------------------------------------------------------------
+# Maintenance
+# ---------------------------------------------------------------------------
+
+def _day(value) -> Optional[date]:
+    if value is None:
+        return None
+    return value.date() if isinstance(value, datetime) else value
+
+
+def _apply(connection, deltas: Dict[Tuple[int, date], int]) -> None:
+    """
+    Add ``deltas`` (keyed by (course_id, day)) to the rollup.
+    """
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    course_ids = {course_id for course_id, _ in deltas}
+    departments = dict(connection.execute(
+        select(models.Course.id, models.Course.department_id).where(models.Course.id.in_(course_ids))
+    ).all())
+    rows = [
+        {"course_id": course_id, "day": day, "department_id": departments[course_id], "enrollments": delta}
+        for (course_id, day), delta in sorted(deltas.items())
+        if course_id in departments
+    ]
+    if not rows:
+        return
+
+    # Enrollments into one course are already serialised on its seat row,
+    # so the upsert's row lock does not add contention
+    dialect = connection.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        upsert = (postgresql if dialect == "postgresql" else sqlite).insert(Rollup)
+        connection.execute(
+            upsert.on_conflict_do_update(
+                index_elements=[Rollup.course_id, Rollup.day],
+                set_={"enrollments": Rollup.enrollments + upsert.excluded["enrollments"]},
+            ),
+            rows,
+        )
+    else:
+        for row in rows:
+            updated = connection.execute(
+                update(Rollup)
+                .where(Rollup.course_id == row["course_id"], Rollup.day == row["day"])
+                .values(enrollments=Rollup.enrollments + row["enrollments"])
+            ).rowcount
+            if not updated:
+                connection.execute(insert(Rollup), [row])
+
+    if any(delta < 0 for delta in deltas.values()):
+        connection.execute(delete(Rollup).where(Rollup.course_id.in_(course_ids), Rollup.enrollments <= 0))
+
+
+def _history(state, key: str):
+    history = state.attrs[key].history
+    old = history.deleted[0] if history.deleted else getattr(state.obj(), key)
+    return old, getattr(state.obj(), key)
+
+
+def _record_enrollments(session: Session, flush_context) -> None:
+    deltas: Dict[Tuple[int, date], int] = defaultdict(int)
+    moved_courses = []
+
+    for obj in session.new:
+        if isinstance(obj, models.Enrollment) and obj.created_at is not None:
+            deltas[(obj.course_id, _day(obj.created_at))] += 1
+    for obj in session.deleted:
+        if isinstance(obj, models.Enrollment):
+            state = inspect(obj)
+            course_id, _ = _history(state, "course_id")
+            created_at, _ = _history(state, "created_at")
+            if created_at is not None:
+                deltas[(course_id, _day(created_at))] -= 1
+    for obj in session.dirty:
+        if isinstance(obj, models.Enrollment):
+            state = inspect(obj)
+            old_course, new_course = _history(state, "course_id")
+            old_created, new_created = _history(state, "created_at")
+            if (old_course, _day(old_created)) != (new_course, _day(new_created)):
+                if old_created is not None:
+                    deltas[(old_course, _day(old_created))] -= 1
+                if new_created is not None:
+                    deltas[(new_course, _day(new_created))] += 1
+        elif isinstance(obj, models.Course):
+            old_dept, new_dept = _history(inspect(obj), "department_id")
+            if old_dept != new_dept:
+                moved_courses.append((obj.id, new_dept))
+
+    connection = session.connection()
+    _apply(connection, deltas)
+    for course_id, department_id in moved_courses:
+        move_course(connection, course_id, department_id)
+
+
+def move_course(connection, course_id: int, department_id: Optional[int]) -> None:
+    """
+    Re-file a course's rollup rows under its new department. Called by the
+    flush listener, and directly by writes that bypass the unit of work.
+    """
+    connection.execute(update(Rollup).where(Rollup.course_id == course_id).values(department_id=department_id))
+
+
+def install(session_factory) -> None:
+    """
+    Maintain the rollup for changes made through sessions of
+    ``session_factory``.
+    """
+    if ROLLUPS_ENABLED and not event.contains(session_factory, "after_flush", _record_enrollments):
+        event.listen(session_factory, "after_flush", _record_enrollments)
+
+
+def rebuild(conn, course_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Recompute the rollup (or the rows of ``course_ids``) from
+    ``enrollments`` in one INSERT ... SELECT. Does not commit; returns the
+    number of rollup rows written.
+    """
+    day = func.date(models.Enrollment.created_at)
+    source = (
+        select(
+            models.Enrollment.course_id,
+            day,
+            models.Course.department_id,
+            func.count(),
+        )
+        .join(models.Course, models.Course.id == models.Enrollment.course_id)
+        .where(models.Enrollment.created_at.is_not(None))
+        .group_by(models.Enrollment.course_id, day, models.Course.department_id)
+    )
+    clear = delete(Rollup)
+    if course_ids is not None:
+        course_ids = list(course_ids)
+        source = source.where(models.Enrollment.course_id.in_(course_ids))
+        clear = clear.where(Rollup.course_id.in_(course_ids))
+
+    conn.execute(clear)
+    conn.execute(insert(Rollup).from_select(["course_id", "day", "department_id", "enrollments"], source))
+    query = select(func.count()).select_from(Rollup)
+    if course_ids is not None:
+        query = query.where(Rollup.course_id.in_(course_ids))
+    return conn.execute(query).scalar_one()
+
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+
+def enrollment_trends(
+    db: Session,
+    granularity: str = "week",
+    group_by: str = "department",
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    department_id: Optional[int] = None,
+    course_id: Optional[int] = None,
+) -> List[dict]:
+    """
+    Enrollment counts per period (``day``/``week``/``term``), one series per
+    department, per course, or overall (``group_by="none"``). ``end`` is
+    inclusive. Empty periods are omitted.
+    """
+    group_column = {"department": Rollup.department_id, "course": Rollup.course_id}.get(group_by)
+    columns = [Rollup.day, func.sum(Rollup.enrollments)]
+    if group_column is not None:
+        columns.insert(0, group_column)
+    query = select(*columns).group_by(*([group_column] if group_column is not None else []), Rollup.day)
+    if start is not None:
+        query = query.where(Rollup.day >= start)
+    if end is not None:
+        query = query.where(Rollup.day <= end)
+    if department_id is not None:
+        query = query.where(Rollup.department_id == department_id)
+    if course_id is not None:
+        query = query.where(Rollup.course_id == course_id)
+
+    buckets: Dict[Optional[int], Dict[date, list]] = defaultdict(dict)
+    for row in db.execute(query):
+        key, day, count = (row[0], row[1], row[2]) if group_column is not None else (None, row[0], row[1])
+        day = date.fromisoformat(day) if isinstance(day, str) else day
+        period_start, label = period_of(day, granularity)
+        bucket = buckets[key].setdefault(period_start, [label, 0])
+        bucket[1] += int(count)
+
+    names = {}
+    if group_by == "department" and buckets:
+        names = dict(db.execute(
+            select(models.Department.id, models.Department.name).where(models.Department.id.in_(list(buckets)))
+        ).all())
+    elif group_by == "course" and buckets:
+        names = dict(db.execute(
+            select(models.Course.id, models.Course.code).where(models.Course.id.in_(list(buckets)))
+        ).all())
+
+    return [
+        {
+            "group_id": key,
+            "group_name": names.get(key) if key is not None else "All",
+            "total": sum(count for _, count in periods.values()),
+            "points": [
+                {"period": label, "start": period_start, "count": count}
+                for period_start, (label, count) in sorted(periods.items())
+            ],
+        }
+        for key, periods in sorted(buckets.items(), key=lambda item: (item[0] is None, item[0] or 0))
+    ]
@@ -0,0 +1,173 @@
+# app/services/writes.py
+"""
+Write paths that take one statement each.
+
+``insert`` flushes a new object: a single ``INSERT ... RETURNING id`` (all
+other defaults are computed client-side). ``update`` is a conditional
+``UPDATE ... WHERE id = :id [AND ...] RETURNING``, joined to the row's
+pre-update self so the same statement also returns the previous values of
+the columns it writes (SQLite cannot return them from a joined table, so
+there they are read first). Neither loads the row, and uniqueness and
+foreign keys are left to the database: an ``IntegrityError`` is mapped
+back to the 400 the caller describes (``unique`` / ``foreign_keys``:
+column name, or tuple of names, -> detail) instead of being pre-checked
+with SELECTs. ``commit`` keeps the written objects loaded, so responding
+with them needs no refresh.
+
+``update`` bypasses the unit of work, so the flush listeners never see it;
+it records the audit entry itself, and callers handle any other follow-up
+(e.g. ``trends.move_course``).
+"""
+
+import re
+from typing import Dict, NamedTuple, Optional, Tuple, Union
+
+from fastapi import HTTPException, status
+from sqlalchemy import select, update as sql_update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.services import audit
+
+Columns = Union[str, Tuple[str, ...]]
+
+# PostgreSQL error detail: 'Key (code)=(CS) already exists.'
+_PG_KEY = re.compile(r"Key \((.*?)\)=")
+_PG_STATES = {"23505": "unique", "23503": "foreign_key"}
+
+
+class Updated(NamedTuple):
+    obj: object
+    previous: dict  # column -> value before the update, for the columns written
+
+
+def violation(error: IntegrityError) -> Tuple[Optional[str], Tuple[str, ...]]:
+    """
+    ("unique" or "foreign_key", column names) of a constraint violation,
+    or (None, ()) if it is neither. SQLite does not say which foreign key
+    failed, so its column list is empty.
+    """
+    orig = error.orig
+    diag = getattr(orig, "diag", None)
+    if diag is not None:  # psycopg / psycopg2
+        state = getattr(orig, "sqlstate", None) or getattr(orig, "pgcode", None)
+        match = _PG_KEY.search(diag.message_detail or "")
+        columns = tuple(name.strip().strip('"') for name in match.group(1).split(",")) if match else ()
+        return _PG_STATES.get(state), columns
+
+    message = str(orig)
+    if message.startswith("UNIQUE constraint failed:"):
+        return "unique", tuple(
+            name.strip().rsplit(".", 1)[-1] for name in message.split(":", 1)[1].split(",")
+        )
+    if message.startswith("FOREIGN KEY constraint failed"):
+        return "foreign_key", ()
+    return None, ()
+
+
+def _detail(
+    error: IntegrityError,
+    unique: Optional[Dict[Columns, str]],
+    foreign_keys: Optional[Dict[Columns, str]],
+) -> Optional[str]:
+    kind, columns = violation(error)
+    messages = {"unique": unique, "foreign_key": foreign_keys}.get(kind) or {}
+    for key, detail in messages.items():
+        if set((key,) if isinstance(key, str) else key) == set(columns):
+            return detail
+    if kind == "foreign_key" and not columns and len(messages) == 1:
+        return next(iter(messages.values()))
+    return None
+
+
+def _rollback_and_raise(db: Session, error: IntegrityError, unique, foreign_keys) -> None:
+    db.rollback()
+    detail = _detail(error, unique, foreign_keys)
+    if detail is None:
+        raise error
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+def insert(
+    db: Session,
+    obj,
+    unique: Optional[Dict[Columns, str]] = None,
+    foreign_keys: Optional[Dict[Columns, str]] = None,
+):
+    """
+    Add and flush ``obj``. On a mapped violation the whole transaction is
+    rolled back and a 400 raised. Does not commit.
+    """
+    db.add(obj)
+    try:
+        db.flush()
+    except IntegrityError as error:
+        _rollback_and_raise(db, error, unique, foreign_keys)
+    return obj
+
+
+def update(
+    db: Session,
+    model,
+    id: int,
+    values: dict,
+    *where,
+    unique: Optional[Dict[Columns, str]] = None,
+    foreign_keys: Optional[Dict[Columns, str]] = None,
+) -> Optional[Updated]:
+    """
+    Set ``values`` on row ``id`` of ``model`` if it also matches the extra
+    ``where`` conditions (e.g. ``etags.if_match``). Increments the row's
+    version, if the model has one. Returns the updated object with the
+    previous values, or None if no row matched (nothing was written). With
+    no values this is a plain lookup. Does not commit.
+    """
+    if not values:
+        obj = db.query(model).filter(model.id == id, *where).first()
+        return Updated(obj, {}) if obj is not None else None
+
+    version = model.__mapper__.version_id_col
+    if version is not None:
+        # Core-style UPDATEs skip the mapper's versioning; bump it here
+        values = {**values, version.key: version + 1}
+
+    keys = list(values)
+    statement = sql_update(model).where(model.id == id, *where).values(values)
+    before = None
+    if db.get_bind().dialect.name == "sqlite":
+        # SQLite's RETURNING cannot read the FROM tables: fetch the old values first
+        before = db.execute(
+            select(*(model.__table__.c[key] for key in keys)).where(model.id == id, *where)
+        ).first()
+        if before is None:
+            return None
+        statement = statement.returning(model)
+    else:
+        old = model.__table__.alias("old")
+        statement = statement.where(old.c.id == model.id).returning(model, *(old.c[key] for key in keys))
+
+    try:
+        row = db.execute(
+            statement.execution_options(synchronize_session=False, populate_existing=True)
+        ).first()
+    except IntegrityError as error:
+        _rollback_and_raise(db, error, unique, foreign_keys)
+    if row is None:
+        return None
+
+    obj, previous = row[0], dict(zip(keys, before if before is not None else row[1:]))
+    audit.record_update(db, obj, previous)
+    return Updated(obj, previous)
+
+
+def commit(db: Session) -> None:
+    """
+    Commit without expiring the session's objects: what was just written
+    (and returned) is what they hold, so serializing them needs no SELECT.
+    """
+    expire_on_commit = db.expire_on_commit
+    db.expire_on_commit = False
+    try:
+        db.commit()
+    finally:
+        db.expire_on_commit = expire_on_commit
@@ -0,0 +1,124 @@
+# app/tasks.py
+"""
+Background job handlers. Importing this module registers them with
+``app.services.jobs``; the worker (``python -m app.worker``) does so at startup.
+"""
+
+from datetime import date, datetime
+
+from app.services import notifications, purge, registration, reports, risk, scheduling, teacher_metrics
+from app.services.jobs import JobContext, PermanentJobError, job_handler
+
+
+@job_handler("enrollments.bulk")
+def bulk_enroll(ctx: JobContext, payload: dict):
+    results = registration.bulk_enroll(
+        ctx.db,
+        payload["student_ids"],
+        payload["course_ids"],
+        dry_run=payload.get("dry_run", False),
+        progress=lambda done, total: ctx.progress(done, total, f"{done}/{total} pairs"),
+    )
+    summary = {}
+    for r in results:
+        summary[r["status"]] = summary.get(r["status"], 0) + 1
+    return {"summary": summary, "results": results}
+
+
+@job_handler("timetable.generate")
+def generate_timetable(ctx: JobContext, payload: dict):
+    if ctx.created_by_id is None:
+        raise PermanentJobError("Timetable jobs need a requesting user to record on bookings.")
+
+    grid = scheduling.TimeGrid(
+        days=payload.get("days", 5),
+        periods=payload.get("periods", 8),
+        day_start=datetime.strptime(payload.get("day_start", "09:00"), "%H:%M").time(),
+        period_minutes=payload.get("period_minutes", 60),
+    )
+    return scheduling.generate_timetable(
+        ctx.db,
+        grid,
+        date.fromisoformat(payload["term_start"]),
+        payload.get("weeks", 16),
+        ctx.created_by_id,
+        department_id=payload.get("department_id"),
+        time_limit=payload.get("time_limit", 50.0),
+        seed=payload.get("seed", 0),
+        dry_run=payload.get("dry_run", False),
+        progress=lambda fraction, message: ctx.progress(fraction, 1.0, message),
+    )
+
+
+@job_handler("reports.generate")
+def generate_reports(ctx: JobContext, payload: dict):
+    files = reports.generate(
+        ctx.job_id,
+        payload["department_ids"],
+        payload["datasets"],
+        payload["formats"],
+        progress=lambda done, total: ctx.progress(done, total, f"{done}/{total} departments"),
+    )
+    return {"files": files}
+
+
+@job_handler("notifications.deliver")
+def deliver_notifications(ctx: JobContext, payload: dict):
+    return notifications.deliver(
+        ctx.db,
+        payload["event_id"],
+        progress=lambda done, total: ctx.progress(done, total, f"{done}/{total} e-mails"),
+    )
+
+
+@job_handler("risk.score")
+def score_risk(ctx: JobContext, payload: dict):
+    if payload.get("course_ids") is not None:
+        course_ids = payload["course_ids"]
+    else:
+        course_ids = risk.course_ids_for(ctx.db, payload.get("department_id"))
+    try:
+        weights = risk.validate_weights(payload.get("weights"))
+    except ValueError as exc:
+        raise PermanentJobError(str(exc))
+    return risk.score_courses(
+        ctx.db,
+        course_ids,
+        weights,
+        progress=lambda done, total: ctx.progress(done, total, f"{done}/{total} courses"),
+    )
+
+
+@job_handler("risk.nightly")
+def score_risk_nightly(ctx: JobContext, payload: dict):
+    result = risk.score_courses(
+        ctx.db,
+        risk.course_ids_for(ctx.db),
+        progress=lambda done, total: ctx.progress(done, total, f"{done}/{total} courses"),
+    )
+    risk.schedule_nightly(ctx.db, current_job_id=ctx.job_id)
+    return result
+
+
+@job_handler("metrics.teachers")
+def snapshot_teacher_metrics(ctx: JobContext, payload: dict):
+    result = teacher_metrics.snapshot(
+        ctx.db,
+        department_id=payload.get("department_id"),
+        progress=lambda fraction, message: ctx.progress(fraction, 1.0, message),
+    )
+    if payload.get("nightly"):
+        teacher_metrics.schedule_nightly(ctx.db, current_job_id=ctx.job_id)
+    return result
+
+
+@job_handler("purge")
+def purge_entity(ctx: JobContext, payload: dict):
+    entity, entity_id = payload["entity"], payload["id"]
+    if entity not in purge.ENTITIES:
+        raise PermanentJobError(f"Cannot purge {entity!r}.")
+    if entity == "user":
+        blockers = purge.blocking_references(ctx.db, entity_id)
+        if blockers:
+            raise PermanentJobError(f"User {entity_id} is still referenced ({', '.join(blockers)}).")
+    return purge.purge(ctx.db, entity, entity_id, progress=ctx.progress)
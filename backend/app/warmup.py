@@ -0,0 +1,86 @@
+# app/warmup.py
+
+import logging
+import time
+from typing import Callable, Dict, List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import configure_mappers
+
+from app import models
+from app.core.security import verify_password_dummy
+from app.database import SessionLocal, engine
+
+logger = logging.getLogger(__name__)
+
+WarmupStep = Callable[[], None]
+
+_steps: List[Tuple[str, WarmupStep]] = []
+
+
+def register_warmup(name: str):
+    """
+    Decorator adding a step to the worker warmup sequence. Steps run in
+    registration order before a worker starts accepting requests.
+    """
+
+    def decorator(fn: WarmupStep) -> WarmupStep:
+        _steps.append((name, fn))
+        return fn
+
+    return decorator
+
+
+@register_warmup("pool")
+def fill_connection_pool() -> None:
+    """
+    Open the pool's steady-state number of connections up front, so the
+    first requests do not pay for TCP + auth handshakes.
+    """
+    size = engine.pool.size() if hasattr(engine.pool, "size") else 1
+    connections = []
+    try:
+        for _ in range(max(1, size)):
+            conn = engine.connect()
+            conn.execute(text("SELECT 1"))
+            connections.append(conn)
+    finally:
+        for conn in connections:
+            conn.close()
+
+
+@register_warmup("bcrypt")
+def init_password_hashing() -> None:
+    """
+    Load the bcrypt backend and build the dummy hash used for unknown emails.
+    """
+    verify_password_dummy("warmup")
+
+
+@register_warmup("catalog")
+def prime_catalog() -> None:
+    """
+    Configure mappers and run the hot catalog queries once, which fills
+    SQLAlchemy's compiled-statement cache.
+    """
+    configure_mappers()
+    with SessionLocal() as db:
+        db.query(models.Department).order_by(models.Department.id).limit(1).all()
+        db.query(models.Course).order_by(models.Course.id).limit(1).all()
+        db.query(models.User).filter(models.User.id == 0).first()
+
+
+def run_warmup() -> Dict[str, float]:
+    """
+    Run every registered step; returns the duration of each in milliseconds.
+    A failing step is logged and skipped rather than keeping the worker down.
+    """
+    timings: Dict[str, float] = {}
+    for name, step in _steps:
+        started = time.perf_counter()
+        try:
+            step()
+        except Exception:
+            logger.exception("Warmup step %r failed", name)
+        timings[name] = round((time.perf_counter() - started) * 1000, 1)
+    return timings
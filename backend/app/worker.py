@@ -0,0 +1,169 @@
+# app/worker.py
+"""
+Background job worker pool.
+
+    python -m app.worker --processes 4
+
+The master forks ``--processes`` workers and replaces any that die. Each
+worker polls the ``jobs`` table (see ``app.services.jobs``), runs one job
+at a time and sleeps ``--poll-interval`` seconds when the queue is empty.
+SIGTERM/SIGINT let running jobs finish before the workers exit. Stale jobs
+of crashed workers are re-queued periodically, and the audit outbox is
+drained every ``AUDIT_DRAIN_INTERVAL`` seconds (see ``app.services.audit``).
+At startup the nightly at-risk scoring and teacher metrics jobs are queued
+if they are not already.
+"""
+
+import argparse
+import logging
+import os
+import signal
+import sys
+import time
+
+logger = logging.getLogger("app.worker")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processes", type=int, default=int(os.getenv("JOB_WORKERS", "2")))
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    parser.add_argument("--kinds", default=None, help="Comma-separated job kinds to run (default: all).")
+    parser.add_argument("--burst", action="store_true", help="Exit once the queue is empty.")
+    parser.add_argument("--log-level", default="info")
+    return parser.parse_args(argv)
+
+
+class Worker:
+    def __init__(self, args):
+        from app.services import jobs
+
+        self.jobs = jobs
+        self.args = args
+        self.kinds = [k for k in (args.kinds or "").split(",") if k] or None
+        self.name = jobs.worker_name()
+        self.stopping = False
+        self.last_stale_check = 0.0
+        self.last_drain = 0.0
+
+    def stop(self, signum, frame) -> None:
+        self.stopping = True
+
+    def requeue_stale(self) -> None:
+        now = time.monotonic()
+        if now - self.last_stale_check < self.jobs.JOB_STALE_SECONDS / 2:
+            return
+        self.last_stale_check = now
+        from app.database import SessionLocal
+
+        with SessionLocal() as db:
+            count = self.jobs.requeue_stale(db)
+        if count:
+            logger.warning("re-queued or failed %d stale jobs", count)
+
+    def drain_outbox(self) -> None:
+        from app.services import audit
+
+        now = time.monotonic()
+        if not audit.AUDIT_ENABLED or now - self.last_drain < audit.AUDIT_DRAIN_INTERVAL:
+            return
+        self.last_drain = now
+        from app.database import SessionLocal
+
+        with SessionLocal() as db:
+            count = audit.drain(db)
+        if count:
+            logger.debug("moved %d outbox events to the audit log", count)
+
+    def run(self) -> int:
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+        logger.info("worker %s polling for %s", self.name, ", ".join(self.kinds or self.jobs.registered_kinds()))
+
+        while not self.stopping:
+            try:
+                self.requeue_stale()
+                self.drain_outbox()
+                outcome = self.jobs.run_next(self.name, self.kinds)
+            except Exception:
+                logger.exception("worker loop error")
+                outcome = None
+            if outcome is None:
+                if self.args.burst:
+                    break
+                time.sleep(self.args.poll_interval)
+        return 0
+
+
+class Master:
+    def __init__(self, args):
+        self.args = args
+        self.children = set()
+        self.stopping = False
+
+    def spawn(self) -> None:
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                code = Worker(self.args).run()
+            except Exception:
+                logger.exception("worker crashed")
+                code = 1
+            finally:
+                os._exit(code)
+        self.children.add(pid)
+
+    def stop(self, signum, frame) -> None:
+        self.stopping = True
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self) -> int:
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+        for _ in range(self.args.processes):
+            self.spawn()
+
+        while self.children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+            self.children.discard(pid)
+            if not self.stopping and not self.args.burst:
+                logger.warning("worker %s exited with status %s; restarting", pid, status)
+                self.spawn()
+
+        logger.info("all workers stopped")
+        return 0
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s %(levelname)s [%(name)s] %(message)s")
+
+    import app.tasks  # noqa: F401  (registers the job handlers)
+    from app.database import SessionLocal
+    from app.services import audit, risk, teacher_metrics, trends
+
+    audit.install(SessionLocal)
+    risk.install(SessionLocal)
+    trends.install(SessionLocal)
+    with SessionLocal() as db:
+        risk.schedule_nightly(db)
+        teacher_metrics.schedule_nightly(db)
+        db.commit()
+
+    if args.processes <= 1:
+        return Worker(args).run()
+    return Master(args).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+# bench/auth_overhead.py
+"""
+Microbenchmark of per-request token handling in ``get_current_user``.
+
+Compares a full ``jwt.decode`` + ``TokenData`` construction (cache miss)
+with a verified-token cache hit, for a single session and for a pool of
+sessions larger than the cache. Usage:
+
+    python -m bench.auth_overhead --iterations 20000
+"""
+
+import argparse
+import sys
+import time
+from datetime import timedelta
+
+from app.core import auth
+from app.core.security import create_access_token
+from app.core.token_cache import VerifiedTokenCache
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20_000)
+    parser.add_argument("--sessions", type=int, default=1_000, help="Distinct tokens in the multi-session runs.")
+    return parser.parse_args(argv)
+
+
+def _time_per_call(tokens, iterations: int) -> float:
+    decode = auth.decode_access_token
+    n = len(tokens)
+    started = time.perf_counter()
+    for i in range(iterations):
+        decode(tokens[i % n])
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    tokens = [
+        create_access_token({"sub": str(i + 1), "role": "student"}, expires_delta=timedelta(hours=1))
+        for i in range(args.sessions)
+    ]
+
+    results = []
+
+    auth.token_cache = VerifiedTokenCache(max_size=0)
+    results.append(("uncached, 1 session", _time_per_call(tokens[:1], args.iterations)))
+    results.append((f"uncached, {args.sessions} sessions", _time_per_call(tokens, args.iterations)))
+
+    auth.token_cache = VerifiedTokenCache(max_size=max(10_000, args.sessions))
+    _time_per_call(tokens, len(tokens))  # warm
+    results.append(("cached, 1 session", _time_per_call(tokens[:1], args.iterations)))
+    results.append((f"cached, {args.sessions} sessions", _time_per_call(tokens, args.iterations)))
+
+    auth.token_cache = VerifiedTokenCache(max_size=args.sessions // 2)
+    results.append((f"cache thrash, {args.sessions} sessions", _time_per_call(tokens, args.iterations)))
+
+    baseline = results[0][1]
+    for label, us in results:
+        print(f"{label:<32} {us:>9.2f} us/request  ({baseline / us:>6.1f}x vs uncached)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
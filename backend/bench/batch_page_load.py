@@ -0,0 +1,158 @@
+# bench/batch_page_load.py
+"""
+Page loads as separate GETs versus one ``POST /batch``.
+
+Boots the app (with ``QUERY_STATS=1``), creates a throwaway department,
+admin, teacher, course and a few enrolled students, then loads two pages'
+data ``--iterations`` times each way:
+
+    teacher_course  /courses/{id}, /departments/, /teacher/courses/{id}/students
+    admin_courses   /departments/, /users/?role=teacher, /users/?role=hod
+
+The separate GETs are issued one after another, as a browser on a single
+connection would; the batch sends the same paths at once. For each page it
+reports p50/p95 wall time of a whole load, the statements it ran (summed
+``X-Query-Count``) and each path's status, which both ways must agree on
+(``/departments/`` is admin-only, so the teacher gets a 403 either way).
+Usage:
+
+    python -m bench.batch_page_load [--iterations 200] [--base-url http://127.0.0.1:8000]
+"""
+
+import argparse
+import sys
+import time
+import uuid
+
+import httpx
+
+from app import models
+from app.database import SessionLocal
+from app.models import UserRole
+from bench.loadtest import QUERY_COUNT_HEADER, percentile, start_server, stop_server
+from bench.registration_contention import bearer
+
+# page -> (role whose token loads it, paths formatted with the fixture ids)
+PAGES = {
+    "teacher_course": (
+        UserRole.TEACHER,
+        ["/courses/{course_id}", "/departments/", "/teacher/courses/{course_id}/students"],
+    ),
+    "admin_courses": (
+        UserRole.ADMIN,
+        ["/departments/", "/users/?role=teacher", "/users/?role=hod"],
+    ),
+}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--students", type=int, default=30, help="Students enrolled in the fixture course.")
+    parser.add_argument("--base-url", default=None, help="Use an already running server (with QUERY_STATS=1).")
+    parser.add_argument("--keep", action="store_true", help="Keep the rows the run creates.")
+    return parser.parse_args(argv)
+
+
+def prepare(tag: str, students: int) -> dict:
+    with SessionLocal() as db:
+        dept = models.Department(name=f"Batch bench {tag}", code=f"BB-{tag}")
+        db.add(dept)
+        db.flush()
+
+        def user(role: UserRole, n: int = 0) -> models.User:
+            return models.User(
+                full_name=f"Batch bench {role.value} {n}",
+                email=f"batchbench-{tag}-{role.value}-{n}@example.org",
+                password_hash="!",
+                role=role,
+                department_id=dept.id,
+            )
+
+        admin, teacher = user(UserRole.ADMIN), user(UserRole.TEACHER)
+        enrolled = [user(UserRole.STUDENT, n) for n in range(students)]
+        db.add_all([admin, teacher, *enrolled])
+        db.flush()
+        course = models.Course(code=f"BB-{tag}", name="Batch bench course", department_id=dept.id, teacher_id=teacher.id)
+        db.add(course)
+        db.flush()
+        db.add_all(models.Enrollment(student_id=student.id, course_id=course.id) for student in enrolled)
+        db.commit()
+        return {
+            "department_id": dept.id,
+            "course_id": course.id,
+            UserRole.ADMIN: admin.id,
+            UserRole.TEACHER: teacher.id,
+        }
+
+
+def cleanup(tag: str) -> None:
+    with SessionLocal() as db:
+        db.query(models.Course).filter(models.Course.code == f"BB-{tag}").delete(synchronize_session=False)
+        db.query(models.User).filter(models.User.email.like(f"batchbench-{tag}-%")).delete(synchronize_session=False)
+        db.query(models.Department).filter(models.Department.code == f"BB-{tag}").delete(synchronize_session=False)
+        db.commit()
+
+
+def _count(response) -> int:
+    count = response.headers.get(QUERY_COUNT_HEADER)
+    if count is None:
+        raise SystemExit(f"No {QUERY_COUNT_HEADER} header; start the server with QUERY_STATS=1.")
+    return int(count)
+
+
+def load_separately(client: httpx.Client, paths) -> int:
+    statements = 0
+    for path in paths:
+        statements += _count(client.get(path))
+    return statements
+
+
+def load_batched(client: httpx.Client, paths) -> int:
+    response = client.post("/batch", json={"requests": [{"method": "GET", "path": path} for path in paths]})
+    response.raise_for_status()
+    return _count(response)
+
+
+def measure(client: httpx.Client, load, paths, iterations: int) -> dict:
+    load(client, paths)  # warm
+    latencies = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        statements = load(client, paths)
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    return {"p50": percentile(latencies, 50), "p95": percentile(latencies, 95), "statements": statements}
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    tag = uuid.uuid4().hex[:8]
+    ids = prepare(tag, args.students)
+
+    proc, base_url = (None, args.base_url) if args.base_url else start_server(1)
+    try:
+        print(f"{'page':<16} {'mode':<9} {'p50 ms':>8} {'p95 ms':>8} {'statements':>11}")
+        for page, (role, paths) in PAGES.items():
+            paths = [path.format(**ids) for path in paths]
+            headers = bearer(ids[role], role.value)
+            with httpx.Client(base_url=base_url, headers=headers, timeout=30) as client:
+                statuses = [client.get(path).status_code for path in paths]
+                batch = client.post("/batch", json={"requests": [{"method": "GET", "path": p} for p in paths]})
+                if [item["status"] for item in batch.json()] != statuses:
+                    raise SystemExit(f"{page}: batch statuses differ from {statuses}: {batch.text}")
+                separate = measure(client, load_separately, paths, args.iterations)
+                batched = measure(client, load_batched, paths, args.iterations)
+            for mode, result in (("separate", separate), ("batch", batched)):
+                print(f"{page:<16} {mode:<9} {result['p50']:>8.2f} {result['p95']:>8.2f} {result['statements']:>11}")
+            print(f"{page:<16} p50 {separate['p50'] / batched['p50']:.2f}x faster batched, statuses {statuses}")
+    finally:
+        if proc is not None:
+            stop_server(proc)
+        if not args.keep:
+            cleanup(tag)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
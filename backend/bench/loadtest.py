@@ -0,0 +1,397 @@
+# bench/loadtest.py
+"""
+End-to-end load test for the API.
+
+Boots ``app.main:app`` under uvicorn (unless ``--base-url`` points at a
+running server), then drives role-based scenarios against the data loaded
+by ``scripts.generate_dataset``:
+
+    login_storm     students logging in concurrently (bcrypt bound)
+    student_browse  students listing/browsing courses and their profile
+    teacher_roster  teachers listing their courses and viewing rosters
+    admin_users     admins listing users with filters
+    mixed           80% students / 15% teachers / 5% admins at once
+
+For every route it reports RPS, p50/p95/p99 latency and SQL queries per
+request (from the ``X-Query-Count`` header enabled by QUERY_STATS=1), and
+writes the results as JSON so two runs can be compared:
+
+    python -m bench.loadtest --output before.json
+    python -m bench.loadtest --output after.json --compare before.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+import httpx
+from sqlalchemy import select
+
+from app import models
+from app.database import SessionLocal
+from app.models import UserRole
+
+QUERY_COUNT_HEADER = "x-query-count"
+
+SCENARIOS = ("login_storm", "student_browse", "teacher_roster", "admin_users", "mixed")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds per scenario.")
+    parser.add_argument("--concurrency", type=int, default=50, help="Virtual users per scenario.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="uvicorn workers to boot.")
+    parser.add_argument("--base-url", default=None, help="Use an already running server instead of booting one.")
+    parser.add_argument("--password", default="password123")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", default=None, help="Previous results file to diff against.")
+    return parser.parse_args(argv)
+
+
+# ---------------------------------------------------------------------------
+# Fixture discovery
+# ---------------------------------------------------------------------------
+
+
+def load_fixtures(limit: int = 2_000) -> dict:
+    """
+    Sample accounts and ids from the database the server is pointed at.
+    """
+    with SessionLocal() as db:
+        def emails(role):
+            return db.execute(
+                select(models.User.email)
+                .where(models.User.role == role, models.User.is_active.is_(True))
+                .order_by(models.User.id)
+                .limit(limit)
+            ).scalars().all()
+
+        teacher_courses = defaultdict(list)
+        rows = db.execute(
+            select(models.User.email, models.Course.id)
+            .join(models.Course, models.Course.teacher_id == models.User.id)
+            .where(models.User.role.in_((UserRole.TEACHER, UserRole.HOD)))
+            .order_by(models.Course.id)
+            .limit(limit * 4)
+        ).all()
+        for email, course_id in rows:
+            teacher_courses[email].append(course_id)
+
+        fixtures = {
+            "students": emails(UserRole.STUDENT),
+            "teachers": teacher_courses,
+            "admins": emails(UserRole.ADMIN),
+            "course_ids": db.execute(select(models.Course.id).limit(limit * 5)).scalars().all(),
+            "department_ids": db.execute(select(models.Department.id)).scalars().all(),
+        }
+
+    missing = [k for k in ("students", "teachers", "admins", "course_ids") if not fixtures[k]]
+    if missing:
+        raise SystemExit(f"No {', '.join(missing)} found; load data with `python -m scripts.generate_dataset` first.")
+    return fixtures
+
+
+# ---------------------------------------------------------------------------
+# Server lifecycle
+# ---------------------------------------------------------------------------
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(workers: int, extra_env=None):
+    port = _free_port()
+    env = {**os.environ, "QUERY_STATS": "1", **(extra_env or {})}
+    proc = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning", "--no-access-log",
+        ],
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit("uvicorn exited during startup.")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return proc, base_url
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    proc.terminate()
+    raise SystemExit("Server did not become healthy within 60s.")
+
+
+def stop_server(proc) -> None:
+    proc.send_signal(signal.SIGINT)
+    try:
+        proc.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+# ---------------------------------------------------------------------------
+# Virtual users
+# ---------------------------------------------------------------------------
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.queries = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    async def call(self, client: httpx.AsyncClient, label: str, method: str, url: str, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.errors[label] += 1
+            return None
+        self.latencies[label].append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            self.errors[label] += 1
+        count = response.headers.get(QUERY_COUNT_HEADER)
+        if count is not None:
+            self.queries[label].append(int(count))
+        return response
+
+
+async def login(client, recorder, email, password):
+    response = await recorder.call(
+        client, "POST /auth/login", "POST", "/auth/login", json={"email": email, "password": password}
+    )
+    if response is None or response.status_code != 200:
+        return None
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def login_storm_user(client, recorder, fx, rng, password, stop_at):
+    while time.monotonic() < stop_at:
+        await login(client, recorder, rng.choice(fx["students"]), password)
+
+
+async def student_user(client, recorder, fx, rng, password, stop_at):
+    headers = await login(client, recorder, rng.choice(fx["students"]), password)
+    if headers is None:
+        return
+    while time.monotonic() < stop_at:
+        roll = rng.random()
+        if roll < 0.4:
+            dept = rng.choice(fx["department_ids"])
+            await recorder.call(client, "GET /courses/?department_id", "GET", f"/courses/?department_id={dept}", headers=headers)
+        elif roll < 0.85:
+            course_id = rng.choice(fx["course_ids"])
+            await recorder.call(client, "GET /courses/{id}", "GET", f"/courses/{course_id}", headers=headers)
+        else:
+            await recorder.call(client, "GET /users/me", "GET", "/users/me", headers=headers)
+
+
+async def teacher_user(client, recorder, fx, rng, password, stop_at):
+    email = rng.choice(list(fx["teachers"]))
+    headers = await login(client, recorder, email, password)
+    if headers is None:
+        return
+    courses = fx["teachers"][email]
+    while time.monotonic() < stop_at:
+        if rng.random() < 0.3:
+            await recorder.call(client, "GET /teacher/courses", "GET", "/teacher/courses", headers=headers)
+        else:
+            course_id = rng.choice(courses)
+            await recorder.call(
+                client, "GET /teacher/courses/{id}/students", "GET",
+                f"/teacher/courses/{course_id}/students", headers=headers,
+            )
+
+
+async def admin_user(client, recorder, fx, rng, password, stop_at):
+    headers = await login(client, recorder, rng.choice(fx["admins"]), password)
+    if headers is None:
+        return
+    while time.monotonic() < stop_at:
+        roll = rng.random()
+        if roll < 0.5:
+            role = rng.choice(("teacher", "hod", "ta"))
+            await recorder.call(client, "GET /users/?role", "GET", f"/users/?role={role}", headers=headers)
+        else:
+            dept = rng.choice(fx["department_ids"])
+            await recorder.call(
+                client, "GET /users/?department_id&role", "GET",
+                f"/users/?department_id={dept}&role=teacher", headers=headers,
+            )
+
+
+MIX = ((student_user, 0.80), (teacher_user, 0.15), (admin_user, 0.05))
+
+SCENARIO_USERS = {
+    "login_storm": login_storm_user,
+    "student_browse": student_user,
+    "teacher_roster": teacher_user,
+    "admin_users": admin_user,
+}
+
+
+async def run_scenario(name, base_url, fx, args) -> dict:
+    rng = random.Random(f"{args.seed}:{name}")
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        started = time.monotonic()
+        stop_at = started + args.duration
+        tasks = []
+        for i in range(args.concurrency):
+            if name == "mixed":
+                user = rng.choices([u for u, _ in MIX], weights=[w for _, w in MIX])[0]
+            else:
+                user = SCENARIO_USERS[name]
+            user_rng = random.Random(f"{args.seed}:{name}:{i}")
+            tasks.append(user(client, recorder, fx, user_rng, args.password, stop_at))
+        await asyncio.gather(*tasks)
+        elapsed = time.monotonic() - started
+
+    return summarize(recorder, elapsed)
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+
+def percentile(sorted_values, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def summarize(recorder: Recorder, elapsed: float) -> dict:
+    routes = {}
+    for label in sorted(set(recorder.latencies) | set(recorder.errors)):
+        lat = sorted(recorder.latencies[label])
+        queries = recorder.queries[label]
+        routes[label] = {
+            "requests": len(lat),
+            "errors": recorder.errors[label],
+            "rps": round(len(lat) / elapsed, 2) if elapsed else 0.0,
+            "p50_ms": round(percentile(lat, 50) * 1000, 2),
+            "p95_ms": round(percentile(lat, 95) * 1000, 2),
+            "p99_ms": round(percentile(lat, 99) * 1000, 2),
+            "queries_per_request": round(statistics.fmean(queries), 2) if queries else None,
+        }
+    return {"duration_s": round(elapsed, 2), "routes": routes}
+
+
+def print_results(results: dict) -> None:
+    header = f"{'route':<38} {'reqs':>8} {'err':>5} {'rps':>9} {'p50':>8} {'p95':>8} {'p99':>8} {'q/req':>6}"
+    for scenario, data in results["scenarios"].items():
+        print(f"\n== {scenario} ({data['duration_s']}s)")
+        print(header)
+        for label, r in data["routes"].items():
+            q = "-" if r["queries_per_request"] is None else f"{r['queries_per_request']:.1f}"
+            print(
+                f"{label:<38} {r['requests']:>8} {r['errors']:>5} {r['rps']:>9.1f} "
+                f"{r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} {q:>6}"
+            )
+
+
+def _pct(new, old):
+    if not old:
+        return "   n/a"
+    return f"{(new - old) / old * 100:+6.1f}%"
+
+
+def print_comparison(results: dict, baseline: dict) -> None:
+    print(f"\n== comparison against {baseline['meta'].get('git_commit') or 'baseline'}")
+    print(f"{'scenario / route':<54} {'rps':>8} {'p95':>8} {'p99':>8} {'q/req':>7}")
+    for scenario, data in results["scenarios"].items():
+        old_routes = baseline["scenarios"].get(scenario, {}).get("routes", {})
+        for label, r in data["routes"].items():
+            old = old_routes.get(label)
+            if old is None:
+                continue
+            dq = "-"
+            if r["queries_per_request"] is not None and old.get("queries_per_request") is not None:
+                dq = f"{r['queries_per_request'] - old['queries_per_request']:+.1f}"
+            print(
+                f"{scenario + ' / ' + label:<54} {_pct(r['rps'], old['rps']):>8} "
+                f"{_pct(r['p95_ms'], old['p95_ms']):>8} {_pct(r['p99_ms'], old['p99_ms']):>8} {dq:>7}"
+            )
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+    fixtures = load_fixtures()
+
+    proc = None
+    base_url = args.base_url
+    if base_url is None:
+        # Every virtual user shares one IP here, so login throttling would
+        # turn the login storm into a 429 storm.
+        proc, base_url = start_server(args.workers, {"LOGIN_THROTTLE_ENABLED": "0"})
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "args": vars(args),
+        },
+        "scenarios": {},
+    }
+
+    try:
+        for name in scenarios:
+            print(f"running {name} for {args.duration:.0f}s with {args.concurrency} users...", flush=True)
+            results["scenarios"][name] = asyncio.run(run_scenario(name, base_url, fixtures, args))
+    finally:
+        if proc is not None:
+            stop_server(proc)
+
+    with open(args.output, "w") as fh:
+        json.dump(results, fh, indent=2)
+
+    print_results(results)
+    if args.compare:
+        with open(args.compare) as fh:
+            print_comparison(results, json.load(fh))
+    print(f"\nresults written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+# bench/login_throttle.py
+"""
+Legitimate login latency under a simulated credential-stuffing attack.
+
+Boots the server twice - with login throttling disabled, then enabled - and
+in each run drives:
+
+    attackers  tasks hammering /auth/login with wrong passwords and unknown
+               emails, spread across a pool of spoofed client IPs; the
+               existing accounts they target never include the legit users
+    legit      a handful of real users logging in with correct passwords
+               from their own IPs, one attempt every --legit-interval seconds
+
+Legit attempts answered 429 (throttled) are counted apart from other
+failures, so a limiter that is too tight shows up as such.
+
+Client IPs are simulated with X-Forwarded-For, so the server is started
+with TRUST_PROXY_HEADERS=1. Usage:
+
+    python -m bench.login_throttle --duration 30 --attackers 64
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+import httpx
+
+from bench.loadtest import load_fixtures, percentile, start_server, stop_server
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--attackers", type=int, default=64, help="Concurrent attacking tasks.")
+    parser.add_argument("--attacker-ips", type=int, default=8, help="Distinct IPs the attack comes from.")
+    parser.add_argument("--legit-users", type=int, default=4)
+    parser.add_argument("--legit-interval", type=float, default=5.0, help="Seconds between one user's logins.")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--password", default="password123")
+    parser.add_argument("--output", default=None)
+    return parser.parse_args(argv)
+
+
+async def attacker(client, emails, ips, rng, stop_at, outcomes):
+    while time.monotonic() < stop_at:
+        if emails and rng.random() < 0.5:
+            email = rng.choice(emails)
+        else:
+            email = f"nobody{rng.randrange(10**9)}@example.org"
+        try:
+            response = await client.post(
+                "/auth/login",
+                json={"email": email, "password": "hunter2"},
+                headers={"X-Forwarded-For": rng.choice(ips)},
+            )
+            outcomes[response.status_code] = outcomes.get(response.status_code, 0) + 1
+        except httpx.HTTPError:
+            outcomes["error"] = outcomes.get("error", 0) + 1
+
+
+async def legit_user(client, email, password, ip, interval, stop_at, latencies, failures, throttled):
+    while time.monotonic() < stop_at:
+        started = time.perf_counter()
+        try:
+            response = await client.post(
+                "/auth/login",
+                json={"email": email, "password": password},
+                headers={"X-Forwarded-For": ip},
+            )
+            code = response.status_code
+        except httpx.HTTPError:
+            code = None
+        latencies.append(time.perf_counter() - started)
+        if code == 429:
+            throttled.append(1)
+        elif code != 200:
+            failures.append(1)
+        await asyncio.sleep(interval)
+
+
+async def run(base_url, fixtures, args) -> dict:
+    ips = [f"203.0.113.{i % 250 + 1}" for i in range(args.attacker_ips)]
+    students = fixtures["students"]
+    legit, targeted = students[: args.legit_users], students[args.legit_users:]
+    outcomes, latencies, failures, throttled = {}, [], [], []
+
+    limits = httpx.Limits(max_connections=args.attackers + args.legit_users)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        stop_at = time.monotonic() + args.duration
+        tasks = [
+            attacker(client, targeted, ips, random.Random(i), stop_at, outcomes)
+            for i in range(args.attackers)
+        ]
+        tasks += [
+            legit_user(
+                client, email, args.password, f"198.51.100.{i + 1}", args.legit_interval, stop_at,
+                latencies, failures, throttled,
+            )
+            for i, email in enumerate(legit)
+        ]
+        await asyncio.gather(*tasks)
+
+    latencies.sort()
+    return {
+        "attack_responses": {str(k): v for k, v in sorted(outcomes.items(), key=lambda kv: str(kv[0]))},
+        "legit_logins": len(latencies),
+        "legit_throttled": len(throttled),
+        "legit_failures": len(failures),
+        "legit_p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "legit_p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "legit_p99_ms": round(percentile(latencies, 99) * 1000, 1),
+    }
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    fixtures = load_fixtures()
+    results = {}
+
+    for label, enabled in (("throttle_off", "0"), ("throttle_on", "1")):
+        proc, base_url = start_server(
+            args.workers, {"LOGIN_THROTTLE_ENABLED": enabled, "TRUST_PROXY_HEADERS": "1"}
+        )
+        try:
+            print(f"running {label} for {args.duration:.0f}s...", flush=True)
+            results[label] = asyncio.run(run(base_url, fixtures, args))
+        finally:
+            stop_server(proc)
+
+    for label, r in results.items():
+        print(
+            f"{label:<13} legit p50 {r['legit_p50_ms']:>8.1f}ms  p95 {r['legit_p95_ms']:>8.1f}ms  "
+            f"p99 {r['legit_p99_ms']:>8.1f}ms  "
+            f"ok {r['legit_logins'] - r['legit_failures'] - r['legit_throttled']}/{r['legit_logins']}  "
+            f"429 {r['legit_throttled']}  failed {r['legit_failures']}  "
+            f"attack {r['attack_responses']}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(results, fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,307 @@
+# bench/registration_contention.py
+"""
+Registration storm: many students register for one capped course at once.
+
+Creates (or reuses) a pool of benchmark students, a fresh course with
+``--seats`` seats, then fires ``--clients`` concurrent
+``POST /enrollments/register`` requests at the server. Afterwards a batch
+of enrollments is dropped concurrently to exercise waitlist promotion.
+
+The run fails (exit code 1) unless all of these hold:
+
+    * exactly ``--seats`` requests were answered "enrolled", the rest "waitlisted"
+    * the enrollments table holds exactly ``--seats`` rows for the course
+    * the seat counter matches (0 while anyone is waiting)
+    * nobody is both enrolled and waitlisted, and nobody is lost
+    * dropped seats went to the head of the waitlist, in order
+
+Usage (tokens are minted directly, so bcrypt is not part of the measurement):
+
+    python -m bench.registration_contention --clients 5000 --seats 200 --workers 4
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import httpx
+from sqlalchemy import func, select
+
+from app import models
+from app.core.security import create_access_token
+from app.database import SessionLocal, engine
+from app.models import UserRole
+from app.services import registration
+from app.services.bulk_load import bulk_insert
+from bench.loadtest import percentile, start_server, stop_server
+
+EMAIL_PREFIX = "regbench"
+DOMAIN = "example.org"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=5_000, help="Students registering at the same moment.")
+    parser.add_argument("--seats", type=int, default=200)
+    parser.add_argument("--drops", type=int, default=50, help="Enrollments dropped concurrently afterwards.")
+    parser.add_argument("--concurrency", type=int, default=500, help="Open HTTP connections.")
+    parser.add_argument("--workers", type=int, default=4, help="uvicorn workers to boot.")
+    parser.add_argument("--base-url", default=None, help="Use an already running server instead of booting one.")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--keep", action="store_true", help="Keep the benchmark course and its rows.")
+    return parser.parse_args(argv)
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+def prepare(clients: int, seats: int) -> dict:
+    """
+    Ensure ``clients`` benchmark students exist and create a new capped course.
+    """
+    with SessionLocal() as db:
+        dept = db.execute(select(models.Department).where(models.Department.code == "REGBENCH")).scalar_one_or_none()
+        if dept is None:
+            dept = models.Department(name="Registration Benchmark", code="REGBENCH")
+            db.add(dept)
+            db.flush()
+
+        def ensure_user(email, role):
+            user = db.execute(select(models.User).where(models.User.email == email)).scalar_one_or_none()
+            if user is None:
+                user = models.User(
+                    full_name=email, email=email, password_hash="!", role=role, department_id=dept.id
+                )
+                db.add(user)
+                db.flush()
+            return user
+
+        admin = ensure_user(f"{EMAIL_PREFIX}-admin@{DOMAIN}", UserRole.ADMIN)
+        teacher = ensure_user(f"{EMAIL_PREFIX}-teacher@{DOMAIN}", UserRole.TEACHER)
+
+        existing = db.execute(
+            select(func.count()).select_from(models.User).where(
+                models.User.email.like(f"{EMAIL_PREFIX}-s%@{DOMAIN}")
+            )
+        ).scalar_one()
+        dept_id, admin_id, teacher_id = dept.id, admin.id, teacher.id
+        db.commit()
+
+    if existing < clients:
+        with engine.begin() as conn:
+            bulk_insert(
+                conn,
+                models.User.__table__,
+                ("full_name", "email", "password_hash", "role", "is_active", "department_id", "created_at"),
+                (
+                    (f"Bench Student {n}", f"{EMAIL_PREFIX}-s{n}@{DOMAIN}", "!", UserRole.STUDENT, True, dept_id,
+                     datetime.utcnow())
+                    for n in range(existing, clients)
+                ),
+            )
+
+    with SessionLocal() as db:
+        student_ids = db.execute(
+            select(models.User.id)
+            .where(models.User.email.like(f"{EMAIL_PREFIX}-s%@{DOMAIN}"))
+            .order_by(models.User.id)
+            .limit(clients)
+        ).scalars().all()
+
+        course = models.Course(
+            code=f"REG-{uuid.uuid4().hex[:8]}",
+            name="Registration storm",
+            department_id=dept_id,
+            teacher_id=teacher_id,
+            capacity=seats,
+        )
+        db.add(course)
+        db.flush()
+        registration.sync_seats(db, course)
+        db.commit()
+
+        return {"course_id": course.id, "student_ids": student_ids, "admin_id": admin_id}
+
+
+def cleanup(course_id: int) -> None:
+    with SessionLocal() as db:
+        for model in (models.WaitlistEntry, models.Enrollment, models.CourseSeats):
+            db.execute(model.__table__.delete().where(model.__table__.c.course_id == course_id))
+        db.execute(models.Course.__table__.delete().where(models.Course.id == course_id))
+        db.commit()
+
+
+def bearer(user_id: int, role: str) -> dict:
+    token = create_access_token({"sub": str(user_id), "role": role}, expires_delta=timedelta(hours=1))
+    return {"Authorization": f"Bearer {token}"}
+
+
+# ---------------------------------------------------------------------------
+# Load
+# ---------------------------------------------------------------------------
+
+
+async def storm(base_url: str, course_id: int, student_ids, concurrency: int) -> dict:
+    headers = {sid: bearer(sid, "student") for sid in student_ids}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    go = asyncio.Event()
+    latencies, statuses, outcomes = [], {}, {}
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        async def one(sid):
+            await go.wait()
+            started = time.perf_counter()
+            try:
+                response = await client.post(
+                    "/enrollments/register", json={"course_id": course_id}, headers=headers[sid]
+                )
+            except httpx.HTTPError as exc:
+                statuses[sid] = type(exc).__name__
+                return
+            latencies.append(time.perf_counter() - started)
+            statuses[sid] = response.status_code
+            if response.status_code == 201:
+                outcomes[sid] = response.json()["status"]
+
+        tasks = [asyncio.create_task(one(sid)) for sid in student_ids]
+        await asyncio.sleep(0)
+        started = time.perf_counter()
+        go.set()
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+    return {"elapsed": elapsed, "latencies": sorted(latencies), "statuses": statuses, "outcomes": outcomes}
+
+
+async def drop_many(base_url: str, enrollment_ids, admin_id: int, concurrency: int) -> dict:
+    headers = bearer(admin_id, "admin")
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        responses = await asyncio.gather(
+            *(client.delete(f"/enrollments/{eid}", headers=headers) for eid in enrollment_ids),
+            return_exceptions=True,
+        )
+    return {
+        eid: (r.status_code if isinstance(r, httpx.Response) else type(r).__name__)
+        for eid, r in zip(enrollment_ids, responses)
+    }
+
+
+# ---------------------------------------------------------------------------
+# Invariants
+# ---------------------------------------------------------------------------
+
+
+def snapshot(course_id: int) -> dict:
+    with SessionLocal() as db:
+        enrolled = db.execute(
+            select(models.Enrollment.id, models.Enrollment.student_id).where(models.Enrollment.course_id == course_id)
+        ).all()
+        waitlist = db.execute(
+            select(models.WaitlistEntry.student_id)
+            .where(models.WaitlistEntry.course_id == course_id)
+            .order_by(models.WaitlistEntry.id)
+        ).scalars().all()
+        seats = db.get(models.CourseSeats, course_id).seats_available
+    return {
+        "enrollments": {eid: sid for eid, sid in enrolled},
+        "enrolled": {sid for _, sid in enrolled},
+        "waitlist": list(waitlist),
+        "seats_available": seats,
+    }
+
+
+def check(label: str, ok: bool, detail: str, failures: list) -> None:
+    print(f"  [{'ok' if ok else 'FAIL'}] {label}: {detail}")
+    if not ok:
+        failures.append(label)
+
+
+def verify_storm(args, result: dict, state: dict, failures: list) -> None:
+    expected_enrolled = min(args.seats, args.clients)
+    statuses = result["statuses"]
+    outcomes = result["outcomes"]
+    api_enrolled = {sid for sid, o in outcomes.items() if o == "enrolled"}
+    api_waitlisted = {sid for sid, o in outcomes.items() if o == "waitlisted"}
+    errors = {s for s in statuses.values() if s != 201}
+
+    check("all requests answered 201", not errors, f"{len(outcomes)}/{len(statuses)} ok, other: {sorted(map(str, errors))}", failures)
+    check("API enrolled == seats", len(api_enrolled) == expected_enrolled, f"{len(api_enrolled)} vs {expected_enrolled}", failures)
+    check("DB enrolled == seats (no overbooking)", len(state["enrollments"]) == expected_enrolled,
+          f"{len(state['enrollments'])} rows for {args.seats} seats", failures)
+    check("API and DB agree on who got a seat", api_enrolled == state["enrolled"], "", failures)
+    check("waitlist holds everyone else", set(state["waitlist"]) == api_waitlisted,
+          f"{len(state['waitlist'])} waiting", failures)
+    check("nobody both enrolled and waitlisted", not (state["enrolled"] & set(state["waitlist"])), "", failures)
+    expected_seats = args.seats - len(state["enrollments"])
+    check("seat counter consistent", state["seats_available"] == expected_seats,
+          f"seats_available={state['seats_available']}", failures)
+
+
+def verify_drops(dropped_students, before: dict, after: dict, statuses: dict, failures: list) -> None:
+    n = len(dropped_students)
+    promoted = before["waitlist"][:n]
+    check("all drops answered 204", all(s == 204 for s in statuses.values()), f"{len(statuses)} drops", failures)
+    check("dropped students are gone", not (set(dropped_students) & after["enrolled"]), "", failures)
+    check("head of waitlist promoted in order", set(promoted) <= after["enrolled"] and after["waitlist"] == before["waitlist"][n:],
+          f"{len(promoted)} promoted", failures)
+    check("still no overbooking", len(after["enrollments"]) == len(before["enrollments"]),
+          f"{len(after['enrollments'])} rows", failures)
+    check("seat counter unchanged while waitlist is non-empty",
+          after["seats_available"] == before["seats_available"] or not after["waitlist"],
+          f"seats_available={after['seats_available']}", failures)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    rng = random.Random(args.seed)
+
+    fixtures = prepare(args.clients, args.seats)
+    course_id = fixtures["course_id"]
+    student_ids = list(fixtures["student_ids"])
+    rng.shuffle(student_ids)
+    print(f"course {course_id}: {args.seats} seats, {len(student_ids)} clients, {engine.dialect.name}")
+
+    proc = None
+    base_url = args.base_url
+    if base_url is None:
+        proc, base_url = start_server(args.workers, extra_env={"LOGIN_THROTTLE_ENABLED": "0"})
+
+    failures = []
+    try:
+        result = asyncio.run(storm(base_url, course_id, student_ids, args.concurrency))
+        lat = result["latencies"]
+        print(
+            f"storm: {len(student_ids)} requests in {result['elapsed']:.2f}s "
+            f"({len(student_ids) / result['elapsed']:.0f} req/s), latency "
+            f"p50 {percentile(lat, 50) * 1000:.0f} ms  p95 {percentile(lat, 95) * 1000:.0f} ms  "
+            f"p99 {percentile(lat, 99) * 1000:.0f} ms"
+        )
+        before = snapshot(course_id)
+        verify_storm(args, result, before, failures)
+
+        drops = rng.sample(sorted(before["enrollments"]), min(args.drops, len(before["enrollments"])))
+        if drops:
+            started = time.perf_counter()
+            statuses = asyncio.run(drop_many(base_url, drops, fixtures["admin_id"], args.concurrency))
+            print(f"drops: {len(drops)} concurrent drops in {time.perf_counter() - started:.2f}s")
+            after = snapshot(course_id)
+            verify_drops([before["enrollments"][eid] for eid in drops], before, after, statuses, failures)
+    finally:
+        if proc is not None:
+            stop_server(proc)
+        if not args.keep:
+            cleanup(course_id)
+
+    print("PASS" if not failures else f"FAIL: {', '.join(failures)}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
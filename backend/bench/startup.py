@@ -0,0 +1,114 @@
+# bench/startup.py
+"""
+Time-to-first-request and memory per worker for the serving entry points.
+
+Launches each variant, polls /health until it answers, and then reads
+RSS/PSS of every worker from /proc (Linux only):
+
+    launcher  python -m app.server     (preloaded, forked, warmed up)
+    uvicorn   python -m uvicorn --workers N  (each worker imports the app)
+
+Usage:
+
+    python -m bench.startup --workers 4
+"""
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import httpx
+
+from app.server import process_memory
+from bench.loadtest import _free_port
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--settle", type=float, default=3.0, help="Seconds to wait for all workers before measuring memory.")
+    return parser.parse_args(argv)
+
+
+def descendants(pid: int):
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as fh:
+            children = [int(c) for c in fh.read().split()]
+    except OSError:
+        return []
+    found = []
+    for child in children:
+        found.append(child)
+        found.extend(descendants(child))
+    return found
+
+
+def measure(label: str, command, workers: int, settle: float) -> dict:
+    port = _free_port()
+    command = [c.format(port=port, workers=workers) for c in command]
+    started = time.monotonic()
+    proc = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    first_request_ms = None
+    try:
+        deadline = started + 120
+        while time.monotonic() < deadline:
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/health/db", timeout=2).status_code == 200:
+                    first_request_ms = (time.monotonic() - started) * 1000
+                    break
+            except httpx.TransportError:
+                time.sleep(0.05)
+
+        time.sleep(settle)
+        worker_pids = [pid for pid in descendants(proc.pid) if process_memory(pid)]
+        # uvicorn --workers also has a multiprocessing resource tracker; keep the N largest.
+        memories = sorted((process_memory(pid) for pid in worker_pids), key=lambda m: m.get("rss", 0), reverse=True)
+        memories = memories[:workers]
+        master = process_memory(proc.pid)
+    finally:
+        proc.send_signal(signal.SIGINT)
+        try:
+            proc.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+    def avg(key):
+        values = [m.get(key, 0) for m in memories]
+        return sum(values) / len(values) / 1024 if values else 0.0
+
+    return {
+        "label": label,
+        "first_request_ms": first_request_ms,
+        "workers_seen": len(memories),
+        "master_rss_mib": master.get("rss", 0) / 1024,
+        "worker_rss_mib": avg("rss"),
+        "worker_pss_mib": avg("pss"),
+        "worker_private_mib": avg("private_clean") + avg("private_dirty"),
+    }
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    variants = [
+        ("launcher", [sys.executable, "-m", "app.server", "--port", "{port}", "--workers", "{workers}", "--log-level", "warning"]),
+        ("uvicorn", [sys.executable, "-m", "uvicorn", "app.main:app", "--port", "{port}", "--workers", "{workers}", "--log-level", "warning"]),
+    ]
+    print(f"{'variant':<10} {'first req':>10} {'workers':>8} {'rss/wkr':>9} {'pss/wkr':>9} {'private/wkr':>12}")
+    for label, command in variants:
+        r = measure(label, command, args.workers, args.settle)
+        ttfr = "timeout" if r["first_request_ms"] is None else f"{r['first_request_ms']:.0f} ms"
+        print(
+            f"{label:<10} {ttfr:>10} {r['workers_seen']:>8} {r['worker_rss_mib']:>7.1f}Mi "
+            f"{r['worker_pss_mib']:>7.1f}Mi {r['worker_private_mib']:>10.1f}Mi"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        sys.exit("bench.startup needs Linux /proc")
+    sys.exit(main())
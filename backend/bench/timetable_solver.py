@@ -0,0 +1,125 @@
+# bench/timetable_solver.py
+"""
+Timetable solver on a synthetic department (no database needed):
+
+    python -m bench.timetable_solver --courses 1000 --rooms 300 --time-limit 50
+
+Generates courses (teacher, expected size, 15% needing a lab, 2-4 weekly
+sessions) and rooms (20% labs, capacities 20-250), runs
+``TimetableSolver`` and re-checks the solution independently: no teacher
+or room double-booking, every room large enough and of the right type.
+Exits non-zero if any hard constraint is violated.
+"""
+
+import argparse
+import random
+import sys
+import time
+from collections import Counter
+
+from app.services.scheduling import RoomSpec, SessionSpec, TimeGrid, TimetableSolver, UNASSIGNED
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--courses", type=int, default=1_000)
+    parser.add_argument("--rooms", type=int, default=300)
+    parser.add_argument("--teachers", type=int, default=250)
+    parser.add_argument("--days", type=int, default=5)
+    parser.add_argument("--periods", type=int, default=8)
+    parser.add_argument("--time-limit", type=float, default=50.0)
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args(argv)
+
+
+def synthetic_department(args):
+    rng = random.Random(args.seed)
+    rooms = []
+    for rid in range(1, args.rooms + 1):
+        if rng.random() < 0.2:
+            rooms.append(RoomSpec(rid, rng.choice((20, 30, 40, 60)), "lab"))
+        else:
+            rooms.append(RoomSpec(rid, rng.choice((30, 40, 60, 60, 80, 120, 250)), "classroom"))
+
+    sessions = []
+    for cid in range(1, args.courses + 1):
+        teacher = rng.randrange(1, args.teachers + 1)
+        if rng.random() < 0.15:
+            size, room_type = rng.randint(10, 40), "lab"
+        else:
+            size, room_type = min(int(rng.lognormvariate(3.6, 0.6)), 240), None
+        for _ in range(rng.choice((2, 3, 3, 4))):
+            sessions.append(SessionSpec(cid, teacher, size, room_type))
+    return sessions, rooms
+
+
+def verify(sessions, rooms, assignments) -> dict:
+    by_id = {room.id: room for room in rooms}
+    room_slots = Counter()
+    teacher_slots = Counter()
+    problems = Counter()
+    for s, (t, room_id) in zip(sessions, assignments):
+        if t == UNASSIGNED:
+            problems["unassigned"] += 1
+            continue
+        room = by_id[room_id]
+        room_slots[(room_id, t)] += 1
+        teacher_slots[(s.teacher_id, t)] += 1
+        if room.capacity is not None and room.capacity < s.size:
+            problems["room too small"] += 1
+        if s.room_type is not None and room.type != s.room_type:
+            problems["wrong room type"] += 1
+    problems["room double-booked"] = sum(n - 1 for n in room_slots.values() if n > 1)
+    problems["teacher double-booked"] = sum(n - 1 for n in teacher_slots.values() if n > 1)
+    return problems
+
+
+def teacher_overload(sessions, slots: int) -> int:
+    """
+    Lower bound on teacher double-bookings: sessions beyond the weekly slots.
+    """
+    load = Counter(s.teacher_id for s in sessions)
+    return sum(max(0, n - slots) for n in load.values())
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    sessions, rooms = synthetic_department(args)
+    grid = TimeGrid(days=args.days, periods=args.periods)
+    unavoidable = teacher_overload(sessions, grid.slots)
+    print(
+        f"{args.courses} courses, {len(sessions)} sessions, {len(rooms)} rooms, "
+        f"{args.teachers} teachers, {grid.slots} slots/week"
+    )
+    if unavoidable:
+        print(f"  (at least {unavoidable} teacher double-bookings are unavoidable: overloaded teachers)")
+
+    started = time.perf_counter()
+    solver = TimetableSolver(sessions, rooms, grid, seed=args.seed)
+    solver.construct()
+    construct_s = time.perf_counter() - started
+    print(f"greedy:   {construct_s:6.2f}s  hard={solver.hard}  soft={solver.soft:.0f}")
+
+    iterations = solver.improve(max(0.0, args.time_limit - construct_s))
+    total_s = time.perf_counter() - started
+    print(f"improved: {total_s:6.2f}s  hard={solver.hard}  soft={solver.soft:.0f}  ({iterations} moves)")
+
+    assignments = [
+        (t, rooms[r].id) if t != UNASSIGNED else (UNASSIGNED, UNASSIGNED)
+        for t, r in zip(solver.slot, solver.room)
+    ]
+    problems = verify(sessions, rooms, assignments)
+    for name, count in sorted(problems.items()):
+        print(f"  {name:<24} {count}")
+    print(f"  {'(unavoidable)':<24} {unavoidable}")
+    same_day = sum(n - 1 for n in solver.course_day.values() if n > 1)
+    print(f"  {'same-day repeats (soft)':<24} {same_day}")
+
+    problems["teacher double-booked"] -= unavoidable
+    ok = not any(problems.values()) and total_s < 60
+    print("PASS" if ok else "FAIL")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
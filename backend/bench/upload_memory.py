@@ -0,0 +1,192 @@
+# bench/upload_memory.py
+"""
+Large submission upload against a real server, watching its memory:
+
+    python -m bench.upload_memory --size-mb 200
+
+Boots uvicorn (one worker), creates a throwaway student, course and
+assignment, streams a ``--size-mb`` file to
+``POST /assignments/{id}/submission`` from a generator (the client never
+holds it either) and samples the server's RSS from /proc while it runs.
+Then downloads it back and compares SHA-256 digests.
+
+Fails unless the upload succeeds, the digest round-trips, and the server's
+peak RSS grew by less than ``--max-growth-mb`` over its idle RSS. Linux only.
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import threading
+import time
+import uuid
+from datetime import timedelta
+
+import httpx
+
+from app import models
+from app.core.security import create_access_token
+from app.database import SessionLocal
+from app.models import UserRole
+from bench.loadtest import start_server, stop_server
+
+BOUNDARY = "bench-upload-boundary"
+CHUNK = 1024 * 1024
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=200)
+    parser.add_argument("--max-growth-mb", type=float, default=32.0)
+    parser.add_argument("--keep", action="store_true", help="Keep the benchmark rows.")
+    return parser.parse_args(argv)
+
+
+def prepare() -> dict:
+    tag = uuid.uuid4().hex[:8]
+    with SessionLocal() as db:
+        dept = models.Department(name=f"Upload Benchmark {tag}", code=f"UPL-{tag}")
+        db.add(dept)
+        db.flush()
+        teacher = models.User(
+            full_name="Upload teacher", email=f"upload-{tag}-t@example.org", password_hash="!",
+            role=UserRole.TEACHER, department_id=dept.id,
+        )
+        student = models.User(
+            full_name="Upload student", email=f"upload-{tag}-s@example.org", password_hash="!",
+            role=UserRole.STUDENT, department_id=dept.id,
+        )
+        db.add_all([teacher, student])
+        db.flush()
+        course = models.Course(code=f"UPL-{tag}", name="Upload", department_id=dept.id, teacher_id=teacher.id)
+        db.add(course)
+        db.flush()
+        db.add(models.Enrollment(student_id=student.id, course_id=course.id))
+        assignment = models.Assignment(course_id=course.id, title="Large upload")
+        db.add(assignment)
+        db.flush()
+        fixtures = {
+            "department_id": dept.id,
+            "user_ids": [teacher.id, student.id],
+            "course_id": course.id,
+            "student_id": student.id,
+            "assignment_id": assignment.id,
+        }
+        db.commit()
+    return fixtures
+
+
+def cleanup(fixtures: dict) -> None:
+    with SessionLocal() as db:
+        db.execute(models.Submission.__table__.delete().where(
+            models.Submission.assignment_id == fixtures["assignment_id"]))
+        db.execute(models.Assignment.__table__.delete().where(models.Assignment.id == fixtures["assignment_id"]))
+        db.execute(models.Enrollment.__table__.delete().where(models.Enrollment.course_id == fixtures["course_id"]))
+        db.execute(models.Course.__table__.delete().where(models.Course.id == fixtures["course_id"]))
+        db.execute(models.User.__table__.delete().where(models.User.id.in_(fixtures["user_ids"])))
+        db.execute(models.Department.__table__.delete().where(models.Department.id == fixtures["department_id"]))
+        db.commit()
+
+
+def rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+class RssSampler(threading.Thread):
+    def __init__(self, pid: int, interval: float = 0.05):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.peak = 0.0
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self.stopped.is_set():
+            self.peak = max(self.peak, rss_mb(self.pid))
+            time.sleep(self.interval)
+
+
+def body(size: int, digest):
+    """
+    multipart/form-data body with one ``file`` part of ``size`` bytes of
+    pseudo-random data, generated a chunk at a time.
+    """
+    yield (
+        f"--{BOUNDARY}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="large.bin"\r\n'
+        f"Content-Type: application/octet-stream\r\n\r\n"
+    ).encode()
+    block = os.urandom(CHUNK)
+    sent = 0
+    while sent < size:
+        n = min(CHUNK, size - sent)
+        # Vary the data so the blob is not trivially compressible or repeated
+        chunk = sent.to_bytes(8, "little") + block[8:n] if n > 8 else block[:n]
+        digest.update(chunk)
+        sent += n
+        yield chunk
+    yield f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    size = args.size_mb * 1024 * 1024
+    fixtures = prepare()
+    headers = {
+        "Authorization": "Bearer " + create_access_token(
+            {"sub": str(fixtures["student_id"]), "role": "student"}, expires_delta=timedelta(hours=1)
+        ),
+    }
+
+    proc, base_url = start_server(1, extra_env={"SUBMISSION_MAX_BYTES": str(size + CHUNK)})
+    failures = []
+    try:
+        idle = rss_mb(proc.pid)
+        sampler = RssSampler(proc.pid)
+        sampler.start()
+
+        digest = hashlib.sha256()
+        started = time.perf_counter()
+        response = httpx.post(
+            f"{base_url}/assignments/{fixtures['assignment_id']}/submission",
+            content=body(size, digest),
+            headers={**headers, "Content-Type": f"multipart/form-data; boundary={BOUNDARY}"},
+            timeout=600,
+        )
+        elapsed = time.perf_counter() - started
+        sampler.stopped.set()
+        sampler.join()
+
+        print(f"upload: {args.size_mb} MB in {elapsed:.1f}s ({args.size_mb / elapsed:.0f} MB/s) -> {response.status_code}")
+        print(f"server RSS: idle {idle:.0f} MB, peak {sampler.peak:.0f} MB (+{sampler.peak - idle:.0f} MB)")
+        if response.status_code != 201:
+            failures.append(f"upload returned {response.status_code}: {response.text[:200]}")
+        else:
+            submission = response.json()
+            if submission["sha256"] != digest.hexdigest() or submission["size"] != size:
+                failures.append("stored digest/size differ from what was sent")
+
+            download = hashlib.sha256()
+            with httpx.stream("GET", f"{base_url}/submissions/{submission['id']}/file", headers=headers) as r:
+                for chunk in r.iter_bytes():
+                    download.update(chunk)
+            if download.hexdigest() != digest.hexdigest():
+                failures.append("downloaded file differs")
+        if sampler.peak - idle > args.max_growth_mb:
+            failures.append(f"RSS grew by {sampler.peak - idle:.0f} MB")
+    finally:
+        stop_server(proc)
+        if not args.keep:
+            cleanup(fixtures)
+
+    print("PASS" if not failures else f"FAIL: {', '.join(failures)}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
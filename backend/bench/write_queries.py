@@ -0,0 +1,155 @@
+# bench/write_queries.py
+"""
+Statements per write endpoint, checked against a budget.
+
+Boots the app (with ``QUERY_STATS=1``), creates a throwaway department,
+teacher and student, then calls each create/update endpoint once and
+reads the ``X-Query-Count`` header. Exits 1 if any endpoint runs more
+statements than its budget, or answers with an unexpected status.
+
+Budgets count every statement sent to the database except COMMIT: the
+current-user lookup, the write itself (``INSERT``/``UPDATE ... RETURNING``,
+see ``app.services.writes``), the audit outbox row, and any checks that are
+not about uniqueness (the teacher's role, an enrollment's prerequisites and
+timetable). On SQLite an update reads the previous values first, one more
+statement. Usage:
+
+    python -m bench.write_queries [--base-url http://127.0.0.1:8000]
+"""
+
+import argparse
+import sys
+import uuid
+
+import httpx
+
+from app import models
+from app.database import SessionLocal, engine
+from app.models import UserRole
+from bench.loadtest import QUERY_COUNT_HEADER, start_server, stop_server
+from bench.registration_contention import bearer
+
+# (method, path, expected status, budget); paths are formatted with the fixture ids
+ENDPOINTS = [
+    ("POST", "/departments/", 201, 3),
+    ("PUT", "/departments/{department_id}", 200, 3),
+    ("POST", "/users/", 201, 3),
+    ("PUT", "/users/{student_id}", 200, 3),
+    ("POST", "/courses/", 201, 4),
+    ("PUT", "/courses/{course_id}", 200, 3),
+    ("POST", "/enrollments/", 201, 12),
+    ("PUT", "/enrollments/{enrollment_id}", 200, 3),
+]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default=None, help="Use an already running server (with QUERY_STATS=1).")
+    parser.add_argument("--keep", action="store_true", help="Keep the rows the run creates.")
+    return parser.parse_args(argv)
+
+
+def prepare(tag: str) -> dict:
+    with SessionLocal() as db:
+        dept = models.Department(name=f"Write bench {tag}", code=f"WB-{tag}")
+        db.add(dept)
+        db.flush()
+        users = {
+            role: models.User(
+                full_name=f"Write bench {role.value}",
+                email=f"writebench-{tag}-{role.value}@example.org",
+                password_hash="!",
+                role=role,
+                department_id=dept.id,
+            )
+            for role in (UserRole.ADMIN, UserRole.TEACHER, UserRole.STUDENT)
+        }
+        db.add_all(users.values())
+        db.commit()
+        return {
+            "department_id": dept.id,
+            "admin_id": users[UserRole.ADMIN].id,
+            "teacher_id": users[UserRole.TEACHER].id,
+            "student_id": users[UserRole.STUDENT].id,
+        }
+
+
+def bodies(tag: str, ids: dict) -> dict:
+    """
+    Request bodies by path; ids of rows created by earlier calls are filled
+    in as they become known.
+    """
+    return {
+        "/departments/": {"name": f"Write bench 2 {tag}", "code": f"WB2-{tag}"},
+        "/departments/{department_id}": {"name": f"Write bench renamed {tag}"},
+        "/users/": {
+            "full_name": "Write bench user",
+            "email": f"writebench-{tag}-new@example.org",
+            "password": "write-bench",
+            "role": "student",
+            "department_id": ids["department_id"],
+        },
+        "/users/{student_id}": {"full_name": "Write bench student (renamed)"},
+        "/courses/": {
+            "code": f"WB-{tag}",
+            "name": "Write bench course",
+            "department_id": ids["department_id"],
+            "teacher_id": ids["teacher_id"],
+        },
+        "/courses/{course_id}": {"name": "Write bench course (renamed)"},
+        "/enrollments/": {"student_id": ids["student_id"], "course_id": ids.get("course_id")},
+        "/enrollments/{enrollment_id}": {"status": "completed"},
+    }
+
+
+def cleanup(tag: str) -> None:
+    with SessionLocal() as db:
+        departments = db.query(models.Department.id).filter(models.Department.code.in_([f"WB-{tag}", f"WB2-{tag}"]))
+        db.query(models.Course).filter(models.Course.code == f"WB-{tag}").delete(synchronize_session=False)
+        db.query(models.User).filter(models.User.email.like(f"writebench-{tag}-%")).delete(synchronize_session=False)
+        db.query(models.Department).filter(models.Department.id.in_(departments.scalar_subquery())).delete(
+            synchronize_session=False
+        )
+        db.commit()
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    tag = uuid.uuid4().hex[:8]
+    ids = prepare(tag)
+    headers = bearer(ids["admin_id"], UserRole.ADMIN.value)
+    extra = 1 if engine.dialect.name == "sqlite" else 0
+
+    proc, base_url = (None, args.base_url) if args.base_url else start_server(1)
+    failures = 0
+    try:
+        with httpx.Client(base_url=base_url, headers=headers, timeout=30) as client:
+            for method, path, expected, budget in ENDPOINTS:
+                body = bodies(tag, ids)[path]
+                response = client.request(method, path.format(**ids), json=body)
+                count = response.headers.get(QUERY_COUNT_HEADER)
+                if count is None:
+                    raise SystemExit(f"No {QUERY_COUNT_HEADER} header; start the server with QUERY_STATS=1.")
+                count = int(count)
+                if method == "PUT":
+                    budget += extra
+                ok = response.status_code == expected and count <= budget
+                if ok and path == "/courses/":
+                    ids["course_id"] = response.json()["id"]
+                elif ok and path == "/enrollments/":
+                    ids["enrollment_id"] = response.json()["id"]
+                failures += not ok
+                print(f"{'ok' if ok else 'FAIL':<5} {method:<5} {path:<30} {response.status_code}  "
+                      f"{count:>2} statements (budget {budget})")
+    finally:
+        if proc is not None:
+            stop_server(proc)
+        if not args.keep:
+            cleanup(tag)
+
+    print(f"{len(ENDPOINTS) - failures}/{len(ENDPOINTS)} endpoints within budget")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+# scripts/backfill_enrollment_rollups.py
+"""
+Rebuild the enrollment trend rollup (``enrollment_daily_counts``) from the
+``enrollments`` table.
+
+Usage (from the backend/ directory):
+
+    python -m scripts.backfill_enrollment_rollups [--course 12 --course 13]
+
+The rollup is maintained on every ORM insert/delete, so this is only needed
+after loading enrollments in bulk (e.g. ``scripts.generate_dataset``) or
+after rows were removed by database cascades. Runs in one transaction.
+"""
+
+import argparse
+import sys
+import time
+
+from app.database import engine
+from app.services import trends
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--course", type=int, action="append", default=None, help="Only rebuild these courses.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        rows = trends.rebuild(conn, args.course)
+    print(f"enrollment_daily_counts: {rows:,} rows in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
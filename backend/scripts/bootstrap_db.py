@@ -0,0 +1,68 @@
+# scripts/bootstrap_db.py
+"""
+Create the database schema in one step instead of replaying migrations.
+
+Usage (from the backend/ directory):
+
+    python -m scripts.bootstrap_db                    # new, empty database
+    python -m scripts.bootstrap_db --stamp-existing   # database from before the baseline
+
+On an empty database every table and index is created from the models and
+``alembic_version`` is stamped at head, in one transaction; ``alembic
+upgrade head`` then applies only migrations added later.
+
+``--stamp-existing`` moves a database that was migrated up to the last
+pre-baseline revision onto the squashed baseline (no schema changes);
+``alembic upgrade head`` then brings it up to date. Run on a database
+already at head, it reports any difference between its schema and the
+models.
+"""
+
+import argparse
+import sys
+import time
+
+from app.database import engine
+from app.services import schema
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--stamp-existing",
+        action="store_true",
+        help=f"Stamp a database at {schema.SQUASHED_HEAD} onto the baseline {schema.BASELINE}.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    started = time.perf_counter()
+
+    try:
+        with engine.begin() as conn:
+            if args.stamp_existing:
+                previous = schema.stamp_existing(conn)
+                if previous is not None:
+                    print(f"Stamped {previous} -> {schema.BASELINE}; run `alembic upgrade head` next.")
+                    return 0
+                revisions = schema.current_revisions(conn)
+                print(f"Already on the new history: {', '.join(revisions)}")
+                if revisions == (schema.script_directory().get_current_head(),):
+                    for difference in schema.differences(conn):
+                        print(f"  schema differs from models: {difference}", file=sys.stderr)
+                return 0
+
+            head = schema.create(conn)
+            tables = len(schema.existing_tables(conn))
+    except RuntimeError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+
+    print(f"Created {tables} tables at {head} in {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+# scripts/check_query_plans.py
+"""
+Query-plan regression check: EXPLAIN the core query of each router and fail
+if any of them reads a large table with a sequential scan.
+
+Usage (from the backend/ directory), against a database loaded with
+``scripts.generate_dataset``:
+
+    python -m scripts.generate_dataset --seed 42 --users 100000 --truncate
+    python -m scripts.check_query_plans [--min-rows 10000] [--verbose]
+
+Tables with fewer than ``--min-rows`` rows are not "large": scanning a few
+hundred departments or resources is the right plan. Statistics are
+refreshed with ANALYZE first. Works on PostgreSQL (``EXPLAIN (FORMAT
+JSON)``, "Seq Scan" nodes) and SQLite (``EXPLAIN QUERY PLAN``, plain
+``SCAN <table>`` steps). Exits 1 if any query regresses.
+
+The queries mirror the routers' own; when a router's query changes shape,
+change it here too.
+"""
+
+import argparse
+import json
+import re
+import sys
+from datetime import datetime, timedelta
+from typing import Dict, List, Set
+
+from sqlalchemy import and_, case, func, select, text
+
+from app import models
+from app.database import engine
+
+SQLITE_SCAN = re.compile(r"^SCAN (\w+)(?: AS \w+)?$")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--min-rows", type=int, default=10_000, help="Tables at least this big must not be seq-scanned.")
+    parser.add_argument("--verbose", action="store_true", help="Print every plan.")
+    return parser.parse_args(argv)
+
+
+def _sample(conn) -> Dict[str, object]:
+    """
+    Realistic parameter values: ids that exist in the loaded data.
+    """
+    def first(column, *where):
+        return conn.execute(select(column).where(*where).limit(1)).scalar()
+
+    booking_start = first(models.Booking.start_time)
+    return {
+        "teacher_id": first(models.Course.teacher_id),
+        "department_id": first(models.Course.department_id),
+        "course_id": first(models.Enrollment.course_id),
+        "student_id": first(models.Enrollment.student_id),
+        "assignment_id": first(models.Grade.assignment_id),
+        "day": first(models.Attendance.date),
+        "resource_id": first(models.Booking.resource_id),
+        "user_id": first(models.User.id),
+        "from": booking_start or datetime.utcnow(),
+        "to": (booking_start or datetime.utcnow()) + timedelta(days=7),
+    }
+
+
+# name -> (where it is used, query builder)
+QUERIES: Dict[str, tuple] = {
+    "courses_by_teacher": (
+        "GET /courses?teacher_id, GET /teacher/courses",
+        lambda p: select(models.Course).where(models.Course.teacher_id == p["teacher_id"]),
+    ),
+    "courses_by_department": (
+        "GET /courses?department_id",
+        lambda p: select(models.Course).where(models.Course.department_id == p["department_id"]),
+    ),
+    "users_by_department": (
+        "GET /users?department_id",
+        lambda p: select(models.User).where(models.User.department_id == p["department_id"]).order_by(models.User.id),
+    ),
+    "course_roster": (
+        "GET /teacher/courses/{id}/students",
+        lambda p: (
+            select(models.User.id, models.User.full_name)
+            .join(models.Enrollment, models.Enrollment.student_id == models.User.id)
+            .where(models.Enrollment.course_id == p["course_id"])
+        ),
+    ),
+    "enrollments_by_student": (
+        "GET /enrollments?student_id",
+        lambda p: select(models.Enrollment).where(models.Enrollment.student_id == p["student_id"]),
+    ),
+    "grades_by_assignment": (
+        "teacher grading / finalize",
+        lambda p: select(models.Grade).where(models.Grade.assignment_id == p["assignment_id"]),
+    ),
+    "grades_by_student": (
+        "student grades",
+        lambda p: select(models.Grade).where(models.Grade.student_id == p["student_id"]),
+    ),
+    "student_deadlines": (
+        "GET /students/me/deadlines",
+        lambda p: (
+            select(models.Assignment.id, models.Assignment.due_date, models.Grade.grade_value)
+            .select_from(models.Enrollment)
+            .join(
+                models.Assignment,
+                and_(
+                    models.Assignment.course_id == models.Enrollment.course_id,
+                    models.Assignment.due_date >= p["from"],
+                    models.Assignment.due_date < p["to"],
+                ),
+            )
+            .outerjoin(
+                models.Grade,
+                and_(
+                    models.Grade.student_id == p["student_id"],
+                    models.Grade.assignment_id == models.Assignment.id,
+                ),
+            )
+            .where(models.Enrollment.student_id == p["student_id"])
+            .order_by(models.Assignment.due_date)
+            .limit(50)
+        ),
+    ),
+    "attendance_by_course_day": (
+        "attendance marking / per-session view",
+        lambda p: select(models.Attendance).where(
+            models.Attendance.course_id == p["course_id"], models.Attendance.date == p["day"]
+        ),
+    ),
+    "attendance_rates": (
+        "risk.compute_scores",
+        lambda p: (
+            select(
+                models.Attendance.student_id,
+                func.count(),
+                func.sum(case((models.Attendance.status == "present", 1), else_=0)),
+            )
+            .where(models.Attendance.course_id.in_([p["course_id"]]))
+            .group_by(models.Attendance.student_id)
+        ),
+    ),
+    "resource_bookings": (
+        "timetable / room availability",
+        lambda p: select(models.Booking).where(
+            models.Booking.resource_id == p["resource_id"],
+            models.Booking.start_time < p["to"],
+            models.Booking.end_time > p["from"],
+        ),
+    ),
+    "unread_notifications": (
+        "GET /notifications",
+        lambda p: (
+            select(models.Notification)
+            .where(models.Notification.user_id == p["user_id"], models.Notification.read_at.is_(None))
+            .limit(50)
+        ),
+    ),
+}
+
+
+def _row_counts(conn) -> Dict[str, int]:
+    tables = ["users", "courses", "enrollments", "assignments", "grades", "attendance", "bookings", "notifications"]
+    return {table: conn.execute(text(f"SELECT count(*) FROM {table}")).scalar_one() for table in tables}
+
+
+def _explain(conn, query) -> tuple:
+    """
+    (plan text, tables read by a sequential scan).
+    """
+    compiled = query.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+    if conn.dialect.name == "postgresql":
+        plan = conn.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar_one()
+        plan = json.loads(plan) if isinstance(plan, str) else plan
+        scanned: Set[str] = set()
+
+        def walk(node):
+            if node.get("Node Type") == "Seq Scan":
+                scanned.add(node["Relation Name"])
+            for child in node.get("Plans", []):
+                walk(child)
+
+        walk(plan[0]["Plan"])
+        return json.dumps(plan, indent=2), scanned
+
+    rows = conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+    details = [row[-1] for row in rows]
+    scanned = {match.group(1) for match in map(SQLITE_SCAN.match, details) if match}
+    return "\n".join(details), scanned
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    failures: List[str] = []
+
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+        counts = _row_counts(conn)
+        large = {table for table, count in counts.items() if count >= args.min_rows}
+        if not large:
+            print(f"No table has {args.min_rows:,} rows; load data with scripts.generate_dataset first.", file=sys.stderr)
+            return 1
+        params = _sample(conn)
+
+        for name, (used_by, build) in QUERIES.items():
+            plan, scanned = _explain(conn, build(params))
+            bad = sorted(scanned & large)
+            print(f"{'FAIL' if bad else 'ok':<5} {name:<26} {used_by}" + (f"  seq scan: {', '.join(bad)}" if bad else ""))
+            if args.verbose or bad:
+                print("      " + plan.replace("\n", "\n      "))
+            if bad:
+                failures.append(name)
+
+    print(f"{len(QUERIES) - len(failures)}/{len(QUERIES)} queries use indexes on large tables "
+          f"({', '.join(sorted(large))})")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,367 @@
+# scripts/generate_dataset.py
+"""
+Generate a synthetic institution and bulk-load it into DATABASE_URL.
+
+Usage (from the backend/ directory):
+
+    python -m scripts.generate_dataset --seed 42 --users 100000 --truncate
+
+Every row is derived from ``--seed``, so two runs with the same arguments
+produce identical data. All generated accounts share ``--password``; emails
+follow ``<role><n>@<domain>`` (e.g. ``student17@example.edu``), which the
+benchmark scripts rely on.
+"""
+
+import argparse
+import random
+import string
+import sys
+import time
+from array import array
+from datetime import date, datetime, timedelta
+
+from passlib.hash import bcrypt
+
+from app import models
+from app.database import engine
+from app.models import UserRole
+from app.services.bulk_load import (
+    bulk_insert,
+    reset_sequences,
+    table_is_empty,
+    truncate_tables,
+)
+from app.services import trends
+
+BCRYPT_SALT_CHARS = "./" + string.ascii_uppercase + string.ascii_lowercase + string.digits
+
+ATTENDANCE_STATUSES = ("present", "present", "present", "present", "absent", "late")
+LETTER_GRADES = ("A", "A-", "B+", "B", "B-", "C+", "C", "D", "F")
+RESOURCE_TYPES = ("classroom", "classroom", "classroom", "lab", "seminar")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--departments", type=int, default=20)
+    parser.add_argument("--users", type=int, default=100_000, help="Total users, all roles included.")
+    parser.add_argument("--teacher-ratio", type=float, default=0.04)
+    parser.add_argument("--ta-ratio", type=float, default=0.01)
+    parser.add_argument("--courses", type=int, default=3_000)
+    parser.add_argument("--courses-per-student", type=int, default=5)
+    parser.add_argument("--assignments-per-course", type=int, default=8)
+    parser.add_argument("--grade-coverage", type=float, default=0.9, help="Share of enrolled students graded per assignment.")
+    parser.add_argument("--sessions-per-course", type=int, default=12, help="Attendance sessions per course in the semester.")
+    parser.add_argument("--resources", type=int, default=300)
+    parser.add_argument("--bookings", type=int, default=20_000)
+    parser.add_argument("--term-start", type=date.fromisoformat, default=date(2025, 8, 4))
+    parser.add_argument("--term-weeks", type=int, default=16)
+    parser.add_argument("--password", default="password123")
+    parser.add_argument("--domain", default="example.edu")
+    parser.add_argument("--batch-size", type=int, default=10_000, help="executemany batch size on non-PostgreSQL backends.")
+    parser.add_argument("--truncate", action="store_true", help="Empty the target tables before loading.")
+    return parser.parse_args(argv)
+
+
+class Institution:
+    """
+    Deterministic id layout shared by all row generators.
+
+    Users are laid out as: 1 admin, one HOD per department, teachers, TAs,
+    then students. Ids are assigned explicitly so that foreign keys can be
+    produced without reading anything back from the database.
+    """
+
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+
+        self.department_ids = list(range(1, args.departments + 1))
+
+        n_teachers = max(args.departments, int(args.users * args.teacher_ratio))
+        n_tas = int(args.users * args.ta_ratio)
+        n_students = args.users - 1 - args.departments - n_teachers - n_tas
+        if n_students <= 0:
+            raise SystemExit("--users is too small for the requested departments/ratios.")
+
+        next_id = 2
+        self.hod_ids = list(range(next_id, next_id + args.departments))
+        next_id += args.departments
+        self.teacher_ids = list(range(next_id, next_id + n_teachers))
+        next_id += n_teachers
+        self.ta_ids = list(range(next_id, next_id + n_tas))
+        next_id += n_tas
+        self.student_ids = range(next_id, next_id + n_students)
+
+        # user id -> department id, stored compactly for 100k+ users
+        self.user_department = array("i", [0]) * (args.users + 1)
+        for i, uid in enumerate(self.hod_ids):
+            self.user_department[uid] = self.department_ids[i]
+        for uid in range(self.teacher_ids[0], args.users + 1):
+            self.user_department[uid] = self.rng.choice(self.department_ids)
+
+        self.teachers_by_department = {d: [] for d in self.department_ids}
+        for i, dept in enumerate(self.department_ids):
+            self.teachers_by_department[dept].append(self.hod_ids[i])
+        for uid in self.teacher_ids:
+            self.teachers_by_department[self.user_department[uid]].append(uid)
+
+        self.course_department = array("i", [0]) * (args.courses + 1)
+        self.course_teacher = array("i", [0]) * (args.courses + 1)
+        self.courses_by_department = {d: [] for d in self.department_ids}
+        for cid in range(1, args.courses + 1):
+            dept = self.department_ids[(cid - 1) % len(self.department_ids)]
+            self.course_department[cid] = dept
+            self.course_teacher[cid] = self.rng.choice(self.teachers_by_department[dept])
+            self.courses_by_department[dept].append(cid)
+
+        self.rosters = {cid: array("i") for cid in range(1, args.courses + 1)}
+        self.assignment_course = array("i", [0])
+
+        salt = "".join(self.rng.choice(BCRYPT_SALT_CHARS) for _ in range(21)) + "."
+        self.password_hash = bcrypt.using(salt=salt).hash(args.password)
+
+    @property
+    def term_start(self) -> datetime:
+        return datetime.combine(self.args.term_start, datetime.min.time())
+
+    def role_of(self, uid: int) -> UserRole:
+        if uid == 1:
+            return UserRole.ADMIN
+        if uid <= self.hod_ids[-1]:
+            return UserRole.HOD
+        if uid <= self.teacher_ids[-1]:
+            return UserRole.TEACHER
+        if self.ta_ids and uid <= self.ta_ids[-1]:
+            return UserRole.TA
+        return UserRole.STUDENT
+
+
+def department_rows(inst: Institution):
+    created = inst.term_start - timedelta(days=365)
+    for dept in inst.department_ids:
+        yield (dept, f"Department {dept:03d}", f"D{dept:03d}", None, created)
+
+
+def user_rows(inst: Institution):
+    created = inst.term_start - timedelta(days=120)
+    counters = {}
+    for uid in range(1, inst.args.users + 1):
+        role = inst.role_of(uid)
+        n = counters[role] = counters.get(role, 0) + 1
+        dept = inst.user_department[uid] or None
+        yield (
+            uid,
+            f"{role.value.title()} {n}",
+            f"{role.value}{n}@{inst.args.domain}",
+            inst.password_hash,
+            role,
+            True,
+            dept,
+            created,
+            created,
+        )
+
+
+def course_rows(inst: Institution):
+    semester = f"{inst.args.term_start.year}-{'FALL' if inst.args.term_start.month >= 7 else 'SPRING'}"
+    for cid in range(1, inst.args.courses + 1):
+        yield (
+            cid,
+            f"C{cid:05d}",
+            f"Course {cid}",
+            None,
+            inst.course_department[cid],
+            inst.course_teacher[cid],
+            semester,
+            inst.rng.choice((2, 3, 3, 4)),
+        )
+
+
+def enrollment_rows(inst: Institution):
+    rng = inst.rng
+    per_student = inst.args.courses_per_student
+    all_courses = range(1, inst.args.courses + 1)
+    window = timedelta(days=21)
+    enrollment_id = 0
+
+    for sid in inst.student_ids:
+        home = inst.courses_by_department[inst.user_department[sid]]
+        # Mostly home-department courses, plus one elective from anywhere.
+        picks = set(rng.sample(home, min(per_student - 1, len(home))))
+        while len(picks) < min(per_student, inst.args.courses):
+            picks.add(rng.choice(all_courses))
+
+        for cid in sorted(picks):
+            enrollment_id += 1
+            inst.rosters[cid].append(sid)
+            created = inst.term_start - window + timedelta(seconds=rng.randrange(int(window.total_seconds())))
+            yield (enrollment_id, sid, cid, "enrolled", created)
+
+
+def assignment_rows(inst: Institution):
+    rng = inst.rng
+    per_course = inst.args.assignments_per_course
+    term_days = inst.args.term_weeks * 7
+    assignment_id = 0
+
+    for cid in range(1, inst.args.courses + 1):
+        for n in range(1, per_course + 1):
+            assignment_id += 1
+            inst.assignment_course.append(cid)
+            due = inst.term_start + timedelta(days=term_days * n // (per_course + 1), hours=23, minutes=59)
+            yield (assignment_id, cid, f"Assignment {n}", None, due + timedelta(days=rng.randrange(-2, 3)))
+
+
+def grade_rows(inst: Institution):
+    rng = inst.rng
+    coverage = inst.args.grade_coverage
+    per_course = inst.args.assignments_per_course
+    term_days = inst.args.term_weeks * 7
+    grade_id = 0
+
+    for aid in range(1, len(inst.assignment_course)):
+        cid = inst.assignment_course[aid]
+        grader = inst.course_teacher[cid]
+        n = (aid - 1) % per_course + 1
+        due = inst.term_start + timedelta(days=term_days * n // (per_course + 1))
+        for sid in inst.rosters[cid]:
+            if rng.random() >= coverage:
+                continue
+            grade_id += 1
+            if rng.random() < 0.5:
+                value = rng.choice(LETTER_GRADES)
+            else:
+                value = str(min(100, max(0, int(rng.gauss(72, 15)))))
+            graded_at = due + timedelta(hours=rng.randrange(1, 24 * 14))
+            yield (grade_id, aid, sid, grader, value, None, rng.random() < 0.7, graded_at)
+
+
+def attendance_rows(inst: Institution):
+    rng = inst.rng
+    sessions = inst.args.sessions_per_course
+    term_days = inst.args.term_weeks * 7
+    attendance_id = 0
+
+    for cid in range(1, inst.args.courses + 1):
+        teacher = inst.course_teacher[cid]
+        first_day = cid % 5  # spread courses across weekdays
+        for n in range(sessions):
+            day = inst.args.term_start + timedelta(days=first_day + (term_days * n) // sessions)
+            for sid in inst.rosters[cid]:
+                attendance_id += 1
+                yield (attendance_id, cid, sid, day, rng.choice(ATTENDANCE_STATUSES), teacher, None)
+
+
+def resource_rows(inst: Institution):
+    rng = inst.rng
+    for rid in range(1, inst.args.resources + 1):
+        rtype = rng.choice(RESOURCE_TYPES)
+        capacity = rng.choice((30, 40, 60, 80, 120, 200)) if rtype != "lab" else rng.choice((20, 30, 40))
+        dept = rng.choice(inst.department_ids) if rng.random() < 0.6 else None
+        yield (rid, f"{rtype.title()} {rid}", rtype, f"Block {chr(65 + rid % 8)}", capacity, dept, True)
+
+
+def booking_rows(inst: Institution):
+    rng = inst.rng
+    if not inst.args.resources:
+        return
+    bookers = inst.teacher_ids + inst.hod_ids
+    term_days = inst.args.term_weeks * 7
+    for bid in range(1, inst.args.bookings + 1):
+        start = inst.term_start + timedelta(days=rng.randrange(term_days), hours=rng.randrange(8, 18))
+        end = start + timedelta(hours=rng.choice((1, 1, 2, 3)))
+        yield (
+            bid,
+            rng.randrange(1, inst.args.resources + 1),
+            rng.choice(bookers),
+            start,
+            end,
+            None,
+            rng.choice(("approved", "approved", "pending", "rejected")),
+        )
+
+
+# (table, columns, generator) in load order
+PLAN = [
+    (models.Department.__table__, ("id", "name", "code", "hod_user_id", "created_at"), department_rows),
+    (
+        models.User.__table__,
+        ("id", "full_name", "email", "password_hash", "role", "is_active", "department_id", "created_at", "updated_at"),
+        user_rows,
+    ),
+    (
+        models.Course.__table__,
+        ("id", "code", "name", "description", "department_id", "teacher_id", "semester", "credits"),
+        course_rows,
+    ),
+    (models.Enrollment.__table__, ("id", "student_id", "course_id", "status", "created_at"), enrollment_rows),
+    (models.Assignment.__table__, ("id", "course_id", "title", "description", "due_date"), assignment_rows),
+    (
+        models.Grade.__table__,
+        ("id", "assignment_id", "student_id", "graded_by_id", "grade_value", "feedback", "is_finalized", "graded_at"),
+        grade_rows,
+    ),
+    (
+        models.Attendance.__table__,
+        ("id", "course_id", "student_id", "date", "status", "marked_by_id", "period"),
+        attendance_rows,
+    ),
+    (
+        models.Resource.__table__,
+        ("id", "name", "type", "location", "capacity", "department_id", "is_active"),
+        resource_rows,
+    ),
+    (
+        models.Booking.__table__,
+        ("id", "resource_id", "booked_by_id", "start_time", "end_time", "purpose", "status"),
+        booking_rows,
+    ),
+]
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    inst = Institution(args)
+    tables = [table for table, _, _ in PLAN]
+
+    started = time.perf_counter()
+    total = 0
+
+    with engine.begin() as conn:
+        if args.truncate:
+            truncate_tables(conn, list(reversed(tables)))
+        else:
+            non_empty = [t.name for t in tables if not table_is_empty(conn, t)]
+            if non_empty:
+                print(
+                    f"Refusing to load into non-empty tables: {', '.join(non_empty)} (use --truncate).",
+                    file=sys.stderr,
+                )
+                return 1
+
+        for table, columns, generate in PLAN:
+            t0 = time.perf_counter()
+            count = bulk_insert(conn, table, columns, generate(inst), batch_size=args.batch_size)
+            elapsed = time.perf_counter() - t0
+            total += count
+            print(f"{table.name:<12} {count:>12,} rows  {elapsed:8.1f}s  {count / max(elapsed, 1e-9):>12,.0f} rows/s")
+
+        # HODs are linked after both sides exist (departments <-> users cycle).
+        dept_table = models.Department.__table__
+        for i, dept in enumerate(inst.department_ids):
+            conn.execute(
+                dept_table.update().where(dept_table.c.id == dept).values(hod_user_id=inst.hod_ids[i])
+            )
+
+        reset_sequences(conn, tables)
+        # Loaded with COPY, so the enrollment trend rollup is built here
+        trends.rebuild(conn)
+
+    elapsed = time.perf_counter() - started
+    print(f"{'total':<12} {total:>12,} rows  {elapsed:8.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+# scripts/generate_timetable.py
+"""
+Generate a weekly timetable and write it to DATABASE_URL.
+
+Usage (from the backend/ directory):
+
+    python -m scripts.generate_timetable --department 3 --term-start 2025-08-04 --weeks 16
+
+Schedules every course of the department (all courses if ``--department``
+is omitted) into a ``--days`` x ``--periods`` grid and the department's
+(or shared) active resources, honouring meetings of other courses that are
+already in place. The solution replaces the courses' meeting slots and
+their bookings for the term: one approved ``Booking`` per session per week,
+written in bulk. A solution with hard violations or sessions without a
+suitable room is not written (exit code 2). ``--dry-run`` solves and reports without writing.
+"""
+
+import argparse
+import sys
+import time
+from datetime import date, datetime
+
+from sqlalchemy import select
+
+from app import models
+from app.database import SessionLocal
+from app.models import UserRole
+from app.services.scheduling import TimeGrid, generate_timetable
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--department", type=int, default=None)
+    parser.add_argument("--term-start", type=date.fromisoformat, default=date.today())
+    parser.add_argument("--weeks", type=int, default=16)
+    parser.add_argument("--days", type=int, default=5)
+    parser.add_argument("--periods", type=int, default=8)
+    parser.add_argument("--day-start", type=lambda v: datetime.strptime(v, "%H:%M").time(), default="09:00")
+    parser.add_argument("--period-minutes", type=int, default=60)
+    parser.add_argument("--time-limit", type=float, default=50.0, help="Solver budget in seconds.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--booked-by", type=int, default=None, help="User id recorded on bookings (default: first admin).")
+    parser.add_argument("--dry-run", action="store_true")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    grid = TimeGrid(args.days, args.periods, args.day_start, args.period_minutes)
+
+    with SessionLocal() as db:
+        booked_by = args.booked_by or db.execute(
+            select(models.User.id).where(models.User.role == UserRole.ADMIN).order_by(models.User.id).limit(1)
+        ).scalar_one_or_none()
+        if booked_by is None:
+            print("No admin user to record as the booker (use --booked-by).", file=sys.stderr)
+            return 1
+
+        started = time.perf_counter()
+        summary = generate_timetable(
+            db,
+            grid,
+            args.term_start,
+            args.weeks,
+            booked_by,
+            department_id=args.department,
+            time_limit=args.time_limit,
+            seed=args.seed,
+            dry_run=args.dry_run,
+            progress=lambda fraction, message: print(f"[{fraction:4.0%}] {message}"),
+        )
+        if summary.get("written"):
+            db.commit()
+
+    print(f"done in {time.perf_counter() - started:.1f}s")
+    for key, value in summary.items():
+        if key != "unplaceable":
+            print(f"  {key:<16} {value}")
+    for item in summary.get("unplaceable", [])[:20]:
+        print(f"  course {item['course_id']}: no suitable room for {item['size']} students", file=sys.stderr)
+
+    return 0 if not summary.get("hard_violations") and not summary.get("unplaceable") else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+# scripts/smtp_stub.py
+"""
+Minimal local SMTP sink for development.
+
+Usage (from the backend/ directory):
+
+    python -m scripts.smtp_stub --port 1025 [--maildir /tmp/mail]
+
+Accepts every message and prints its recipients and subject; with
+``--maildir`` each message is also saved as a ``.eml`` file. Run the
+worker with ``NOTIFY_TRANSPORT=smtp`` to deliver notifications to it.
+Only the commands ``smtplib`` needs are implemented; no TLS, no auth.
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import sys
+from email import message_from_bytes
+
+_counter = itertools.count(1)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1025)
+    parser.add_argument("--maildir", default=None)
+    return parser.parse_args(argv)
+
+
+def deliver(data: bytes, recipients, maildir) -> None:
+    message = message_from_bytes(data)
+    number = next(_counter)
+    print(f"#{number} to {', '.join(recipients)}: {message.get('Subject', '')}", flush=True)
+    if maildir:
+        with open(os.path.join(maildir, f"{os.getpid()}-{number:08d}.eml"), "wb") as f:
+            f.write(data)
+
+
+async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, maildir) -> None:
+    async def reply(line: str) -> None:
+        writer.write(line.encode() + b"\r\n")
+        await writer.drain()
+
+    await reply("220 localhost smtp-stub ready")
+    recipients = []
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            command = line.decode("utf-8", "replace").strip()
+            verb = command[:4].upper()
+
+            if verb in ("HELO", "EHLO"):
+                await reply("250 localhost")
+            elif verb == "MAIL":
+                recipients = []
+                await reply("250 OK")
+            elif verb == "RCPT":
+                recipients.append(command.split(":", 1)[-1].strip().strip("<>"))
+                await reply("250 OK")
+            elif verb == "DATA":
+                await reply("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                while True:
+                    data_line = await reader.readline()
+                    if not data_line or data_line in (b".\r\n", b".\n"):
+                        break
+                    lines.append(data_line[1:] if data_line.startswith(b"..") else data_line)
+                deliver(b"".join(lines), recipients, maildir)
+                recipients = []
+                await reply("250 OK: queued")
+            elif verb == "RSET":
+                recipients = []
+                await reply("250 OK")
+            elif verb == "NOOP":
+                await reply("250 OK")
+            elif verb == "QUIT":
+                await reply("221 Bye")
+                break
+            else:
+                await reply("502 Command not implemented")
+    finally:
+        writer.close()
+
+
+async def serve(args) -> None:
+    server = await asyncio.start_server(lambda r, w: handle(r, w, args.maildir), args.host, args.port)
+    print(f"SMTP stub listening on {args.host}:{args.port}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.maildir:
+        os.makedirs(args.maildir, exist_ok=True)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
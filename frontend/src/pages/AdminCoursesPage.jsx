@@ -3,9 +3,8 @@
 import { useEffect, useMemo, useState } from "react";
 import { useNavigate } from "react-router-dom";
 import {
+  batchGet,
   fetchCurrentUser,
-  fetchDepartments,
-  fetchUsers,
   fetchCourses,
   createCourse,
   updateCourse,
@@ -81,11 +80,7 @@ const AdminCoursesPage = () => {
 
     setLoadingMeta(true);
 
-    Promise.all([
-      fetchDepartments(),
-      fetchUsers({ role: "teacher" }),
-      fetchUsers({ role: "hod" }),
-    ])
+    batchGet(["/departments/", "/users/?role=teacher", "/users/?role=hod"])
       .then(([deps, teachersOnly, hods]) => {
         setDepartments(deps);
         // merge teachers + HODs as potential course instructors
@@ -218,7 +213,7 @@ const AdminCoursesPage = () => {
         department_id: editingDeptId ? Number(editingDeptId) : null,
         teacher_id: editingTeacherId ? Number(editingTeacherId) : null,
       };
-      const updated = await updateCourse(id, payload);
+      const updated = await updateCourse(id, payload, courses.find((c) => c.id === id)?.version);
       setCourses((prev) => prev.map((c) => (c.id === id ? updated : c)));
       cancelEdit();
     } catch (err) {
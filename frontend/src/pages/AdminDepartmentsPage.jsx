@@ -107,11 +107,15 @@ const AdminDepartmentsPage = () => {
     setSaving(true);
     setDeptError(null);
     try {
-      const updated = await updateDepartment(id, {
-        name: editingName.trim(),
-        code: editingCode.trim(),
-        hod_user_id: null,
-      });
+      const updated = await updateDepartment(
+        id,
+        {
+          name: editingName.trim(),
+          code: editingCode.trim(),
+          hod_user_id: null,
+        },
+        departments.find((d) => d.id === id)?.version
+      );
       setDepartments((prev) =>
         prev.map((d) => (d.id === id ? updated : d))
       );
@@ -190,7 +190,7 @@ const AdminUsersPage = () => {
         department_id: editingDeptId ? Number(editingDeptId) : null,
         is_active: editingIsActive,
       };
-      const updated = await updateUser(id, payload);
+      const updated = await updateUser(id, payload, users.find((u) => u.id === id)?.version);
       setUsers((prev) => prev.map((u) => (u.id === id ? updated : u)));
       cancelEdit();
     } catch (err) {
@@ -2,12 +2,7 @@
 
 import { useEffect, useMemo, useState } from "react";
 import { useNavigate, useParams } from "react-router-dom";
-import {
-  fetchCurrentUser,
-  fetchDepartments,
-  fetchCourseById,
-  fetchEnrolledStudentsForCourse,
-} from "../services/api";
+import { batchGet, fetchCurrentUser } from "../services/api";
 import { getToken } from "../auth";
 
 const TeacherCourseDetailPage = () => {
@@ -54,10 +49,10 @@ const TeacherCourseDetailPage = () => {
     setLoadingData(true);
     setDataError(null);
 
-    Promise.all([
-      fetchCourseById(courseId),
-      fetchDepartments(),
-      fetchEnrolledStudentsForCourse(courseId),
+    batchGet([
+      `/courses/${courseId}`,
+      "/departments/",
+      `/teacher/courses/${courseId}/students`,
     ])
       .then(([courseData, deps, enrolled]) => {
         setCourse(courseData);
@@ -64,6 +64,13 @@ function getAuthHeaders() {
   };
 }
 
+// Optimistic concurrency: with the version the record was loaded at, the
+// server answers 412 instead of overwriting someone else's change.
+function withIfMatch(headers, version) {
+  if (version === undefined || version === null) return headers;
+  return { ...headers, "If-Match": `"${version}"` };
+}
+
 // --------- Department APIs ----------
 
 export async function fetchDepartments() {
@@ -100,8 +107,8 @@ export async function createDepartment({ name, code }) {
   return response.json(); // DepartmentRead
 }
 
-export async function updateDepartment(id, payload) {
-  const headers = getAuthHeaders();
+export async function updateDepartment(id, payload, version) {
+  const headers = withIfMatch(getAuthHeaders(), version);
   const response = await fetch(`${API_BASE_URL}/departments/${id}`, {
     method: "PUT",
     headers,
@@ -181,8 +188,8 @@ export async function createUser(payload) {
   return response.json(); // UserRead
 }
 
-export async function updateUser(id, payload) {
-  const headers = getAuthHeaders();
+export async function updateUser(id, payload, version) {
+  const headers = withIfMatch(getAuthHeaders(), version);
   const response = await fetch(`${API_BASE_URL}/users/${id}`, {
     method: "PUT",
     headers,
@@ -261,8 +268,8 @@ export async function createCourse(payload) {
   return response.json(); // CourseRead
 }
 
-export async function updateCourse(id, payload) {
-  const headers = getAuthHeaders();
+export async function updateCourse(id, payload, version) {
+  const headers = withIfMatch(getAuthHeaders(), version);
   const response = await fetch(`${API_BASE_URL}/courses/${id}`, {
     method: "PUT",
     headers,
@@ -346,3 +353,40 @@ export async function fetchEnrolledStudentsForCourse(courseId) {
 
   return response.json(); // UserRead[]
 }
+
+// --------- Batch API ----------
+
+// Several GETs in one round trip (POST /batch, at most 20 paths). Resolves
+// to the response bodies in the order of `paths`, e.g.
+//   const [course, students] = await batchGet([`/courses/${id}`, `/teacher/courses/${id}/students`]);
+// and, like the single-resource helpers, rejects if any of them failed.
+export async function batchGet(paths) {
+  const headers = getAuthHeaders();
+  const response = await fetch(`${API_BASE_URL}/batch`, {
+    method: "POST",
+    headers,
+    body: JSON.stringify({ requests: paths.map((path) => ({ method: "GET", path })) }),
+  });
+
+  if (!response.ok) {
+    let detail = `Batch request failed: ${response.status}`;
+    try {
+      const data = await response.json();
+      if (data.detail) detail = data.detail;
+    } catch {}
+    throw new Error(detail);
+  }
+
+  const results = await response.json();
+  const failed = results.findIndex((result) => result.status >= 400);
+  if (failed !== -1) {
+    const detail = results[failed].body && results[failed].body.detail;
+    throw new Error(
+      typeof detail === "string"
+        ? detail
+        : `Failed to fetch ${paths[failed]}: ${results[failed].status}`
+    );
+  }
+
+  return results.map((result) => result.body);
+}